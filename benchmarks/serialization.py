@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""
+Benchmark the serialization of the TAC and FIPA messages.
+
+Every TACMessage type is encoded and decoded with both schemas of the TAC protocol,
+and the FIPA CFP, Propose and Accept messages are encoded and decoded with the payloads built by the participants.
+The games are parameterized by the number of agents, the number of goods and the length of the transaction history
+(i.e. the number of transactions in a state update).
+
+The results are printed, or written to a file, as a JSON document, e.g.:
+
+    python -m benchmarks.serialization --nb-goods 10 100 --output serialization.json
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import statistics
+import sys
+import timeit
+from typing import Any, Callable, Dict, List, Optional
+
+import google.protobuf
+from aea.protocols.base.message import Message
+from aea.protocols.base.serialization import Serializer
+from aea.protocols.fipa.message import FIPAMessage
+from aea.protocols.fipa.serialization import FIPASerializer
+
+from tac.__version__ import __version__
+from tac.agents.participant.v1.base.helpers import (
+    build_dict,
+    get_goods_quantities_description,
+)
+from tac.platform.game.base import GameData, Transaction
+from tac.platform.protocols.tac.message import TACMessage
+from tac.platform.protocols.tac.serialization import (
+    GameIndex,
+    TAC_SCHEMA_VERSION,
+    TACSerializer,
+)
+
+DEFAULT_NB_AGENTS = [10]
+DEFAULT_NB_GOODS = [10, 100]
+DEFAULT_HISTORY_LENGTHS = [0, 100]
+
+
+def _agent_pbks(nb_agents: int) -> List[str]:
+    """Get the public keys of the agents of a game."""
+    return ["tac_agent_{}_pbk".format(i) for i in range(nb_agents)]
+
+
+def _good_pbks(nb_goods: int) -> List[str]:
+    """Get the public keys of the goods of a game."""
+    return ["tac_good_{}_pbk".format(i) for i in range(nb_goods)]
+
+
+def _make_game_data(nb_agents: int, nb_goods: int) -> GameData:
+    """Make the game data of the first agent of a game."""
+    agent_pbks = _agent_pbks(nb_agents)
+    good_pbks = _good_pbks(nb_goods)
+    return GameData(
+        agent_pbks[0],
+        100.0,
+        [2] * nb_goods,
+        [1.0 / nb_goods] * nb_goods,
+        nb_agents,
+        nb_goods,
+        1.0,
+        {agent_pbk: agent_pbk[: -len("_pbk")] for agent_pbk in agent_pbks},
+        {good_pbk: good_pbk[: -len("_pbk")] for good_pbk in good_pbks},
+        "benchmark",
+    )
+
+
+def _make_transaction(nb_agents: int, nb_goods: int, i: int) -> Transaction:
+    """Make the i-th transaction of the first agent of a game, over every good."""
+    agent_pbks = _agent_pbks(nb_agents)
+    return Transaction(
+        "transaction_{}".format(i),
+        i % 2 == 0,
+        agent_pbks[1 + i % (nb_agents - 1)],
+        10.0,
+        {good_pbk: i % 3 for good_pbk in _good_pbks(nb_goods)},
+        agent_pbks[0],
+    )
+
+
+def make_tac_messages(
+    nb_agents: int, nb_goods: int, history_length: int
+) -> Dict[TACMessage.Type, TACMessage]:
+    """
+    Make a TAC message of every type.
+
+    :param nb_agents: the number of agents of the game.
+    :param nb_goods: the number of goods of the game.
+    :param history_length: the number of transactions in the state update.
+    :return: the messages, by type.
+    """
+    game_data = _make_game_data(nb_agents, nb_goods)
+    tx = _make_transaction(nb_agents, nb_goods, 0)
+    messages = [
+        TACMessage(tac_type=TACMessage.Type.REGISTER, agent_name="tac_agent_0"),
+        TACMessage(tac_type=TACMessage.Type.UNREGISTER),
+        TACMessage(
+            tac_type=TACMessage.Type.TRANSACTION,
+            transaction_id=tx.transaction_id,
+            is_sender_buyer=tx.is_sender_buyer,
+            counterparty=tx.counterparty,
+            amount=tx.amount,
+            quantities_by_good_pbk=tx.quantities_by_good_pbk,
+        ),
+        TACMessage(tac_type=TACMessage.Type.GET_STATE_UPDATE),
+        TACMessage(tac_type=TACMessage.Type.CANCELLED),
+        TACMessage(
+            tac_type=TACMessage.Type.GAME_DATA,
+            money=game_data.money,
+            endowment=game_data.endowment,
+            utility_params=game_data.utility_params,
+            nb_agents=game_data.nb_agents,
+            nb_goods=game_data.nb_goods,
+            tx_fee=game_data.tx_fee,
+            agent_pbk_to_name=game_data.agent_pbk_to_name,
+            good_pbk_to_name=game_data.good_pbk_to_name,
+        ),
+        TACMessage(
+            tac_type=TACMessage.Type.TRANSACTION_CONFIRMATION,
+            transaction_id=tx.transaction_id,
+        ),
+        TACMessage(
+            tac_type=TACMessage.Type.STATE_UPDATE,
+            initial_state=game_data,
+            transactions=[
+                _make_transaction(nb_agents, nb_goods, i) for i in range(history_length)
+            ],
+        ),
+        TACMessage(
+            tac_type=TACMessage.Type.TAC_ERROR,
+            error_code=TACMessage.ErrorCode.TRANSACTION_NOT_VALID,
+            error_msg="Error in checking transaction",
+        ),
+        TACMessage(
+            tac_type=TACMessage.Type.BATCH,
+            messages=[
+                TACSerializer().encode(
+                    TACMessage(
+                        tac_type=TACMessage.Type.TRANSACTION_CONFIRMATION,
+                        transaction_id="transaction_{}".format(i),
+                    )
+                )
+                for i in range(nb_agents)
+            ],
+        ),
+    ]
+    return {TACMessage.Type(msg.get("type")): msg for msg in messages}
+
+
+def make_fipa_messages(nb_goods: int) -> Dict[FIPAMessage.Performative, FIPAMessage]:
+    """
+    Make the FIPA messages of a negotiation, with the payloads built by the participants.
+
+    :param nb_goods: the number of goods of the game.
+    :return: the messages, by performative.
+    """
+    good_pbks = _good_pbks(nb_goods)
+    proposal = get_goods_quantities_description(good_pbks, [1] * nb_goods, True)
+    proposal.values["price"] = 10.0
+    return {
+        FIPAMessage.Performative.CFP: FIPAMessage(
+            message_id=1,
+            dialogue_id=1,
+            target=0,
+            performative=FIPAMessage.Performative.CFP,
+            query=json.dumps(build_dict(set(good_pbks), False)).encode("utf-8"),
+        ),
+        FIPAMessage.Performative.PROPOSE: FIPAMessage(
+            message_id=2,
+            dialogue_id=1,
+            target=1,
+            performative=FIPAMessage.Performative.PROPOSE,
+            proposal=[proposal],
+        ),
+        FIPAMessage.Performative.ACCEPT: FIPAMessage(
+            message_id=3,
+            dialogue_id=1,
+            target=2,
+            performative=FIPAMessage.Performative.ACCEPT,
+        ),
+    }
+
+
+def _time_per_call(function: Callable[[], Any], repeat: int, number: int) -> float:
+    """
+    Time a function.
+
+    :param function: the function to time.
+    :param repeat: the number of measurements.
+    :param number: the number of calls per measurement.
+    :return: the median time per call, in microseconds.
+    """
+    timings = timeit.Timer(function).repeat(repeat=repeat, number=number)
+    return statistics.median(timings) / number * 1e6
+
+
+def benchmark_message(
+    serializer: Serializer, msg: Message, repeat: int, number: int
+) -> Dict[str, Any]:
+    """
+    Benchmark the serialization of a message.
+
+    :param serializer: the serializer.
+    :param msg: the message.
+    :param repeat: the number of measurements.
+    :param number: the number of calls per measurement.
+    :return: the size of the encoded message and the median encoding and decoding times, in microseconds.
+    """
+    msg_bytes = serializer.encode(msg)
+    return {
+        "size_bytes": len(msg_bytes),
+        "encode_us": _time_per_call(lambda: serializer.encode(msg), repeat, number),
+        "decode_us": _time_per_call(
+            lambda: serializer.decode(msg_bytes), repeat, number
+        ),
+    }
+
+
+def run(
+    nb_agents_list: List[int],
+    nb_goods_list: List[int],
+    history_lengths: List[int],
+    repeat: int = 5,
+    number: int = 100,
+) -> Dict[str, Any]:
+    """
+    Run the benchmarks.
+
+    The messages which do not depend on the length of the history, or on the number of agents, are benchmarked once.
+
+    :param nb_agents_list: the numbers of agents of the games.
+    :param nb_goods_list: the numbers of goods of the games.
+    :param history_lengths: the numbers of transactions in the state updates.
+    :param repeat: the number of measurements of every benchmark.
+    :param number: the number of calls per measurement.
+    :return: the results, as a JSON-serializable dictionary.
+    """
+    results = []  # type: List[Dict[str, Any]]
+    for nb_goods in nb_goods_list:
+        for performative, fipa_msg in make_fipa_messages(nb_goods).items():
+            result = dict(
+                protocol="fipa",
+                message=performative.value,
+                nb_goods=nb_goods,
+            )  # type: Dict[str, Any]
+            result.update(benchmark_message(FIPASerializer(), fipa_msg, repeat, number))
+            results.append(result)
+
+        for nb_agents in nb_agents_list:
+            game_index = GameIndex(_agent_pbks(nb_agents), _good_pbks(nb_goods))
+            serializers = {
+                1: TACSerializer(),
+                TAC_SCHEMA_VERSION: TACSerializer(TAC_SCHEMA_VERSION, game_index),
+            }
+            for i, history_length in enumerate(history_lengths):
+                messages = make_tac_messages(nb_agents, nb_goods, history_length)
+                for tac_type, tac_msg in messages.items():
+                    if tac_type != TACMessage.Type.STATE_UPDATE and i > 0:
+                        continue
+                    for schema_version, serializer in serializers.items():
+                        result = dict(
+                            protocol="tac",
+                            message=tac_type.value,
+                            schema_version=schema_version,
+                            nb_agents=nb_agents,
+                            nb_goods=nb_goods,
+                        )
+                        if tac_type == TACMessage.Type.STATE_UPDATE:
+                            result["history_length"] = history_length
+                        result.update(
+                            benchmark_message(serializer, tac_msg, repeat, number)
+                        )
+                        results.append(result)
+
+    return {
+        "metadata": {
+            "date": datetime.datetime.now().isoformat(),
+            "tac_version": __version__,
+            "python_version": platform.python_version(),
+            "python_implementation": platform.python_implementation(),
+            "protobuf_version": google.protobuf.__version__,
+            "platform": platform.platform(),
+            "repeat": repeat,
+            "number": number,
+        },
+        "results": results,
+    }
+
+
+def parse_arguments(args: Optional[List[str]] = None) -> argparse.Namespace:
+    """Arguments parsing."""
+    parser = argparse.ArgumentParser(
+        "benchmarks.serialization",
+        description="Benchmark the serialization of the TAC and FIPA messages.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "--nb-agents",
+        type=int,
+        nargs="+",
+        default=DEFAULT_NB_AGENTS,
+        help="The numbers of agents.",
+    )
+    parser.add_argument(
+        "--nb-goods",
+        type=int,
+        nargs="+",
+        default=DEFAULT_NB_GOODS,
+        help="The numbers of goods.",
+    )
+    parser.add_argument(
+        "--history-lengths",
+        type=int,
+        nargs="+",
+        default=DEFAULT_HISTORY_LENGTHS,
+        help="The numbers of transactions in the state updates.",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="The number of measurements of every benchmark.",
+    )
+    parser.add_argument(
+        "--number", type=int, default=100, help="The number of calls per measurement."
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="The path of the JSON file where to write the results. If not set, they are printed.",
+    )
+    return parser.parse_args(args)
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    """Run the benchmarks from the command line."""
+    arguments = parse_arguments(args)
+    assert all(nb_agents >= 2 for nb_agents in arguments.nb_agents)
+    assert all(nb_goods >= 1 for nb_goods in arguments.nb_goods)
+    report = run(
+        arguments.nb_agents,
+        arguments.nb_goods,
+        arguments.history_lengths,
+        repeat=arguments.repeat,
+        number=arguments.number,
+    )
+    if arguments.output is None:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        with open(arguments.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -37,6 +37,7 @@ import time
 from collections import defaultdict
 from typing import List, Dict, Any
 
+from tac.platform.game.dump import find_game_dump, load_game
 from tac.platform.game.stats import GameStats
 
 OUR_DIRECTORY = os.path.dirname(inspect.getfile(inspect.currentframe()))  # type: ignore
@@ -230,10 +231,15 @@ def collect_data(datadir: str, experiment_names: List[str]) -> List[GameStats]:
     """
     result = []
     for experiment_name in experiment_names:
-        json_experiment_data = json.load(
-            open(os.path.join(datadir, experiment_name, "game.json"))
+        game_dump_filepath = find_game_dump(os.path.join(datadir, experiment_name))
+        assert game_dump_filepath is not None, "No game dump for {}".format(
+            experiment_name
         )
-        game_stats = GameStats.from_json(json_experiment_data)
+        game = load_game(game_dump_filepath)
+        assert game is not None, "Found incomplete data for {}".format(
+            experiment_name
+        )
+        game_stats = GameStats(game)
         result.append(game_stats)
 
     return result
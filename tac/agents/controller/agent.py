@@ -24,25 +24,35 @@ import argparse
 import datetime
 import dateutil.parser
 import logging
+import os
 import pprint
 import random
 import time
-from typing import Optional
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set
 
 
 from aea.agent import Agent
 from aea.channels.oef.connection import OEFMailBox
-from aea.mail.base import Envelope
+from aea.mail.base import Address, Envelope
 
 from tac.agents.controller.base.handlers import (
     OEFHandler,
     GameHandler,
     AgentMessageDispatcher,
 )
+from tac.agents.controller.base.metrics import (
+    METRICS_FILENAME,
+    ControllerMetrics,
+    MetricsServer,
+)
 from tac.agents.controller.base.tac_parameters import TACParameters
 from tac.platform.game.base import GamePhase
+from tac.platform.protocols.tac.batching import BatchingOutBox
+from tac.platform.protocols.tac.compression import DEFAULT_COMPRESSION_THRESHOLD
+from tac.platform.protocols.tac.serialization import TACSerializer
 from tac.platform.shared_sim_status import set_controller_state, ControllerAgentState
-from tac.gui.monitor import Monitor, NullMonitor, VisdomMonitor
+from tac.gui.monitor import AsyncMonitor, Monitor, NullMonitor, VisdomMonitor
 
 if __name__ != "__main__":
     logger = logging.getLogger(__name__)
@@ -51,7 +61,12 @@ else:
 
 
 class ControllerAgent(Agent):
-    """The controller agent class implements a controller for TAC."""
+    """
+    The controller agent class implements a controller for TAC.
+
+    A controller can host several games, identified by their version ids, over the same OEF connection.
+    Every game has its own phases, timers and dumps; the agent stops when all its games are over.
+    """
 
     def __init__(
         self,
@@ -64,6 +79,7 @@ class ControllerAgent(Agent):
         max_reactions: int = 100,
         private_key_pem: Optional[str] = None,
         debug: bool = False,
+        metrics_port: Optional[int] = None,
         **kwargs
     ):
         """
@@ -72,12 +88,13 @@ class ControllerAgent(Agent):
         :param name: the name of the agent.
         :param oef_addr: the TCP/IP address of the OEF node.
         :param oef_port: the TCP/IP port of the OEF node.
-        :param strategy: the strategy object that specify the behaviour during the competition.
+        :param tac_parameters: the parameters of the game of the controller. More games can be hosted with add_game.
         :param agent_timeout: the time in (fractions of) seconds to time out an agent between act and react.
         :param max_reactions: the maximum number of reactions (messages processed) per call to react.
         :param monitor: a Visdom dashboard to visualize agent statistics during the competition.
         :param private_key_pem: the path to a private key in PEM format.
         :param debug: if True, run the agent in debug mode.
+        :param metrics_port: the local TCP port where the metrics are served. If None, the metrics are only dumped at the end.
         """
         super().__init__(name, private_key_pem, agent_timeout, debug=debug)
         self.mailbox = OEFMailBox(self.crypto.public_key, oef_addr, oef_port)
@@ -89,13 +106,24 @@ class ControllerAgent(Agent):
             self.name,
             tac_parameters.version_id,
         )
-        self.agent_message_dispatcher = AgentMessageDispatcher(self)
+        self.metrics = ControllerMetrics()
+        self.metrics_server = (
+            MetricsServer(self.metrics, metrics_port)
+            if metrics_port is not None
+            else None
+        )  # type: Optional[MetricsServer]
         self.game_handler = GameHandler(
-            name, self.crypto, self.mailbox, monitor, tac_parameters
+            name, self.crypto, self.mailbox, monitor, tac_parameters, self.metrics
         )
+        self.game_handlers = OrderedDict(
+            [(self.game_handler.version_id, self.game_handler)]
+        )  # type: Dict[str, GameHandler]
+        self._released_version_ids = set()  # type: Set[str]
+        # the TAC messages sent within a cycle are coalesced, and flushed by the game handlers.
+        self.mailbox.outbox = BatchingOutBox(self.mailbox.outbox, self.get_serializer)
+        self.agent_message_dispatcher = AgentMessageDispatcher(self)
 
         self.max_reactions = max_reactions
-        self.last_activity = datetime.datetime.now()
 
         logger.debug(
             "[{}]: Initialized myself as Controller Agent :\n{}".format(
@@ -106,109 +134,206 @@ class ControllerAgent(Agent):
             self.game_handler.tac_parameters.version_id, ControllerAgentState.STARTING
         )
 
+    def add_game(
+        self, tac_parameters: TACParameters, monitor: Optional[Monitor] = None
+    ) -> GameHandler:
+        """
+        Host another game.
+
+        The game shares the OEF connection, the outbox and the metrics of the controller.
+        Until its start time, it only costs a check per cycle.
+
+        :param tac_parameters: the parameters of the game. Its version id must differ from the ones of the hosted games.
+        :param monitor: the monitor of the game. If None, the game is not monitored.
+        :return: the handler of the game.
+        """
+        assert (
+            tac_parameters.version_id not in self.game_handlers
+        ), "A game with version id {} is already hosted.".format(
+            tac_parameters.version_id
+        )
+        game_handler = GameHandler(
+            self.name,
+            self.crypto,
+            self.mailbox,
+            monitor if monitor is not None else NullMonitor(),
+            tac_parameters,
+            self.metrics,
+        )
+        self.game_handlers[game_handler.version_id] = game_handler
+        self.agent_message_dispatcher.add_game(game_handler)
+        set_controller_state(game_handler.version_id, ControllerAgentState.STARTING)
+        return game_handler
+
+    def get_game_handler(self, version_id: Optional[str]) -> Optional[GameHandler]:
+        """
+        Get a hosted game.
+
+        If the controller hosts a single game, this is the game of the controller, whatever the version id.
+        Otherwise, the version id must name one of the hosted games.
+
+        :param version_id: the version id of the game, or None if it is not known.
+        :return: the handler of the game, or None if no such game is hosted.
+        """
+        if len(self.game_handlers) == 1:
+            return self.game_handler
+        if version_id is None:
+            return None
+        return self.game_handlers.get(version_id)
+
+    def get_serializer(self, to: Address) -> TACSerializer:
+        """
+        Get the serializer of the messages to an agent, from the game the agent is registered to.
+
+        :param to: the public key of the agent.
+        :return: the serializer.
+        """
+        for game_handler in self.game_handlers.values():
+            if to in game_handler.registered_agents:
+                return game_handler.get_serializer(to)
+        return self.game_handler.get_serializer(to)
+
     def act(self) -> None:
         """
-        Perform the agent's actions.
+        Perform the agent's actions, i.e. move every hosted game through its phases.
 
         :return: None
         """
-        if self.game_handler.game_phase == GamePhase.PRE_GAME:
-            now = datetime.datetime.now()
-            seconds_to_wait = (
-                self.game_handler.tac_parameters.start_time - now
-            ).total_seconds()
-            seconds_to_wait = 0.5 if seconds_to_wait < 0 else seconds_to_wait
-            logger.debug(
-                "[{}]: waiting for starting the competition: start_time={}, current_time={}, timedelta ={}s".format(
-                    self.name,
-                    str(self.game_handler.tac_parameters.start_time),
-                    str(now),
-                    seconds_to_wait,
-                )
-            )
-            self.game_handler.competition_start = now + datetime.timedelta(
-                seconds=seconds_to_wait
-                + self.game_handler.tac_parameters.registration_timedelta.seconds
-            )
+        now = datetime.datetime.now()
+        for game_handler in list(self.game_handlers.values()):
+            if self.liveness.is_stopped:
+                return
+            if game_handler.game_phase != GamePhase.POST_GAME:
+                self._act_on_game(game_handler, now)
 
-            time.sleep(seconds_to_wait)
+    def _act_on_game(self, game_handler: GameHandler, now: datetime.datetime) -> None:
+        """
+        Move a game through its phases.
+
+        :param game_handler: the game.
+        :param now: the current time.
+        :return: None
+        """
+        tac_parameters = game_handler.tac_parameters
+        if game_handler.game_phase == GamePhase.PRE_GAME:
+            if now < tac_parameters.start_time:
+                return
+            game_handler.competition_start = now + tac_parameters.registration_timedelta
             logger.debug(
                 "[{}]: Register competition with parameters: {}".format(
-                    self.name, pprint.pformat(self.game_handler.tac_parameters.__dict__)
+                    self.name, pprint.pformat(tac_parameters.__dict__)
                 )
             )
-            self.oef_handler.register_tac()
+            self.oef_handler.register_tac(game_handler.version_id)
 
             set_controller_state(
-                self.game_handler.tac_parameters.version_id,
-                ControllerAgentState.REGISTRATION_OPEN,
+                game_handler.version_id, ControllerAgentState.REGISTRATION_OPEN
             )
 
-            self.game_handler._game_phase = GamePhase.GAME_SETUP
-        elif self.game_handler.game_phase == GamePhase.GAME_SETUP:
+            game_handler._game_phase = GamePhase.GAME_SETUP
+        elif game_handler.game_phase == GamePhase.GAME_SETUP:
             assert (
-                self.game_handler.competition_start is not None
+                game_handler.competition_start is not None
             ), "No competition start time set!"
-            now = datetime.datetime.now()
-            if now >= self.game_handler.competition_start:
+            if now >= game_handler.competition_start:
                 logger.debug(
-                    "[{}]: Checking if we can start the competition.".format(self.name)
+                    "[{}]: Checking if we can start the competition {}.".format(
+                        self.name, game_handler.version_id
+                    )
                 )
-                min_nb_agents = self.game_handler.tac_parameters.min_nb_agents
-                nb_reg_agents = len(self.game_handler.registered_agents)
+                min_nb_agents = tac_parameters.min_nb_agents
+                nb_reg_agents = len(game_handler.registered_agents)
 
                 set_controller_state(
-                    self.game_handler.tac_parameters.version_id,
-                    ControllerAgentState.RUNNING,
+                    game_handler.version_id, ControllerAgentState.RUNNING
                 )
 
                 if nb_reg_agents >= min_nb_agents:
                     logger.debug(
-                        "[{}]: Start competition. Registered agents: {}, minimum number of agents: {}.".format(
-                            self.name, nb_reg_agents, min_nb_agents
+                        "[{}]: Start competition {}. Registered agents: {}, minimum number of agents: {}.".format(
+                            self.name,
+                            game_handler.version_id,
+                            nb_reg_agents,
+                            min_nb_agents,
                         )
                     )
-                    self.game_handler.start_competition()
+                    game_handler.start_competition()
                 else:
                     logger.debug(
-                        "[{}]: Not enough agents to start TAC. Registered agents: {}, minimum number of agents: {}.".format(
-                            self.name, nb_reg_agents, min_nb_agents
+                        "[{}]: Not enough agents to start TAC {}. Registered agents: {}, minimum number of agents: {}.".format(
+                            self.name,
+                            game_handler.version_id,
+                            nb_reg_agents,
+                            min_nb_agents,
                         )
                     )
-                    set_controller_state(
-                        self.game_handler.tac_parameters.version_id,
-                        ControllerAgentState.STOPPING_UNSUFFICIENT_AGENTS,
+                    self._finish_game(
+                        game_handler, ControllerAgentState.STOPPING_UNSUFFICIENT_AGENTS
                     )
-                    self.stop()
-                    return
-        elif self.game_handler.game_phase == GamePhase.GAME:
-            current_time = datetime.datetime.now()
-            inactivity_duration = current_time - self.last_activity
-            if (
-                inactivity_duration
-                > self.game_handler.tac_parameters.inactivity_timedelta
-            ):
+        elif game_handler.game_phase == GamePhase.GAME:
+            inactivity_duration = now - game_handler.last_activity
+            if inactivity_duration > tac_parameters.inactivity_timedelta:
                 logger.debug(
-                    "[{}]: Inactivity timeout expired. Terminating...".format(self.name)
+                    "[{}]: Inactivity timeout expired for TAC {}. Terminating...".format(
+                        self.name, game_handler.version_id
+                    )
                 )
-                set_controller_state(
-                    self.game_handler.tac_parameters.version_id,
-                    ControllerAgentState.FINISHED_INACTIVITY,
+                self._finish_game(
+                    game_handler, ControllerAgentState.FINISHED_INACTIVITY
                 )
-                self.stop()
-                return
-            elif current_time > self.game_handler.tac_parameters.end_time:
+            elif now > tac_parameters.end_time:
                 logger.debug(
-                    "[{}]: Competition timeout expired. Terminating...".format(
-                        self.name
+                    "[{}]: Competition timeout expired for TAC {}. Terminating...".format(
+                        self.name, game_handler.version_id
                     )
                 )
-                set_controller_state(
-                    self.game_handler.tac_parameters.version_id,
-                    ControllerAgentState.FINISHED_GAME_TIMEOUT,
+                self._finish_game(
+                    game_handler, ControllerAgentState.FINISHED_GAME_TIMEOUT
                 )
-                self.stop()
-                return
+
+    def _finish_game(
+        self, game_handler: GameHandler, state: ControllerAgentState
+    ) -> None:
+        """
+        Finish a game: notify its participants, and dump it.
+
+        The agent stops with its last running game.
+
+        :param game_handler: the game.
+        :param state: the final state of the game.
+        :return: None
+        """
+        set_controller_state(game_handler.version_id, state)
+        if all(
+            other is game_handler or other.game_phase == GamePhase.POST_GAME
+            for other in self.game_handlers.values()
+        ):
+            self.stop()
+            return
+        if game_handler.game_phase in (GamePhase.GAME, GamePhase.GAME_SETUP):
+            game_handler.notify_competition_cancelled()
+        game_handler._game_phase = GamePhase.POST_GAME
+        self.oef_handler.unregister_tac(game_handler.version_id)
+        self._release_game(game_handler)
+
+    def _release_game(self, game_handler: GameHandler) -> None:
+        """
+        Release the resources held by a game, and dump it. It is done once per game.
+
+        The metrics of the controller, as of the end of the game, are dumped next to the game.
+
+        :param game_handler: the game.
+        :return: None
+        """
+        if game_handler.version_id in self._released_version_ids:
+            return
+        self._released_version_ids.add(game_handler.version_id)
+        if game_handler.monitor.is_running:
+            game_handler.monitor.stop()
+        game_handler.stop()
+        game_handler.simulation_dump()
+        self.metrics.update()
+        self.metrics.dump(os.path.join(game_handler.version_dir, METRICS_FILENAME))
 
     def react(self) -> None:
         """
@@ -225,7 +350,6 @@ class ControllerAgent(Agent):
                     self.oef_handler.handle_oef_message(envelope)
                 elif envelope.protocol_id == "tac":
                     self.agent_message_dispatcher.handle_agent_message(envelope)
-                    self.last_activity = datetime.datetime.now()
                 else:
                     raise ValueError(
                         "Unknown protocol_id: {}".format(envelope.protocol_id)
@@ -237,9 +361,14 @@ class ControllerAgent(Agent):
 
         :return: None
         """
+        self.agent_message_dispatcher.update()
+        for game_handler in self.game_handlers.values():
+            game_handler.update()
 
     def setup(self) -> None:
         """Set up the agent."""
+        if self.metrics_server is not None:
+            self.metrics_server.start()
 
     def start(self) -> None:
         """
@@ -263,23 +392,31 @@ class ControllerAgent(Agent):
 
     def stop(self) -> None:
         """
-        Stop the agent.
+        Stop the agent, cancelling the games still running.
 
         :return: None
         """
         logger.debug("[{}]: Stopping myself...".format(self.name))
-        if (
-            self.game_handler.game_phase == GamePhase.GAME
-            or self.game_handler.game_phase == GamePhase.GAME_SETUP
-        ):
-            self.game_handler.notify_competition_cancelled()
+        is_cancelled = False
+        for game_handler in self.game_handlers.values():
+            if (
+                game_handler.game_phase == GamePhase.GAME
+                or game_handler.game_phase == GamePhase.GAME_SETUP
+            ):
+                game_handler.notify_competition_cancelled()
+                is_cancelled = True
+        self.game_handler.flush_outbox()
+        if is_cancelled:
+            # wait some time to make sure the connection delivers the messages
+            time.sleep(2.0)
         super().stop()
 
     def teardown(self) -> None:
         """Tear down the agent."""
-        if self.game_handler.monitor.is_running:
-            self.game_handler.monitor.stop()
-        self.game_handler.simulation_dump()
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+        for game_handler in self.game_handlers.values():
+            self._release_game(game_handler)
 
 
 def _parse_arguments():
@@ -361,6 +498,12 @@ def _parse_arguments():
     parser.add_argument(
         "--visdom-port", default=8097, help="TCP/IP port of the Visdom server."
     )
+    parser.add_argument(
+        "--dashboard-max-rate",
+        default=1.0,
+        type=float,
+        help="The maximum number of dashboard refreshes per second, done in the background. If 0, the dashboard is refreshed synchronously at every update.",
+    )
     parser.add_argument(
         "--data-output-dir",
         default="data",
@@ -372,11 +515,60 @@ def _parse_arguments():
         type=str,
         help="The version ID.",
     )
+    parser.add_argument(
+        "--extra-version-ids",
+        default=[],
+        nargs="*",
+        type=str,
+        help="The version IDs of the other games hosted by the controller, with the same parameters.",
+    )
     parser.add_argument(
         "--seed",
         default=42,
         help="The random seed for the generation of the game parameters.",
     )
+    parser.add_argument(
+        "--dump-compression",
+        default=None,
+        choices=["gzip", "zstd"],
+        help="The compression of the game dump.",
+    )
+    parser.add_argument(
+        "--recover-from",
+        default=None,
+        type=str,
+        help="The transaction log of a competition to resume, e.g. after a crash of the controller.",
+    )
+    parser.add_argument(
+        "--settlement-workers",
+        default=0,
+        type=int,
+        help="The number of worker processes used to settle the transactions in batches. If 0, transactions are settled one by one.",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        default=0.0,
+        type=float,
+        help="The number of messages per second allowed to every agent. If 0, the messages are not limited.",
+    )
+    parser.add_argument(
+        "--rate-limit-burst",
+        default=10,
+        type=int,
+        help="The number of messages an agent can send at once, when the rate is limited.",
+    )
+    parser.add_argument(
+        "--compression-threshold",
+        default=DEFAULT_COMPRESSION_THRESHOLD,
+        type=int,
+        help="The size (in bytes) from which the messages to the agents supporting compression are compressed. If 0, the messages are not compressed.",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        default=None,
+        type=int,
+        help="The local TCP port where the metrics of the controller are served in the Prometheus text format.",
+    )
 
     return parser.parse_args()
 
@@ -401,9 +593,18 @@ def main(
     dashboard: bool = False,
     visdom_addr: str = "localhost",
     visdom_port: int = 8097,
+    dashboard_max_rate: float = 1.0,
     data_output_dir: str = "data",
     version_id: str = str(random.randint(0, 10000)),
+    extra_version_ids: Optional[List[str]] = None,
     seed: int = 42,
+    settlement_workers: int = 0,
+    recover_from: Optional[str] = None,
+    dump_compression: Optional[str] = None,
+    rate_limit: float = 0.0,
+    rate_limit_burst: int = 10,
+    compression_threshold: int = DEFAULT_COMPRESSION_THRESHOLD,
+    metrics_port: Optional[int] = None,
     **kwargs
 ):
     """Run the controller script."""
@@ -420,35 +621,50 @@ def main(
             VisdomMonitor(visdom_addr=visdom_addr, visdom_port=visdom_port)
             if dashboard
             else NullMonitor()
-        )
+        )  # type: Monitor
+        if dashboard and dashboard_max_rate > 0:
+            monitor = AsyncMonitor(monitor, max_rate=dashboard_max_rate)
         whitelist = (
             set(open(whitelist_file).read().splitlines(keepends=False))
             if whitelist_file
             else None
         )
-        tac_parameters = TACParameters(
-            min_nb_agents=nb_agents,
-            money_endowment=money_endowment,
-            nb_goods=nb_goods,
-            tx_fee=tx_fee,
-            base_good_endowment=base_good_endowment,
-            lower_bound_factor=lower_bound_factor,
-            upper_bound_factor=upper_bound_factor,
-            start_time=dateutil.parser.parse(str(start_time)),
-            registration_timeout=registration_timeout,
-            competition_timeout=competition_timeout,
-            inactivity_timeout=inactivity_timeout,
-            whitelist=whitelist,
-            data_output_dir=data_output_dir,
-            version_id=version_id,
-        )
+        tac_parameters_per_game = [
+            TACParameters(
+                min_nb_agents=nb_agents,
+                money_endowment=money_endowment,
+                nb_goods=nb_goods,
+                tx_fee=tx_fee,
+                base_good_endowment=base_good_endowment,
+                lower_bound_factor=lower_bound_factor,
+                upper_bound_factor=upper_bound_factor,
+                start_time=dateutil.parser.parse(str(start_time)),
+                registration_timeout=registration_timeout,
+                competition_timeout=competition_timeout,
+                inactivity_timeout=inactivity_timeout,
+                whitelist=whitelist,
+                data_output_dir=data_output_dir,
+                version_id=game_version_id,
+                settlement_workers=settlement_workers,
+                dump_compression=dump_compression,
+                rate_limit=rate_limit,
+                rate_limit_burst=rate_limit_burst,
+                compression_threshold=compression_threshold,
+            )
+            for game_version_id in [version_id] + list(extra_version_ids or [])
+        ]
         agent = ControllerAgent(
             name=name,
             oef_addr=oef_addr,
             oef_port=oef_port,
-            tac_parameters=tac_parameters,
+            tac_parameters=tac_parameters_per_game[0],
             monitor=monitor,
+            metrics_port=metrics_port,
         )
+        for tac_parameters in tac_parameters_per_game[1:]:
+            agent.add_game(tac_parameters)
+        if recover_from is not None:
+            agent.game_handler.recover_competition(recover_from)
         agent.start()
 
     except Exception as e:
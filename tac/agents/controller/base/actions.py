@@ -25,6 +25,7 @@ This module contains the classes which define the actions of an agent.
 """
 
 import logging
+from typing import Optional
 
 from aea.protocols.oef.models import Description, DataModel, Attribute
 
@@ -71,25 +72,62 @@ class OEFActions(OEFActionInterface):
         self.agent_name = agent_name
         self.tac_version_id = tac_version_id
 
-    def register_tac(self) -> None:
+    def register_tac(self, version_id: Optional[str] = None) -> None:
         """
         Register on the OEF as a TAC controller agent.
 
+        A controller hosting several games registers once per game.
+
+        :param version_id: the version id of the game. If None, the version id of the controller.
         :return: None.
         """
-        desc = Description(
-            {"version": self.tac_version_id}, data_model=CONTROLLER_DATAMODEL
-        )
+        desc = self._tac_description(version_id)
         logger.debug(
             "[{}]: Registering with {} data model".format(
                 self.agent_name, desc.data_model.name
             )
         )
+        self._send_service_message(OEFMessage.Type.REGISTER_SERVICE, desc)
+
+    def unregister_tac(self, version_id: Optional[str] = None) -> None:
+        """
+        Unregister from the OEF as a TAC controller agent, e.g. when a game is over.
+
+        :param version_id: the version id of the game. If None, the version id of the controller.
+        :return: None.
+        """
+        desc = self._tac_description(version_id)
+        logger.debug(
+            "[{}]: Unregistering the game {}".format(
+                self.agent_name, desc.values["version"]
+            )
+        )
+        self._send_service_message(OEFMessage.Type.UNREGISTER_SERVICE, desc)
+
+    def _tac_description(self, version_id: Optional[str]) -> Description:
+        """
+        Get the description of a game on the OEF.
+
+        :param version_id: the version id of the game. If None, the version id of the controller.
+        :return: the description.
+        """
+        return Description(
+            {"version": version_id if version_id is not None else self.tac_version_id},
+            data_model=CONTROLLER_DATAMODEL,
+        )
+
+    def _send_service_message(
+        self, oef_type: OEFMessage.Type, desc: Description
+    ) -> None:
+        """
+        Send a message about a service description to the OEF.
+
+        :param oef_type: the type of the message, i.e. REGISTER_SERVICE or UNREGISTER_SERVICE.
+        :param desc: the service description.
+        :return: None
+        """
         msg = OEFMessage(
-            oef_type=OEFMessage.Type.REGISTER_SERVICE,
-            id=1,
-            service_description=desc,
-            service_id="",
+            oef_type=oef_type, id=1, service_description=desc, service_id=""
         )
         msg_bytes = OEFSerializer().encode(msg)
         self.mailbox.outbox.put_message(
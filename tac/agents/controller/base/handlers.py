@@ -33,13 +33,12 @@ The methods are split in three classes:
 """
 
 import datetime
-import json
 import logging
 import os
 import time
 from abc import ABC, abstractmethod
-from collections import defaultdict
-from typing import Any, Dict, Optional, List, Set, TYPE_CHECKING
+from collections import OrderedDict, defaultdict
+from typing import AbstractSet, Dict, Optional, List, Tuple, TYPE_CHECKING, cast
 
 from aea.agent import Liveness
 from aea.crypto.base import Crypto
@@ -48,14 +47,33 @@ from aea.protocols.oef.message import OEFMessage
 from aea.protocols.oef.serialization import OEFSerializer
 from tac.agents.controller.base.actions import OEFActions
 from tac.agents.controller.base.helpers import generate_good_pbk_to_name
+from tac.agents.controller.base.metrics import ControllerMetrics
+from tac.agents.controller.base.rate_limiter import RateLimiter
 from tac.agents.controller.base.reactions import OEFReactions
+from tac.agents.controller.base.registry import AgentRegistry
+from tac.agents.controller.base.settled_index import SettledTransactionIndex
+from tac.agents.controller.base.settlement import SettlementEngine
 from tac.agents.controller.base.states import Game
 from tac.agents.controller.base.tac_parameters import TACParameters
+from tac.agents.controller.base.transaction_log import (
+    TRANSACTION_LOG_FILENAME,
+    TransactionLog,
+    recover_game,
+)
 from tac.gui.monitor import Monitor
 from tac.platform.game.base import GameData, GamePhase, Transaction
+from tac.platform.game.dump import dump_game, game_dump_filename
 from tac.platform.game.stats import GameStats
+from tac.platform.protocols.tac.batching import BatchingOutBox
+from tac.platform.protocols.tac.compression import choose_compression
 from tac.platform.protocols.tac.message import TACMessage
-from tac.platform.protocols.tac.serialization import TACSerializer
+from tac.platform.protocols.tac.serialization import (
+    GameIndex,
+    TAC_SCHEMA_VERSION,
+    TACSerializer,
+    peek_type_and_decompress,
+    peek_version_id,
+)
 from tac.platform.shared_sim_status import get_shared_dir
 
 if TYPE_CHECKING:
@@ -67,14 +85,22 @@ logger = logging.getLogger(__name__)
 class TACMessageHandler(ABC):
     """Abstract class for a TACMessage handler."""
 
-    def __init__(self, controller_agent: "ControllerAgent") -> None:
+    def __init__(
+        self,
+        controller_agent: "ControllerAgent",
+        game_handler: Optional["GameHandler"] = None,
+    ) -> None:
         """
         Instantiate a TACMessage handler.
 
         :param controller_agent: the controller agent instance
+        :param game_handler: the game whose messages are handled. If None, the game of the controller.
         :return: None
         """
         self.controller_agent = controller_agent
+        self.game_handler = (
+            game_handler if game_handler is not None else controller_agent.game_handler
+        )
 
     def __call__(self, message: TACMessage, sender: Address) -> None:
         """Call the handler."""
@@ -90,103 +116,153 @@ class TACMessageHandler(ABC):
         :return: None
         """
 
+    @property
+    def has_deferred_work(self) -> bool:
+        """Check whether the handler has work deferred until the end of the reaction cycle."""
+        return False
+
+    def update(self) -> None:
+        """
+        Perform the work deferred by the handler until the end of a reaction cycle.
+
+        :return: None
+        """
+
 
 class RegisterHandler(TACMessageHandler):
-    """Class for a register handler."""
+    """
+    Class for a register handler.
 
-    def __init__(self, controller_agent: "ControllerAgent") -> None:
+    The dashboard is updated once per reaction cycle with all the agents registered in the cycle.
+    """
+
+    def __init__(
+        self,
+        controller_agent: "ControllerAgent",
+        game_handler: Optional["GameHandler"] = None,
+    ) -> None:
         """Instantiate a RegisterHandler."""
-        super().__init__(controller_agent)
+        super().__init__(controller_agent, game_handler)
+        self._new_registrations = {}  # type: Dict[Address, str]
+        self._nb_registrations = 0
+        self._first_registration_time = None  # type: Optional[float]
 
     def handle(self, message: TACMessage, sender: Address) -> None:
         """
         Handle a register message.
 
-        If the public key is already registered, answer with an error message.
+        If the agent name is not whitelisted, or the public key or the name is already registered, answer with an error message.
 
         :param message: the 'get agent state' TACMessage.
         :param sender: the public key of the sender
         :return: None
         """
-        whitelist = self.controller_agent.game_handler.tac_parameters.whitelist
+        registry = self.game_handler.registry
         agent_name = message.get("agent_name")
-        if whitelist is not None and agent_name not in whitelist:
+        if not registry.is_whitelisted(agent_name):
             logger.error(
                 "[{}]: Agent name not in whitelist: '{}'".format(
                     self.controller_agent.name, agent_name
                 )
             )
-            tac_msg = TACMessage(
-                tac_type=TACMessage.Type.TAC_ERROR,
-                error_code=TACMessage.ErrorCode.AGENT_NAME_NOT_IN_WHITELIST,
-            )
-            tac_bytes = TACSerializer().encode(tac_msg)
-            self.controller_agent.mailbox.outbox.put_message(
-                to=sender,
-                sender=self.controller_agent.crypto.public_key,
-                protocol_id=TACMessage.protocol_id,
-                message=tac_bytes,
-            )
+            self._send_error(sender, TACMessage.ErrorCode.AGENT_NAME_NOT_IN_WHITELIST)
+            return
 
-        if sender in self.controller_agent.game_handler.registered_agents:
+        if sender in registry:
             logger.error(
                 "[{}]: Agent already registered: '{}'".format(
-                    self.controller_agent.name,
-                    self.controller_agent.game_handler.agent_pbk_to_name[sender],
+                    self.controller_agent.name, registry.pbk_to_name[sender]
                 )
             )
-            tac_msg = TACMessage(
-                tac_type=TACMessage.Type.TAC_ERROR,
-                error_code=TACMessage.ErrorCode.AGENT_PBK_ALREADY_REGISTERED,
-            )
-            tac_bytes = TACSerializer().encode(tac_msg)
-            self.controller_agent.mailbox.outbox.put_message(
-                to=sender,
-                sender=self.controller_agent.crypto.public_key,
-                protocol_id=TACMessage.protocol_id,
-                message=tac_bytes,
-            )
+            self._send_error(sender, TACMessage.ErrorCode.AGENT_PBK_ALREADY_REGISTERED)
+            return
 
-        if agent_name in self.controller_agent.game_handler.agent_pbk_to_name.values():
+        if registry.is_name_registered(agent_name):
             logger.error(
                 "[{}]: Agent with this name already registered: '{}'".format(
                     self.controller_agent.name, agent_name
                 )
             )
-            tac_msg = TACMessage(
-                tac_type=TACMessage.Type.TAC_ERROR,
-                error_code=TACMessage.ErrorCode.AGENT_NAME_ALREADY_REGISTERED,
+            self._send_error(sender, TACMessage.ErrorCode.AGENT_NAME_ALREADY_REGISTERED)
+            return
+
+        registry.register(sender, agent_name)
+        self._new_registrations[sender] = agent_name
+        game_handler = self.game_handler
+        if message.is_set("schema_version"):
+            game_handler.schema_version_per_participant[sender] = message.get(
+                "schema_version"
             )
-            tac_bytes = TACSerializer().encode(tac_msg)
-            self.controller_agent.mailbox.outbox.put_message(
-                to=sender,
-                sender=self.controller_agent.crypto.public_key,
-                protocol_id=TACMessage.protocol_id,
-                message=tac_bytes,
+        if (
+            message.is_set("compressions")
+            and game_handler.tac_parameters.compression_threshold > 0
+        ):
+            compression = choose_compression(message.get("compressions"))
+            if compression is not None:
+                game_handler.compression_per_participant[sender] = compression
+        logger.debug(
+            "[{}]: Agent registered: '{}'".format(
+                self.controller_agent.name, agent_name
             )
+        )
+
+    @property
+    def has_deferred_work(self) -> bool:
+        """Check whether agents registered in the reaction cycle."""
+        return len(self._new_registrations) > 0
 
+    def update(self) -> None:
+        """
+        Report the agents registered in the last reaction cycle to the dashboard and in the logs.
+
+        :return: None
+        """
+        if len(self._new_registrations) == 0:
+            return
+        now = time.monotonic()
+        if self._first_registration_time is None:
+            self._first_registration_time = now
+        self._nb_registrations += len(self._new_registrations)
+
+        monitor = self.game_handler.monitor
         try:
-            self.controller_agent.game_handler.monitor.dashboard.agent_pbk_to_name.update({sender: agent_name})  # type: ignore
-            self.controller_agent.game_handler.monitor.update()
+            # the dashboard may be refreshed from another thread: replace the mapping instead of mutating it.
+            monitor.dashboard.agent_pbk_to_name = dict(self.game_handler.agent_pbk_to_name)  # type: ignore
+            monitor.update()
         except Exception as e:
             logger.error(str(e))
 
-        self.controller_agent.game_handler.agent_pbk_to_name[sender] = agent_name
-        logger.debug(
-            "[{}]: Agent registered: '{}'".format(
+        elapsed = now - self._first_registration_time
+        logger.info(
+            "[{}]: Registered {} agents ({} in total, {}).".format(
                 self.controller_agent.name,
-                self.controller_agent.game_handler.agent_pbk_to_name[sender],
+                len(self._new_registrations),
+                self._nb_registrations,
+                (
+                    "{:.1f} registrations/s".format(self._nb_registrations / elapsed)
+                    if elapsed > 0
+                    else "first batch"
+                ),
             )
         )
-        self.controller_agent.game_handler.registered_agents.add(sender)
+        self._new_registrations = {}
+
+    def _send_error(self, sender: Address, error_code: TACMessage.ErrorCode) -> None:
+        """Reply to a registration with an error."""
+        tac_msg = TACMessage(tac_type=TACMessage.Type.TAC_ERROR, error_code=error_code)
+        self.game_handler.send_tac_message(sender, tac_msg)
 
 
 class UnregisterHandler(TACMessageHandler):
     """Class for an unregister handler."""
 
-    def __init__(self, controller_agent: "ControllerAgent") -> None:
+    def __init__(
+        self,
+        controller_agent: "ControllerAgent",
+        game_handler: Optional["GameHandler"] = None,
+    ) -> None:
         """Instantiate an UnregisterHandler."""
-        super().__init__(controller_agent)
+        super().__init__(controller_agent, game_handler)
 
     def handle(self, message: TACMessage, sender: Address) -> None:
         """
@@ -198,7 +274,8 @@ class UnregisterHandler(TACMessageHandler):
         :param sender: the public key of the sender
         :return: None
         """
-        if sender not in self.controller_agent.game_handler.registered_agents:
+        registry = self.game_handler.registry
+        if sender not in registry:
             logger.error(
                 "[{}]: Agent not registered: '{}'".format(
                     self.controller_agent.name, sender
@@ -208,42 +285,57 @@ class UnregisterHandler(TACMessageHandler):
                 tac_type=TACMessage.Type.TAC_ERROR,
                 error_code=TACMessage.ErrorCode.AGENT_NOT_REGISTERED,
             )
-            tac_bytes = TACSerializer().encode(tac_msg)
-            self.controller_agent.mailbox.outbox.put_message(
-                to=sender,
-                sender=self.controller_agent.crypto.public_key,
-                protocol_id=TACMessage.protocol_id,
-                message=tac_bytes,
-            )
+            self.game_handler.send_tac_message(sender, tac_msg)
         else:
+            agent_name = registry.unregister(sender)
+            self.game_handler.schema_version_per_participant.pop(sender, None)
+            self.game_handler.compression_per_participant.pop(sender, None)
             logger.debug(
                 "[{}]: Agent unregistered: '{}'".format(
-                    self.controller_agent.name,
-                    self.controller_agent.game_handler.agent_pbk_to_name[sender],
+                    self.controller_agent.name, agent_name
                 )
             )
-            self.controller_agent.game_handler.registered_agents.remove(sender)
-            self.controller_agent.game_handler.agent_pbk_to_name.pop(sender)
 
 
 class TransactionHandler(TACMessageHandler):
     """Class for a transaction handler."""
 
-    def __init__(self, controller_agent: "ControllerAgent") -> None:
+    def __init__(
+        self,
+        controller_agent: "ControllerAgent",
+        game_handler: Optional["GameHandler"] = None,
+    ) -> None:
         """Instantiate a TransactionHandler."""
-        super().__init__(controller_agent)
+        super().__init__(controller_agent, game_handler)
         self._pending_transaction_requests = {}  # type: Dict[str, Transaction]
+        self._queued_transactions = (
+            {}
+        )  # type: Dict[str, Tuple[TACMessage, Address, Transaction]]
+
+    @property
+    def pool_size(self) -> int:
+        """Get the number of transactions waiting for their matching transaction."""
+        return len(self._pending_transaction_requests)
 
     def handle(self, message: TACMessage, sender: Address) -> None:
         """
         Handle a transaction TACMessage message.
 
         If the transaction is invalid (e.g. because the state of the game are not consistent), reply with an error.
+        A transaction with the id of a settled transaction, or of a transaction queued for settlement
+        (i.e. a replayed or duplicated transaction), is rejected before entering the pool.
 
         :param message: the 'get agent state' TACMessage.
         :param sender: the public key of the sender
         :return: None
         """
+        transaction_id = message.get("transaction_id")
+        if (
+            transaction_id in self.game_handler.settled_transactions
+            or transaction_id in self._queued_transactions
+        ):
+            self._handle_already_settled_transaction(message, sender)
+            return
         transaction = Transaction.from_message(message, sender)
         logger.debug(
             "[{}]: Handling transaction: {}".format(
@@ -253,17 +345,15 @@ class TransactionHandler(TACMessageHandler):
 
         # if transaction arrives first time then put it into the pending pool
         if message.get("transaction_id") not in self._pending_transaction_requests:
-            if self.controller_agent.game_handler.current_game.is_transaction_valid(
-                transaction
-            ):
+            if self.game_handler.current_game.is_transaction_valid(transaction):
                 logger.debug(
                     "[{}]: Put transaction TACMessage in the pool: {}".format(
                         self.controller_agent.name, message.get("transaction_id")
                     )
                 )
-                self._pending_transaction_requests[
-                    message.get("transaction_id")
-                ] = transaction
+                self._pending_transaction_requests[message.get("transaction_id")] = (
+                    transaction
+                )
             else:
                 self._handle_invalid_transaction(message, sender)
         # if transaction arrives second time then process it
@@ -271,28 +361,60 @@ class TransactionHandler(TACMessageHandler):
             pending_tx = self._pending_transaction_requests.pop(
                 message.get("transaction_id")
             )
-            if transaction.matches(pending_tx):
-                if self.controller_agent.game_handler.current_game.is_transaction_valid(
-                    transaction
-                ):
-                    self.controller_agent.game_handler.confirmed_transaction_per_participant[
-                        pending_tx.sender
-                    ].append(
-                        pending_tx
+            settlement_engine = self.game_handler.settlement_engine
+            if transaction.matches(pending_tx) and settlement_engine is not None:
+                logger.debug(
+                    "[{}]: Queue transaction for settlement: {}".format(
+                        self.controller_agent.name, message.get("transaction_id")
                     )
-                    self.controller_agent.game_handler.confirmed_transaction_per_participant[
-                        transaction.sender
-                    ].append(
-                        transaction
+                )
+                self._queued_transactions[message.get("transaction_id")] = (
+                    message,
+                    sender,
+                    pending_tx,
+                )
+                settlement_engine.submit(transaction)
+            elif transaction.matches(pending_tx):
+                if self.game_handler.current_game.is_transaction_valid(transaction):
+                    self._handle_valid_transaction(
+                        message, sender, pending_tx, transaction
                     )
-                    self._handle_valid_transaction(message, sender, transaction)
                 else:
                     self._handle_invalid_transaction(message, sender)
             else:
                 self._handle_non_matching_transaction(message, sender)
 
+    @property
+    def has_deferred_work(self) -> bool:
+        """Check whether transactions are queued for settlement."""
+        return len(self._queued_transactions) > 0
+
+    def update(self) -> None:
+        """
+        Settle the transactions queued in the settlement engine, if any, and notify the outcome.
+
+        :return: None
+        """
+        settlement_engine = self.game_handler.settlement_engine
+        if settlement_engine is None:
+            return
+        for transaction, is_settled in settlement_engine.settle():
+            message, sender, pending_tx = self._queued_transactions.pop(
+                transaction.transaction_id
+            )
+            if is_settled:
+                self._handle_settled_transaction(
+                    message, sender, pending_tx, transaction
+                )
+            else:
+                self._handle_invalid_transaction(message, sender)
+
     def _handle_valid_transaction(
-        self, message: TACMessage, sender: Address, transaction: Transaction
+        self,
+        message: TACMessage,
+        sender: Address,
+        pending_tx: Transaction,
+        transaction: Transaction,
     ) -> None:
         """
         Handle a valid transaction.
@@ -301,7 +423,10 @@ class TransactionHandler(TACMessageHandler):
         - update the game state
         - send a transaction confirmation both to the buyer and the seller.
 
-        :param tx: the transaction.
+        :param message: the transaction TACMessage received last.
+        :param sender: the public key of the sender of the message.
+        :param pending_tx: the matching transaction received first.
+        :param transaction: the transaction received last.
         :return: None
         """
         logger.debug(
@@ -311,29 +436,42 @@ class TransactionHandler(TACMessageHandler):
         )
 
         # update the game state.
-        self.controller_agent.game_handler.current_game.settle_transaction(transaction)
+        self.game_handler.current_game.settle_transaction(transaction)
+        self._handle_settled_transaction(message, sender, pending_tx, transaction)
+
+    def _handle_settled_transaction(
+        self,
+        message: TACMessage,
+        sender: Address,
+        pending_tx: Transaction,
+        transaction: Transaction,
+    ) -> None:
+        """
+        Handle a transaction that has been settled.
+
+        That is:
+        - record the transaction for both the participants
+        - update the dashboard monitor
+        - send a transaction confirmation both to the buyer and the seller.
+
+        :param message: the transaction TACMessage received last.
+        :param sender: the public key of the sender of the message.
+        :param pending_tx: the matching transaction received first.
+        :param transaction: the transaction received last.
+        :return: None
+        """
+        self.game_handler.record_settled_transaction(transaction)
 
         # update the dashboard monitor
-        self.controller_agent.game_handler.monitor.update()
+        self.game_handler.monitor.update()
 
         # send the transaction confirmation.
         tac_msg = TACMessage(
             tac_type=TACMessage.Type.TRANSACTION_CONFIRMATION,
             transaction_id=message.get("transaction_id"),
         )
-        tac_bytes = TACSerializer().encode(tac_msg)
-        self.controller_agent.outbox.put_message(
-            to=sender,
-            sender=self.controller_agent.crypto.public_key,
-            protocol_id=TACMessage.protocol_id,
-            message=tac_bytes,
-        )
-        self.controller_agent.outbox.put_message(
-            to=message.get("counterparty"),
-            sender=self.controller_agent.crypto.public_key,
-            protocol_id=TACMessage.protocol_id,
-            message=tac_bytes,
-        )
+        self.game_handler.send_tac_message(sender, tac_msg)
+        self.game_handler.send_tac_message(message.get("counterparty"), tac_msg)
 
         # log messages
         logger.debug(
@@ -341,9 +479,7 @@ class TransactionHandler(TACMessageHandler):
                 self.controller_agent.name, message.get("transaction_id")
             )
         )
-        holdings_summary = (
-            self.controller_agent.game_handler.current_game.get_holdings_summary()
-        )
+        holdings_summary = self.game_handler.current_game.get_holdings_summary()
         logger.debug(
             "[{}]: Current state:\n{}".format(
                 self.controller_agent.name, holdings_summary
@@ -352,45 +488,64 @@ class TransactionHandler(TACMessageHandler):
 
     def _handle_invalid_transaction(self, message: TACMessage, sender: Address) -> None:
         """Handle an invalid transaction."""
+        self.controller_agent.metrics.rejections += 1
         tac_msg = TACMessage(
             tac_type=TACMessage.Type.TAC_ERROR,
             error_code=TACMessage.ErrorCode.TRANSACTION_NOT_VALID,
             details={"transaction_id": message.get("transaction_id")},
         )
-        tac_bytes = TACSerializer().encode(tac_msg)
-        self.controller_agent.mailbox.outbox.put_message(
-            to=sender,
-            sender=self.controller_agent.crypto.public_key,
-            protocol_id=TACMessage.protocol_id,
-            message=tac_bytes,
+        self.game_handler.send_tac_message(sender, tac_msg)
+
+    def _handle_already_settled_transaction(
+        self, message: TACMessage, sender: Address
+    ) -> None:
+        """Handle a transaction with the id of a transaction settled or queued for settlement."""
+        logger.warning(
+            "[{}]: Transaction '{}' from {} has already been settled or queued for settlement.".format(
+                self.controller_agent.name, message.get("transaction_id"), sender
+            )
+        )
+        self.controller_agent.metrics.rejections += 1
+        tac_msg = TACMessage(
+            tac_type=TACMessage.Type.TAC_ERROR,
+            error_code=TACMessage.ErrorCode.TRANSACTION_ALREADY_SETTLED,
+            details={"transaction_id": message.get("transaction_id")},
         )
+        self.game_handler.send_tac_message(sender, tac_msg)
 
     def _handle_non_matching_transaction(
         self, message: TACMessage, sender: Address
     ) -> None:
         """Handle non-matching transaction."""
+        self.controller_agent.metrics.rejections += 1
         tac_msg = TACMessage(
             tac_type=TACMessage.Type.TAC_ERROR,
             error_code=TACMessage.ErrorCode.TRANSACTION_NOT_MATCHING,
         )
-        tac_bytes = TACSerializer().encode(tac_msg)
-        self.controller_agent.mailbox.outbox.put_message(
-            to=sender,
-            sender=self.controller_agent.crypto.public_key,
-            protocol_id=TACMessage.protocol_id,
-            message=tac_bytes,
-        )
+        self.game_handler.send_tac_message(sender, tac_msg)
 
 
 class GetStateUpdateHandler(TACMessageHandler):
-    """Class for a state update handler."""
+    """
+    Class for a state update handler.
+
+    The requests are answered at the end of the reaction cycle, so that several requests
+    from the same agent in the same cycle are answered once, with the latest state.
+    """
+
+    def __init__(
+        self,
+        controller_agent: "ControllerAgent",
+        game_handler: Optional["GameHandler"] = None,
+    ) -> None:
+        """Instantiate a GetStateUpdateHandler."""
+        super().__init__(controller_agent, game_handler)
+        self._pending_requests = OrderedDict()  # type: Dict[Address, None]
 
     def handle(self, message: TACMessage, sender: Address) -> None:
         """
         Handle a 'get agent state' TACMessage.
 
-        If the public key is not registered, answer with an error message.
-
         :param message: the 'get agent state' TACMessage.
         :param sender: the public key of the sender
         :return: None
@@ -400,7 +555,33 @@ class GetStateUpdateHandler(TACMessageHandler):
                 self.controller_agent.name, message
             )
         )
-        if not self.controller_agent.game_handler.is_game_running:
+        self._pending_requests[sender] = None
+
+    @property
+    def has_deferred_work(self) -> bool:
+        """Check whether state updates are requested."""
+        return len(self._pending_requests) > 0
+
+    def update(self) -> None:
+        """
+        Answer the pending requests, once per agent.
+
+        :return: None
+        """
+        while self._pending_requests:
+            sender, _ = self._pending_requests.popitem(last=False)
+            self._send_state_update(sender)
+
+    def _send_state_update(self, sender: Address) -> None:
+        """
+        Send the state of an agent.
+
+        If the competition is not running or the public key is not registered, answer with an error message.
+
+        :param sender: the public key of the agent.
+        :return: None
+        """
+        if not self.game_handler.is_game_running:
             logger.error(
                 "[{}]: GetStateUpdate TACMessage is not valid while the competition is not running.".format(
                     self.controller_agent.name
@@ -410,10 +591,10 @@ class GetStateUpdateHandler(TACMessageHandler):
                 tac_type=TACMessage.Type.TAC_ERROR,
                 error_code=TACMessage.ErrorCode.COMPETITION_NOT_RUNNING,
             )
-        if sender not in self.controller_agent.game_handler.registered_agents:
+        elif sender not in self.game_handler.registered_agents:
             logger.error(
                 "[{}]: Agent not registered: '{}'".format(
-                    self.controller_agent.name, message.get("agent_name")
+                    self.controller_agent.name, sender
                 )
             )
             tac_msg = TACMessage(
@@ -421,10 +602,8 @@ class GetStateUpdateHandler(TACMessageHandler):
                 error_code=TACMessage.ErrorCode.AGENT_NOT_REGISTERED,
             )
         else:
-            transactions = self.controller_agent.game_handler.confirmed_transaction_per_participant[
-                sender
-            ]  # type: List[Transaction]
-            initial_game_data = self.controller_agent.game_handler.game_data_per_participant[
+            transactions = self.game_handler.current_game.transactions.view(sender)
+            initial_game_data = self.game_handler.game_data_per_participant[
                 sender
             ]  # type: GameData
             tac_msg = TACMessage(
@@ -432,17 +611,17 @@ class GetStateUpdateHandler(TACMessageHandler):
                 initial_state=initial_game_data,
                 transactions=transactions,
             )
-        tac_bytes = TACSerializer().encode(tac_msg)
-        self.controller_agent.mailbox.outbox.put_message(
-            to=sender,
-            sender=self.controller_agent.crypto.public_key,
-            protocol_id=TACMessage.protocol_id,
-            message=tac_bytes,
-        )
+        self.game_handler.send_tac_message(sender, tac_msg)
 
 
 class AgentMessageDispatcher(object):
-    """Class to wrap the decoding procedure and dispatching the handling of the message to the right function."""
+    """
+    Class to wrap the decoding procedure and dispatching the handling of the message to the right function.
+
+    Every game hosted by the controller has its own handlers. A message is routed to the game named by its version id,
+    or to the only game if the controller hosts a single one. When several games are hosted, a message without
+    the version id of one of them is rejected as invalid.
+    """
 
     def __init__(self, controller_agent: "ControllerAgent"):
         """
@@ -452,55 +631,188 @@ class AgentMessageDispatcher(object):
         """
         self.controller_agent = controller_agent
 
-        self.handlers = {
-            TACMessage.Type.REGISTER: RegisterHandler(controller_agent),
-            TACMessage.Type.UNREGISTER: UnregisterHandler(controller_agent),
-            TACMessage.Type.TRANSACTION: TransactionHandler(controller_agent),
-            TACMessage.Type.GET_STATE_UPDATE: GetStateUpdateHandler(controller_agent),
-        }  # type: Dict[TACMessage.Type, TACMessageHandler]
+        self.handlers_per_game = (
+            OrderedDict()
+        )  # type: Dict[str, Dict[TACMessage.Type, TACMessageHandler]]
+        for game_handler in controller_agent.game_handlers.values():
+            self.add_game(game_handler)
+
+        tac_parameters = controller_agent.game_handler.tac_parameters
+        self.rate_limiter = (
+            RateLimiter(tac_parameters.rate_limit, tac_parameters.rate_limit_burst)
+            if tac_parameters.rate_limit > 0
+            else None
+        )  # type: Optional[RateLimiter]
+
+    @property
+    def allow_compressed(self) -> bool:
+        """Check whether the agents may send compressed messages, i.e. whether a game is configured for compression."""
+        return any(
+            game_handler.tac_parameters.compression_threshold > 0
+            for game_handler in self.controller_agent.game_handlers.values()
+        )
+
+    @property
+    def handlers(self) -> Dict[TACMessage.Type, TACMessageHandler]:
+        """Get the handlers of the game of the controller."""
+        return self.handlers_per_game[self.controller_agent.game_handler.version_id]
+
+    def add_game(self, game_handler: "GameHandler") -> None:
+        """
+        Create the handlers of the messages of a game.
+
+        :param game_handler: the game.
+        :return: None
+        """
+        controller_agent = self.controller_agent
+        self.handlers_per_game[game_handler.version_id] = {
+            TACMessage.Type.REGISTER: RegisterHandler(controller_agent, game_handler),
+            TACMessage.Type.UNREGISTER: UnregisterHandler(
+                controller_agent, game_handler
+            ),
+            TACMessage.Type.TRANSACTION: TransactionHandler(
+                controller_agent, game_handler
+            ),
+            TACMessage.Type.GET_STATE_UPDATE: GetStateUpdateHandler(
+                controller_agent, game_handler
+            ),
+        }
 
     def handle_agent_message(self, envelope: Envelope) -> None:
         """
         Dispatch the TACMessage to the right handler.
 
-        If no handler is found for the provided type of TACMessage, return an "invalid TACMessage" error.
-        If something bad happen, return a "generic" error.
+        A BATCH message is routed to its game and unpacked, and each of its messages is handled as if it came
+        in its own envelope.
+        A compressed message is rejected as invalid, unless a game is configured for compression.
+        Otherwise, it is decompressed once, when its type is read, and handled decompressed.
+        The rate limit of the sender is checked before reading the message, and for every message of a batch.
 
         :param envelope: the envelope to handle
         :return: None
         """
         assert envelope.protocol_id == "tac"
-        tac_msg = TACSerializer().decode(envelope.message)
-        logger.debug(
-            "[{}] on_message: origin={}".format(
-                self.controller_agent.name, envelope.sender
+        if not self._is_within_rate_limit(envelope.sender):
+            return
+        allow_compressed = self.allow_compressed
+        tac_bytes = envelope.message
+        try:
+            tac_msg_type, tac_bytes = peek_type_and_decompress(
+                tac_bytes, allow_compressed
+            )
+        except ValueError:
+            tac_msg_type = None
+        if tac_msg_type != TACMessage.Type.BATCH:
+            self._handle_tac_message(envelope.sender, tac_bytes, tac_msg_type)
+            return
+        game_handler = self._route(tac_bytes)
+        if game_handler is None:
+            self._handle_tac_message(envelope.sender, tac_bytes, None)
+            return
+        try:
+            batch = game_handler.serializer.decode_lazy(tac_bytes, tac_msg_type)
+            messages = batch.get("messages")  # type: List[bytes]
+        except Exception as e:
+            logger.debug(
+                "[{}]: Invalid batch from {}: {}".format(
+                    self.controller_agent.name, envelope.sender, str(e)
+                )
+            )
+            self._handle_tac_message(envelope.sender, tac_bytes, None)
+            return
+        for index, tac_bytes in enumerate(messages):
+            # the first message is accounted for by the envelope.
+            if index > 0 and not self._is_within_rate_limit(envelope.sender):
+                return
+            try:
+                tac_msg_type, tac_bytes = peek_type_and_decompress(
+                    tac_bytes, allow_compressed
+                )
+            except ValueError:
+                tac_msg_type = None
+            if tac_msg_type == TACMessage.Type.BATCH:
+                # batches cannot be nested.
+                tac_msg_type = None
+            self._handle_tac_message(envelope.sender, tac_bytes, tac_msg_type)
+
+    def _is_within_rate_limit(self, sender: Address) -> bool:
+        """
+        Check whether a message of a sender is within its rate limit, and account for it.
+
+        A message over the limit is dropped, and the sender is notified with a "rate limit exceeded" error
+        once per burst of dropped messages.
+
+        :param sender: the public key of the sender.
+        :return: True if the message can be handled, False if it must be dropped.
+        """
+        if self.rate_limiter is None or self.rate_limiter.allow(sender):
+            return True
+        self.controller_agent.metrics.rate_limited += 1
+        if self.rate_limiter.nb_rejected(sender) == 1:
+            logger.warning(
+                "[{}]: Rate limit exceeded by {}".format(
+                    self.controller_agent.name, sender
+                )
+            )
+            tac_error = TACMessage(
+                tac_type=TACMessage.Type.TAC_ERROR,
+                error_code=TACMessage.ErrorCode.RATE_LIMIT_EXCEEDED,
             )
+            self.controller_agent.game_handler.send_tac_message(sender, tac_error)
+        return False
+
+    def _handle_tac_message(
+        self,
+        sender: Address,
+        tac_bytes: bytes,
+        tac_msg_type: Optional[TACMessage.Type],
+    ) -> None:
+        """
+        Dispatch a TACMessage to the right handler.
+
+        The type and the version id of the message are read without parsing its content, and the message is decoded lazily:
+        its fields are decoded only when the handler accesses them.
+        If no game or no handler is found for the provided message, return an "invalid TACMessage" error.
+        If something bad happen, return a "generic" error.
+
+        :param sender: the public key of the sender.
+        :param tac_bytes: the encoded message, decompressed.
+        :param tac_msg_type: the type of the message, as read by peek_type_and_decompress, or None if it is not recognized.
+        :return: None
+        """
+        metrics = self.controller_agent.metrics
+        logger.debug(
+            "[{}] on_message: origin={}".format(self.controller_agent.name, sender)
         )
-        tac_msg_type = tac_msg.get("type")
-        handle_tac_message = self.handlers.get(
-            TACMessage.Type(tac_msg_type), None
+        game_handler = self._route(tac_bytes)
+        handle_tac_message = (
+            self.handlers_per_game[game_handler.version_id].get(tac_msg_type, None)
+            if game_handler is not None
+            else None
         )  # type: Optional[TACMessageHandler]
-        if handle_tac_message is None:
+        if game_handler is None or handle_tac_message is None:
             logger.debug(
                 "[{}]: Unknown message from {}".format(
-                    self.controller_agent.name, envelope.sender
+                    self.controller_agent.name, sender
                 )
             )
             tac_error = TACMessage(
                 tac_type=TACMessage.Type.TAC_ERROR,
                 error_code=TACMessage.ErrorCode.REQUEST_NOT_VALID.value,
             )
-            tac_bytes = TACSerializer().encode(tac_error)
-            self.controller_agent.mailbox.outbox.put_message(
-                to=envelope.sender,
-                sender=self.controller_agent.crypto.public_key,
-                protocol_id=tac_error.protocol_id,
-                message=tac_bytes,
+            (game_handler or self.controller_agent.game_handler).send_tac_message(
+                sender, tac_error
             )
             return
         else:
+            game_handler.last_activity = datetime.datetime.now()
+            metrics.observe_received(len(tac_bytes))
+            tac_msg = game_handler.serializer.decode_lazy(
+                tac_bytes, tac_msg_type, metrics.observe_decode
+            )
+            start = time.perf_counter()
             try:
-                handle_tac_message(tac_msg, envelope.sender)
+                handle_tac_message(tac_msg, sender)
             except Exception as e:
                 logger.debug(
                     "[{}]: Error caught: {}".format(self.controller_agent.name, str(e))
@@ -510,17 +822,53 @@ class AgentMessageDispatcher(object):
                     tac_type=TACMessage.Type.TAC_ERROR,
                     error_code=TACMessage.ErrorCode.GENERIC_ERROR.value,
                 )
-                tac_bytes = TACSerializer().encode(tac_error)
-                self.controller_agent.mailbox.outbox.put_message(
-                    to=envelope.sender,
-                    sender=self.controller_agent.crypto.public_key,
-                    protocol_id=tac_error.protocol_id,
-                    message=tac_bytes,
+                game_handler.send_tac_message(sender, tac_error)
+            finally:
+                metrics.observe_handler(tac_msg_type.name, time.perf_counter() - start)
+
+    def _route(self, tac_bytes: bytes) -> Optional["GameHandler"]:
+        """
+        Get the game of a message, from its version id.
+
+        :param tac_bytes: the encoded message.
+        :return: the game, or None if the controller hosts no such game or the game is over.
+        """
+        try:
+            version_id = peek_version_id(tac_bytes)
+        except ValueError:
+            version_id = None
+        game_handler = self.controller_agent.get_game_handler(version_id)
+        if game_handler is None or game_handler.game_phase == GamePhase.POST_GAME:
+            return None
+        return game_handler
+
+    def update(self) -> None:
+        """
+        Let every handler perform its deferred work at the end of a reaction cycle, and time it.
+
+        Also, report the size of the pools of transactions waiting for their matching transaction.
+
+        :return: None
+        """
+        metrics = self.controller_agent.metrics
+        pool_size = 0
+        for handlers in self.handlers_per_game.values():
+            for tac_msg_type, handler in handlers.items():
+                if not handler.has_deferred_work:
+                    continue
+                start = time.perf_counter()
+                handler.update()
+                metrics.observe_handler_update(
+                    tac_msg_type.name, time.perf_counter() - start
                 )
+            pool_size += cast(
+                TransactionHandler, handlers[TACMessage.Type.TRANSACTION]
+            ).pool_size
+        metrics.pending_pool_size = pool_size
 
 
 class GameHandler:
-    """A class to manage a TAC instance."""
+    """A class to manage a TAC instance, identified by its version id."""
 
     def __init__(
         self,
@@ -529,6 +877,7 @@ class GameHandler:
         mailbox: MailBox,
         monitor: Monitor,
         tac_parameters: TACParameters,
+        metrics: Optional[ControllerMetrics] = None,
     ) -> None:
         """
         Instantiate a GameHandler.
@@ -538,21 +887,26 @@ class GameHandler:
         :param mailbox: the mailbox.
         :param monitor: the monitor.
         :param tac_parameters: the tac parameters.
+        :param metrics: the runtime metrics of the controller.
         :return: None
         """
         self.agent_name = agent_name
         self.crypto = crypto
         self.mailbox = mailbox
         self.tac_parameters = tac_parameters
+        self.metrics = metrics if metrics is not None else ControllerMetrics()
         self.competition_start = None  # type: Optional[datetime.datetime]
+        self.last_activity = datetime.datetime.now()
         self._game_phase = GamePhase.PRE_GAME
 
-        self.registered_agents = set()  # type: Set[str]
-        self.agent_pbk_to_name = defaultdict()  # type: Dict[str, str]
+        self.registry = AgentRegistry(tac_parameters.whitelist)
         self.good_pbk_to_name = generate_good_pbk_to_name(
             self.tac_parameters.nb_goods
         )  # type: Dict[str, str]
         self._current_game = None  # type: Optional[Game]
+        self.settlement_engine = None  # type: Optional[SettlementEngine]
+        self.settled_transactions = SettledTransactionIndex()
+        self.transaction_log = None  # type: Optional[TransactionLog]
         self.inactivity_timeout_timedelta = (
             datetime.timedelta(seconds=tac_parameters.inactivity_timeout)
             if tac_parameters.inactivity_timeout is not None
@@ -560,9 +914,10 @@ class GameHandler:
         )
 
         self.game_data_per_participant = {}  # type: Dict[str, GameData]
-        self.confirmed_transaction_per_participant = defaultdict(
-            lambda: []
-        )  # type: Dict[str, List[Transaction]]
+        self.schema_version_per_participant = {}  # type: Dict[str, int]
+        self.compression_per_participant = {}  # type: Dict[str, str]
+        self.serializer = TACSerializer()
+        self._serializers = {}  # type: Dict[Tuple[int, Optional[str]], TACSerializer]
 
         self.monitor = monitor
         self.monitor.start(None)
@@ -571,9 +926,28 @@ class GameHandler:
     def reset(self) -> None:
         """Reset the game."""
         self._current_game = None
-        self.registered_agents = set()
-        self.agent_pbk_to_name = defaultdict()
+        self.registry = AgentRegistry(self.tac_parameters.whitelist)
         self.good_pbk_to_name = defaultdict()
+        self.settled_transactions = SettledTransactionIndex()
+        self.schema_version_per_participant = {}
+        self.compression_per_participant = {}
+        self.serializer = TACSerializer()
+        self._serializers = {}
+
+    @property
+    def version_id(self) -> str:
+        """Get the version id of the game."""
+        return self.tac_parameters.version_id
+
+    @property
+    def registered_agents(self) -> AbstractSet[str]:
+        """Get the public keys of the registered agents."""
+        return self.registry.public_keys
+
+    @property
+    def agent_pbk_to_name(self) -> Dict[str, str]:
+        """Get the mapping from the public keys of the registered agents to their names."""
+        return self.registry.pbk_to_name
 
     @property
     def game_phase(self) -> GamePhase:
@@ -586,6 +960,15 @@ class GameHandler:
         assert self._current_game is not None, "No current_game assigned!"
         return self._current_game
 
+    @property
+    def version_dir(self) -> str:
+        """Get the directory where the data of the TAC instance are stored."""
+        return os.path.join(
+            get_shared_dir(),
+            self.tac_parameters.data_output_dir,
+            self.tac_parameters.version_id,
+        )
+
     @property
     def is_game_running(self) -> bool:
         """
@@ -600,6 +983,16 @@ class GameHandler:
         # assert that there is no competition running.
         assert not self.is_game_running
         self._current_game = self._create_game()
+        self.settled_transactions = SettledTransactionIndex()
+        self._create_serializer()
+        if self.tac_parameters.settlement_workers > 0:
+            self.settlement_engine = SettlementEngine(
+                self.current_game, self.tac_parameters.settlement_workers
+            )
+        os.makedirs(self.version_dir, exist_ok=True)
+        self.transaction_log = TransactionLog.create(
+            os.path.join(self.version_dir, TRANSACTION_LOG_FILENAME), self.current_game
+        )
 
         try:
             self.monitor.set_gamestats(GameStats(self.current_game))
@@ -622,6 +1015,154 @@ class GameHandler:
             )
         )
 
+    def recover_competition(self, transaction_log_path: str) -> None:
+        """
+        Resume a competition from its transaction log, e.g. after a crash of the controller.
+
+        The game is rebuilt from the log, the participants are registered again with their names,
+        and the log is rewritten so that new transactions are appended after the last complete record.
+
+        :param transaction_log_path: the path of the transaction log.
+        :return: None
+        """
+        assert not self.is_game_running
+        game = recover_game(transaction_log_path)
+        self._current_game = game
+        self.registry = AgentRegistry(self.tac_parameters.whitelist)
+        for agent_pbk, agent_name in game.configuration.agent_pbk_to_name.items():
+            self.registry.register(agent_pbk, agent_name)
+        self.good_pbk_to_name = dict(game.configuration.good_pbk_to_name)
+        self.settled_transactions = SettledTransactionIndex(
+            tx.transaction_id for tx in game.transactions
+        )
+        self._create_serializer()
+
+        for public_key in game.configuration.agent_pbks:
+            agent_state = game.initial_agent_states[public_key]
+            self.game_data_per_participant[public_key] = GameData(
+                public_key,
+                agent_state.balance,
+                agent_state.current_holdings,
+                agent_state.utility_params,
+                game.configuration.nb_agents,
+                game.configuration.nb_goods,
+                game.configuration.tx_fee,
+                game.configuration.agent_pbk_to_name,
+                game.configuration.good_pbk_to_name,
+                game.configuration.version_id,
+            )
+        if self.tac_parameters.settlement_workers > 0:
+            self.settlement_engine = SettlementEngine(
+                game, self.tac_parameters.settlement_workers
+            )
+        self.transaction_log = TransactionLog.create(transaction_log_path, game)
+
+        try:
+            self.monitor.set_gamestats(GameStats(game))
+            self.monitor.update()
+        except Exception as e:
+            logger.exception(e)
+
+        self._game_phase = GamePhase.GAME
+        logger.info(
+            "[{}]: Recovered competition with {} transactions.".format(
+                self.agent_name, len(game.transactions)
+            )
+        )
+
+    def record_settled_transaction(self, transaction: Transaction) -> None:
+        """
+        Record a transaction that has been settled in the current game.
+
+        The history of the participants is read from the transactions of the game, hence it is not recorded here.
+
+        :param transaction: the transaction settled in the game.
+        :return: None
+        """
+        self.settled_transactions.add(transaction.transaction_id)
+        self.metrics.settlements += 1
+        if self.transaction_log is not None:
+            self.transaction_log.append(transaction)
+
+    def _create_serializer(self) -> None:
+        """
+        Create the serializer of the current game, which knows the index of its agents and goods.
+
+        :return: None
+        """
+        configuration = self.current_game.configuration
+        self.serializer = TACSerializer(
+            TAC_SCHEMA_VERSION,
+            GameIndex(configuration.agent_pbks, configuration.good_pbks),
+        )
+        self._serializers = {}
+
+    def get_serializer(self, to: Address) -> TACSerializer:
+        """
+        Get the serializer of the messages to an agent, given the schema version and the compressions it supports.
+
+        :param to: the public key of the agent.
+        :return: the serializer.
+        """
+        schema_version = min(
+            self.schema_version_per_participant.get(to, 1),
+            self.serializer.schema_version,
+        )
+        compression = self.compression_per_participant.get(to)
+        serializer = self._serializers.get((schema_version, compression))
+        if serializer is None:
+            serializer = TACSerializer(
+                schema_version,
+                self.serializer.game_index if schema_version >= 2 else None,
+                compression,
+                self.tac_parameters.compression_threshold,
+                self.version_id,
+            )
+            self._serializers[(schema_version, compression)] = serializer
+        return serializer
+
+    def send_tac_message(self, to: Address, tac_msg: TACMessage) -> None:
+        """
+        Encode a TACMessage and put it in the outbox.
+
+        The packed (v2) schema and the compression are used only for the agents that declared to support them when they registered.
+        The message is held in the outbox until the next flush (see flush_outbox).
+
+        :param to: the public key of the recipient.
+        :param tac_msg: the message.
+        :return: None
+        """
+        start = time.perf_counter()
+        tac_bytes = self.get_serializer(to).encode(tac_msg)
+        self.metrics.observe_encode(len(tac_bytes), time.perf_counter() - start)
+        self.mailbox.outbox.put_message(
+            to=to,
+            sender=self.crypto.public_key,
+            protocol_id=TACMessage.protocol_id,
+            message=tac_bytes,
+        )
+
+    def update(self) -> None:
+        """
+        Perform the periodic work of the game handler.
+
+        :return: None
+        """
+        self.flush_outbox()
+        if self.transaction_log is not None:
+            self.transaction_log.update()
+        self.metrics.update()
+
+    def flush_outbox(self) -> None:
+        """
+        Send the TAC messages coalesced in the outbox since the last flush.
+
+        :return: None
+        """
+        outbox = self.mailbox.outbox
+        if isinstance(outbox, BatchingOutBox):
+            self.metrics.envelopes_out += outbox.flush()
+
     def _create_game(self) -> Game:
         """
         Create a TAC game.
@@ -639,7 +1180,7 @@ class GameHandler:
             self.tac_parameters.base_good_endowment,
             self.tac_parameters.lower_bound_factor,
             self.tac_parameters.upper_bound_factor,
-            self.agent_pbk_to_name,
+            dict(self.agent_pbk_to_name),
             self.good_pbk_to_name,
         )
 
@@ -686,45 +1227,45 @@ class GameHandler:
                 good_pbk_to_name=self.current_game.configuration.good_pbk_to_name,
                 version_id=self.current_game.configuration.version_id,
             )
-            tac_bytes = TACSerializer().encode(msg)
-            self.mailbox.outbox.put_message(
-                to=public_key,
-                sender=self.crypto.public_key,
-                protocol_id=TACMessage.protocol_id,
-                message=tac_bytes,
-            )
+            self.send_tac_message(public_key, msg)
 
     def notify_competition_cancelled(self):
-        """Notify agents that the TAC is cancelled."""
+        """
+        Notify agents that the TAC is cancelled.
+
+        The messages are sent at once, but the connection may take some time to deliver them.
+        """
         logger.debug(
-            "[{}]: Notifying agents that TAC is cancelled.".format(self.agent_name)
+            "[{}]: Notifying agents that TAC {} is cancelled.".format(
+                self.agent_name, self.version_id
+            )
         )
         for agent_pbk in self.registered_agents:
             tac_msg = TACMessage(tac_type=TACMessage.Type.CANCELLED)
-            tac_bytes = TACSerializer().encode(tac_msg)
-            self.mailbox.outbox.put_message(
-                to=agent_pbk,
-                sender=self.crypto.public_key,
-                protocol_id=TACMessage.protocol_id,
-                message=tac_bytes,
-            )
-        # wait some time to make sure the connection delivers the messages
-        time.sleep(2.0)
+            self.send_tac_message(agent_pbk, tac_msg)
+        self.flush_outbox()
         self._game_phase = GamePhase.POST_GAME
 
+    def stop(self) -> None:
+        """
+        Release the resources held by the game handler.
+
+        :return: None
+        """
+        if self.settlement_engine is not None:
+            self.settlement_engine.stop()
+        if self.transaction_log is not None:
+            self.transaction_log.close()
+
     def simulation_dump(self) -> None:
         """
         Dump the details of the simulation.
 
         :return: None.
         """
-        shared_dir = get_shared_dir()
-        version_dir = (
-            shared_dir
-            + "/"
-            + self.tac_parameters.data_output_dir
-            + "/"
-            + self.tac_parameters.version_id
+        version_dir = self.version_dir
+        path = os.path.join(
+            version_dir, game_dump_filename(self.tac_parameters.dump_compression)
         )
 
         if not self.is_game_running:
@@ -733,14 +1274,13 @@ class GameHandler:
                     self.agent_name
                 )
             )
-            game_dict = {}  # type: Dict[str, Any]
+            game = None  # type: Optional[Game]
         else:
             logger.info("[{}]: Dumping simulation.".format(self.agent_name))
-            game_dict = self.current_game.to_dict()
+            game = self.current_game
 
         os.makedirs(version_dir, exist_ok=True)
-        with open(os.path.join(version_dir, "game.json"), "w") as f:
-            json.dump(game_dict, f)
+        dump_game(game, path)
 
 
 class OEFHandler(OEFActions, OEFReactions):
@@ -27,6 +27,7 @@ It cointains:
 """
 
 from abc import abstractmethod
+from typing import Optional
 
 from aea.mail.base import Envelope
 
@@ -59,9 +60,19 @@ class OEFActionInterface:
     """This interface contains the methods to interact with the OEF."""
 
     @abstractmethod
-    def register_tac(self) -> None:
+    def register_tac(self, version_id: Optional[str] = None) -> None:
         """
         Register tac to OEF Service Directory.
 
+        :param version_id: the version id of the game. If None, the version id of the controller.
+        :return: None
+        """
+
+    @abstractmethod
+    def unregister_tac(self, version_id: Optional[str] = None) -> None:
+        """
+        Unregister tac from OEF Service Directory.
+
+        :param version_id: the version id of the game. If None, the version id of the controller.
         :return: None
         """
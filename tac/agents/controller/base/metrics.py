@@ -0,0 +1,431 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+This module contains the runtime metrics of the controller.
+
+The metrics are plain counters, gauges and fixed-bucket histograms updated in the main loop of the controller,
+so that recording a sample costs a few arithmetic operations.
+They are rendered in the Prometheus text exposition format, served over a local HTTP endpoint
+and dumped at the end of the competition.
+"""
+
+import bisect
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+METRICS_FILENAME = "metrics.prom"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_LATENCY_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+)
+
+
+class Histogram:
+    """A histogram with fixed buckets."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> None:
+        """
+        Initialize a histogram.
+
+        :param buckets: the (sorted) upper bounds of the buckets. The '+Inf' bucket is implicit.
+        :return: None
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """
+        Record a sample.
+
+        :param value: the value of the sample.
+        :return: None
+        """
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self) -> List[Tuple[str, int]]:
+        """
+        Get the cumulative count of every bucket, as in the Prometheus format.
+
+        :return: a list of pairs (upper bound, number of samples lower than or equal to the bound).
+        """
+        result = []
+        total = 0
+        for bound, count in zip(self.buckets + (float("inf"),), list(self.counts)):
+            total += count
+            result.append(("+Inf" if bound == float("inf") else repr(bound), total))
+        return result
+
+
+class ControllerMetrics:
+    """The runtime metrics of the controller."""
+
+    def __init__(
+        self,
+        rate_interval: float = 1.0,
+        latency_buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> None:
+        """
+        Initialize the metrics.
+
+        :param rate_interval: the time window (in seconds) over which the settlement and rejection rates are computed.
+        :param latency_buckets: the buckets of the latency histograms.
+        :return: None
+        """
+        self.rate_interval = rate_interval
+        self.latency_buckets = tuple(latency_buckets)
+
+        self.handler_latency = {}  # type: Dict[str, Histogram]
+        self.handler_update_latency = {}  # type: Dict[str, Histogram]
+        self.decode_latency = Histogram(self.latency_buckets)
+        self.encode_latency = Histogram(self.latency_buckets)
+        self.messages_in = 0
+        self.messages_out = 0
+        self.envelopes_out = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.settlements = 0
+        self.rejections = 0
+        self.rate_limited = 0
+
+        self.pending_pool_size = 0
+        self.settlements_per_second = 0.0
+        self.rejections_per_second = 0.0
+
+        self._window_start = time.monotonic()
+        self._window_settlements = 0
+        self._window_rejections = 0
+
+    def observe_handler(self, message_type: str, seconds: float) -> None:
+        """
+        Record the time spent handling a message.
+
+        :param message_type: the type of the handled message.
+        :param seconds: the handling time.
+        :return: None
+        """
+        self._observe_by_type(self.handler_latency, message_type, seconds)
+
+    def observe_handler_update(self, message_type: str, seconds: float) -> None:
+        """
+        Record the time spent by a handler on the work deferred until the end of a reaction cycle.
+
+        :param message_type: the type of the messages of the handler.
+        :param seconds: the time spent in the update of the handler.
+        :return: None
+        """
+        self._observe_by_type(self.handler_update_latency, message_type, seconds)
+
+    def _observe_by_type(
+        self, histograms: Dict[str, Histogram], message_type: str, seconds: float
+    ) -> None:
+        """
+        Record a sample in the histogram of a message type, created on the first sample.
+
+        :param histograms: the histograms, by message type.
+        :param message_type: the message type.
+        :param seconds: the sample.
+        :return: None
+        """
+        histogram = histograms.get(message_type)
+        if histogram is None:
+            histogram = Histogram(self.latency_buckets)
+            histograms[message_type] = histogram
+        histogram.observe(seconds)
+
+    def observe_received(self, nb_bytes: int) -> None:
+        """
+        Record an incoming message.
+
+        :param nb_bytes: the size of the message.
+        :return: None
+        """
+        self.messages_in += 1
+        self.bytes_in += nb_bytes
+
+    def observe_decode(self, seconds: float) -> None:
+        """
+        Record the decoding of a field of an incoming message, which is decoded lazily.
+
+        :param seconds: the decoding time, including the parsing of the message for the first field decoded.
+        :return: None
+        """
+        self.decode_latency.observe(seconds)
+
+    def observe_encode(self, nb_bytes: int, seconds: float) -> None:
+        """
+        Record the encoding of an outgoing message.
+
+        :param nb_bytes: the size of the message.
+        :param seconds: the encoding time.
+        :return: None
+        """
+        self.messages_out += 1
+        self.bytes_out += nb_bytes
+        self.encode_latency.observe(seconds)
+
+    def update(self) -> None:
+        """
+        Update the settlement and rejection rates, once the rate interval has elapsed.
+
+        :return: None
+        """
+        now = time.monotonic()
+        elapsed = now - self._window_start
+        if elapsed < self.rate_interval:
+            return
+        self.settlements_per_second = (
+            self.settlements - self._window_settlements
+        ) / elapsed
+        self.rejections_per_second = (
+            self.rejections - self._window_rejections
+        ) / elapsed
+        self._window_start = now
+        self._window_settlements = self.settlements
+        self._window_rejections = self.rejections
+
+    def render(self) -> str:
+        """
+        Render the metrics in the Prometheus text exposition format.
+
+        :return: the metrics, as text.
+        """
+        lines = []  # type: List[str]
+
+        def _metric(name: str, metric_type: str, help_text: str, value: float) -> None:
+            lines.append("# HELP {} {}".format(name, help_text))
+            lines.append("# TYPE {} {}".format(name, metric_type))
+            lines.append("{} {}".format(name, value))
+
+        def _histogram_samples(name: str, histogram: Histogram, labels: str) -> None:
+            for bound, count in histogram.cumulative_counts():
+                lines.append(
+                    '{}_bucket{{{}le="{}"}} {}'.format(name, labels, bound, count)
+                )
+            labels = "{{{}}}".format(labels.rstrip(",")) if labels else ""
+            lines.append("{}_sum{} {}".format(name, labels, histogram.sum))
+            lines.append("{}_count{} {}".format(name, labels, histogram.count))
+
+        for name, histograms, help_text in (
+            (
+                "tac_controller_handler_latency_seconds",
+                self.handler_latency,
+                "Time spent handling a message, by type.",
+            ),
+            (
+                "tac_controller_handler_update_latency_seconds",
+                self.handler_update_latency,
+                "Time spent by the handlers on the work deferred until the end of a reaction cycle, by message type.",
+            ),
+        ):
+            lines.append("# HELP {} {}".format(name, help_text))
+            lines.append("# TYPE {} histogram".format(name))
+            for message_type, histogram in sorted(list(histograms.items())):
+                _histogram_samples(
+                    name, histogram, 'message_type="{}",'.format(message_type)
+                )
+
+        for direction, histogram, help_text in (
+            (
+                "decode",
+                self.decode_latency,
+                "Time spent to decode a field of a TAC message, including the parsing of the message for the first field decoded.",
+            ),
+            ("encode", self.encode_latency, "Time spent to encode a TAC message."),
+        ):
+            name = "tac_controller_{}_latency_seconds".format(direction)
+            lines.append("# HELP {} {}".format(name, help_text))
+            lines.append("# TYPE {} histogram".format(name))
+            _histogram_samples(name, histogram, "")
+
+        _metric(
+            "tac_controller_messages_received_total",
+            "counter",
+            "Number of TAC messages received.",
+            self.messages_in,
+        )
+        _metric(
+            "tac_controller_messages_sent_total",
+            "counter",
+            "Number of TAC messages sent.",
+            self.messages_out,
+        )
+        _metric(
+            "tac_controller_envelopes_sent_total",
+            "counter",
+            "Number of envelopes sent with TAC messages, which can carry several messages in a batch.",
+            self.envelopes_out,
+        )
+        _metric(
+            "tac_controller_received_bytes_total",
+            "counter",
+            "Size of the TAC messages received, once decompressed.",
+            self.bytes_in,
+        )
+        _metric(
+            "tac_controller_sent_bytes_total",
+            "counter",
+            "Size of the TAC messages sent.",
+            self.bytes_out,
+        )
+        _metric(
+            "tac_controller_settlements_total",
+            "counter",
+            "Number of transactions settled.",
+            self.settlements,
+        )
+        _metric(
+            "tac_controller_rejections_total",
+            "counter",
+            "Number of transactions rejected.",
+            self.rejections,
+        )
+        _metric(
+            "tac_controller_rate_limited_total",
+            "counter",
+            "Number of messages rejected because their sender exceeded the rate limit.",
+            self.rate_limited,
+        )
+        _metric(
+            "tac_controller_settlements_per_second",
+            "gauge",
+            "Transactions settled per second.",
+            self.settlements_per_second,
+        )
+        _metric(
+            "tac_controller_rejections_per_second",
+            "gauge",
+            "Transactions rejected per second.",
+            self.rejections_per_second,
+        )
+        _metric(
+            "tac_controller_pending_pool_size",
+            "gauge",
+            "Number of transactions waiting for their matching transaction.",
+            self.pending_pool_size,
+        )
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str) -> None:
+        """
+        Dump the metrics to a file, in the Prometheus text exposition format.
+
+        :param path: the path of the file.
+        :return: None
+        """
+        with open(path, "w") as f:
+            f.write(self.render())
+
+
+class MetricsServer:
+    """Serve the metrics of the controller over HTTP, from a background thread."""
+
+    def __init__(
+        self, metrics: ControllerMetrics, port: int, host: str = "127.0.0.1"
+    ) -> None:
+        """
+        Initialize the metrics server.
+
+        :param metrics: the metrics to serve.
+        :param port: the TCP port. If 0, a free port is chosen.
+        :param host: the address to bind. By default, only local connections are accepted.
+        :return: None
+        """
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self._server = None  # type: Optional[HTTPServer]
+        self._thread = None  # type: Optional[threading.Thread]
+
+    @property
+    def is_running(self) -> bool:
+        """Check whether the server is running."""
+        return self._server is not None
+
+    def start(self) -> None:
+        """
+        Start serving the metrics.
+
+        :return: None
+        """
+        if self.is_running:
+            return
+        metrics = self.metrics
+
+        class _RequestHandler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:
+                logger.debug(format, *args)
+
+        self._server = HTTPServer((self.host, self.port), _RequestHandler)
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="metrics-server", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            "Serving the controller metrics on http://{}:{}/metrics".format(
+                self.host, self.port
+            )
+        )
+
+    def stop(self) -> None:
+        """
+        Stop serving the metrics.
+
+        :return: None
+        """
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+        self._server = None
+        self._thread = None
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the per-agent rate limiting of the controller."""
+
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from aea.mail.base import Address
+
+
+class TokenBucket:
+    """
+    A token bucket.
+
+    The bucket holds at most 'burst' tokens and is refilled at 'rate' tokens per second.
+    Every message consumes one token; a message that finds the bucket empty is over the limit.
+    """
+
+    __slots__ = ("rate", "burst", "tokens", "last_refill")
+
+    def __init__(self, rate: float, burst: int, now: Optional[float] = None) -> None:
+        """
+        Initialize a full token bucket.
+
+        :param rate: the refill rate, in tokens per second.
+        :param burst: the capacity of the bucket.
+        :param now: the current time (monotonic clock). If None, it is read from the clock.
+        :return: None
+        """
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.last_refill = time.monotonic() if now is None else now
+
+    def consume(self, now: Optional[float] = None) -> bool:
+        """
+        Try to consume a token.
+
+        >>> bucket = TokenBucket(rate=1.0, burst=2, now=0.0)
+        >>> [bucket.consume(now=0.0) for _ in range(3)]
+        [True, True, False]
+        >>> bucket.consume(now=1.0)
+        True
+
+        :param now: the current time (monotonic clock). If None, it is read from the clock.
+        :return: True if a token was available, False otherwise.
+        """
+        now = time.monotonic() if now is None else now
+        self.tokens = min(
+            self.burst, self.tokens + (now - self.last_refill) * self.rate
+        )
+        self.last_refill = now
+        if self.tokens < 1.0:
+            return False
+        self.tokens -= 1.0
+        return True
+
+
+class RateLimiter:
+    """
+    Limit the rate of the messages of every sender with its own token bucket.
+
+    A bucket idle for long enough to be full again is the same as a new one, hence it is evicted:
+    only the senders active in the last burst / rate seconds have a bucket.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        """
+        Initialize the rate limiter.
+
+        :param rate: the number of messages per second allowed to every sender.
+        :param burst: the number of messages a sender can send at once.
+        :return: None
+        """
+        assert rate > 0 and burst >= 1
+        self.rate = rate
+        self.burst = burst
+        self.idle_timeout = burst / rate
+        # the buckets, from the least recently used.
+        self._buckets = OrderedDict()  # type: Dict[Address, TokenBucket]
+        self._throttled = {}  # type: Dict[Address, int]
+
+    def __len__(self) -> int:
+        """Get the number of buckets."""
+        return len(self._buckets)
+
+    def allow(self, sender: Address, now: Optional[float] = None) -> bool:
+        """
+        Check whether a message of a sender is within the limit, and account for it.
+
+        :param sender: the public key of the sender.
+        :param now: the current time (monotonic clock). If None, it is read from the clock.
+        :return: True if the message can be processed, False if it must be rejected.
+        """
+        now = time.monotonic() if now is None else now
+        self._evict_idle(now)
+        bucket = self._buckets.get(sender)
+        if bucket is None:
+            bucket = TokenBucket(self.rate, self.burst, now)
+            self._buckets[sender] = bucket
+        else:
+            self._buckets.move_to_end(sender)  # type: ignore
+        if bucket.consume(now):
+            self._throttled.pop(sender, None)
+            return True
+        self._throttled[sender] = self._throttled.get(sender, 0) + 1
+        return False
+
+    def _evict_idle(self, now: float) -> None:
+        """
+        Evict the buckets which have been full again since their last message.
+
+        :param now: the current time (monotonic clock).
+        :return: None
+        """
+        while len(self._buckets) > 0:
+            sender, bucket = next(iter(self._buckets.items()))
+            if now - bucket.last_refill < self.idle_timeout:
+                break
+            del self._buckets[sender]
+            self._throttled.pop(sender, None)
+
+    def nb_rejected(self, sender: Address) -> int:
+        """
+        Get the number of messages of a sender rejected since its last accepted message.
+
+        :param sender: the public key of the sender.
+        :return: the number of rejected messages.
+        """
+        return self._throttled.get(sender, 0)
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the registry of the agents registered to the controller."""
+
+from typing import AbstractSet, Dict, FrozenSet, Iterable, Optional
+
+from aea.mail.base import Address
+
+
+class AgentRegistry:
+    """
+    Index of the registered agents, by public key and by name.
+
+    Every check needed to accept a registration takes constant time.
+    """
+
+    def __init__(self, whitelist: Optional[Iterable[str]] = None) -> None:
+        """
+        Initialize an empty registry.
+
+        :param whitelist: the names of the agents allowed to register. If None, every name is allowed.
+        :return: None
+        """
+        self.whitelist = (
+            frozenset(whitelist) if whitelist is not None else None
+        )  # type: Optional[FrozenSet[str]]
+        self._pbk_to_name = {}  # type: Dict[Address, str]
+        self._name_to_pbk = {}  # type: Dict[str, Address]
+
+    def __len__(self) -> int:
+        """Get the number of registered agents."""
+        return len(self._pbk_to_name)
+
+    def __contains__(self, agent_pbk: object) -> bool:
+        """Check whether a public key is registered."""
+        return agent_pbk in self._pbk_to_name
+
+    @property
+    def public_keys(self) -> AbstractSet[Address]:
+        """Get a (live) view of the registered public keys."""
+        return self._pbk_to_name.keys()
+
+    @property
+    def pbk_to_name(self) -> Dict[Address, str]:
+        """Get the mapping from the registered public keys to the agent names. It must not be modified."""
+        return self._pbk_to_name
+
+    def is_whitelisted(self, agent_name: str) -> bool:
+        """
+        Check whether a name is allowed to register.
+
+        :param agent_name: the name of the agent.
+        :return: True if there is no whitelist or the name is in the whitelist.
+        """
+        return self.whitelist is None or agent_name in self.whitelist
+
+    def is_name_registered(self, agent_name: str) -> bool:
+        """
+        Check whether a name is already registered.
+
+        :param agent_name: the name of the agent.
+        :return: True if an agent with that name is registered.
+        """
+        return agent_name in self._name_to_pbk
+
+    def register(self, agent_pbk: Address, agent_name: str) -> None:
+        """
+        Register an agent.
+
+        :param agent_pbk: the public key of the agent.
+        :param agent_name: the name of the agent.
+        :return: None
+        :raises ValueError: if the public key or the name is already registered.
+        """
+        if agent_pbk in self._pbk_to_name:
+            raise ValueError("Agent pbk already registered: {}".format(agent_pbk))
+        if agent_name in self._name_to_pbk:
+            raise ValueError("Agent name already registered: {}".format(agent_name))
+        self._pbk_to_name[agent_pbk] = agent_name
+        self._name_to_pbk[agent_name] = agent_pbk
+
+    def unregister(self, agent_pbk: Address) -> str:
+        """
+        Unregister an agent.
+
+        :param agent_pbk: the public key of the agent.
+        :return: the name of the agent.
+        :raises KeyError: if the public key is not registered.
+        """
+        agent_name = self._pbk_to_name.pop(agent_pbk)
+        del self._name_to_pbk[agent_name]
+        return agent_name
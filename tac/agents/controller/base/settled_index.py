@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the index of the transactions settled by the controller."""
+
+import hashlib
+from typing import Iterable, Set
+
+
+def transaction_digest(transaction_id: str) -> int:
+    """
+    Get the 64-bit digest of a transaction id.
+
+    >>> transaction_digest("tx_0") == transaction_digest("tx_0")
+    True
+    >>> transaction_digest("tx_0") < 2 ** 64
+    True
+
+    :param transaction_id: the transaction id.
+    :return: the digest, as an integer.
+    """
+    return int.from_bytes(
+        hashlib.blake2b(transaction_id.encode("utf-8"), digest_size=8).digest(),
+        "little",
+    )
+
+
+class SettledTransactionIndex:
+    """
+    Index of the ids of the settled transactions, to detect the replayed and duplicated transactions.
+
+    Only a 64-bit digest of every id is kept, which is much smaller than the id itself (it embeds the public keys
+    of both parties). Two different ids share a digest with probability about n^2 / 2^65 for n settled transactions,
+    i.e. less than 1e-7 for a million transactions.
+    """
+
+    def __init__(self, transaction_ids: Iterable[str] = ()) -> None:
+        """
+        Initialize the index.
+
+        :param transaction_ids: the ids of the transactions already settled, e.g. in a recovered game.
+        :return: None
+        """
+        self._digests = {
+            transaction_digest(transaction_id) for transaction_id in transaction_ids
+        }  # type: Set[int]
+
+    def __len__(self) -> int:
+        """Get the number of settled transactions."""
+        return len(self._digests)
+
+    def __contains__(self, transaction_id: object) -> bool:
+        """Check whether a transaction id has been settled."""
+        return (
+            isinstance(transaction_id, str)
+            and transaction_digest(transaction_id) in self._digests
+        )
+
+    def add(self, transaction_id: str) -> None:
+        """
+        Record a settled transaction.
+
+        :param transaction_id: the transaction id.
+        :return: None
+        """
+        self._digests.add(transaction_digest(transaction_id))
@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+This module contains the settlement engine of the controller.
+
+Matched transactions are queued by the transaction handler and settled in batches:
+- the batch is partitioned into conflict-free groups, i.e. groups of transactions that involve disjoint sets of agents;
+- every group is validated and applied on a copy of the balances and holdings kept in shared memory,
+  possibly split across several worker processes;
+- the settled transactions are committed to the game in their arrival order.
+
+Since a transaction is always placed in a later group than every previous transaction involving the same agents,
+the outcome is the same as settling the transactions one by one in arrival order.
+"""
+
+import logging
+import multiprocessing
+from multiprocessing.pool import Pool
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from tac.agents.controller.base.states import Game
+from tac.platform.game.base import Transaction
+
+logger = logging.getLogger(__name__)
+
+Chunk = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+# the state arrays of the worker processes, set by _init_worker.
+_worker_balances = None  # type: Optional[np.ndarray]
+_worker_holdings = None  # type: Optional[np.ndarray]
+_worker_share_of_tx_fee = 0.0
+
+
+def partition_transactions(
+    transactions: List[Transaction], agent_pbk_to_index: Dict[str, int]
+) -> List[List[int]]:
+    """
+    Partition a list of transactions into conflict-free groups.
+
+    A transaction is placed in the first group after the groups of all the previous transactions involving its buyer or its seller.
+    Hence, the transactions in a group involve disjoint sets of agents and,
+    for every agent, the groups preserve the arrival order of its transactions.
+
+    >>> txs = [Transaction('tx_0', True, 'b', 1, {}, 'a'), Transaction('tx_1', True, 'd', 1, {}, 'c'), Transaction('tx_2', True, 'c', 1, {}, 'a')]
+    >>> partition_transactions(txs, {'a': 0, 'b': 1, 'c': 2, 'd': 3})
+    [[0, 1], [2]]
+
+    :param transactions: the transactions, in arrival order.
+    :param agent_pbk_to_index: the map from agent public keys to their index.
+    :return: the groups, as lists of indexes in the transaction list.
+    """
+    groups = []  # type: List[List[int]]
+    last_group_per_agent = {}  # type: Dict[int, int]
+    for tx_index, tx in enumerate(transactions):
+        buyer = agent_pbk_to_index[tx.buyer_pbk]
+        seller = agent_pbk_to_index[tx.seller_pbk]
+        group_index = (
+            max(
+                last_group_per_agent.get(buyer, -1),
+                last_group_per_agent.get(seller, -1),
+            )
+            + 1
+        )
+        last_group_per_agent[buyer] = group_index
+        last_group_per_agent[seller] = group_index
+        if group_index == len(groups):
+            groups.append([])
+        groups[group_index].append(tx_index)
+    return groups
+
+
+def settle_group(
+    balances: np.ndarray,
+    holdings: np.ndarray,
+    share_of_tx_fee: float,
+    chunk: Chunk,
+) -> np.ndarray:
+    """
+    Validate and apply a group of transactions involving disjoint sets of agents.
+
+    :param balances: the balances of the agents, updated in place.
+    :param holdings: the holdings of the agents, of shape (nb_agents, nb_goods), updated in place.
+    :param share_of_tx_fee: the share of the transaction fee paid by each party.
+    :param chunk: the buyer indexes, the seller indexes, the amounts and the quantities of the transactions.
+    :return: the mask of the valid transactions.
+    """
+    buyers, sellers, amounts, quantities = chunk
+    is_valid = np.logical_not(balances[buyers] < amounts + share_of_tx_fee)
+    is_valid &= np.all(holdings[sellers] >= quantities, axis=1)
+
+    valid_buyers = buyers[is_valid]
+    valid_sellers = sellers[is_valid]
+    valid_amounts = amounts[is_valid]
+    valid_quantities = quantities[is_valid]
+    holdings[valid_buyers] += valid_quantities
+    holdings[valid_sellers] -= valid_quantities
+    balances[valid_buyers] -= valid_amounts + share_of_tx_fee
+    balances[valid_sellers] += valid_amounts - share_of_tx_fee
+    return is_valid
+
+
+def _init_worker(
+    balances_buffer: Any,
+    holdings_buffer: Any,
+    nb_agents: int,
+    nb_goods: int,
+    share_of_tx_fee: float,
+) -> None:
+    """Attach a worker process to the shared state arrays."""
+    global _worker_balances, _worker_holdings, _worker_share_of_tx_fee
+    _worker_balances = np.frombuffer(balances_buffer, dtype=np.float64)
+    _worker_holdings = np.frombuffer(holdings_buffer, dtype=np.int64).reshape(
+        (nb_agents, nb_goods)
+    )
+    _worker_share_of_tx_fee = share_of_tx_fee
+
+
+def _settle_chunk(chunk: Chunk) -> np.ndarray:
+    """Settle a chunk of a conflict-free group in a worker process."""
+    assert _worker_balances is not None and _worker_holdings is not None
+    return settle_group(
+        _worker_balances, _worker_holdings, _worker_share_of_tx_fee, chunk
+    )
+
+
+class SettlementEngine:
+    """Settle matched transactions in batches of conflict-free groups."""
+
+    def __init__(self, game: Game, nb_workers: int = 1) -> None:
+        """
+        Instantiate a settlement engine.
+
+        :param game: the game whose transactions are settled.
+        :param nb_workers: the number of worker processes. If less than 2, the groups are settled in the controller process.
+        :return: None
+        """
+        self.game = game
+        self.nb_workers = nb_workers
+        self._pending = []  # type: List[Transaction]
+
+        configuration = game.configuration
+        self._agent_pbk_to_index = {
+            agent_pbk: index for index, agent_pbk in enumerate(configuration.agent_pbks)
+        }  # type: Dict[str, int]
+        self._share_of_tx_fee = round(configuration.tx_fee / 2.0, 2)
+
+        self._balances_buffer = multiprocessing.RawArray("d", configuration.nb_agents)
+        self._holdings_buffer = multiprocessing.RawArray(
+            "q", configuration.nb_agents * configuration.nb_goods
+        )
+        self._balances = np.frombuffer(self._balances_buffer, dtype=np.float64)
+        self._holdings = np.frombuffer(self._holdings_buffer, dtype=np.int64).reshape(
+            (configuration.nb_agents, configuration.nb_goods)
+        )
+        for agent_pbk, index in self._agent_pbk_to_index.items():
+            agent_state = game.agent_states[agent_pbk]
+            self._balances[index] = agent_state.balance
+            self._holdings[index] = agent_state.current_holdings
+
+        self._pool = None  # type: Optional[Pool]
+        if self.nb_workers > 1:
+            self._pool = multiprocessing.Pool(
+                self.nb_workers,
+                initializer=_init_worker,
+                initargs=(
+                    self._balances_buffer,
+                    self._holdings_buffer,
+                    configuration.nb_agents,
+                    configuration.nb_goods,
+                    self._share_of_tx_fee,
+                ),
+            )
+
+    @property
+    def nb_pending(self) -> int:
+        """Get the number of transactions waiting to be settled."""
+        return len(self._pending)
+
+    def submit(self, tx: Transaction) -> None:
+        """
+        Queue a matched transaction for settlement.
+
+        :param tx: the transaction.
+        :return: None
+        """
+        self._pending.append(tx)
+
+    def settle(self) -> List[Tuple[Transaction, bool]]:
+        """
+        Settle all the queued transactions.
+
+        The valid transactions are committed to the game in arrival order.
+
+        :return: the queued transactions, in arrival order, each paired with whether it has been settled.
+        """
+        if len(self._pending) == 0:
+            return []
+        transactions, self._pending = self._pending, []
+
+        nb_goods = self.game.configuration.nb_goods
+        buyers = np.array(
+            [self._agent_pbk_to_index[tx.buyer_pbk] for tx in transactions],
+            dtype=np.int64,
+        )
+        sellers = np.array(
+            [self._agent_pbk_to_index[tx.seller_pbk] for tx in transactions],
+            dtype=np.int64,
+        )
+        amounts = np.array([tx.amount for tx in transactions], dtype=np.float64)
+        quantities = np.array(
+            [list(tx.quantities_by_good_pbk.values()) for tx in transactions],
+            dtype=np.int64,
+        ).reshape((len(transactions), nb_goods))
+
+        is_valid = np.zeros(len(transactions), dtype=bool)
+        for group in partition_transactions(transactions, self._agent_pbk_to_index):
+            indexes = np.array(group, dtype=np.int64)
+            chunks = [
+                (buyers[part], sellers[part], amounts[part], quantities[part])
+                for part in self._split(indexes)
+            ]
+            if self._pool is not None and len(chunks) > 1:
+                results = self._pool.map(_settle_chunk, chunks)
+            else:
+                results = [
+                    settle_group(
+                        self._balances, self._holdings, self._share_of_tx_fee, chunk
+                    )
+                    for chunk in chunks
+                ]
+            is_valid[indexes] = np.concatenate(results)
+
+        self._commit(transactions, is_valid, buyers, sellers)
+        logger.debug(
+            "Settled {} out of {} transactions.".format(
+                int(np.sum(is_valid)), len(transactions)
+            )
+        )
+        return list(zip(transactions, is_valid.tolist()))
+
+    def _split(self, indexes: np.ndarray) -> List[np.ndarray]:
+        """Split a group among the worker processes."""
+        if self._pool is None:
+            return [indexes]
+        nb_chunks = min(self.nb_workers, len(indexes))
+        return np.array_split(indexes, nb_chunks)
+
+    def _commit(
+        self,
+        transactions: List[Transaction],
+        is_valid: np.ndarray,
+        buyers: np.ndarray,
+        sellers: np.ndarray,
+    ) -> None:
+        """Commit the settled transactions and the resulting agent states to the game."""
+        touched_agents = set()
+        for tx_index, tx in enumerate(transactions):
+            if is_valid[tx_index]:
+                self.game.record_transaction(tx)
+                touched_agents.add(int(buyers[tx_index]))
+                touched_agents.add(int(sellers[tx_index]))
+
+        agent_pbks = self.game.configuration.agent_pbks
+        for index in touched_agents:
+            agent_state = self.game.agent_states[agent_pbks[index]]
+            agent_state.set_balance_and_holdings(
+                float(self._balances[index]), self._holdings[index].tolist()
+            )
+
+    def stop(self) -> None:
+        """
+        Stop the worker processes.
+
+        :return: None
+        """
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
@@ -30,6 +30,7 @@ import logging
 from typing import List, Dict, Any
 
 from aea.mail.base import Address
+from tac.agents.controller.base.transaction_store import TransactionStore
 from tac.agents.participant.v1.base.states import AgentState
 from tac.platform.game.base import GameConfiguration, GoodState, Transaction
 from tac.platform.game.helpers import (
@@ -248,7 +249,7 @@ class Game:
         """
         self._configuration = configuration  # type GameConfiguration
         self._initialization = initialization  # type: GameInitialization
-        self.transactions = []  # type: List[Transaction]
+        self.transactions = TransactionStore()
 
         self._initial_agent_states = dict(
             (
@@ -464,29 +465,39 @@ class Game:
         :raises: AssertionError if the transaction is not valid.
         """
         assert self.is_transaction_valid(tx)
-        self.transactions.append(tx)
         buyer_state = self.agent_states[tx.buyer_pbk]
         seller_state = self.agent_states[tx.seller_pbk]
 
-        nb_instances_traded = sum(tx.quantities_by_good_pbk.values())
-
-        # update holdings and prices
-        for good_id, (good_pbk, quantity) in enumerate(
-            tx.quantities_by_good_pbk.items()
-        ):
+        # update holdings
+        for good_id, quantity in enumerate(tx.quantities_by_good_pbk.values()):
             buyer_state._current_holdings[good_id] += quantity
             seller_state._current_holdings[good_id] -= quantity
-            if quantity > 0:
-                # for now the price is simply the amount proportional to the share in the bundle
-                price = tx.amount / nb_instances_traded
-                good_state = self.good_states[good_pbk]
-                good_state.price = price
 
         share_of_tx_fee = round(self.configuration.tx_fee / 2.0, 2)
         # update balances and charge share of fee to buyer and seller
         buyer_state.balance -= tx.amount + share_of_tx_fee
         seller_state.balance += tx.amount - share_of_tx_fee
 
+        self.record_transaction(tx)
+
+    def record_transaction(self, tx: Transaction) -> None:
+        """
+        Record a settled transaction and update the prices of the traded goods.
+
+        The agent states are not modified, i.e. the effects of the transaction must be applied by the caller.
+
+        :param tx: the game transaction.
+        :return: None
+        """
+        self.transactions.append(tx)
+        nb_instances_traded = sum(tx.quantities_by_good_pbk.values())
+        for good_pbk, quantity in tx.quantities_by_good_pbk.items():
+            if quantity > 0:
+                # for now the price is simply the amount proportional to the share in the bundle
+                price = tx.amount / nb_instances_traded
+                good_state = self.good_states[good_pbk]
+                good_state.price = price
+
     def get_holdings_matrix(self) -> List[Endowment]:
         """
         Get the holdings matrix of shape (nb_agents, nb_goods).
@@ -26,6 +26,8 @@ import random
 
 from typing import Set, Optional
 
+from tac.platform.protocols.tac.compression import DEFAULT_COMPRESSION_THRESHOLD
+
 
 class TACParameters(object):
     """This class contains the parameters for the TAC."""
@@ -46,6 +48,11 @@ class TACParameters(object):
         whitelist: Optional[Set[str]] = None,
         data_output_dir: str = "data",
         version_id: str = str(random.randint(0, 10000)),
+        settlement_workers: int = 0,
+        dump_compression: Optional[str] = None,
+        rate_limit: float = 0.0,
+        rate_limit_burst: int = 10,
+        compression_threshold: int = DEFAULT_COMPRESSION_THRESHOLD,
     ):
         """
         Initialize parameters for TAC.
@@ -62,6 +69,13 @@ class TACParameters(object):
         :param competition_timeout: the duration (in seconds) of the competition phase.
         :param inactivity_timeout: the time when the competition will start.
         :param whitelist: the set of agent names allowed. If None, no checks on the agent names.
+        :param data_output_dir: the output directory for the simulation data.
+        :param version_id: the version id of the TAC.
+        :param settlement_workers: the number of worker processes of the settlement engine. If 0, transactions are settled as soon as they are matched.
+        :param dump_compression: the compression of the game dump: None, 'gzip' or 'zstd'.
+        :param rate_limit: the number of messages per second allowed to every agent. If 0, the messages are not limited.
+        :param rate_limit_burst: the number of messages an agent can send at once, when the rate is limited.
+        :param compression_threshold: the size (in bytes) from which the messages to the agents supporting compression are compressed. If 0, the messages are not compressed.
         """
         self._min_nb_agents = min_nb_agents
         self._money_endowment = money_endowment
@@ -77,6 +91,11 @@ class TACParameters(object):
         self._whitelist = whitelist
         self._data_output_dir = data_output_dir
         self._version_id = version_id
+        self._settlement_workers = settlement_workers
+        self._dump_compression = dump_compression
+        self._rate_limit = rate_limit
+        self._rate_limit_burst = rate_limit_burst
+        self._compression_threshold = compression_threshold
         self._check_values()
 
     def _check_values(self) -> None:
@@ -89,6 +108,14 @@ class TACParameters(object):
             raise ValueError
         if self._inactivity_timeout is None:
             raise ValueError
+        if self._settlement_workers < 0:
+            raise ValueError
+        if self._dump_compression not in (None, "gzip", "zstd"):
+            raise ValueError
+        if self._rate_limit < 0 or self._rate_limit_burst < 1:
+            raise ValueError
+        if self._compression_threshold < 0:
+            raise ValueError
 
     @property
     def min_nb_agents(self) -> int:
@@ -181,3 +208,28 @@ class TACParameters(object):
     def version_id(self) -> str:
         """Version id."""
         return self._version_id
+
+    @property
+    def settlement_workers(self) -> int:
+        """Number of worker processes of the settlement engine (0 if the engine is disabled)."""
+        return self._settlement_workers
+
+    @property
+    def dump_compression(self) -> Optional[str]:
+        """Compression of the game dump (None if not compressed)."""
+        return self._dump_compression
+
+    @property
+    def rate_limit(self) -> float:
+        """Number of messages per second allowed to every agent (0 if not limited)."""
+        return self._rate_limit
+
+    @property
+    def rate_limit_burst(self) -> int:
+        """Number of messages an agent can send at once."""
+        return self._rate_limit_burst
+
+    @property
+    def compression_threshold(self) -> int:
+        """Size (in bytes) from which the messages are compressed (0 if not compressed)."""
+        return self._compression_threshold
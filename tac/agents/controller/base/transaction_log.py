@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+This module contains the write-ahead transaction log of the controller.
+
+The log is a JSON-lines file:
+- the first line is the header, i.e. the configuration and the initialization of the game;
+- every following line is a settled transaction, in settlement order.
+
+The writer buffers the records and flushes them to disk in groups (group commit).
+A record is complete only if it is terminated by a newline, so a line truncated by a crash is ignored by the readers.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Callable, IO, Iterator, List, Optional, Tuple
+
+from tac.agents.controller.base.states import Game, GameInitialization
+from tac.platform.game.base import GameConfiguration, Transaction
+
+logger = logging.getLogger(__name__)
+
+TRANSACTION_LOG_FILENAME = "transactions.jsonl"
+
+
+def _fsync_directory(directory: str) -> None:
+    """
+    Sync a directory to disk, so that a file renamed in it survives a crash.
+
+    Directories cannot be opened on Windows, where the rename is durable without it.
+
+    :param directory: the path of the directory.
+    :return: None
+    """
+    if os.name == "nt":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class TransactionLog:
+    """Append-only log of the settled transactions of a game."""
+
+    def __init__(
+        self, path: str, sync_every: int = 100, sync_interval: float = 1.0
+    ) -> None:
+        """
+        Open a transaction log for appending.
+
+        :param path: the path of the log file.
+        :param sync_every: the maximum number of records waiting to be synced to disk.
+        :param sync_interval: the maximum time (in seconds) a record waits to be synced to disk.
+        :return: None
+        """
+        self.path = path
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self._file = open(path, "a")  # type: IO[str]
+        self._nb_unsynced = 0
+        self._last_sync = time.monotonic()
+
+    @classmethod
+    def create(cls, path: str, game: Game, **kwargs) -> "TransactionLog":
+        """
+        Create a new transaction log for a game, replacing any existing file.
+
+        The log is written to a temporary file in the same directory, synced, and then atomically renamed over
+        the existing file, so that the existing log is left untouched if the creation fails (e.g. in a recovery).
+
+        :param path: the path of the log file.
+        :param game: the game, whose configuration and initialization are written in the header.
+        :return: the transaction log, with the transactions already in the game written.
+        """
+        header = {
+            "configuration": game.configuration.to_dict(),
+            "initialization": game.initialization.to_dict(),
+        }
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(
+            dir=directory, prefix="." + os.path.basename(path) + "."
+        )
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(json.dumps(header) + "\n")
+                for tx in game.transactions:
+                    f.write(json.dumps(tx.to_dict()) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        _fsync_directory(directory)
+        return cls(path, **kwargs)
+
+    @property
+    def closed(self) -> bool:
+        """Check whether the log is closed."""
+        return self._file.closed
+
+    def append(self, tx: Transaction) -> None:
+        """
+        Append a settled transaction to the log.
+
+        The record is synced to disk when the group commit is due.
+
+        :param tx: the transaction.
+        :return: None
+        """
+        self._file.write(json.dumps(tx.to_dict()) + "\n")
+        self._nb_unsynced += 1
+        if self._nb_unsynced >= self.sync_every:
+            self.sync()
+
+    def update(self) -> None:
+        """
+        Sync the pending records if they have waited longer than the sync interval.
+
+        :return: None
+        """
+        if (
+            self._nb_unsynced > 0
+            and time.monotonic() - self._last_sync >= self.sync_interval
+        ):
+            self.sync()
+
+    def sync(self) -> None:
+        """
+        Flush the pending records and sync them to disk.
+
+        :return: None
+        """
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._nb_unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        """
+        Sync the pending records and close the log.
+
+        :return: None
+        """
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+
+class TransactionLogReader:
+    """Read a transaction log, possibly while it is being written."""
+
+    def __init__(self, path: str) -> None:
+        """
+        Open a transaction log for reading.
+
+        :param path: the path of the log file.
+        :return: None
+        """
+        self.path = path
+        self._file = open(path, "r")  # type: IO[str]
+        self._header = (
+            None
+        )  # type: Optional[Tuple[GameConfiguration, GameInitialization]]
+
+    def _read_record(self) -> Optional[str]:
+        """Read the next complete record, if any."""
+        position = self._file.tell()
+        line = self._file.readline()
+        if not line.endswith("\n"):
+            # incomplete record: wait for the writer to terminate it.
+            self._file.seek(position)
+            return None
+        return line
+
+    def read_header(self) -> Tuple[GameConfiguration, GameInitialization]:
+        """
+        Read the header of the log.
+
+        :return: the configuration and the initialization of the game.
+        :raises ValueError: if the header is not available.
+        """
+        if self._header is None:
+            line = self._read_record()
+            if line is None:
+                raise ValueError("The transaction log has no header.")
+            header = json.loads(line)
+            self._header = (
+                GameConfiguration.from_dict(header["configuration"]),
+                GameInitialization.from_dict(header["initialization"]),
+            )
+        return self._header
+
+    def read_transactions(self) -> Iterator[Transaction]:
+        """
+        Read the transactions currently available in the log.
+
+        :return: an iterator over the transactions not read yet.
+        """
+        self.read_header()
+        line = self._read_record()
+        while line is not None:
+            yield Transaction.from_dict(json.loads(line))
+            line = self._read_record()
+
+    def follow(
+        self,
+        poll_interval: float = 0.1,
+        is_stopped: Callable[[], bool] = lambda: False,
+    ) -> Iterator[Transaction]:
+        """
+        Read the transactions as they are appended to the log.
+
+        :param poll_interval: the time (in seconds) to wait before polling the log again.
+        :param is_stopped: a callable that returns True when the reader must stop following the log.
+        :return: an iterator over the transactions.
+        """
+        while True:
+            yield from self.read_transactions()
+            if is_stopped():
+                return
+            time.sleep(poll_interval)
+
+    def close(self) -> None:
+        """
+        Close the reader.
+
+        :return: None
+        """
+        self._file.close()
+
+
+def recover_game(path: str) -> Game:
+    """
+    Rebuild a game from its transaction log.
+
+    :param path: the path of the log file.
+    :return: the game, with every logged transaction settled.
+    """
+    reader = TransactionLogReader(path)
+    try:
+        configuration, initialization = reader.read_header()
+        game = Game(configuration, initialization)
+        transactions = list(reader.read_transactions())  # type: List[Transaction]
+    finally:
+        reader.close()
+
+    for tx in transactions:
+        game.settle_transaction(tx)
+    logger.info(
+        "Recovered game '{}' with {} transactions from {}.".format(
+            configuration.version_id, len(transactions), path
+        )
+    )
+    return game
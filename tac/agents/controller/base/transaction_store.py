@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+This module contains the store of the settled transactions of a game.
+
+Every transaction is stored once, in settlement order. For every agent, the store keeps the offsets of the
+transactions involving it, so that the history of an agent is read through a view instead of being copied.
+Since the store is append-only, a snapshot of the store is a view of its first transactions.
+"""
+
+import bisect
+import itertools
+from array import array
+from typing import Dict, Iterable, Iterator, List, Sequence, Union, overload
+
+from aea.mail.base import Address
+from tac.platform.game.base import Transaction
+
+
+def _as_seen_by(tx: Transaction, agent_pbk: Address) -> Transaction:
+    """
+    Get a transaction as sent by one of its parties.
+
+    :param tx: the transaction, as sent by one of the parties.
+    :param agent_pbk: the public key of the party.
+    :return: the transaction itself if it was sent by the party, the matching transaction otherwise.
+    """
+    if tx.sender == agent_pbk:
+        return tx
+    return Transaction(
+        tx.transaction_id,
+        not tx.is_sender_buyer,
+        tx.sender,
+        tx.amount,
+        tx.quantities_by_good_pbk,
+        tx.counterparty,
+    )
+
+
+class TransactionStore(Sequence[Transaction]):
+    """
+    An append-only store of the settled transactions of a game, indexed by agent.
+
+    It is a sequence of the transactions in settlement order, which compares equal to a list of the same transactions.
+    """
+
+    def __init__(self, transactions: Iterable[Transaction] = ()) -> None:
+        """
+        Initialize the store.
+
+        :param transactions: the transactions already settled, in settlement order.
+        :return: None
+        """
+        self._transactions = []  # type: List[Transaction]
+        self._offsets_per_agent = {}  # type: Dict[Address, array]
+        for tx in transactions:
+            self.append(tx)
+
+    def append(self, tx: Transaction) -> None:
+        """
+        Append a settled transaction, and index it for both its parties.
+
+        :param tx: the transaction.
+        :return: None
+        """
+        offset = len(self._transactions)
+        self._transactions.append(tx)
+        for agent_pbk in (tx.sender, tx.counterparty):
+            offsets = self._offsets_per_agent.get(agent_pbk)
+            if offsets is None:
+                offsets = array("L")
+                self._offsets_per_agent[agent_pbk] = offsets
+            offsets.append(offset)
+
+    def view(self, agent_pbk: Address) -> "AgentTransactionView":
+        """
+        Get the history of an agent.
+
+        :param agent_pbk: the public key of the agent.
+        :return: a (live) view of the transactions involving the agent, as sent by the agent.
+        """
+        return AgentTransactionView(self, agent_pbk)
+
+    def snapshot(self) -> "TransactionStoreSnapshot":
+        """
+        Get a snapshot of the store.
+
+        :return: a view of the transactions settled so far, which the transactions appended later do not affect.
+        """
+        return TransactionStoreSnapshot(self, len(self._transactions))
+
+    def offsets(self, agent_pbk: Address) -> Sequence[int]:
+        """
+        Get the offsets of the transactions involving an agent.
+
+        :param agent_pbk: the public key of the agent.
+        :return: the offsets, in increasing order. It must not be modified.
+        """
+        return self._offsets_per_agent.get(agent_pbk, array("L"))
+
+    def __len__(self) -> int:
+        """Get the number of transactions."""
+        return len(self._transactions)
+
+    @overload
+    def __getitem__(self, index: int) -> Transaction:
+        """Get a transaction."""
+
+    @overload  # noqa: F811
+    def __getitem__(self, index: slice) -> List[Transaction]:
+        """Get a list of transactions."""
+
+    def __getitem__(  # noqa: F811
+        self, index: Union[int, slice]
+    ) -> Union[Transaction, List[Transaction]]:
+        """Get a transaction, or a list of transactions for a slice."""
+        return self._transactions[index]
+
+    def __iter__(self) -> Iterator[Transaction]:
+        """Iterate over the transactions, in settlement order."""
+        return iter(self._transactions)
+
+    def __eq__(self, other: object) -> bool:
+        """Compare with another store or a list of transactions."""
+        if isinstance(other, TransactionStore):
+            return self._transactions == other._transactions
+        if isinstance(other, list):
+            return self._transactions == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        """Get the representation of the store."""
+        return "TransactionStore({!r})".format(self._transactions)
+
+
+class TransactionStoreSnapshot(Sequence[Transaction]):
+    """
+    A view of the first transactions of a store.
+
+    The store can be appended to while the snapshot is read, e.g. from another thread.
+    """
+
+    def __init__(self, store: TransactionStore, length: int) -> None:
+        """
+        Initialize the snapshot.
+
+        :param store: the transaction store.
+        :param length: the number of transactions of the snapshot, at most the number of transactions of the store.
+        :return: None
+        """
+        assert 0 <= length <= len(store)
+        self._store = store
+        self._length = length
+
+    def view(self, agent_pbk: Address) -> "AgentTransactionView":
+        """
+        Get the history of an agent, up to the snapshot.
+
+        :param agent_pbk: the public key of the agent.
+        :return: a view of the transactions of the snapshot involving the agent, as sent by the agent.
+        """
+        return AgentTransactionView(self, agent_pbk)
+
+    def offsets(self, agent_pbk: Address) -> Sequence[int]:
+        """
+        Get the offsets of the transactions of the snapshot involving an agent.
+
+        :param agent_pbk: the public key of the agent.
+        :return: the offsets, in increasing order.
+        """
+        offsets = self._store.offsets(agent_pbk)
+        return offsets[: bisect.bisect_left(offsets, self._length)]
+
+    def __len__(self) -> int:
+        """Get the number of transactions."""
+        return self._length
+
+    @overload
+    def __getitem__(self, index: int) -> Transaction:
+        """Get a transaction."""
+
+    @overload  # noqa: F811
+    def __getitem__(self, index: slice) -> List[Transaction]:
+        """Get a list of transactions."""
+
+    def __getitem__(  # noqa: F811
+        self, index: Union[int, slice]
+    ) -> Union[Transaction, List[Transaction]]:
+        """Get a transaction, or a list of transactions for a slice."""
+        offsets = range(self._length)[index]
+        if isinstance(offsets, range):
+            return [self._store[offset] for offset in offsets]
+        return self._store[offsets]
+
+    def __iter__(self) -> Iterator[Transaction]:
+        """Iterate over the transactions, in settlement order."""
+        return itertools.islice(self._store, self._length)
+
+
+class AgentTransactionView(Sequence[Transaction]):
+    """The history of an agent: the transactions of a store involving the agent, as sent by the agent."""
+
+    def __init__(
+        self,
+        store: Union[TransactionStore, TransactionStoreSnapshot],
+        agent_pbk: Address,
+    ) -> None:
+        """
+        Initialize the view.
+
+        :param store: the transaction store.
+        :param agent_pbk: the public key of the agent.
+        :return: None
+        """
+        self._store = store
+        self._agent_pbk = agent_pbk
+
+    def __len__(self) -> int:
+        """Get the number of transactions involving the agent."""
+        return len(self._store.offsets(self._agent_pbk))
+
+    @overload
+    def __getitem__(self, index: int) -> Transaction:
+        """Get a transaction."""
+
+    @overload  # noqa: F811
+    def __getitem__(self, index: slice) -> List[Transaction]:
+        """Get a list of transactions."""
+
+    def __getitem__(  # noqa: F811
+        self, index: Union[int, slice]
+    ) -> Union[Transaction, List[Transaction]]:
+        """Get a transaction, or a list of transactions for a slice."""
+        offsets = self._store.offsets(self._agent_pbk)
+        if isinstance(index, slice):
+            return [
+                _as_seen_by(self._store[offset], self._agent_pbk)
+                for offset in offsets[index]
+            ]
+        return _as_seen_by(self._store[offsets[index]], self._agent_pbk)
+
+    def __iter__(self) -> Iterator[Transaction]:
+        """Iterate over the transactions involving the agent, in settlement order."""
+        for offset in self._store.offsets(self._agent_pbk):
+            yield _as_seen_by(self._store[offset], self._agent_pbk)
@@ -27,6 +27,7 @@ from typing import Optional
 from aea.agent import Agent
 from aea.channels.oef.connection import OEFMailBox
 from aea.mail.base import Envelope
+from tac.agents.participant.v1.base.dialogues import DEFAULT_DIALOGUE_TIMEOUT
 from tac.agents.participant.v1.base.game_instance import GameInstance
 from tac.agents.participant.v1.base.handlers import (
     ControllerHandler,
@@ -36,6 +37,7 @@ from tac.agents.participant.v1.base.handlers import (
 from tac.agents.participant.v1.base.strategy import Strategy
 from tac.gui.dashboards.agent import AgentDashboard
 from tac.platform.game.base import GamePhase
+from tac.platform.protocols.tac.batching import BatchingOutBox
 
 logger = logging.getLogger(__name__)
 
@@ -57,6 +59,8 @@ class ParticipantAgent(Agent):
         dashboard: Optional[AgentDashboard] = None,
         private_key_pem: Optional[str] = None,
         debug: bool = False,
+        dialogue_timeout: float = DEFAULT_DIALOGUE_TIMEOUT,
+        archive_dialogues: bool = False,
     ):
         """
         Initialize a participant agent.
@@ -73,6 +77,8 @@ class ParticipantAgent(Agent):
         :param dashboard: a Visdom dashboard to visualize agent statistics during the competition.
         :param private_key_pem: the path to a private key in PEM format.
         :param debug: if True, run the agent in debug mode.
+        :param dialogue_timeout: the seconds without any message after which a dialogue is removed.
+        :param archive_dialogues: whether to archive a summary of the removed dialogues in the stats manager.
         """
         super().__init__(name, private_key_pem, agent_timeout, debug=debug)
         self.mailbox = OEFMailBox(self.crypto.public_key, oef_addr, oef_port)
@@ -85,8 +91,16 @@ class ParticipantAgent(Agent):
             services_interval,
             pending_transaction_timeout,
             dashboard,
+            dialogue_timeout,
+            archive_dialogues,
+            debug,
         )
         self.max_reactions = max_reactions
+        # the TAC messages (all to the controller) sent within a cycle are coalesced, and flushed in update().
+        self.batching_outbox = BatchingOutBox(
+            self.mailbox.outbox, lambda to: self.game_instance.tac_serializer
+        )
+        self.mailbox.outbox = self.batching_outbox
 
         self.controller_handler = ControllerHandler(
             self.crypto, self.liveness, self.game_instance, self.mailbox, self.name
@@ -150,6 +164,9 @@ class ParticipantAgent(Agent):
         :return: None
         """
         self.game_instance.transaction_manager.cleanup_pending_transactions()
+        self.game_instance.cleanup_dialogues()
+        self.game_instance.search.cleanup()
+        self.batching_outbox.flush()
 
     def stop(self) -> None:
         """
@@ -157,6 +174,7 @@ class ParticipantAgent(Agent):
 
         :return: None
         """
+        self.batching_outbox.flush()
         super().stop()
         self.game_instance.stop()
 
@@ -36,14 +36,16 @@ from aea.crypto.base import Crypto
 from aea.mail.base import MailBox
 from aea.protocols.oef.message import OEFMessage
 from aea.protocols.oef.serialization import OEFSerializer, DEFAULT_OEF
-from tac.agents.participant.v1.base.game_instance import GameInstance
+from tac.agents.participant.v1.base.game_instance import (
+    GameInstance,
+    SearchTarget,
+)
 from tac.agents.participant.v1.base.interfaces import (
     ControllerActionInterface,
     OEFActionInterface,
     DialogueActionInterface,
 )
 from tac.platform.protocols.tac.message import TACMessage
-from tac.platform.protocols.tac.serialization import TACSerializer
 
 logger = logging.getLogger(__name__)
 
@@ -85,7 +87,7 @@ class ControllerActions(ControllerActionInterface):
         :return: None
         """
         tac_msg = TACMessage(tac_type=TACMessage.Type.GET_STATE_UPDATE)
-        tac_bytes = TACSerializer().encode(tac_msg)
+        tac_bytes = self.game_instance.tac_serializer.encode(tac_msg)
         self.mailbox.outbox.put_message(
             to=self.game_instance.controller_pbk,
             sender=self.crypto.public_key,
@@ -135,7 +137,7 @@ class OEFActions(OEFActionInterface):
             [Constraint("version", GtEq(self.game_instance.expected_version_id))]
         )
         search_id = self.game_instance.search.get_next_id()
-        self.game_instance.search.ids_for_tac.add(search_id)
+        self.game_instance.search.add(search_id, SearchTarget.TAC)
 
         msg = OEFMessage(
             oef_type=OEFMessage.Type.SEARCH_SERVICES, id=search_id, query=query
@@ -279,7 +281,7 @@ class OEFActions(OEFActionInterface):
                     )
                 )
                 search_id = self.game_instance.search.get_next_id()
-                self.game_instance.search.ids_for_sellers.add(search_id)
+                self.game_instance.search.add(search_id, SearchTarget.SELLERS)
 
                 msg = OEFMessage(
                     oef_type=OEFMessage.Type.SEARCH_SERVICES, id=search_id, query=query
@@ -309,7 +311,7 @@ class OEFActions(OEFActionInterface):
                     )
                 )
                 search_id = self.game_instance.search.get_next_id()
-                self.game_instance.search.ids_for_buyers.add(search_id)
+                self.game_instance.search.add(search_id, SearchTarget.BUYERS)
 
                 msg = OEFMessage(
                     oef_type=OEFMessage.Type.SEARCH_SERVICES, id=search_id, query=query
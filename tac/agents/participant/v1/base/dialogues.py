@@ -23,18 +23,20 @@ This module contains the classes required for dialogue management.
 
 - DialogueLabel: The dialogue label class acts as an identifier for dialogues.
 - Dialogue: The dialogue class maintains state of a dialogue and manages it.
+- DialogueSummary: The dialogue summary class keeps the outcome of a dialogue after it is removed.
 - Dialogues: The dialogues class keeps track of all dialogues.
 """
 
 import logging
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from aea.helpers.dialogue.base import DialogueLabel
-from aea.helpers.dialogue.base import Dialogue as BaseDialogue
 from aea.helpers.dialogue.base import Dialogues as BaseDialogues
 from aea.mail.base import Address
 from aea.protocols.base.message import Message
 from aea.protocols.fipa.message import FIPAMessage
+from tac.agents.participant.v1.base.timing_wheel import TimingWheel
 
 Action = Any
 logger = logging.getLogger(__name__)
@@ -47,32 +49,162 @@ MATCH_ACCEPT_TARGET = ACCEPT_TARGET + 1
 DECLINED_CFP_TARGET = STARTING_MESSAGE_ID
 DECLINED_PROPOSE_TARGET = PROPOSE_TARGET + 1
 DECLINED_ACCEPT_TARGET = ACCEPT_TARGET + 1
+# no message is exchanged in a dialogue after one of these.
+TERMINAL_PERFORMATIVES = {
+    FIPAMessage.Performative.DECLINE,
+    FIPAMessage.Performative.MATCH_ACCEPT,
+}
+DEFAULT_DIALOGUE_TIMEOUT = 60.0
+DIALOGUE_EXPIRY_WHEEL_NB_SLOTS = 64
+
+# for every (performative, target) of a message in a registered dialogue: whether the dialogue was initiated by the
+# agent, and the performative of the last message the agent sent in it.
+EXPECTED_DIALOGUE_STATES = {
+    (FIPAMessage.Performative.PROPOSE, PROPOSE_TARGET): (
+        True,
+        FIPAMessage.Performative.CFP,
+    ),
+    (FIPAMessage.Performative.ACCEPT, ACCEPT_TARGET): (
+        False,
+        FIPAMessage.Performative.PROPOSE,
+    ),
+    (FIPAMessage.Performative.MATCH_ACCEPT, MATCH_ACCEPT_TARGET): (
+        True,
+        FIPAMessage.Performative.ACCEPT,
+    ),
+    (FIPAMessage.Performative.DECLINE, DECLINED_CFP_TARGET): (
+        True,
+        FIPAMessage.Performative.CFP,
+    ),
+    (FIPAMessage.Performative.DECLINE, DECLINED_PROPOSE_TARGET): (
+        False,
+        FIPAMessage.Performative.PROPOSE,
+    ),
+    (FIPAMessage.Performative.DECLINE, DECLINED_ACCEPT_TARGET): (
+        True,
+        FIPAMessage.Performative.ACCEPT,
+    ),
+}  # type: Dict[Tuple[FIPAMessage.Performative, int], Tuple[bool, FIPAMessage.Performative]]
+
+
+class DialogueSummary:
+    """The dialogue summary class keeps the outcome of a dialogue after it is removed."""
+
+    __slots__ = (
+        "dialogue_id",
+        "dialogue_opponent_pbk",
+        "is_self_initiated",
+        "is_seller",
+        "nb_messages",
+        "last_performative",
+        "is_expired",
+        "duration",
+    )
+
+    def __init__(
+        self,
+        dialogue_id: int,
+        dialogue_opponent_pbk: Address,
+        is_self_initiated: bool,
+        is_seller: bool,
+        nb_messages: int,
+        last_performative: Optional[FIPAMessage.Performative],
+        is_expired: bool,
+        duration: float,
+    ) -> None:
+        """
+        Initialize a dialogue summary.
 
+        :param dialogue_id: the id of the dialogue
+        :param dialogue_opponent_pbk: the pbk of the agent with which the dialogue was kept
+        :param is_self_initiated: whether the agent initiated the dialogue
+        :param is_seller: whether the agent was the seller in the dialogue
+        :param nb_messages: the number of (FIPA) messages exchanged in the dialogue
+        :param last_performative: the performative of the last message exchanged, if any
+        :param is_expired: whether the dialogue was removed before reaching a terminal state
+        :param duration: the seconds between the creation of the dialogue and its last message
 
-class Dialogue(BaseDialogue):
-    """The dialogue class maintains state of a dialogue and manages it."""
-
-    def __init__(self, dialogue_label: DialogueLabel, is_seller: bool) -> None:
+        :return: None
+        """
+        self.dialogue_id = dialogue_id
+        self.dialogue_opponent_pbk = dialogue_opponent_pbk
+        self.is_self_initiated = is_self_initiated
+        self.is_seller = is_seller
+        self.nb_messages = nb_messages
+        self.last_performative = last_performative
+        self.is_expired = is_expired
+        self.duration = duration
+
+
+class Dialogue:
+    """
+    The dialogue class maintains state of a dialogue and manages it.
+
+    Only the state needed to follow the negotiation (the last performatives and message id) is kept,
+    the messages themselves are kept only in debug mode.
+    """
+
+    __slots__ = (
+        "_dialogue_label",
+        "_is_self_initiated",
+        "_is_seller",
+        "_last_outgoing_performative",
+        "_last_performative",
+        "_last_message_id",
+        "_nb_messages",
+        "_created_at",
+        "_last_activity",
+        "_is_terminal",
+        "_outgoing_messages",
+        "_incoming_messages",
+        "_on_end",
+    )
+
+    def __init__(
+        self,
+        dialogue_label: DialogueLabel,
+        is_seller: bool,
+        debug: bool = False,
+        on_end: Optional[Callable[["Dialogue"], None]] = None,
+    ) -> None:
         """
         Initialize a dialogue label.
 
         :param dialogue_label: the identifier of the dialogue
         :param is_seller: indicates whether the agent associated with the dialogue is a seller or buyer
+        :param debug: if True, keep the messages of the dialogue.
+        :param on_end: the function called with the dialogue when it reaches a terminal state, if any.
 
         :return: None
         """
-        BaseDialogue.__init__(self, dialogue_label=dialogue_label)
+        self._dialogue_label = dialogue_label
+        self._is_self_initiated = (
+            dialogue_label.dialogue_opponent_pbk != dialogue_label.dialogue_starter_pbk
+        )
         self._is_seller = is_seller
-        self._role = "seller" if is_seller else "buyer"
-        self._outgoing_messages = []  # type: List[Message]
-        self._outgoing_messages_controller = []  # type: List[Message]
-        self._incoming_messages = []  # type: List[Message]
+        self._last_outgoing_performative = (
+            None
+        )  # type: Optional[FIPAMessage.Performative]
+        self._last_performative = None  # type: Optional[FIPAMessage.Performative]
+        self._last_message_id = None  # type: Optional[int]
+        self._nb_messages = 0
+        self._created_at = time.monotonic()
+        self._last_activity = self._created_at
+        self._is_terminal = False
+        self._outgoing_messages = [] if debug else None  # type: Optional[List[Message]]
+        self._incoming_messages = [] if debug else None  # type: Optional[List[Message]]
+        self._on_end = on_end
 
     @property
     def dialogue_label(self) -> DialogueLabel:
         """Get the dialogue lable."""
         return self._dialogue_label
 
+    @property
+    def is_self_initiated(self) -> bool:
+        """Check whether the agent initiated the dialogue."""
+        return self._is_self_initiated
+
     @property
     def is_seller(self) -> bool:
         """Check whether the agent acts as the seller in this dialogue."""
@@ -81,7 +213,37 @@ class Dialogue(BaseDialogue):
     @property
     def role(self) -> str:
         """Get role of agent in dialogue."""
-        return self._role
+        return "seller" if self._is_seller else "buyer"
+
+    @property
+    def last_outgoing_performative(self) -> Optional[FIPAMessage.Performative]:
+        """Get the performative of the last (FIPA) message sent in the dialogue."""
+        return self._last_outgoing_performative
+
+    @property
+    def last_message_id(self) -> Optional[int]:
+        """Get the id of the last (FIPA) message sent or received in the dialogue."""
+        return self._last_message_id
+
+    @property
+    def last_activity(self) -> float:
+        """Get the time (monotonic clock) of the last message of the dialogue, or of its creation."""
+        return self._last_activity
+
+    @property
+    def is_terminal(self) -> bool:
+        """Check whether the dialogue has ended, i.e. no further message is expected."""
+        return self._is_terminal
+
+    @property
+    def outgoing_messages(self) -> List[Message]:
+        """Get the messages sent in the dialogue (only kept in debug mode)."""
+        return self._outgoing_messages if self._outgoing_messages is not None else []
+
+    @property
+    def incoming_messages(self) -> List[Message]:
+        """Get the messages received in the dialogue (only kept in debug mode)."""
+        return self._incoming_messages if self._incoming_messages is not None else []
 
     def outgoing_extend(self, messages: List[Message]) -> None:
         """
@@ -90,7 +252,12 @@ class Dialogue(BaseDialogue):
         :param messages: a list of messages to be added
         :return: None
         """
-        self._outgoing_messages.extend(messages)
+        if self._outgoing_messages is not None:
+            self._outgoing_messages.extend(messages)
+        for message in messages:
+            performative = self._on_message(message)
+            if performative is not None:
+                self._last_outgoing_performative = performative
 
     def incoming_extend(self, messages: List[Message]) -> None:
         """
@@ -99,7 +266,44 @@ class Dialogue(BaseDialogue):
         :param messages: a list of messages to be added
         :return: None
         """
-        self._incoming_messages.extend(messages)
+        if self._incoming_messages is not None:
+            self._incoming_messages.extend(messages)
+        for message in messages:
+            self._on_message(message)
+
+    def _on_message(self, message: Message) -> Optional[FIPAMessage.Performative]:
+        """
+        Record the activity of the dialogue, and detect its end.
+
+        :param message: the message sent or received
+        :return: the performative of the message, or None if it is not a FIPA message (e.g. to the controller).
+        """
+        self._last_activity = time.monotonic()
+        performative = message.get("performative")
+        if performative is None:
+            return None
+        self._nb_messages += 1
+        self._last_performative = performative
+        self._last_message_id = message.get("id")
+        if performative in TERMINAL_PERFORMATIVES and not self._is_terminal:
+            self._is_terminal = True
+            if self._on_end is not None:
+                self._on_end(self)
+        return performative
+
+    def is_expecting(
+        self, last_outgoing_performative: FIPAMessage.Performative
+    ) -> bool:
+        """
+        Check whether the last message sent in the dialogue has the given performative (and is still answerable).
+
+        :param last_outgoing_performative: the performative
+        :return: True if yes, False otherwise.
+        """
+        return (
+            not self._is_terminal
+            and self._last_outgoing_performative == last_outgoing_performative
+        )
 
     def is_expecting_propose(self) -> bool:
         """
@@ -107,13 +311,7 @@ class Dialogue(BaseDialogue):
 
         :return: True if yes, False otherwise.
         """
-        last_sent_message = (
-            self._outgoing_messages[-1] if len(self._outgoing_messages) > 0 else None
-        )  # type: Optional[Message]
-        result = (last_sent_message is not None) and last_sent_message.get(
-            "performative"
-        ) == FIPAMessage.Performative.CFP
-        return result
+        return self.is_expecting(FIPAMessage.Performative.CFP)
 
     def is_expecting_initial_accept(self) -> bool:
         """
@@ -121,13 +319,7 @@ class Dialogue(BaseDialogue):
 
         :return: True if yes, False otherwise.
         """
-        last_sent_message = (
-            self._outgoing_messages[-1] if len(self._outgoing_messages) > 0 else None
-        )  # type: Optional[Message]
-        result = (last_sent_message is not None) and last_sent_message.get(
-            "performative"
-        ) == FIPAMessage.Performative.PROPOSE
-        return result
+        return self.is_expecting(FIPAMessage.Performative.PROPOSE)
 
     def is_expecting_matching_accept(self) -> bool:
         """
@@ -135,13 +327,7 @@ class Dialogue(BaseDialogue):
 
         :return: True if yes, False otherwise.
         """
-        last_sent_message = (
-            self._outgoing_messages[-1] if len(self._outgoing_messages) > 0 else None
-        )  # type: Optional[Message]
-        result = (last_sent_message is not None) and last_sent_message.get(
-            "performative"
-        ) == FIPAMessage.Performative.ACCEPT
-        return result
+        return self.is_expecting(FIPAMessage.Performative.ACCEPT)
 
     def is_expecting_cfp_decline(self) -> bool:
         """
@@ -149,13 +335,7 @@ class Dialogue(BaseDialogue):
 
         :return: True if yes, False otherwise.
         """
-        last_sent_message = (
-            self._outgoing_messages[-1] if len(self._outgoing_messages) > 0 else None
-        )  # type: Optional[Message]
-        result = (last_sent_message is not None) and last_sent_message.get(
-            "performative"
-        ) == FIPAMessage.Performative.CFP
-        return result
+        return self.is_expecting(FIPAMessage.Performative.CFP)
 
     def is_expecting_propose_decline(self) -> bool:
         """
@@ -163,13 +343,7 @@ class Dialogue(BaseDialogue):
 
         :return: True if yes, False otherwise.
         """
-        last_sent_message = (
-            self._outgoing_messages[-1] if len(self._outgoing_messages) > 0 else None
-        )  # type: Optional[Message]
-        result = (last_sent_message is not None) and last_sent_message.get(
-            "performative"
-        ) == FIPAMessage.Performative.PROPOSE
-        return result
+        return self.is_expecting(FIPAMessage.Performative.PROPOSE)
 
     def is_expecting_accept_decline(self) -> bool:
         """
@@ -177,27 +351,56 @@ class Dialogue(BaseDialogue):
 
         :return: True if yes, False otherwise.
         """
-        last_sent_message = (
-            self._outgoing_messages[-1] if len(self._outgoing_messages) > 0 else None
-        )  # type: Optional[Message]
-        result = (last_sent_message is not None) and last_sent_message.get(
-            "performative"
-        ) == FIPAMessage.Performative.ACCEPT
-        return result
+        return self.is_expecting(FIPAMessage.Performative.ACCEPT)
+
+    def summary(self) -> DialogueSummary:
+        """
+        Get a compact summary of the dialogue.
+
+        :return: the summary
+        """
+        return DialogueSummary(
+            self.dialogue_label.dialogue_id,
+            self.dialogue_label.dialogue_opponent_pbk,
+            self.is_self_initiated,
+            self.is_seller,
+            self._nb_messages,
+            self._last_performative,
+            not self._is_terminal,
+            self._last_activity - self._created_at,
+        )
 
 
 class Dialogues(BaseDialogues):
-    """The dialogues class keeps track of all dialogues."""
+    """
+    The dialogues class keeps track of all dialogues.
+
+    The dialogues which have ended, or have had no message for longer than the timeout, are removed on cleanup.
+    The ended dialogues are collected as they end, and the expiry of the others is scheduled on a timing wheel
+    (and rescheduled from their last activity when it is due), so that the cleanup does not visit every dialogue.
+    """
 
-    def __init__(self) -> None:
+    def __init__(
+        self, dialogue_timeout: float = DEFAULT_DIALOGUE_TIMEOUT, debug: bool = False
+    ) -> None:
         """
         Initialize dialogues.
 
+        :param dialogue_timeout: the seconds without any message after which a dialogue is removed.
+        :param debug: if True, keep the messages of the dialogues.
+
         :return: None
         """
         BaseDialogues.__init__(self)
+        self.dialogue_timeout = dialogue_timeout
+        self.debug = debug
         self._dialogues_as_seller = {}  # type: Dict[DialogueLabel, Dialogue]
         self._dialogues_as_buyer = {}  # type: Dict[DialogueLabel, Dialogue]
+        self._ended = []  # type: List[Dialogue]
+        self._expiry_wheel = TimingWheel(
+            max(dialogue_timeout, 1.0) / DIALOGUE_EXPIRY_WHEEL_NB_SLOTS,
+            DIALOGUE_EXPIRY_WHEEL_NB_SLOTS,
+        )
 
     @property
     def dialogues_as_seller(self) -> Dict[DialogueLabel, Dialogue]:
@@ -237,6 +440,34 @@ class Dialogues(BaseDialogues):
         )
         return result
 
+    def _registered_dialogue(
+        self, message: Message, agent_pbk: Address, sender: Address
+    ) -> Optional[Dialogue]:
+        """
+        Get the registered dialogue of an agent message, if the dialogue is expecting the message.
+
+        :param message: the agent message
+        :param agent_pbk: the public key of the agent
+        :param sender: the sender of the message
+
+        :return: the dialogue, or None
+        """
+        expected_state = EXPECTED_DIALOGUE_STATES.get(
+            (message.get("performative"), message.get("target"))
+        )
+        if expected_state is None:
+            return None
+        is_self_initiated, last_outgoing_performative = expected_state
+        dialogue_label = DialogueLabel(
+            message.get("dialogue_id"),
+            sender,
+            agent_pbk if is_self_initiated else sender,
+        )
+        dialogue = self.dialogues.get(dialogue_label)
+        if dialogue is None or not dialogue.is_expecting(last_outgoing_performative):
+            return None
+        return dialogue
+
     def is_belonging_to_registered_dialogue(
         self, message: Message, agent_pbk: Address, sender: Address
     ) -> bool:
@@ -248,58 +479,7 @@ class Dialogues(BaseDialogues):
 
         :return: boolean indicating whether the message belongs to a registered dialogue
         """
-        dialogue_id = message.get("dialogue_id")
-        opponent = sender
-        target = message.get("target")
-        performative = message.get("performative")
-        self_initiated_dialogue_label = DialogueLabel(dialogue_id, opponent, agent_pbk)
-        other_initiated_dialogue_label = DialogueLabel(dialogue_id, opponent, opponent)
-        result = False
-        if (
-            performative == FIPAMessage.Performative.PROPOSE
-            and target == PROPOSE_TARGET
-            and self_initiated_dialogue_label in self.dialogues
-        ):
-            self_initiated_dialogue = self.dialogues[self_initiated_dialogue_label]
-            result = self_initiated_dialogue.is_expecting_propose()
-        elif performative == FIPAMessage.Performative.ACCEPT:
-            if (
-                target == ACCEPT_TARGET
-                and other_initiated_dialogue_label in self.dialogues
-            ):
-                other_initiated_dialogue = self.dialogues[
-                    other_initiated_dialogue_label
-                ]
-                result = other_initiated_dialogue.is_expecting_initial_accept()
-        elif performative == FIPAMessage.Performative.MATCH_ACCEPT:
-            if (
-                target == MATCH_ACCEPT_TARGET
-                and self_initiated_dialogue_label in self.dialogues
-            ):
-                self_initiated_dialogue = self.dialogues[self_initiated_dialogue_label]
-                result = self_initiated_dialogue.is_expecting_matching_accept()
-        elif performative == FIPAMessage.Performative.DECLINE:
-            if (
-                target == DECLINED_CFP_TARGET
-                and self_initiated_dialogue_label in self.dialogues
-            ):
-                self_initiated_dialogue = self.dialogues[self_initiated_dialogue_label]
-                result = self_initiated_dialogue.is_expecting_cfp_decline()
-            elif (
-                target == DECLINED_PROPOSE_TARGET
-                and other_initiated_dialogue_label in self.dialogues
-            ):
-                other_initiated_dialogue = self.dialogues[
-                    other_initiated_dialogue_label
-                ]
-                result = other_initiated_dialogue.is_expecting_propose_decline()
-            elif (
-                target == DECLINED_ACCEPT_TARGET
-                and self_initiated_dialogue_label in self.dialogues
-            ):
-                self_initiated_dialogue = self.dialogues[self_initiated_dialogue_label]
-                result = self_initiated_dialogue.is_expecting_accept_decline()
-        return result
+        return self._registered_dialogue(message, agent_pbk, sender) is not None
 
     def get_dialogue(
         self, message: Message, sender: Address, agent_pbk: Address
@@ -312,53 +492,8 @@ class Dialogues(BaseDialogues):
 
         :return: the dialogue
         """
-        dialogue_id = message.get("dialogue_id")
-        opponent = sender
-        target = message.get("target")
-        performative = message.get("performative")
-        self_initiated_dialogue_label = DialogueLabel(dialogue_id, opponent, agent_pbk)
-        other_initiated_dialogue_label = DialogueLabel(dialogue_id, opponent, opponent)
-        if (
-            performative == FIPAMessage.Performative.PROPOSE
-            and target == PROPOSE_TARGET
-            and self_initiated_dialogue_label in self.dialogues
-        ):
-            dialogue = self.dialogues[self_initiated_dialogue_label]
-        elif performative == FIPAMessage.Performative.ACCEPT:
-            if (
-                target == ACCEPT_TARGET
-                and other_initiated_dialogue_label in self.dialogues
-            ):
-                dialogue = self.dialogues[other_initiated_dialogue_label]
-            else:
-                raise ValueError("Should have found dialogue.")
-        elif performative == FIPAMessage.Performative.MATCH_ACCEPT:
-            if (
-                target == MATCH_ACCEPT_TARGET
-                and self_initiated_dialogue_label in self.dialogues
-            ):
-                dialogue = self.dialogues[self_initiated_dialogue_label]
-            else:
-                raise ValueError("Should have found dialogue.")
-        elif performative == FIPAMessage.Performative.DECLINE:
-            if (
-                target == DECLINED_CFP_TARGET
-                and self_initiated_dialogue_label in self.dialogues
-            ):
-                dialogue = self.dialogues[self_initiated_dialogue_label]
-            elif (
-                target == DECLINED_PROPOSE_TARGET
-                and other_initiated_dialogue_label in self.dialogues
-            ):
-                dialogue = self.dialogues[other_initiated_dialogue_label]
-            elif (
-                target == DECLINED_ACCEPT_TARGET
-                and self_initiated_dialogue_label in self.dialogues
-            ):
-                dialogue = self.dialogues[self_initiated_dialogue_label]
-            else:
-                raise ValueError("Should have found dialogue.")
-        else:
+        dialogue = self._registered_dialogue(message, agent_pbk, sender)
+        if dialogue is None:
             raise ValueError("Should have found dialogue.")
         return dialogue
 
@@ -412,7 +547,7 @@ class Dialogues(BaseDialogues):
         :return: the created dialogue
         """
         assert dialogue_label not in self.dialogues
-        dialogue = Dialogue(dialogue_label, is_seller)
+        dialogue = Dialogue(dialogue_label, is_seller, self.debug, self._ended.append)
         if is_seller:
             assert dialogue_label not in self.dialogues_as_seller
             self._dialogues_as_seller.update({dialogue_label: dialogue})
@@ -420,4 +555,58 @@ class Dialogues(BaseDialogues):
             assert dialogue_label not in self.dialogues_as_buyer
             self._dialogues_as_buyer.update({dialogue_label: dialogue})
         self.dialogues.update({dialogue_label: dialogue})
+        self._expiry_wheel.schedule(
+            dialogue_label, dialogue.last_activity + self.dialogue_timeout
+        )
         return dialogue
+
+    def cleanup(self, now: Optional[float] = None) -> List[Dialogue]:
+        """
+        Remove the dialogues which have ended or expired.
+
+        :param now: the current time (monotonic clock). If None, it is read from the clock.
+
+        :return: the removed dialogues
+        """
+        now = time.monotonic() if now is None else now
+        removed = []  # type: List[Dialogue]
+        ended = list(self._ended)
+        self._ended.clear()
+        for dialogue in ended:
+            if self.dialogues.get(dialogue.dialogue_label) is dialogue:
+                self._remove(dialogue)
+                removed.append(dialogue)
+        for dialogue_label in self._expiry_wheel.advance(now):
+            dialogue = self.dialogues[dialogue_label]
+            deadline = dialogue.last_activity + self.dialogue_timeout
+            if deadline < now:
+                self._remove(dialogue)
+                removed.append(dialogue)
+            else:
+                # the dialogue had some activity since its expiry was scheduled.
+                self._expiry_wheel.schedule(dialogue_label, deadline)
+        return removed
+
+    def _remove(self, dialogue: Dialogue) -> None:
+        """
+        Remove a dialogue from all the indexes.
+
+        :param dialogue: the dialogue
+
+        :return: None
+        """
+        dialogue_label = dialogue.dialogue_label
+        del self.dialogues[dialogue_label]
+        self._expiry_wheel.cancel(dialogue_label)
+        if dialogue.is_seller:
+            del self._dialogues_as_seller[dialogue_label]
+        else:
+            del self._dialogues_as_buyer[dialogue_label]
+        logger.debug(
+            "Removing dialogue (as {}): dialogue_id={}, opponent={}, expired={}".format(
+                dialogue.role,
+                dialogue_label.dialogue_id,
+                dialogue_label.dialogue_opponent_pbk,
+                not dialogue.is_terminal,
+            )
+        )
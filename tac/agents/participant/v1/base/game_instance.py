@@ -22,37 +22,76 @@
 
 import datetime
 import random
-from typing import Any, List, Optional, Set, Tuple, Dict, Union, Sequence, cast
+import time
+from enum import Enum
+from typing import List, Optional, Set, Tuple, Dict, Union, Sequence
+
+import numpy as np
 
 from aea.channels.oef.connection import MailStats
 from aea.mail.base import Address
 from aea.protocols.oef.models import Description, Query
 
-from tac.agents.participant.v1.base.dialogues import Dialogues, Dialogue
+from tac.agents.participant.v1.base.dialogues import (
+    DEFAULT_DIALOGUE_TIMEOUT,
+    Dialogues,
+    Dialogue,
+)
 from tac.agents.participant.v1.base.helpers import (
+    CFPServices,
     build_dict,
     build_query,
     get_goods_quantities_description,
+    get_unit_proposal_description,
 )
 from tac.agents.participant.v1.base.states import AgentState, WorldState
 from tac.agents.participant.v1.base.stats_manager import StatsManager
 from tac.agents.participant.v1.base.strategy import Strategy
+from tac.agents.participant.v1.base.timing_wheel import TimingWheel
 from tac.agents.participant.v1.base.transaction_manager import TransactionManager
 from tac.gui.dashboards.agent import AgentDashboard
 from tac.platform.game.base import GamePhase, GameConfiguration
 from tac.platform.game.base import GameData, Transaction
 from tac.platform.protocols.tac.message import TACMessage
+from tac.platform.protocols.tac.serialization import TACSerializer
+
+# the ids of the goods proposed and the prices of the unit proposals, or the proposals.
+CandidateProposals = Union[Tuple[np.ndarray, np.ndarray], List[Description]]
+
+
+DEFAULT_SEARCH_TIMEOUT = 60.0
+SEARCH_EXPIRY_WHEEL_NB_SLOTS = 16
+
+
+class SearchTarget(Enum):
+    """This class defines what a search is for."""
+
+    TAC = "tac"
+    SELLERS = "sellers"
+    BUYERS = "buyers"
 
 
 class Search:
-    """This class deals with the search state."""
+    """
+    This class deals with the search state.
 
-    def __init__(self):
-        """Instantiate the search class."""
+    Only the outstanding searches are kept, i.e. those whose result has not been received yet.
+    A search expires when its result is not received within the search timeout.
+    """
+
+    def __init__(self, search_timeout: float = DEFAULT_SEARCH_TIMEOUT):
+        """
+        Instantiate the search class.
+
+        :param search_timeout: the seconds after which a search without result expires.
+        """
         self._id = 0
-        self.ids_for_tac = set()  # type: Set[int]
-        self.ids_for_sellers = set()  # type: Set[int]
-        self.ids_for_buyers = set()  # type: Set[int]
+        self.search_timeout = search_timeout
+        self._outstanding = {}  # type: Dict[int, Tuple[SearchTarget, float]]
+        self._expiry_wheel = TimingWheel(
+            search_timeout / SEARCH_EXPIRY_WHEEL_NB_SLOTS, SEARCH_EXPIRY_WHEEL_NB_SLOTS
+        )
+        self.nb_expired = 0
 
     @property
     def id(self) -> int:
@@ -68,6 +107,68 @@ class Search:
         self._id += 1
         return self._id
 
+    @property
+    def nb_outstanding(self) -> int:
+        """Get the number of outstanding searches."""
+        return len(self._outstanding)
+
+    def add(
+        self, search_id: int, target: SearchTarget, now: Optional[float] = None
+    ) -> None:
+        """
+        Register a search which has been issued.
+
+        :param search_id: the search id.
+        :param target: what the search is for.
+        :param now: the current time (monotonic clock). If None, it is read from the clock.
+
+        :return: None
+        """
+        now = time.monotonic() if now is None else now
+        self._outstanding[search_id] = (target, now)
+        self._expiry_wheel.schedule(search_id, now + self.search_timeout)
+
+    def pop(
+        self, search_id: int, now: Optional[float] = None
+    ) -> Optional[Tuple[SearchTarget, float]]:
+        """
+        Remove an outstanding search, when its result is received.
+
+        >>> search = Search()
+        >>> search_id = search.get_next_id()
+        >>> search.add(search_id, SearchTarget.SELLERS, now=1.0)
+        >>> search.pop(search_id, now=1.5)
+        (<SearchTarget.SELLERS: 'sellers'>, 0.5)
+        >>> search.pop(search_id) is None
+        True
+
+        :param search_id: the search id.
+        :param now: the current time (monotonic clock). If None, it is read from the clock.
+
+        :return: what the search is for and its latency in seconds, or None if the search is unknown or has expired.
+        """
+        outstanding = self._outstanding.pop(search_id, None)
+        if outstanding is None:
+            return None
+        self._expiry_wheel.cancel(search_id)
+        target, issued_at = outstanding
+        now = time.monotonic() if now is None else now
+        return target, now - issued_at
+
+    def cleanup(self, now: Optional[float] = None) -> int:
+        """
+        Remove the searches whose result has not been received within the search timeout.
+
+        :param now: the current time (monotonic clock). If None, it is read from the clock.
+
+        :return: the number of expired searches.
+        """
+        expired = self._expiry_wheel.advance(now)
+        for search_id in expired:
+            self._outstanding.pop(search_id, None)
+        self.nb_expired += len(expired)
+        return len(expired)
+
 
 class GameInstance:
     """The GameInstance maintains state of the game from the agent's perspective."""
@@ -81,6 +182,9 @@ class GameInstance:
         services_interval: int = 10,
         pending_transaction_timeout: int = 10,
         dashboard: Optional[AgentDashboard] = None,
+        dialogue_timeout: float = DEFAULT_DIALOGUE_TIMEOUT,
+        archive_dialogues: bool = False,
+        debug: bool = False,
     ) -> None:
         """
         Instantiate a game instance.
@@ -92,16 +196,22 @@ class GameInstance:
         :param services_interval: the interval at which services are updated.
         :param pending_transaction_timeout: the timeout after which transactions are removed from the lock manager.
         :param dashboard: the agent dashboard.
+        :param dialogue_timeout: the seconds without any message after which a dialogue is removed.
+        :param archive_dialogues: whether to archive a summary of the removed dialogues in the stats manager.
+        :param debug: if True, keep the messages of the dialogues.
 
         :return: None
         """
         self.agent_name = agent_name
         self.controller_pbk = None  # type: Optional[str]
+        # the messages to the controller name the game, as it may host several games.
+        self.tac_serializer = TACSerializer(version_id=expected_version_id)
 
         self._strategy = strategy
 
         self._search = Search()
-        self._dialogues = Dialogues()
+        self._dialogues = Dialogues(dialogue_timeout, debug)
+        self._archive_dialogues = archive_dialogues
 
         self._game_phase = GamePhase.PRE_GAME
 
@@ -125,6 +235,10 @@ class GameInstance:
         )
 
         self.stats_manager = StatsManager(mail_stats, dashboard)
+        # the candidate proposals of each role, with the version of the state after the locks they were generated from.
+        self._candidate_proposals = (
+            {}
+        )  # type: Dict[bool, Tuple[int, CandidateProposals]]
 
         self.dashboard = dashboard
         if self.dashboard is not None:
@@ -140,8 +254,9 @@ class GameInstance:
 
         :return: None
         """
-        # TODO: extend TAC messages to include reference to version id; then replace below with assert
-        game_data.version_id = self.expected_version_id
+        if game_data.version_id is None:
+            # the controller does not send the version id of its game.
+            game_data.version_id = self.expected_version_id
         self._game_configuration = GameConfiguration(
             game_data.version_id,
             game_data.nb_agents,
@@ -156,6 +271,9 @@ class GameInstance:
         self._agent_state = AgentState(
             game_data.money, game_data.endowment, game_data.utility_params
         )
+        self.transaction_manager.init_states_after_locks(
+            self._agent_state, game_data.tx_fee
+        )
         if self.strategy.is_world_modeling:
             opponent_pbks = self.game_configuration.agent_pbks
             opponent_pbks.remove(agent_pbk)
@@ -176,8 +294,10 @@ class GameInstance:
         """
         self.init(message.get("initial_state"), agent_pbk)
         self._game_phase = GamePhase.GAME
+        tx_fee = message.get("initial_state").get("tx_fee")
         for tx in message.get("transactions"):
-            self.agent_state.update(tx, message.get("initial_state").get("tx_fee"))
+            self.agent_state.update(tx, tx_fee)
+        self.transaction_manager.init_states_after_locks(self.agent_state, tx_fee)
 
     @property
     def expected_version_id(self) -> str:
@@ -361,9 +481,7 @@ class GameInstance:
         return res
 
     def is_matching(
-        self,
-        cfp_services: Dict[str, Union[bool, List[Any]]],
-        goods_description: Description,
+        self, cfp_services: CFPServices, goods_description: Description
     ) -> bool:
         """
         Check for a match between the CFP services and the goods description.
@@ -373,16 +491,12 @@ class GameInstance:
 
         :return: Bool
         """
-        services = cfp_services["services"]
-        services = cast(List[Any], services)
-        if cfp_services["description"] is goods_description.data_model.name:
+        if cfp_services.description == goods_description.data_model.name:
             # The call for proposal description and the goods model name cannot be the same for trading agent pairs.
             return False
-        for good_pbk in goods_description.data_model.attributes_by_name.keys():
-            if good_pbk not in services:
-                continue
-            return True
-        return False
+        return not cfp_services.services.isdisjoint(
+            goods_description.data_model.attributes_by_name
+        )
 
     def get_goods_pbks(self, is_supply: bool) -> Set[str]:
         """
@@ -424,27 +538,20 @@ class GameInstance:
 
     def state_after_locks(self, is_seller: bool) -> AgentState:
         """
-        Apply all the locks to the current state of the agent.
+        Get the current state of the agent with all the locks applied.
 
         This assumes, that all the locked transactions will be successful.
+        The state is maintained by the transaction manager as the locks change, hence it must not be modified.
 
         :param is_seller: Boolean indicating the role of the agent.
 
         :return: the agent state with the locks applied to current state
         """
         assert self._agent_state is not None, "Agent state not assigned!"
-        transactions = (
-            list(self.transaction_manager.locked_txs_as_seller.values())
-            if is_seller
-            else list(self.transaction_manager.locked_txs_as_buyer.values())
-        )
-        state_after_locks = self._agent_state.apply(
-            transactions, self.game_configuration.tx_fee
-        )
-        return state_after_locks
+        return self.transaction_manager.state_after_locks(is_seller)
 
     def generate_proposal(
-        self, cfp_services: Dict[str, Union[bool, List[Any]]], is_seller: bool
+        self, cfp_services: CFPServices, is_seller: bool
     ) -> Optional[Description]:
         """
         Wrap the function which generates proposals from a seller or buyer.
@@ -456,8 +563,53 @@ class GameInstance:
 
         :return: a list of descriptions
         """
+        candidates = self._get_candidate_proposals(is_seller)
+        if isinstance(candidates, tuple):
+            good_ids, prices = candidates
+            if len(good_ids) == 0:
+                return None
+            good_id = int(random.choice(good_ids))
+            proposal = get_unit_proposal_description(
+                self.game_configuration.good_pbks,
+                good_id,
+                float(prices[good_id]),
+                is_supply=is_seller,
+            )
+            # the unit proposals share the data model of the goods, hence they all match the CFP, or none does.
+            return proposal if self.is_matching(cfp_services, proposal) else None
+
+        proposals = [
+            proposal
+            for proposal in candidates
+            if self.is_matching(cfp_services, proposal)
+        ]
+        if not proposals:
+            return None
+        else:
+            return random.choice(proposals)
+
+    def _get_candidate_proposals(self, is_seller: bool) -> CandidateProposals:
+        """
+        Get the candidate proposals of a role, whatever the CFP.
+
+        They are cached until the state after the locks of the role changes, unless the agent models the world
+        (its prices are sampled for every proposal).
+
+        :param is_seller: Boolean indicating the role of the agent.
+
+        :return: the ids of the goods proposed and the prices of the unit proposals of all the goods, if the strategy generates unit proposals; the proposals with a positive price otherwise.
+        """
+        is_cached = not self.strategy.is_world_modeling
+        version = self.transaction_manager.state_version(is_seller)
+        if is_cached:
+            cached = self._candidate_proposals.get(is_seller)
+            is_hit = cached is not None and cached[0] == version
+            self.stats_manager.add_proposal_cache_lookup(is_seller, is_hit)
+            if is_hit:
+                return cached[1]
+
         state_after_locks = self.state_after_locks(is_seller=is_seller)
-        candidate_proposals = self.strategy.get_proposals(
+        args = (
             self.game_configuration.good_pbks,
             state_after_locks.current_holdings,
             state_after_locks.utility_params,
@@ -465,17 +617,32 @@ class GameInstance:
             is_seller,
             self._world_state,
         )
-        proposals = []
-        for proposal in candidate_proposals:
-            if not self.is_matching(cfp_services, proposal):
-                continue
-            if not proposal.values["price"] > 0:
-                continue
-            proposals.append(proposal)
-        if not proposals:
-            return None
+        prices = self.strategy.get_unit_proposal_prices(*args)
+        if prices is not None:
+            candidates = (
+                np.flatnonzero(prices > 0),
+                prices,
+            )  # type: CandidateProposals
         else:
-            return random.choice(proposals)
+            candidates = [
+                proposal
+                for proposal in self.strategy.get_proposals(*args)
+                if proposal.values["price"] > 0
+            ]
+        if is_cached:
+            self._candidate_proposals[is_seller] = (version, candidates)
+        return candidates
+
+    def cleanup_dialogues(self) -> None:
+        """
+        Remove the dialogues which have ended or expired, together with their pending proposals and acceptances.
+
+        :return: None
+        """
+        for dialogue in self.dialogues.cleanup():
+            self.transaction_manager.discard_pending(dialogue.dialogue_label)
+            if self._archive_dialogues:
+                self.stats_manager.archive_dialogue(dialogue.summary())
 
     def stop(self):
         """Stop the services attached to the game instance."""
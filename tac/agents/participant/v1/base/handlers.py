@@ -31,7 +31,7 @@ from typing import Any
 
 from aea.agent import Liveness
 from aea.crypto.base import Crypto
-from aea.mail.base import MailBox, Envelope
+from aea.mail.base import Address, MailBox, Envelope
 from aea.protocols.base.message import Message
 from aea.protocols.fipa.serialization import FIPASerializer
 from aea.protocols.oef.message import OEFMessage
@@ -49,7 +49,6 @@ from tac.agents.participant.v1.base.reactions import (
 )
 from tac.platform.game.base import GamePhase
 from tac.platform.protocols.tac.message import TACMessage
-from tac.platform.protocols.tac.serialization import TACSerializer
 
 logger = logging.getLogger(__name__)
 
@@ -143,13 +142,33 @@ class ControllerHandler(ControllerActions, ControllerReactions):
         Handle messages from the controller.
 
         The controller does not expect a response for any of these messages.
+        The messages of a BATCH message are handled in order, as if they came in their own envelope.
 
         :param envelope: the controller message
 
         :return: None
         """
         assert envelope.protocol_id == "tac"
-        tac_msg = TACSerializer().decode(envelope.message)
+        tac_msg = self.game_instance.tac_serializer.decode_lazy(envelope.message)
+        if TACMessage.Type(tac_msg.get("type")) != TACMessage.Type.BATCH:
+            self._handle_controller_tac_message(tac_msg, envelope.sender)
+            return
+        for tac_bytes in tac_msg.get("messages"):
+            # the serializer changes when the game data is received.
+            inner_msg = self.game_instance.tac_serializer.decode_lazy(tac_bytes)
+            self._handle_controller_tac_message(inner_msg, envelope.sender)
+
+    def _handle_controller_tac_message(
+        self, tac_msg: TACMessage, sender: Address
+    ) -> None:
+        """
+        Handle a TAC message from the controller.
+
+        :param tac_msg: the message.
+        :param sender: the public key of the sender.
+
+        :return: None
+        """
         tac_msg_type = TACMessage.Type(tac_msg.get("type"))
         logger.debug(
             "[{}]: Handling controller response. type={}".format(
@@ -157,29 +176,29 @@ class ControllerHandler(ControllerActions, ControllerReactions):
             )
         )
         try:
-            if envelope.sender != self.game_instance.controller_pbk:
+            if sender != self.game_instance.controller_pbk:
                 raise ValueError(
                     "The sender of the message is not the controller agent we registered with."
                 )
 
             if tac_msg_type == TACMessage.Type.TAC_ERROR:
-                self.on_tac_error(tac_msg, envelope.sender)
+                self.on_tac_error(tac_msg, sender)
             elif self.game_instance.game_phase == GamePhase.PRE_GAME:
                 raise ValueError(
                     "We do not expect a controller agent message in the pre game phase."
                 )
             elif self.game_instance.game_phase == GamePhase.GAME_SETUP:
                 if tac_msg_type == TACMessage.Type.GAME_DATA:
-                    self.on_start(tac_msg, envelope.sender)
+                    self.on_start(tac_msg, sender)
                 elif tac_msg_type == TACMessage.Type.CANCELLED:
                     self.on_cancelled()
             elif self.game_instance.game_phase == GamePhase.GAME:
                 if tac_msg_type == TACMessage.Type.TRANSACTION_CONFIRMATION:
-                    self.on_transaction_confirmed(tac_msg, envelope.sender)
+                    self.on_transaction_confirmed(tac_msg, sender)
                 elif tac_msg_type == TACMessage.Type.CANCELLED:
                     self.on_cancelled()
                 elif tac_msg_type == TACMessage.Type.STATE_UPDATE:
-                    self.on_state_update(tac_msg, envelope.sender)
+                    self.on_state_update(tac_msg, sender)
             elif self.game_instance.game_phase == GamePhase.POST_GAME:
                 raise ValueError(
                     "We do not expect a controller agent message in the post game phase."
@@ -19,8 +19,10 @@
 # ------------------------------------------------------------------------------
 
 """This module contains helper methods for base agent implementations."""
+import functools
+import json
 import logging
-from typing import Dict, List, Set, Sequence
+from typing import Dict, FrozenSet, List, Set, Sequence
 
 from aea.helpers.dialogue.base import DialogueLabel
 from aea.mail.base import Address
@@ -37,6 +39,8 @@ from oef.query import GtEq
 
 logger = logging.getLogger(__name__)
 
+CFP_QUERY_CACHE_SIZE = 1024
+
 
 TAC_SUPPLY_DATAMODEL_NAME = "tac_supply"
 TAC_DEMAND_DATAMODEL_NAME = "tac_demand"
@@ -187,6 +191,70 @@ def build_query(good_pbks: Set[str], is_searching_for_sellers: bool) -> Query:
     return query
 
 
+def get_unit_proposal_description(
+    good_pbks: List[str], good_id: int, price: float, is_supply: bool
+) -> Description:
+    """
+    Get the TAC description of a proposal of a single unit of a good.
+
+    >>> desc = get_unit_proposal_description(['tac_good_0', 'tac_good_1'], 1, 2.5, True)
+    >>> desc.values == {"tac_good_0": 0, "tac_good_1": 1, "price": 2.5}
+    True
+
+    :param good_pbks: the public keys of the goods.
+    :param good_id: the index of the good proposed.
+    :param price: the price of the proposal.
+    :param is_supply: True if the proposal is from a seller, False if it is from a buyer.
+
+    :return: the description of the proposal.
+    """
+    quantities = [0] * len(good_pbks)
+    quantities[good_id] = 1
+    desc = get_goods_quantities_description(good_pbks, quantities, is_supply=is_supply)
+    desc.values["price"] = price
+    return desc
+
+
+class CFPServices:
+    """The services called for in a CFP: the name of the data model of the goods, and their public keys."""
+
+    __slots__ = ("description", "services")
+
+    def __init__(self, description: str, services: FrozenSet[str]) -> None:
+        """
+        Initialize the services of a CFP.
+
+        :param description: the name of the data model of the goods, i.e. whether they are supplied or demanded.
+        :param services: the public keys of the goods.
+
+        :return: None
+        """
+        self.description = description
+        self.services = services
+
+
+@functools.lru_cache(maxsize=CFP_QUERY_CACHE_SIZE)
+def parse_cfp_query(query: bytes) -> CFPServices:
+    """
+    Parse the query of a CFP, i.e. a services dictionary (see build_dict) in JSON.
+
+    The agents receive the same few queries from many opponents, hence the parsed queries are interned by their bytes.
+
+    >>> query = b'{"description": "tac_demand", "services": ["tac_good_0", "tac_good_1"]}'
+    >>> cfp_services = parse_cfp_query(query)
+    >>> cfp_services.description, sorted(cfp_services.services)
+    ('tac_demand', ['tac_good_0', 'tac_good_1'])
+    >>> parse_cfp_query(query) is cfp_services
+    True
+
+    :param query: the query of the CFP.
+
+    :return: the services of the CFP. They are shared, hence they must not be modified.
+    """
+    services = json.loads(query.decode("utf-8"))
+    return CFPServices(services["description"], frozenset(services["services"]))
+
+
 def build_dict(good_pbks: Set[str], is_supply: bool) -> Dict[str, Sequence[str]]:
     """
     Build supply or demand services dictionary.
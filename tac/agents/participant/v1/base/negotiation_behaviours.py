@@ -20,7 +20,6 @@
 
 """This module contains a class which implements the FIPA protocol for the TAC."""
 
-import json
 import logging
 import pprint
 from typing import List, cast
@@ -34,11 +33,13 @@ from aea.protocols.fipa.serialization import FIPASerializer
 from aea.protocols.oef.models import Description
 from tac.agents.participant.v1.base.dialogues import Dialogue
 from tac.agents.participant.v1.base.game_instance import GameInstance
-from tac.agents.participant.v1.base.helpers import generate_transaction_id
+from tac.agents.participant.v1.base.helpers import (
+    generate_transaction_id,
+    parse_cfp_query,
+)
 from tac.agents.participant.v1.base.stats_manager import EndState
 from tac.platform.game.base import Transaction
 from tac.platform.protocols.tac.message import TACMessage
-from tac.platform.protocols.tac.serialization import TACSerializer
 
 logger = logging.getLogger(__name__)
 
@@ -94,7 +95,7 @@ class FIPABehaviour:
         )
         new_msg_id = cfp.get("id") + 1
         decline = False
-        cfp_services = json.loads(cfp.get("query").decode("utf-8"))
+        cfp_services = parse_cfp_query(cfp.get("query"))
         if not self.game_instance.is_matching(cfp_services, goods_description):
             decline = True
             logger.debug(
@@ -187,7 +188,6 @@ class FIPABehaviour:
                 proposal=[proposal],
             )
             dialogue.outgoing_extend([msg])
-            dialogue.outgoing_extend([msg])
             msg_bytes = FIPASerializer().encode(msg)
             response = Envelope(
                 to=dialogue.dialogue_label.dialogue_opponent_pbk,
@@ -380,7 +380,7 @@ class FIPABehaviour:
                 quantities_by_good_pbk=transaction.quantities_by_good_pbk,
             )
             dialogue.outgoing_extend([tac_msg])
-            tac_bytes = TACSerializer().encode(tac_msg)
+            tac_bytes = self.game_instance.tac_serializer.encode(tac_msg)
             results.append(
                 Envelope(
                     to=self.game_instance.controller_pbk,
@@ -475,7 +475,7 @@ class FIPABehaviour:
             quantities_by_good_pbk=transaction.quantities_by_good_pbk,
         )
         dialogue.outgoing_extend([tac_msg])
-        tac_bytes = TACSerializer().encode(tac_msg)
+        tac_bytes = self.game_instance.tac_serializer.encode(tac_msg)
         results.append(
             Envelope(
                 to=self.game_instance.controller_pbk,
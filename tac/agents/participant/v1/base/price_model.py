@@ -18,54 +18,75 @@
 #
 # ------------------------------------------------------------------------------
 
-"""A module containing a simple price model."""
+"""
+A module containing a simple price model.
 
-import numpy as np
+The price of every good is modelled by a multi-armed bandit over a grid of prices, with a beta distribution per arm,
+and expectations are drawn by Thompson sampling. The parameters of the beta distributions of all the goods are held in
+two arrays, so that the arms of a good, or of several goods, are sampled in a single draw.
+"""
 
+from typing import Dict, List, Optional
 
-class PriceBandit(object):
-    """A class for a multi-armed bandit model of price."""
+import numpy as np
 
-    def __init__(self, price: float, beta_a: float = 1.0, beta_b: float = 1.0):
-        """
-        Instantiate a price bandit object.
+from aea.mail.base import Address
+
+PRICE_GRID = np.arange(201) / 10  # the prices 0.0, 0.1, ..., 20.0
+DEFAULT_PRICE = (
+    20.0  # the price expected when no price of the grid satisfies the constraint
+)
+
+
+def _price_index(price: float) -> int:
+    """
+    Get the index of a price in the price grid.
+
+    :param price: the price, rounded to the first decimal
+    :return: the index
+    :raises KeyError: if the price is not in the grid
+    """
+    index = int(round(price * 10))
+    if not (0 <= index < len(PRICE_GRID) and abs(PRICE_GRID[index] - price) < 1e-9):
+        raise KeyError(price)
+    return index
+
+
+def _sample_price_expectations(
+    beta_a: np.ndarray, beta_b: np.ndarray, constraints: np.ndarray, is_seller: bool
+) -> np.ndarray:
+    """
+    Draw the best prices of several goods, given a constraint for every good.
+
+    :param beta_a: the a parameters of the beta distributions, one row per good
+    :param beta_b: the b parameters of the beta distributions, one row per good
+    :param constraints: the constraints on the prices, one per good
+    :param is_seller: indicating whether the agent is a buyer or seller
+    :return: the winning prices, one per good
+    """
+    constraints = np.asarray(constraints, dtype=float).reshape(-1, 1)
+    # a seller only considers the prices above her constraint, a buyer the ones below.
+    mask = PRICE_GRID > constraints if is_seller else PRICE_GRID < constraints
+    samples = np.full(mask.shape, -1.0)
+    samples[mask] = np.random.beta(beta_a[mask], beta_b[mask])
+    winning_prices = PRICE_GRID[np.argmax(samples, axis=1)]
+    return np.where(mask.any(axis=1), winning_prices, DEFAULT_PRICE)
 
-        :param price: the price this bandit is modelling
-        :param beta_a: the a parameter of the beta distribution
-        :param beta_b: the b parameter of the beta distribution
-        """
-        self.price = price
-        # default params imply a uniform random prior
-        self.beta_a = beta_a
-        self.beta_b = beta_b
 
-    def sample(self) -> float:
-        """
-        Sample from the bandit.
-
-        :return: the sampled value
-        """
-        return np.random.beta(self.beta_a, self.beta_b)
+class GoodPriceModel(object):
+    """A class for a price model of a good: a bandit for every price of the price grid."""
 
-    def update(self, outcome: bool) -> None:
+    def __init__(
+        self, beta_a: Optional[np.ndarray] = None, beta_b: Optional[np.ndarray] = None
+    ):
         """
-        Update the bandit.
+        Instantiate a good price model.
 
-        :param outcome: the outcome used for updating
-        :return: None
+        :param beta_a: the a parameters of the beta distributions of the prices (by default, a uniform random prior)
+        :param beta_b: the b parameters of the beta distributions of the prices (by default, a uniform random prior)
         """
-        self.beta_a += outcome
-        self.beta_b += 1 - outcome
-
-
-class GoodPriceModel(object):
-    """A class for a price model of a good."""
-
-    def __init__(self):
-        """Instantiate a good price model."""
-        self.price_bandits = dict(
-            (price, PriceBandit(price)) for price in [i / 10 for i in range(201)]
-        )
+        self.beta_a = np.ones(len(PRICE_GRID)) if beta_a is None else beta_a
+        self.beta_b = np.ones(len(PRICE_GRID)) if beta_b is None else beta_b
 
     def update(self, outcome: bool, price: float) -> None:
         """
@@ -75,8 +96,9 @@ class GoodPriceModel(object):
         :param outcome: the negotiation outcome
         :return: None
         """
-        bandit = self.price_bandits[price]
-        bandit.update(outcome)
+        index = _price_index(price)
+        self.beta_a[index] += outcome
+        self.beta_b[index] += 1 - outcome
 
     def get_price_expectation(self, constraint: float, is_seller: bool) -> float:
         """
@@ -86,15 +108,48 @@ class GoodPriceModel(object):
         :param is_seller: indicating whether the agent is a buyer or seller
         :return: the winning price
         """
-        maxsample = -1
-        winning_price = 20.0
-        for price, bandit in self.price_bandits.items():
-            if (is_seller and price <= constraint) or (
-                not is_seller and price >= constraint
-            ):
-                continue
-            sample = bandit.sample()
-            if sample > maxsample:
-                maxsample = sample
-                winning_price = price
-        return winning_price
+        return float(
+            _sample_price_expectations(
+                self.beta_a[np.newaxis],
+                self.beta_b[np.newaxis],
+                np.array([constraint]),
+                is_seller,
+            )[0]
+        )
+
+
+class GoodPriceModels(object):
+    """A class for the price models of several goods, which are sampled together."""
+
+    def __init__(self, good_pbks: List[Address]):
+        """
+        Instantiate the price models of the goods.
+
+        :param good_pbks: the public keys of the goods
+        """
+        self._good_ids = {
+            good_pbk: good_id for good_id, good_pbk in enumerate(good_pbks)
+        }  # type: Dict[Address, int]
+        self.beta_a = np.ones((len(good_pbks), len(PRICE_GRID)))
+        self.beta_b = np.ones((len(good_pbks), len(PRICE_GRID)))
+        # the model of every good is a view on its rows.
+        self.models = {
+            good_pbk: GoodPriceModel(self.beta_a[good_id], self.beta_b[good_id])
+            for good_pbk, good_id in self._good_ids.items()
+        }  # type: Dict[Address, GoodPriceModel]
+
+    def get_price_expectations(
+        self, good_pbks: List[Address], constraints: List[float], is_seller: bool
+    ) -> np.ndarray:
+        """
+        Get the best prices of several goods (given a constraint for every good).
+
+        :param good_pbks: the public keys of the goods
+        :param constraints: the constraints on the prices, one per good
+        :param is_seller: indicating whether the agent is a buyer or seller
+        :return: the winning prices, one per good
+        """
+        good_ids = [self._good_ids[good_pbk] for good_pbk in good_pbks]
+        return _sample_price_expectations(
+            self.beta_a[good_ids], self.beta_b[good_ids], constraints, is_seller
+        )
@@ -39,9 +39,14 @@ from aea.protocols.default.serialization import DefaultSerializer
 from aea.protocols.fipa.message import FIPAMessage
 from aea.protocols.fipa.serialization import FIPASerializer
 from tac.agents.participant.v1.base.dialogues import Dialogue
-from tac.agents.participant.v1.base.game_instance import GameInstance, GamePhase
+from tac.agents.participant.v1.base.game_instance import (
+    GameInstance,
+    GamePhase,
+    SearchTarget,
+)
 from tac.agents.participant.v1.base.helpers import (
     dialogue_label_from_transaction_id,
+    parse_cfp_query,
     TAC_DEMAND_DATAMODEL_NAME,
 )
 from tac.agents.participant.v1.base.interfaces import (
@@ -52,8 +57,13 @@ from tac.agents.participant.v1.base.interfaces import (
 from tac.agents.participant.v1.base.negotiation_behaviours import FIPABehaviour
 from tac.agents.participant.v1.base.stats_manager import EndState
 from tac.platform.game.base import GameData
+from tac.platform.protocols.tac.compression import supported_compressions
 from tac.platform.protocols.tac.message import TACMessage
-from tac.platform.protocols.tac.serialization import TACSerializer
+from tac.platform.protocols.tac.serialization import (
+    GameIndex,
+    TAC_SCHEMA_VERSION,
+    TACSerializer,
+)
 
 
 logger = logging.getLogger(__name__)
@@ -132,6 +142,13 @@ class ControllerReactions(ControllerReactionInterface):
         )
         self.game_instance.init(game_data, self.crypto.public_key)
         self.game_instance._game_phase = GamePhase.GAME
+        if message.is_set("schema_version") and message.get("schema_version") >= 2:
+            game_configuration = self.game_instance.game_configuration
+            self.game_instance.tac_serializer = TACSerializer(
+                min(message.get("schema_version"), TAC_SCHEMA_VERSION),
+                GameIndex(game_configuration.agent_pbks, game_configuration.good_pbks),
+                version_id=game_configuration.version_id,
+            )
 
         dashboard = self.game_instance.dashboard
         if dashboard is not None:
@@ -165,12 +182,9 @@ class ControllerReactions(ControllerReactionInterface):
             self._request_state_update()
             return
 
-        transaction = self.game_instance.transaction_manager.pop_locked_tx(
+        transaction = self.game_instance.transaction_manager.settle_locked_tx(
             message.get("transaction_id")
         )
-        self.game_instance.agent_state.update(
-            transaction, self.game_instance.game_configuration.tx_fee
-        )
         dialogue_label = dialogue_label_from_transaction_id(
             self.crypto.public_key, message.get("transaction_id")
         )
@@ -257,6 +271,19 @@ class ControllerReactions(ControllerReactionInterface):
             or error_code == TACMessage.ErrorCode.AGENT_NOT_REGISTERED
         ):
             self.liveness._is_stopped = True
+        elif error_code == TACMessage.ErrorCode.TRANSACTION_ALREADY_SETTLED:
+            logger.warning(
+                "[{}]: The controller rejected a duplicate of a settled transaction: {}".format(
+                    self.agent_name,
+                    (message.get("details") or {}).get("transaction_id"),
+                )
+            )
+        elif error_code == TACMessage.ErrorCode.RATE_LIMIT_EXCEEDED:
+            logger.warning(
+                "[{}]: Some requests have been dropped by the controller.".format(
+                    self.agent_name
+                )
+            )
         elif (
             error_code == TACMessage.ErrorCode.REQUEST_NOT_VALID
             or error_code == TACMessage.ErrorCode.GENERIC_ERROR
@@ -272,7 +299,7 @@ class ControllerReactions(ControllerReactionInterface):
         :return: None
         """
         tac_msg = TACMessage(tac_type=TACMessage.Type.GET_STATE_UPDATE)
-        tac_bytes = TACSerializer().encode(tac_msg)
+        tac_bytes = self.game_instance.tac_serializer.encode(tac_msg)
         self.mailbox.outbox.put_message(
             to=self.game_instance.controller_pbk,
             sender=self.crypto.public_key,
@@ -325,18 +352,22 @@ class OEFReactions(OEFReactionInterface):
         logger.debug(
             "[{}]: on search result: {} {}".format(self.agent_name, search_id, agents)
         )
-        if search_id in self.game_instance.search.ids_for_tac:
-            self._on_controller_search_result(agents)
-        elif search_id in self.game_instance.search.ids_for_sellers:
-            self._on_services_search_result(agents, is_searching_for_sellers=True)
-        elif search_id in self.game_instance.search.ids_for_buyers:
-            self._on_services_search_result(agents, is_searching_for_sellers=False)
-        else:
+        outstanding = self.game_instance.search.pop(search_id)
+        if outstanding is None:
             logger.debug(
                 "[{}]: Unknown search id: search_id={}".format(
                     self.agent_name, search_id
                 )
             )
+            return
+        target, latency = outstanding
+        self.game_instance.stats_manager.add_search_result(latency, len(agents))
+        if target == SearchTarget.TAC:
+            self._on_controller_search_result(agents)
+        else:
+            self._on_services_search_result(
+                agents, is_searching_for_sellers=target == SearchTarget.SELLERS
+            )
 
     def on_oef_error(self, oef_error: Message) -> None:
         """
@@ -484,9 +515,12 @@ class OEFReactions(OEFReactionInterface):
         self.game_instance.controller_pbk = controller_pbk
         self.game_instance._game_phase = GamePhase.GAME_SETUP
         tac_msg = TACMessage(
-            tac_type=TACMessage.Type.REGISTER, agent_name=self.agent_name
+            tac_type=TACMessage.Type.REGISTER,
+            agent_name=self.agent_name,
+            schema_version=TAC_SCHEMA_VERSION,
+            compressions=supported_compressions(),
         )
-        tac_bytes = TACSerializer().encode(tac_msg)
+        tac_bytes = self.game_instance.tac_serializer.encode(tac_msg)
         self.mailbox.outbox.put_message(
             to=self.game_instance.controller_pbk,
             sender=self.crypto.public_key,
@@ -505,7 +539,7 @@ class OEFReactions(OEFReactionInterface):
         self.game_instance.controller_pbk = controller_pbk
         self.game_instance._game_phase = GamePhase.GAME_SETUP
         tac_msg = TACMessage(tac_type=TACMessage.Type.GET_STATE_UPDATE)
-        tac_bytes = TACSerializer().encode(tac_msg)
+        tac_bytes = self.game_instance.tac_serializer.encode(tac_msg)
         self.mailbox.outbox.put_message(
             to=self.game_instance.controller_pbk,
             sender=self.crypto.public_key,
@@ -553,8 +587,8 @@ class DialogueReactions(DialogueReactionInterface):
         :return: None
         """
         assert message.get("performative") == FIPAMessage.Performative.CFP
-        services = json.loads(message.get("query").decode("utf-8"))
-        is_seller = services["description"] == TAC_DEMAND_DATAMODEL_NAME
+        cfp_services = parse_cfp_query(message.get("query"))
+        is_seller = cfp_services.description == TAC_DEMAND_DATAMODEL_NAME
         dialogue = self.dialogues.create_opponent_initiated(
             sender, message.get("dialogue_id"), is_seller
         )
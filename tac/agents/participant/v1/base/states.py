@@ -30,10 +30,12 @@ import copy
 import pprint
 from typing import Dict, List
 
+import numpy as np
+
 from aea.helpers.state.base import AgentState as BaseAgentState
 from aea.helpers.state.base import WorldState as BaseWorldState
 from aea.mail.base import Address
-from tac.agents.participant.v1.base.price_model import GoodPriceModel
+from tac.agents.participant.v1.base.price_model import GoodPriceModels
 from tac.platform.game.helpers import logarithmic_utility
 from tac.platform.game.base import Transaction
 
@@ -59,6 +61,7 @@ class AgentState(BaseAgentState):
         self.balance = money
         self._utility_params = copy.copy(utility_params)
         self._current_holdings = copy.copy(endowment)
+        self._is_shared = False
 
     @property
     def current_holdings(self):
@@ -70,6 +73,61 @@ class AgentState(BaseAgentState):
         """Get utility parameter for each good."""
         return copy.copy(self._utility_params)
 
+    def share(self) -> "AgentState":
+        """
+        Get a copy-on-write copy of the state.
+
+        The copy shares the holdings and the utility params of this state, instead of copying them.
+        The holdings are copied by whichever of the two states is updated first.
+
+        >>> state = AgentState(10.0, [1, 2], [0.5, 0.5])
+        >>> other = state.share()
+        >>> other._current_holdings is state._current_holdings
+        True
+        >>> other.update(Transaction("tx_0", True, "pbk", 1.0, {"good_0": 1, "good_1": 0}, "other_pbk"), 0.0)
+        >>> (state.current_holdings, other.current_holdings)
+        ([1, 2], [2, 2])
+
+        :return: the copy.
+        """
+        state = AgentState.__new__(AgentState)
+        BaseAgentState.__init__(state)
+        state.balance = self.balance
+        state._utility_params = self._utility_params
+        state._current_holdings = self._current_holdings
+        state._is_shared = True
+        self._is_shared = True
+        return state
+
+    def _unshare(self) -> None:
+        """
+        Copy the holdings if they are shared with another state, before they are modified.
+
+        :return: None
+        """
+        if self._is_shared:
+            self._current_holdings = copy.copy(self._current_holdings)
+            self._is_shared = False
+
+    def set_balance_and_holdings(self, balance: float, holdings: Endowment) -> None:
+        """
+        Set the balance and the holdings of the agent, e.g. as computed by a settlement of several transactions at once.
+
+        >>> state = AgentState(10.0, [1, 2], [0.5, 0.5])
+        >>> other = state.share()
+        >>> other.set_balance_and_holdings(8.0, [2, 2])
+        >>> (state.balance, state.current_holdings), (other.balance, other.current_holdings)
+        ((10.0, [1, 2]), (8.0, [2, 2]))
+
+        :param balance: the balance of the agent.
+        :param holdings: the holdings of every good.
+        :return: None
+        """
+        assert len(holdings) == len(self._utility_params)
+        self.balance = balance
+        self._current_holdings = copy.copy(holdings)
+        self._is_shared = False
+
     def get_score(self) -> float:
         """
         Compute the score of the current state.
@@ -143,10 +201,32 @@ class AgentState(BaseAgentState):
             diff = tx.amount - share_of_tx_fee
             self.balance += diff
 
+        self._unshare()
         for good_id, quantity in enumerate(tx.quantities_by_good_pbk.values()):
             quantity_delta = quantity if tx.is_sender_buyer else -quantity
             self._current_holdings[good_id] += quantity_delta
 
+    def revert(self, tx: Transaction, tx_fee: float) -> None:
+        """
+        Revert the update of the agent state from a transaction.
+
+        :param tx: the transaction.
+        :param tx_fee: the transaction fee.
+        :return: None
+        """
+        share_of_tx_fee = round(tx_fee / 2.0, 2)
+        if tx.is_sender_buyer:
+            diff = tx.amount + share_of_tx_fee
+            self.balance += diff
+        else:
+            diff = tx.amount - share_of_tx_fee
+            self.balance -= diff
+
+        self._unshare()
+        for good_id, quantity in enumerate(tx.quantities_by_good_pbk.values()):
+            quantity_delta = quantity if tx.is_sender_buyer else -quantity
+            self._current_holdings[good_id] -= quantity_delta
+
     def __copy__(self):
         """Copy the object."""
         return AgentState(self.balance, self.current_holdings, self.utility_params)
@@ -191,23 +271,19 @@ class WorldState(BaseWorldState):
         :return: None
         """
         BaseWorldState.__init__(self)
+        # every opponent starts from the same expected state, so they share its holdings and utility params
+        # until their models diverge (see AgentState.share).
+        expected_opponent_state = AgentState(
+            self._expected_initial_money_amount(initial_agent_state.balance),
+            self._expected_good_endowments(initial_agent_state.current_holdings),
+            self._expected_utility_params(initial_agent_state.utility_params),
+        )
         self.opponent_states = dict(
-            (
-                agent_pbk,
-                AgentState(
-                    self._expected_initial_money_amount(initial_agent_state.balance),
-                    self._expected_good_endowments(
-                        initial_agent_state.current_holdings
-                    ),
-                    self._expected_utility_params(initial_agent_state.utility_params),
-                ),
-            )
-            for agent_pbk in opponent_pbks
+            (agent_pbk, expected_opponent_state.share()) for agent_pbk in opponent_pbks
         )  # type: Dict[str, AgentState]
 
-        self.good_price_models = dict(
-            (good_pbk, GoodPriceModel()) for good_pbk in good_pbks
-        )
+        self._price_models = GoodPriceModels(good_pbks)
+        self.good_price_models = self._price_models.models
 
     def update_on_cfp(self, query) -> None:
         """Update the world state when a new cfp is received."""
@@ -312,6 +388,35 @@ class WorldState(BaseWorldState):
         expected_price = good_price_model.get_price_expectation(constraint, is_seller)
         return expected_price
 
+    def expected_prices(
+        self,
+        good_pbks: List[Address],
+        marginal_utilities: List[float],
+        is_seller: bool,
+        share_of_tx_fee: float,
+    ) -> np.ndarray:
+        """
+        Compute expectations of the prices of several goods given their constraints, in a single draw.
+
+        :param good_pbks: the pbks of the goods
+        :param marginal_utilities: the marginal utilities from the goods
+        :param is_seller: whether the agent is a seller or buyer
+        :param share_of_tx_fee: the share of the tx fee the agent pays
+        :return: the expected prices, one per good
+        """
+        marginal_utilities = np.asarray(marginal_utilities, dtype=float)
+        constraints = np.round(
+            (
+                marginal_utilities + share_of_tx_fee
+                if is_seller
+                else marginal_utilities - share_of_tx_fee
+            ),
+            1,
+        )
+        return self._price_models.get_price_expectations(
+            good_pbks, constraints, is_seller
+        )
+
     def _update_price(self, good_pbk: Address, price: float, is_accepted: bool) -> None:
         """
         Update the price for the good based on an outcome.
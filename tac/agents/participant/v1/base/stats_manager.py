@@ -21,13 +21,15 @@
 """This module contains a class to handle statistics on the TAC."""
 
 import time
+from collections import deque
 from enum import Enum
 from threading import Thread
-from typing import Dict, Optional
+from typing import Deque, Dict, Optional
 
 import numpy as np
 
 from aea.channels.oef.connection import MailStats
+from tac.agents.participant.v1.base.dialogues import DialogueSummary
 
 
 class EndState(Enum):
@@ -42,13 +44,22 @@ class EndState(Enum):
 class StatsManager(object):
     """Class to handle statistics on the game."""
 
-    def __init__(self, mail_stats, dashboard, task_timeout: float = 2.0) -> None:
+    def __init__(
+        self,
+        mail_stats,
+        dashboard,
+        task_timeout: float = 2.0,
+        max_archived_dialogues: int = 1000,
+        max_search_results: int = 1000,
+    ) -> None:
         """
         Initialize a StatsManager.
 
         :param mail_stats: the mail stats of the mail box.
         :param dashboard: The dashboard.
         :param task_timeout: seconds to sleep for the task
+        :param max_archived_dialogues: the number of summaries of removed dialogues to keep (the most recent ones).
+        :param max_search_results: the number of search results to average the search stats over (the most recent ones).
 
         :return: None
         """
@@ -72,6 +83,21 @@ class StatsManager(object):
             EndState.DECLINED_ACCEPT: 0,
         }  # type: Dict[EndState, int]
 
+        self._archived_dialogues = deque(
+            maxlen=max_archived_dialogues
+        )  # type: Deque[DialogueSummary]
+        self._nb_expired_dialogues = 0
+
+        self._proposal_cache_hits = {True: 0, False: 0}  # type: Dict[bool, int]
+        self._proposal_cache_misses = {True: 0, False: 0}  # type: Dict[bool, int]
+
+        self._search_latencies = deque(
+            maxlen=max_search_results
+        )  # type: Deque[float]
+        self._search_result_counts = deque(
+            maxlen=max_search_results
+        )  # type: Deque[int]
+
     @property
     def mail_stats(self) -> MailStats:
         """Get the mail stats."""
@@ -103,13 +129,74 @@ class StatsManager(object):
         else:
             self._other_initiated_dialogue_stats[end_state] += 1
 
+    @property
+    def archived_dialogues(self) -> Deque[DialogueSummary]:
+        """Get the summaries of the most recently removed dialogues."""
+        return self._archived_dialogues
+
+    @property
+    def nb_expired_dialogues(self) -> int:
+        """Get the number of archived dialogues which were removed before reaching a terminal state."""
+        return self._nb_expired_dialogues
+
+    def archive_dialogue(self, summary: DialogueSummary) -> None:
+        """
+        Archive the summary of a removed dialogue.
+
+        :param summary: the summary of the dialogue
+
+        :return: None
+        """
+        self._archived_dialogues.append(summary)
+        if summary.is_expired:
+            self._nb_expired_dialogues += 1
+
+    def add_proposal_cache_lookup(self, is_seller: bool, is_hit: bool) -> None:
+        """
+        Add a lookup of the candidate proposals in the cache of the game instance.
+
+        :param is_seller: the role of the agent
+        :param is_hit: whether the candidate proposals were found in the cache
+
+        :return: None
+        """
+        if is_hit:
+            self._proposal_cache_hits[is_seller] += 1
+        else:
+            self._proposal_cache_misses[is_seller] += 1
+
+    def proposal_cache_hit_rate(self, is_seller: Optional[bool] = None) -> float:
+        """
+        Get the hit rate of the cache of the candidate proposals.
+
+        :param is_seller: the role of the agent, or None for both roles
+
+        :return: the share of the lookups which were hits (0.0 if there was no lookup)
+        """
+        roles = [True, False] if is_seller is None else [is_seller]
+        hits = sum(self._proposal_cache_hits[role] for role in roles)
+        lookups = hits + sum(self._proposal_cache_misses[role] for role in roles)
+        return hits / lookups if lookups > 0 else 0.0
+
+    def add_search_result(self, latency: float, nb_results: int) -> None:
+        """
+        Add the result of a search.
+
+        :param latency: the seconds between the search and its result
+        :param nb_results: the number of agents found
+
+        :return: None
+        """
+        self._search_latencies.append(latency)
+        self._search_result_counts.append(nb_results)
+
     def avg_search_time(self) -> float:
         """
-        Average the search timedeltas.
+        Average the search timedeltas, over the most recent search results.
 
         :return: avg search time in seconds
         """
-        timedeltas = list(self.mail_stats._search_timedelta.values())
+        timedeltas = self._search_latencies
         if len(timedeltas) == 0:
             result = 0.0
         else:
@@ -118,11 +205,11 @@ class StatsManager(object):
 
     def avg_search_result_counts(self) -> float:
         """
-        Average the search result counts.
+        Average the search result counts, over the most recent search results.
 
         :return: avg search result counts
         """
-        counts = list(self.mail_stats._search_result_counts.values())
+        counts = self._search_result_counts
         if len(counts) == 0:
             result = 0.0
         else:
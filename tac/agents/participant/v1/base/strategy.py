@@ -24,6 +24,8 @@ from abc import abstractmethod
 from enum import Enum
 from typing import List, Set, Optional
 
+import numpy as np
+
 from aea.protocols.oef.models import Description
 
 from tac.agents.participant.v1.base.states import WorldState
@@ -171,6 +173,32 @@ class Strategy:
         :return: a list of proposals in Description form
         """
 
+    def get_unit_proposal_prices(
+        self,
+        good_pbks: List[str],
+        current_holdings: List[int],
+        utility_params: List[float],
+        tx_fee: float,
+        is_seller: bool,
+        world_state: Optional[WorldState],
+    ) -> Optional[np.ndarray]:
+        """
+        Generate the prices of the proposals of a single unit of every good, from the agent in the role of seller/buyer.
+
+        A strategy whose proposals are all of a single unit of a good can implement this method,
+        so that only the proposal sent is built as a Description. By default, the proposals are generated by get_proposals.
+
+        :param good_pbks: a list of good public keys
+        :param current_holdings: a list of current good holdings
+        :param utility_params: a list of utility params
+        :param tx_fee: the transaction fee
+        :param is_seller: Boolean indicating the role of the agent
+        :param world_state: the world state modelled by the agent
+
+        :return: an array with the price of the proposal of every good (the goods with a non-positive price are not proposed), or None.
+        """
+        return None
+
     def is_acceptable_proposal(self, proposal_delta_score: float) -> bool:
         """
         Determine whether a proposal is acceptable to the agent.
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains a hashed timing wheel, to expire items on a monotonic clock."""
+
+import time
+from typing import Dict, Hashable, List, Optional
+
+
+class TimingWheel:
+    """
+    A hashed timing wheel.
+
+    The time is divided in ticks, and every item is stored in the slot of the tick of its deadline, modulo the number of slots.
+    Advancing the wheel visits only the slots of the ticks elapsed since the previous advance (at most one turn of the wheel),
+    hence the work is proportional to the number of expired items when the deadlines are less than a turn ahead.
+    """
+
+    def __init__(self, tick: float, nb_slots: int = 64, now: Optional[float] = None):
+        """
+        Initialize an empty wheel.
+
+        :param tick: the duration of a tick, in seconds.
+        :param nb_slots: the number of slots, i.e. of ticks in a turn of the wheel.
+        :param now: the current time (monotonic clock). If None, it is read from the clock.
+        :return: None
+        """
+        assert tick > 0 and nb_slots > 0
+        self.tick = tick
+        self._slots = [
+            {} for _ in range(nb_slots)
+        ]  # type: List[Dict[Hashable, float]]
+        self._slot_indexes = {}  # type: Dict[Hashable, int]
+        self._current_tick = self._tick_of(time.monotonic() if now is None else now)
+
+    def _tick_of(self, instant: float) -> int:
+        """Get the tick of an instant."""
+        return int(instant // self.tick)
+
+    def __len__(self) -> int:
+        """Get the number of scheduled items."""
+        return len(self._slot_indexes)
+
+    def __contains__(self, item: object) -> bool:
+        """Check whether an item is scheduled."""
+        return item in self._slot_indexes
+
+    def schedule(self, item: Hashable, deadline: float) -> None:
+        """
+        Schedule the expiry of an item, replacing its previous deadline if any.
+
+        :param item: the item.
+        :param deadline: the instant the item expires at (monotonic clock).
+        :return: None
+        """
+        self.cancel(item)
+        slot_index = max(self._tick_of(deadline), self._current_tick) % len(
+            self._slots
+        )
+        self._slots[slot_index][item] = deadline
+        self._slot_indexes[item] = slot_index
+
+    def cancel(self, item: Hashable) -> bool:
+        """
+        Cancel the expiry of an item.
+
+        :param item: the item.
+        :return: True if the item was scheduled, False otherwise.
+        """
+        slot_index = self._slot_indexes.pop(item, None)
+        if slot_index is None:
+            return False
+        del self._slots[slot_index][item]
+        return True
+
+    def advance(self, now: Optional[float] = None) -> List[Hashable]:
+        """
+        Advance the wheel to the current time, and remove the expired items.
+
+        >>> wheel = TimingWheel(tick=1.0, nb_slots=4, now=0.0)
+        >>> wheel.schedule("a", 2.5)
+        >>> wheel.schedule("b", 5.0)
+        >>> wheel.advance(now=2.0)
+        []
+        >>> wheel.advance(now=3.0)
+        ['a']
+        >>> wheel.advance(now=10.0), len(wheel)
+        (['b'], 0)
+
+        :param now: the current time (monotonic clock). If None, it is read from the clock.
+        :return: the expired items, i.e. those whose deadline is not after now.
+        """
+        now = time.monotonic() if now is None else now
+        nb_slots = len(self._slots)
+        last_tick = min(self._tick_of(now), self._current_tick + nb_slots - 1)
+        expired = []  # type: List[Hashable]
+        for tick in range(self._current_tick, last_tick + 1):
+            slot = self._slots[tick % nb_slots]
+            if len(slot) == 0:
+                continue
+            expired_in_slot = [
+                item for item, deadline in slot.items() if deadline <= now
+            ]
+            for item in expired_in_slot:
+                del slot[item]
+                del self._slot_indexes[item]
+            expired.extend(expired_in_slot)
+        self._current_tick = max(self._current_tick, self._tick_of(now))
+        return expired
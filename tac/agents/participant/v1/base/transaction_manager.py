@@ -20,12 +20,15 @@
 
 """This module contains a class to manage transactions the agent has committed to at varying degrees."""
 
-import datetime
+import copy
 import logging
-from collections import defaultdict, deque
-from typing import Dict, Tuple, Deque
+import time
+from collections import defaultdict
+from typing import Dict, Hashable, Optional
 
 from tac.agents.participant.v1.base.dialogues import DialogueLabel
+from tac.agents.participant.v1.base.states import AgentState
+from tac.agents.participant.v1.base.timing_wheel import TimingWheel
 from tac.platform.game.base import Transaction, TransactionId
 
 logger = logging.getLogger(__name__)
@@ -33,9 +36,27 @@ logger = logging.getLogger(__name__)
 MESSAGE_ID = int
 TRANSACTION_ID = str
 
+# the pools of the transaction manager, whose entries expire after the pending transaction timeout.
+PENDING_PROPOSALS = "pending_proposals"
+PENDING_INITIAL_ACCEPTANCES = "pending_initial_acceptances"
+LOCKED_TXS = "locked_txs"
+POOLS = (PENDING_PROPOSALS, PENDING_INITIAL_ACCEPTANCES, LOCKED_TXS)
+
+EXPIRY_WHEEL_NB_SLOTS = 64
+
 
 class TransactionManager(object):
-    """Class to handle pending transaction proposals/acceptances and locked transactions."""
+    """
+    Class to handle pending transaction proposals/acceptances and locked transactions.
+
+    For both roles, the state of the agent after the locks of the role is maintained as the locks are added,
+    removed and settled, so that it is read without replaying the locked transactions. Its version is bumped
+    whenever it changes, so that what is computed from it can be cached.
+
+    The entries of the three pools (pending proposals, pending initial acceptances and locked transactions) expire
+    after the pending transaction timeout, e.g. when the counterpart goes silent. Their deadlines are kept in a single
+    timing wheel on the monotonic clock, so that the cleanup only visits the expired entries.
+    """
 
     def __init__(self, agent_name: str, pending_transaction_timeout: int = 30) -> None:
         """
@@ -61,55 +82,78 @@ class TransactionManager(object):
 
         self.pending_transaction_timeout = pending_transaction_timeout
 
-        self._last_update_for_transactions = (
-            deque()
-        )  # type: Deque[Tuple[datetime.datetime, TRANSACTION_ID]]
+        self._agent_state = None  # type: Optional[AgentState]
+        self._tx_fee = 0.0
+        self._states_after_locks = {}  # type: Dict[bool, AgentState]
+        self._state_versions = {True: 0, False: 0}  # type: Dict[bool, int]
 
-    def cleanup_pending_transactions(self) -> None:
+        self._expiry_wheel = TimingWheel(
+            max(pending_transaction_timeout, 1) / EXPIRY_WHEEL_NB_SLOTS,
+            EXPIRY_WHEEL_NB_SLOTS,
+        )
+        self.nb_expired = dict((pool, 0) for pool in POOLS)  # type: Dict[str, int]
+
+    @property
+    def pool_sizes(self) -> Dict[str, int]:
+        """Get the number of entries of every pool."""
+        return {
+            PENDING_PROPOSALS: sum(
+                len(proposals) for proposals in self.pending_proposals.values()
+            ),
+            PENDING_INITIAL_ACCEPTANCES: sum(
+                len(acceptances)
+                for acceptances in self.pending_initial_acceptances.values()
+            ),
+            LOCKED_TXS: len(self.locked_txs),
+        }
+
+    def cleanup_pending_transactions(self, now: Optional[float] = None) -> None:
         """
-        Remove all the pending messages (i.e. either proposals or acceptances) that have been stored for an amount of time longer than the timeout.
+        Remove all the pending proposals, pending acceptances and locks that have been stored for an amount of time longer than the timeout.
+
+        :param now: the current time (monotonic clock). If None, it is read from the clock.
 
         :return: None
         """
-        queue = self._last_update_for_transactions
-        timeout = datetime.timedelta(0, self.pending_transaction_timeout)
-
-        if len(queue) == 0:
-            return
-
-        next_date, next_item = queue[0]
-
-        while datetime.datetime.now() - next_date > timeout:
-
-            # remove the element from the queue
-            queue.popleft()
-
-            # extract dialogue label and message id
-            transaction_id = next_item
+        for pool, key in self._expiry_wheel.advance(now):
             logger.debug(
-                "[{}]: Removing transaction: {}".format(self.agent_name, transaction_id)
+                "[{}]: Removing expired entry of {}: {}".format(
+                    self.agent_name, pool, key
+                )
             )
+            self.nb_expired[pool] += 1
+            if pool == LOCKED_TXS:
+                self._remove_locked_tx(key)
+            else:
+                dialogue_label, proposal_id = key
+                pending = self._pending_pool(pool)
+                transactions = pending.get(dialogue_label, {})
+                transactions.pop(proposal_id, None)
+                if len(transactions) == 0:
+                    pending.pop(dialogue_label, None)
+
+    def _pending_pool(
+        self, pool: str
+    ) -> Dict[DialogueLabel, Dict[MESSAGE_ID, Transaction]]:
+        """Get the pending proposals or the pending initial acceptances."""
+        return (
+            self.pending_proposals
+            if pool == PENDING_PROPOSALS
+            else self.pending_initial_acceptances
+        )
 
-            # remove (safely) the associated pending proposal (if present)
-            self.locked_txs.pop(transaction_id, None)
-            self.locked_txs_as_buyer.pop(transaction_id, None)
-            self.locked_txs_as_seller.pop(transaction_id, None)
-
-            # check the next transaction, if present
-            if len(queue) == 0:
-                break
-            next_date, next_item = queue[0]
-
-    def _register_transaction_with_time(self, transaction_id: TransactionId) -> None:
+    def _schedule_expiry(self, pool: str, key: Hashable) -> None:
         """
-        Register a transaction with a creation datetime.
+        Schedule the expiry of an entry of a pool, after the pending transaction timeout.
 
-        :param transaction_id: the transaction id
+        :param pool: the pool.
+        :param key: the key of the entry, i.e. a transaction id for the locks and a (dialogue label, message id) pair otherwise.
 
         :return: None
         """
-        now = datetime.datetime.now()
-        self._last_update_for_transactions.append((now, transaction_id))
+        self._expiry_wheel.schedule(
+            (pool, key), time.monotonic() + self.pending_transaction_timeout
+        )
 
     def add_pending_proposal(
         self, dialogue_label: DialogueLabel, proposal_id: int, transaction: Transaction
@@ -129,6 +173,7 @@ class TransactionManager(object):
             and proposal_id not in self.pending_proposals[dialogue_label]
         )
         self.pending_proposals[dialogue_label][proposal_id] = transaction
+        self._schedule_expiry(PENDING_PROPOSALS, (dialogue_label, proposal_id))
 
     def pop_pending_proposal(
         self, dialogue_label: DialogueLabel, proposal_id: int
@@ -147,8 +192,21 @@ class TransactionManager(object):
             and proposal_id in self.pending_proposals[dialogue_label]
         )
         transaction = self.pending_proposals[dialogue_label].pop(proposal_id)
+        self._expiry_wheel.cancel((PENDING_PROPOSALS, (dialogue_label, proposal_id)))
         return transaction
 
+    def discard_pending(self, dialogue_label: DialogueLabel) -> None:
+        """
+        Remove (safely) all the pending proposals and acceptances of a dialogue.
+
+        :param dialogue_label: the dialogue label
+
+        :return: None
+        """
+        for pool in (PENDING_PROPOSALS, PENDING_INITIAL_ACCEPTANCES):
+            for proposal_id in self._pending_pool(pool).pop(dialogue_label, {}):
+                self._expiry_wheel.cancel((pool, (dialogue_label, proposal_id)))
+
     def add_pending_initial_acceptance(
         self, dialogue_label: DialogueLabel, proposal_id: int, transaction: Transaction
     ) -> None:
@@ -167,6 +225,9 @@ class TransactionManager(object):
             and proposal_id not in self.pending_initial_acceptances[dialogue_label]
         )
         self.pending_initial_acceptances[dialogue_label][proposal_id] = transaction
+        self._schedule_expiry(
+            PENDING_INITIAL_ACCEPTANCES, (dialogue_label, proposal_id)
+        )
 
     def pop_pending_initial_acceptance(
         self, dialogue_label: DialogueLabel, proposal_id: int
@@ -185,6 +246,9 @@ class TransactionManager(object):
             and proposal_id in self.pending_initial_acceptances[dialogue_label]
         )
         transaction = self.pending_initial_acceptances[dialogue_label].pop(proposal_id)
+        self._expiry_wheel.cancel(
+            (PENDING_INITIAL_ACCEPTANCES, (dialogue_label, proposal_id))
+        )
         return transaction
 
     def add_locked_tx(self, transaction: Transaction, as_seller: bool) -> None:
@@ -199,12 +263,16 @@ class TransactionManager(object):
         """
         transaction_id = transaction.transaction_id
         assert transaction_id not in self.locked_txs
-        self._register_transaction_with_time(transaction_id)
+        self._schedule_expiry(LOCKED_TXS, transaction_id)
         self.locked_txs[transaction_id] = transaction
         if as_seller:
             self.locked_txs_as_seller[transaction_id] = transaction
         else:
             self.locked_txs_as_buyer[transaction_id] = transaction
+        state_after_locks = self._states_after_locks.get(as_seller)
+        if state_after_locks is not None:
+            state_after_locks.update(transaction, self._tx_fee)
+        self._state_versions[as_seller] += 1
 
     def pop_locked_tx(self, transaction_id: TransactionId) -> Transaction:
         """
@@ -216,7 +284,93 @@ class TransactionManager(object):
         :return: the transaction
         """
         assert transaction_id in self.locked_txs
-        transaction = self.locked_txs.pop(transaction_id)
-        self.locked_txs_as_buyer.pop(transaction_id, None)
-        self.locked_txs_as_seller.pop(transaction_id, None)
+        transaction = self._remove_locked_tx(transaction_id)
+        assert transaction is not None
+        return transaction
+
+    def settle_locked_tx(self, transaction_id: TransactionId) -> Transaction:
+        """
+        Remove a lock whose transaction has been settled, and apply the transaction to the state of the agent.
+
+        :param transaction_id: the transaction id
+        :raise AssertionError: if the transaction with the given transaction id has not been found.
+
+        :return: the transaction
+        """
+        transaction = self.pop_locked_tx(transaction_id)
+        if self._agent_state is not None:
+            self._agent_state.update(transaction, self._tx_fee)
+            for state_after_locks in self._states_after_locks.values():
+                state_after_locks.update(transaction, self._tx_fee)
+        self._state_versions[True] += 1
+        self._state_versions[False] += 1
         return transaction
+
+    def _remove_locked_tx(self, transaction_id: TransactionId) -> Optional[Transaction]:
+        """
+        Remove a lock, if present, and revert it from the state after the locks of its role.
+
+        :param transaction_id: the transaction id
+
+        :return: the transaction, or None if it was not locked.
+        """
+        transaction = self.locked_txs.pop(transaction_id, None)
+        if transaction is None:
+            return None
+        self._expiry_wheel.cancel((LOCKED_TXS, transaction_id))
+        as_seller = transaction_id in self.locked_txs_as_seller
+        locked_txs = (
+            self.locked_txs_as_seller if as_seller else self.locked_txs_as_buyer
+        )
+        locked_txs.pop(transaction_id, None)
+        state_after_locks = self._states_after_locks.get(as_seller)
+        if state_after_locks is not None:
+            if len(locked_txs) == 0:
+                # no lock is left: start again from the state of the agent, so that the rounding errors do not accumulate.
+                self._states_after_locks[as_seller] = copy.copy(self._agent_state)
+            else:
+                state_after_locks.revert(transaction, self._tx_fee)
+        self._state_versions[as_seller] += 1
+        return transaction
+
+    def init_states_after_locks(self, agent_state: AgentState, tx_fee: float) -> None:
+        """
+        Set the state of the agent which the locks apply to, e.g. at the start of the game or after a state update.
+
+        :param agent_state: the current state of the agent. It is updated when a locked transaction is settled (see settle_locked_tx).
+        :param tx_fee: the transaction fee.
+
+        :return: None
+        """
+        self._agent_state = agent_state
+        self._tx_fee = tx_fee
+        for as_seller, locked_txs in [
+            (True, self.locked_txs_as_seller),
+            (False, self.locked_txs_as_buyer),
+        ]:
+            self._states_after_locks[as_seller] = agent_state.apply(
+                list(locked_txs.values()), tx_fee
+            )
+            self._state_versions[as_seller] += 1
+
+    def state_after_locks(self, is_seller: bool) -> AgentState:
+        """
+        Get the state of the agent with all the locks of a role applied, assuming that the locked transactions will be successful.
+
+        :param is_seller: Boolean indicating the role of the agent.
+        :raise AssertionError: if the state of the agent has not been set (see init_states_after_locks).
+
+        :return: the state after the locks. It is maintained by the manager, hence it must not be modified.
+        """
+        assert self._agent_state is not None, "Agent state not assigned!"
+        return self._states_after_locks[is_seller]
+
+    def state_version(self, is_seller: bool) -> int:
+        """
+        Get the version of the state of the agent after the locks of a role.
+
+        :param is_seller: Boolean indicating the role of the agent.
+
+        :return: the version, which increases whenever the state after the locks of the role changes.
+        """
+        return self._state_versions[is_seller]
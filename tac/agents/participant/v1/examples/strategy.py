@@ -22,12 +22,14 @@
 
 from typing import List, Optional, Set
 
+import numpy as np
+
 from aea.protocols.oef.models import Description
 
-from tac.agents.participant.v1.base.helpers import get_goods_quantities_description
+from tac.agents.participant.v1.base.helpers import get_unit_proposal_description
 from tac.agents.participant.v1.base.states import WorldState
 from tac.agents.participant.v1.base.strategy import RegisterAs, SearchFor, Strategy
-from tac.platform.game.helpers import marginal_utility
+from tac.platform.game.helpers import marginal_utilities_of_unit_changes
 
 
 class BaselineStrategy(Strategy):
@@ -120,52 +122,76 @@ class BaselineStrategy(Strategy):
 
         :return: a list of proposals in Description form
         """
-        quantities = (
-            self.supplied_good_quantities(current_holdings)
-            if is_seller
-            else self.demanded_good_quantities(current_holdings)
+        prices = self.get_unit_proposal_prices(
+            good_pbks,
+            current_holdings,
+            utility_params,
+            tx_fee,
+            is_seller,
+            world_state,
         )
+        return [
+            get_unit_proposal_description(
+                good_pbks, good_id, float(prices[good_id]), is_supply=is_seller
+            )
+            for good_id in np.flatnonzero(prices > 0)
+        ]
+
+    def get_unit_proposal_prices(
+        self,
+        good_pbks: List[str],
+        current_holdings: List[int],
+        utility_params: List[float],
+        tx_fee: float,
+        is_seller: bool,
+        world_state: Optional[WorldState],
+    ) -> np.ndarray:
+        """
+        Generate the prices of the proposals of a single unit of every good from the seller/buyer.
+
+        The marginal utilities of all the goods are computed in a single pass.
+
+        :param good_pbks: a list of good public keys
+        :param current_holdings: a list of current good holdings
+        :param utility_params: a list of utility params
+        :param tx_fee: the transaction fee
+        :param is_seller: Boolean indicating the role of the agent
+        :param world_state: the world state module
+
+        :return: an array with the price of the proposal of every good (the goods with a non-positive price are not proposed)
+        """
         share_of_tx_fee = round(tx_fee / 2.0, 2)
         rounding_adjustment = 0.01
-        proposals = []
-        for good_id, good_pbk in zip(range(len(quantities)), good_pbks):
-            if is_seller and quantities[good_id] == 0:
-                continue
-            proposal = [0] * len(quantities)
-            proposal[good_id] = 1
-            desc = get_goods_quantities_description(
-                good_pbks, proposal, is_supply=is_seller
+        switch = -1 if is_seller else 1
+        marginal_utilities = np.round(
+            marginal_utilities_of_unit_changes(utility_params, current_holdings, switch)
+            * switch,
+            2,
+        )
+        if is_seller:
+            is_proposed = (
+                np.asarray(self.supplied_good_quantities(current_holdings)) != 0
             )
-            delta_holdings = [i * -1 for i in proposal] if is_seller else proposal
-            switch = -1 if is_seller else 1
-            marginal_utility_from_delta_holdings = (
-                marginal_utility(utility_params, current_holdings, delta_holdings)
-                * switch
+        else:
+            is_proposed = np.ones(len(current_holdings), dtype=bool)
+
+        if self.is_world_modeling:
+            assert (
+                world_state is not None
+            ), "Need to provide world state if is_world_modeling=True."
+            prices = np.zeros(len(current_holdings))
+            good_ids = np.flatnonzero(is_proposed)
+            prices[good_ids] = world_state.expected_prices(
+                [good_pbks[good_id] for good_id in good_ids],
+                marginal_utilities[good_ids],
+                is_seller,
+                share_of_tx_fee,
             )
-            if self.is_world_modeling:
-                assert (
-                    world_state is not None
-                ), "Need to provide world state if is_world_modeling=True."
-                desc.values["price"] = world_state.expected_price(
-                    good_pbk,
-                    round(marginal_utility_from_delta_holdings, 2),
-                    is_seller,
-                    share_of_tx_fee,
-                )
-            else:
-                if is_seller:
-                    desc.values["price"] = (
-                        round(marginal_utility_from_delta_holdings, 2)
-                        + share_of_tx_fee
-                        + rounding_adjustment
-                    )
-                else:
-                    desc.values["price"] = (
-                        round(marginal_utility_from_delta_holdings, 2)
-                        - share_of_tx_fee
-                        - rounding_adjustment
-                    )
-            if not desc.values["price"] > 0:
-                continue
-            proposals.append(desc)
-        return proposals
+            return prices
+
+        if is_seller:
+            prices = marginal_utilities + share_of_tx_fee + rounding_adjustment
+        else:
+            prices = marginal_utilities - share_of_tx_fee - rounding_adjustment
+        prices[~is_proposed] = 0.0
+        return prices
@@ -22,14 +22,12 @@
 """Module containing the controller dashboard and related classes."""
 
 import argparse
-import json
-import os
 from typing import Optional, Dict
 
 import numpy as np
 
 from tac.gui.dashboards.base import start_visdom_server, Dashboard
-from tac.agents.controller.base.states import Game
+from tac.platform.game.dump import find_game_dump, load_game
 from tac.platform.game.stats import GameStats
 
 DEFAULT_ENV_NAME = "tac_simulation_env_main"
@@ -83,10 +81,11 @@ class ControllerDashboard(Dashboard):
         :param env_name: the environment name
         :return: controller dashboard
         """
-        game_data_json_filepath = os.path.join(datadir, "game.json")
-        print("Loading data from {}".format(game_data_json_filepath))
-        game_data = json.load(open(game_data_json_filepath))
-        game = Game.from_dict(game_data)
+        game_dump_filepath = find_game_dump(datadir)
+        assert game_dump_filepath is not None, "No game dump in {}".format(datadir)
+        print("Loading data from {}".format(game_dump_filepath))
+        game = load_game(game_dump_filepath)
+        assert game is not None, "Found incomplete data in {}".format(datadir)
         game_stats = GameStats(game)
         return ControllerDashboard(game_stats, env_name=env_name)
 
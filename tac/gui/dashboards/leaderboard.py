@@ -21,15 +21,14 @@
 """Module containing the controller dashboard and related classes."""
 
 import argparse
-import json
 import numpy as np
 import pandas as pd
 import os
 from collections import defaultdict
 from typing import Optional, Dict, List
 
-from tac.agents.controller.base.states import Game
 from tac.gui.dashboards.base import start_visdom_server, Dashboard
+from tac.platform.game.dump import find_game_dump, load_game
 from tac.platform.game.stats import GameStats
 
 DEFAULT_ENV_NAME = "tac_simulation_env_main"
@@ -176,16 +175,15 @@ class LeaderboardDashboard(Dashboard):
 
         game_dirs = sorted(os.listdir(self.competition_directory))
         for game_dir in game_dirs:
-            game_data_json_filepath = os.path.join(
-                self.competition_directory, game_dir, "game.json"
+            game_dump_filepath = find_game_dump(
+                os.path.join(self.competition_directory, game_dir)
             )
-            if not os.path.exists(game_data_json_filepath):
+            if game_dump_filepath is None:
                 continue
-            game_data = json.load(open(game_data_json_filepath))
-            if game_data == {}:
+            game = load_game(game_dump_filepath)
+            if game is None:
                 print("Found incomplete data for game_dir={}!".format(game_dir))
                 continue
-            game = Game.from_dict(game_data)
             game_stats = GameStats(game)
             result.append(game_stats)
 
@@ -20,13 +20,19 @@
 
 """Module containing monitor classes."""
 
+import logging
+import threading
 from abc import ABC, abstractmethod
 from typing import Optional
 
+from tac.agents.controller.base.states import Game
+from tac.agents.controller.base.transaction_store import TransactionStoreSnapshot
 from tac.gui.dashboards.controller import ControllerDashboard
 
 from tac.platform.game.stats import GameStats
 
+logger = logging.getLogger(__name__)
+
 
 class Monitor(ABC):
     """Abstract monitor class."""
@@ -116,3 +122,130 @@ class VisdomMonitor(Monitor):
             raise Exception("The dashboard not running.")
         self.dashboard.stop()
         self._dashboard = None
+
+
+class GameSnapshot:
+    """
+    A snapshot of a game, with what the game stats read: its configuration, its initialization and its transactions.
+
+    The transactions are a view of the transactions settled when the snapshot was taken.
+    """
+
+    def __init__(self, game: Game):
+        """
+        Take a snapshot of a game.
+
+        :param game: the game.
+        """
+        self.configuration = game.configuration
+        self.initialization = game.initialization
+        self.transactions = (
+            game.transactions.snapshot()
+        )  # type: TransactionStoreSnapshot
+
+
+class AsyncMonitor(Monitor):
+    """
+    Refresh a monitor from a background thread, at a maximum rate.
+
+    A call to update() only marks the monitor as dirty, so that the caller never waits for the dashboard.
+    The background thread refreshes the wrapped monitor at most 'max_rate' times per second,
+    coalescing all the updates received in the meantime.
+
+    The wrapped monitor shows a snapshot of the game, which the background thread takes before every refresh.
+    Since the transactions of a game are only appended, the snapshot is a view of the transactions settled so far,
+    hence it is consistent without copying or settling the transactions again.
+    """
+
+    def __init__(self, monitor: Monitor, max_rate: float = 1.0):
+        """
+        Instantiate the monitor.
+
+        :param monitor: the monitor to refresh.
+        :param max_rate: the maximum number of refreshes per second.
+        """
+        assert max_rate > 0
+        self.monitor = monitor
+        self.max_rate = max_rate
+        self._game = None  # type: Optional[Game]
+        self._game_snapshot = None  # type: Optional[GameSnapshot]
+        self._lock = threading.Lock()
+        self._dirty = threading.Event()
+        self._stop_requested = threading.Event()
+        self._thread = None  # type: Optional[threading.Thread]
+
+    @property
+    def dashboard(self) -> ControllerDashboard:
+        """Get the dashboard of the wrapped monitor."""
+        return self.monitor.dashboard  # type: ignore
+
+    @property
+    def is_running(self) -> bool:
+        """Check if the monitor is running."""
+        return self._thread is not None
+
+    def start(self, game_stats: Optional[GameStats] = None):
+        """Start the monitor and its background thread."""
+        if self.is_running:
+            raise Exception("The monitor is already running.")
+        self.monitor.start(self._make_snapshot_stats(game_stats))
+        self._stop_requested.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="monitor-refresh", daemon=True
+        )
+        self._thread.start()
+
+    def set_gamestats(self, game_stats: GameStats):
+        """Set the game stats."""
+        with self._lock:
+            self.monitor.set_gamestats(self._make_snapshot_stats(game_stats))  # type: ignore
+
+    def update(self):
+        """Mark the monitor as dirty. The refresh is done by the background thread."""
+        self._dirty.set()
+
+    def stop(self):
+        """Refresh the monitor for the last time and stop it."""
+        if not self.is_running:
+            raise Exception("The monitor is not running.")
+        assert self._thread is not None
+        self._stop_requested.set()
+        self._dirty.set()
+        self._thread.join()
+        self._thread = None
+        self._refresh()
+        self.monitor.stop()
+
+    def _make_snapshot_stats(
+        self, game_stats: Optional[GameStats]
+    ) -> Optional[GameStats]:
+        """Make the stats of a snapshot of the game, to be shown by the wrapped monitor."""
+        if game_stats is None:
+            self._game = None
+            self._game_snapshot = None
+            return None
+        self._game = game_stats.game
+        self._game_snapshot = GameSnapshot(self._game)
+        return GameStats(self._game_snapshot)  # type: ignore
+
+    def _refresh(self) -> None:
+        """Take a new snapshot of the game and refresh the wrapped monitor."""
+        with self._lock:
+            try:
+                if self._game is not None and self._game_snapshot is not None:
+                    self._game_snapshot.transactions = (
+                        self._game.transactions.snapshot()
+                    )
+                self.monitor.update()
+            except Exception as e:
+                logger.exception(e)
+
+    def _run(self) -> None:
+        """Refresh the wrapped monitor when it is dirty, at most 'max_rate' times per second."""
+        while True:
+            self._dirty.wait()
+            if self._stop_requested.is_set():
+                return
+            self._dirty.clear()
+            self._refresh()
+            self._stop_requested.wait(1.0 / self.max_rate)
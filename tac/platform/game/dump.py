@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+This module contains the streaming writer and reader of the game dumps.
+
+A game dump is a JSON document with the same structure as Game.to_dict(),
+laid out with one transaction per line so that it can be written and read incrementally:
+
+    {"configuration": {...}, "initialization": {...}, "transactions": [
+    {...},
+    {...}
+    ]}
+
+The dump can be compressed with gzip ('.gz' extension) or, if the 'zstandard' package is installed, zstd ('.zst' extension).
+"""
+
+import gzip
+import io
+import json
+import os
+from typing import IO, Iterator, Optional, Tuple
+
+from tac.agents.controller.base.states import Game, GameInitialization
+from tac.platform.game.base import GameConfiguration, Transaction
+
+GAME_DUMP_FILENAME = "game.json"
+COMPRESSION_EXTENSIONS = {None: "", "gzip": ".gz", "zstd": ".zst"}
+
+_TRANSACTIONS_START = ', "transactions": [\n'
+_TRANSACTIONS_END = "]}\n"
+
+
+def game_dump_filename(compression: Optional[str] = None) -> str:
+    """
+    Get the file name of a game dump.
+
+    >>> game_dump_filename()
+    'game.json'
+    >>> game_dump_filename("gzip")
+    'game.json.gz'
+
+    :param compression: the compression of the dump: None, 'gzip' or 'zstd'.
+    :return: the file name.
+    """
+    if compression not in COMPRESSION_EXTENSIONS:
+        raise ValueError("Unknown compression: {}".format(compression))
+    return GAME_DUMP_FILENAME + COMPRESSION_EXTENSIONS[compression]
+
+
+def find_game_dump(directory: str) -> Optional[str]:
+    """
+    Find the game dump in a directory, whatever its compression.
+
+    :param directory: the directory.
+    :return: the path of the game dump, or None if there is no game dump.
+    """
+    for compression in COMPRESSION_EXTENSIONS.keys():
+        path = os.path.join(directory, game_dump_filename(compression))
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def open_game_dump(path: str, mode: str = "r") -> IO[str]:
+    """
+    Open a game dump in text mode, with the compression given by its extension.
+
+    :param path: the path of the game dump.
+    :param mode: 'r' to read, 'w' to write.
+    :return: the file object.
+    """
+    assert mode in ("r", "w")
+    if path.endswith(COMPRESSION_EXTENSIONS["gzip"]):
+        return gzip.open(path, mode + "t", encoding="utf-8")  # type: ignore
+    if path.endswith(COMPRESSION_EXTENSIONS["zstd"]):
+        try:
+            import zstandard
+        except ImportError:  # pragma: no cover
+            raise ImportError(
+                "The 'zstandard' package is required for zstd compressed game dumps."
+            )
+        if mode == "r":
+            stream = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"))
+        else:
+            stream = zstandard.ZstdCompressor().stream_writer(open(path, "wb"))
+        return io.TextIOWrapper(stream, encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class GameDumpWriter:
+    """Write a game dump incrementally."""
+
+    def __init__(
+        self,
+        path: str,
+        configuration: GameConfiguration,
+        initialization: GameInitialization,
+    ) -> None:
+        """
+        Open a game dump and write its configuration and initialization.
+
+        :param path: the path of the game dump.
+        :param configuration: the game configuration.
+        :param initialization: the game initialization.
+        :return: None
+        """
+        self.path = path
+        self._file = open_game_dump(path, "w")
+        self._nb_transactions = 0
+        header = json.dumps(
+            {
+                "configuration": configuration.to_dict(),
+                "initialization": initialization.to_dict(),
+            }
+        )
+        self._file.write(header[:-1] + _TRANSACTIONS_START)
+
+    def write_transaction(self, tx: Transaction) -> None:
+        """
+        Write a transaction.
+
+        :param tx: the transaction.
+        :return: None
+        """
+        if self._nb_transactions > 0:
+            self._file.write(",\n")
+        self._file.write(json.dumps(tx.to_dict()))
+        self._nb_transactions += 1
+
+    def close(self) -> None:
+        """
+        Terminate the document and close the game dump.
+
+        :return: None
+        """
+        if self._file.closed:
+            return
+        if self._nb_transactions > 0:
+            self._file.write("\n")
+        self._file.write(_TRANSACTIONS_END)
+        self._file.close()
+
+    def __enter__(self) -> "GameDumpWriter":
+        """Enter the context."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Exit the context."""
+        self.close()
+
+
+def dump_game(game: Optional[Game], path: str) -> None:
+    """
+    Dump a game, one transaction at a time.
+
+    :param game: the game. If None, an empty document is written.
+    :param path: the path of the game dump.
+    :return: None
+    """
+    if game is None:
+        with open_game_dump(path, "w") as f:
+            f.write("{}\n")
+        return
+    with GameDumpWriter(path, game.configuration, game.initialization) as writer:
+        for tx in game.transactions:
+            writer.write_transaction(tx)
+
+
+def read_game_dump(
+    path: str,
+) -> Optional[Tuple[GameConfiguration, GameInitialization, Iterator[Transaction]]]:
+    """
+    Read a game dump incrementally.
+
+    Dumps that are not laid out one transaction per line (e.g. written with json.dump) are read as a whole.
+
+    :param path: the path of the game dump.
+    :return: the configuration, the initialization and an iterator over the transactions; None if the dump is empty.
+    """
+    f = open_game_dump(path, "r")
+    first_line = f.readline()
+    if not first_line.endswith(_TRANSACTIONS_START):
+        content = json.loads(first_line + f.read())
+        f.close()
+        if content == {}:
+            return None
+        transactions = iter(
+            [Transaction.from_dict(tx_dict) for tx_dict in content["transactions"]]
+        )
+        return (
+            GameConfiguration.from_dict(content["configuration"]),
+            GameInitialization.from_dict(content["initialization"]),
+            transactions,
+        )
+
+    header = json.loads(first_line[: -len(_TRANSACTIONS_START)] + "}")
+
+    def _transactions() -> Iterator[Transaction]:
+        with f:
+            for line in f:
+                if line == _TRANSACTIONS_END:
+                    return
+                yield Transaction.from_dict(json.loads(line.rstrip(",\n")))
+            raise ValueError("Truncated game dump: {}".format(path))
+
+    return (
+        GameConfiguration.from_dict(header["configuration"]),
+        GameInitialization.from_dict(header["initialization"]),
+        _transactions(),
+    )
+
+
+def load_game(path: str) -> Optional[Game]:
+    """
+    Load a game from its dump, settling one transaction at a time.
+
+    :param path: the path of the game dump.
+    :return: the game, or None if the dump is empty.
+    """
+    game_dump = read_game_dump(path)
+    if game_dump is None:
+        return None
+    configuration, initialization, transactions = game_dump
+    game = Game(configuration, initialization)
+    for tx in transactions:
+        game.settle_transaction(tx)
+    return game
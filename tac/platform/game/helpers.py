@@ -242,6 +242,43 @@ def marginal_utility(
     return new_utility - current_utility
 
 
+def marginal_utilities_of_unit_changes(
+    utility_function_params: List[float],
+    current_holdings: List[int],
+    delta: int,
+    quantity_shift: int = QUANTITY_SHIFT,
+) -> np.ndarray:
+    """
+    Compute, for every good, the agent's marginal utility of changing her holdings of that good only by a delta.
+
+    The logarithmic utility is a sum over the goods, hence the change of a single good only changes its own term,
+    and all the marginal utilities are computed in a single pass. For every good, this is equal to the
+    marginal_utility of the delta holdings with the delta for the good and zeros elsewhere.
+
+    >>> marginal_utilities_of_unit_changes([1.0, 2.0], [0, 1], 1).round(4).tolist()
+    [0.6931, 0.8109]
+
+    :param utility_function_params: utility function params of the agent
+    :param current_holdings: a list of goods with the quantity for each good
+    :param delta: the change of the holdings of each good (e.g. 1 or -1)
+    :param quantity_shift: a factor to shift the quantities in the utility function (to ensure the natural logarithm can be used on the entire range of quantities)
+    :return: the array of the marginal utilities, one per good
+    """
+    params = np.asarray(utility_function_params, dtype=float)
+    shifted_holdings = np.asarray(current_holdings, dtype=float) + quantity_shift
+
+    def goodwise_utility(quantities: np.ndarray) -> np.ndarray:
+        """Compute the term of every good in the logarithmic utility."""
+        is_positive = quantities > 0
+        return np.where(
+            is_positive, params * np.log(np.where(is_positive, quantities, 1.0)), -10000
+        )
+
+    return goodwise_utility(shifted_holdings + delta) - goodwise_utility(
+        shifted_holdings
+    )
+
+
 def make_agent_name(agent_id: int, is_world_modeling: bool, nb_agents: int) -> str:
     """
     Make the name for baseline agents from an integer identifier.
@@ -146,17 +146,17 @@ class GameStats:
     def tx_counts(self) -> Dict[str, Dict[str, int]]:
         """Get the tx counts."""
         agent_pbk_to_name = self.game.configuration.agent_pbk_to_name
-        result = {agent_name: 0 for agent_name in agent_pbk_to_name.values()}
-        results = {"seller": result.copy(), "buyer": result.copy()}
-
-        temp_game = Game(self.game.configuration, self.game.initialization)
+        results = {
+            "seller": {},
+            "buyer": {},
+        }  # type: Dict[str, Dict[str, int]]
 
-        # compute the partial scores for every agent after every transaction
-        # (remember that indexes of the transaction start from one, because index 0 is reserved for the initial scores)
-        for idx, tx in enumerate(self.game.transactions):
-            temp_game.settle_transaction(tx)
-            results["seller"][agent_pbk_to_name[tx.seller_pbk]] += 1
-            results["buyer"][agent_pbk_to_name[tx.buyer_pbk]] += 1
+        # read the history of every agent, where the agent is the sender of every transaction.
+        for agent_pbk, agent_name in agent_pbk_to_name.items():
+            history = self.game.transactions.view(agent_pbk)
+            nb_buys = sum(1 for tx in history if tx.is_sender_buyer)
+            results["seller"][agent_name] = len(history) - nb_buys
+            results["buyer"][agent_name] = nb_buys
 
         return results
 
@@ -164,17 +164,14 @@ class GameStats:
         """Get the tx counts."""
         agent_pbk_to_name = self.game.configuration.agent_pbk_to_name
         results = {
-            agent_name: [] for agent_name in agent_pbk_to_name.values()
+            agent_name: [
+                tx.amount
+                for tx in self.game.transactions.view(agent_pbk)
+                if not tx.is_sender_buyer
+            ]
+            for agent_pbk, agent_name in agent_pbk_to_name.items()
         }  # type: Dict[str, List[float]]
 
-        temp_game = Game(self.game.configuration, self.game.initialization)
-
-        # compute the partial scores for every agent after every transaction
-        # (remember that indexes of the transaction start from one, because index 0 is reserved for the initial scores)
-        for idx, tx in enumerate(self.game.transactions):
-            temp_game.settle_transaction(tx)
-            results[agent_pbk_to_name[tx.seller_pbk]].append(tx.amount)
-
         return results
 
     def eq_vs_mean_price(self) -> Tuple[List[str], np.ndarray]:
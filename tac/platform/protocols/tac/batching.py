@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+Coalescing of the TAC messages sent to the same recipient.
+
+The TAC messages put in a BatchingOutBox are held until the outbox is flushed, e.g. at the end of every cycle
+of the agent. Then, the messages to a recipient which supports the BATCH messages are sent in a single envelope,
+and the messages to the other recipients are sent one per envelope, as before.
+The BatchingOutBox wraps the outbox of the mailbox of the agent, and sends the envelopes through it.
+"""
+
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from aea.mail.base import Address, Envelope, OutBox, ProtocolId
+from .message import TACMessage
+from .serialization import TACSerializer
+
+
+class BatchingOutBox(object):
+    """An outbox which coalesces the TAC messages to the same recipient until it is flushed."""
+
+    def __init__(
+        self,
+        outbox: OutBox,
+        get_serializer: Callable[[Address], Optional[TACSerializer]],
+    ) -> None:
+        """
+        Initialize the outbox.
+
+        :param outbox: the outbox the envelopes are sent through, e.g. the outbox of the mailbox.
+        :param get_serializer: a function returning the serializer of the messages to a recipient, or None if the recipient is unknown.
+        :return: None
+        """
+        self.outbox = outbox
+        self._get_serializer = get_serializer
+        self._pending = (
+            OrderedDict()
+        )  # type: Dict[Tuple[Address, Address], List[bytes]]
+
+    @property
+    def nb_pending(self) -> int:
+        """Get the number of TAC messages waiting for the next flush."""
+        return sum(len(messages) for messages in self._pending.values())
+
+    def empty(self) -> bool:
+        """
+        Check whether the outbox is empty, i.e. no envelope is waiting to be sent or flushed.
+
+        :return: boolean indicating whether the outbox is empty
+        """
+        return len(self._pending) == 0 and self.outbox.empty()
+
+    def put(self, item: Envelope) -> None:
+        """
+        Put an envelope in the outbox. The TAC messages are held until the next flush.
+
+        :param item: the envelope.
+        :return: None
+        """
+        if item.protocol_id == TACMessage.protocol_id:
+            self._pending.setdefault((item.to, item.sender), []).append(item.message)
+        else:
+            self.outbox.put(item)
+
+    def put_message(
+        self, to: Address, sender: Address, protocol_id: ProtocolId, message: bytes
+    ) -> None:
+        """
+        Put a message in the outbox. The TAC messages are held until the next flush.
+
+        :param to: the recipient of the message.
+        :param sender: the sender of the message.
+        :param protocol_id: the protocol id.
+        :param message: the content of the message.
+        :return: None
+        """
+        self.put(
+            Envelope(to=to, sender=sender, protocol_id=protocol_id, message=message)
+        )
+
+    def flush(self) -> int:
+        """
+        Send the TAC messages held since the last flush, in a BATCH message per recipient when possible.
+
+        :return: the number of envelopes sent.
+        """
+        nb_envelopes = 0
+        for (to, sender), messages in self._pending.items():
+            serializer = self._get_serializer(to)
+            if (
+                len(messages) > 1
+                and serializer is not None
+                and serializer.supports_batch
+            ):
+                messages = [serializer.encode_batch(messages)]
+            for message in messages:
+                self.outbox.put(
+                    Envelope(
+                        to=to,
+                        sender=sender,
+                        protocol_id=TACMessage.protocol_id,
+                        message=message,
+                    )
+                )
+            nb_envelopes += len(messages)
+        self._pending.clear()
+        return nb_envelopes
@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""
+Compression of the TAC messages.
+
+A serialized TACMessage larger than a threshold can be compressed and wrapped in a TACMessage
+which carries only the compression and the compressed bytes.
+The compressors are primed with a dictionary of the strings which recur in the TAC messages (field tags,
+good public keys and names), built from sample messages so that every agent derives the same bytes.
+zlib is always available; zstd needs the 'zstandard' package.
+The size of a decompressed message is bounded, so that a small compressed message cannot expand to an arbitrary size.
+"""
+
+import functools
+import zlib
+from typing import List, Optional, Sequence
+
+from . import tac_pb2
+
+ZLIB = "zlib"
+ZSTD = "zstd"
+
+DEFAULT_COMPRESSION_THRESHOLD = 4096
+
+# zlib only uses the last 32KB of a dictionary.
+MAX_DICTIONARY_SIZE = 32768
+
+# the maximum size (in bytes) of a decompressed message.
+MAX_DECOMPRESSED_SIZE = 64 * 1024 * 1024
+
+COMPRESSION_TO_PB = {
+    ZLIB: tac_pb2.TACMessage.ZLIB,
+    ZSTD: tac_pb2.TACMessage.ZSTD,
+}
+PB_TO_COMPRESSION = {value: key for key, value in COMPRESSION_TO_PB.items()}
+
+
+def _is_zstd_available() -> bool:
+    """Check whether the 'zstandard' package is installed."""
+    try:
+        import zstandard  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def supported_compressions() -> List[str]:
+    """
+    Get the compressions supported by this agent, from the preferred one.
+
+    :return: the names of the compressions.
+    """
+    return [ZSTD, ZLIB] if _is_zstd_available() else [ZLIB]
+
+
+def choose_compression(compressions: Sequence[str]) -> Optional[str]:
+    """
+    Choose the compression to use with a peer.
+
+    :param compressions: the compressions supported by the peer.
+    :return: the preferred compression supported by both, or None if there is none.
+    """
+    for compression in supported_compressions():
+        if compression in compressions:
+            return compression
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def compression_dictionary() -> bytes:
+    """
+    Get the dictionary of the compressors.
+
+    It is the concatenation of sample TAC messages of games with 10, 100 and 1000 goods,
+    with the most frequent content at the end, where zlib and zstd find it at the shortest distances.
+
+    :return: the dictionary.
+    """
+    samples = []
+    for nb_digits in (3, 2, 1):
+        string_format = "tac_good_{:0" + str(nb_digits) + "}"
+        good_names = [string_format.format(i) for i in range(10)]
+        good_pbks = [good_name + "_pbk" for good_name in good_names]
+
+        game_data = tac_pb2.TACController.GameData()  # type: ignore
+        game_data.good_pbks.extend(good_pbks)
+        game_data.good_names.extend(good_names)
+        for good_pbk, good_name in zip(good_pbks, good_names):
+            pair = game_data.good_pbk_to_name.add()
+            pair.first = good_pbk
+            pair.second = good_name
+        samples.append(game_data.SerializeToString())
+
+        tx = tac_pb2.TACAgent.Transaction()  # type: ignore
+        for good_pbk in good_pbks:
+            pair = tx.quantities.add()
+            pair.first = good_pbk
+            pair.second = 1
+        samples.append(tx.SerializeToString())
+    return b"".join(samples)[-MAX_DICTIONARY_SIZE:]
+
+
+def compress(data: bytes, compression: str) -> bytes:
+    """
+    Compress data.
+
+    >>> data = b"tac_good_0_pbk" * 100
+    >>> decompress(compress(data, ZLIB), ZLIB) == data
+    True
+
+    :param data: the data.
+    :param compression: the name of the compression.
+    :return: the compressed data.
+    :raises ValueError: if the compression is not supported.
+    """
+    if compression == ZLIB:
+        compressor = zlib.compressobj(zdict=compression_dictionary())
+        return compressor.compress(data) + compressor.flush()
+    if compression == ZSTD:
+        return _zstd_compressor().compress(data)
+    raise ValueError("Compression not supported: {}".format(compression))
+
+
+def decompress(
+    data: bytes, compression: str, max_size: int = MAX_DECOMPRESSED_SIZE
+) -> bytes:
+    """
+    Decompress data.
+
+    >>> decompress(compress(b"tac_good_0_pbk" * 100, ZLIB), ZLIB, max_size=100)
+    Traceback (most recent call last):
+    ...
+    ValueError: Decompressed data larger than 100 bytes.
+
+    :param data: the compressed data.
+    :param compression: the name of the compression.
+    :param max_size: the maximum size (in bytes) of the decompressed data.
+    :return: the data.
+    :raises ValueError: if the compression is not supported, if the data is not a single complete compressed stream,
+                        or if the decompressed data is larger than the maximum size.
+    """
+    if compression == ZLIB:
+        return _zlib_decompress(data, max_size)
+    if compression == ZSTD:
+        return _zstd_decompress(data, max_size)
+    raise ValueError("Compression not supported: {}".format(compression))
+
+
+def _zlib_decompress(data: bytes, max_size: int) -> bytes:
+    """Decompress zlib data, without producing more than the maximum size."""
+    decompressor = zlib.decompressobj(zdict=compression_dictionary())
+    try:
+        # max_length=0 means no limit, hence ask for one more byte than allowed.
+        decompressed = decompressor.decompress(data, max_size + 1)
+    except zlib.error as e:
+        raise ValueError("Invalid zlib data: {}".format(e))
+    if len(decompressed) > max_size or decompressor.unconsumed_tail:
+        raise ValueError("Decompressed data larger than {} bytes.".format(max_size))
+    if not decompressor.eof:
+        raise ValueError("Truncated zlib data.")
+    if decompressor.unused_data:
+        raise ValueError("Unexpected data after the zlib stream.")
+    return decompressed
+
+
+@functools.lru_cache(maxsize=None)
+def _zstd_dictionary():
+    """Get the dictionary of the zstd compressors."""
+    import zstandard
+
+    return zstandard.ZstdCompressionDict(
+        compression_dictionary(), dict_type=zstandard.DICT_TYPE_RAWCONTENT
+    )
+
+
+def _zstd_compressor():
+    """Get a zstd compressor primed with the dictionary."""
+    import zstandard
+
+    return zstandard.ZstdCompressor(dict_data=_zstd_dictionary())
+
+
+def _zstd_decompressor():
+    """Get a zstd decompressor primed with the dictionary."""
+    import zstandard
+
+    return zstandard.ZstdDecompressor(dict_data=_zstd_dictionary())
+
+
+def _zstd_decompress(data: bytes, max_size: int) -> bytes:
+    """
+    Decompress a zstd frame, without producing more than the maximum size.
+
+    The frame must declare its content size (as the frames of compress do), which is checked before decompressing:
+    the output of a frame is allocated from its declared size, whatever the max_output_size, and zstd fails
+    as soon as the frame produces more than it declared.
+    """
+    import zstandard
+
+    try:
+        content_size = zstandard.frame_content_size(data)
+        if content_size < 0:
+            raise ValueError("The zstd frame does not declare its content size.")
+        if content_size > max_size:
+            raise ValueError(
+                "Decompressed data larger than {} bytes.".format(max_size)
+            )
+        decompressor = _zstd_decompressor().decompressobj()
+        decompressed = decompressor.decompress(data)
+    except zstandard.ZstdError as e:
+        raise ValueError("Invalid zstd data: {}".format(e))
+    if len(decompressed) > max_size or decompressor.unconsumed_tail:
+        raise ValueError("Decompressed data larger than {} bytes.".format(max_size))
+    if not decompressor.eof:
+        raise ValueError("Truncated zstd data.")
+    if decompressor.unused_data:
+        raise ValueError("Unexpected data after the zstd frame.")
+    return decompressed
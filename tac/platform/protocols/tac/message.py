@@ -20,7 +20,7 @@
 
 """This module contains the default message definition."""
 from enum import Enum
-from typing import Dict, Optional, cast
+from typing import Dict, List, Optional, cast
 
 from aea.protocols.base.message import Message
 
@@ -42,6 +42,7 @@ class TACMessage(Message):
         TRANSACTION_CONFIRMATION = "transaction_confirmation"
         STATE_UPDATE = "state_update"
         TAC_ERROR = "tac_error"
+        BATCH = "batch"
 
         def __str__(self):
             """Get string representation."""
@@ -60,6 +61,8 @@ class TACMessage(Message):
         AGENT_NAME_NOT_IN_WHITELIST = 7
         COMPETITION_NOT_RUNNING = 8
         DIALOGUE_INCONSISTENT = 9
+        RATE_LIMIT_EXCEEDED = 10
+        TRANSACTION_ALREADY_SETTLED = 11
 
     _from_ec_to_msg = {
         ErrorCode.GENERIC_ERROR: "Unexpected error.",
@@ -72,6 +75,8 @@ class TACMessage(Message):
         ErrorCode.AGENT_NAME_NOT_IN_WHITELIST: "Agent name not in whitelist.",
         ErrorCode.COMPETITION_NOT_RUNNING: "The competition is not running yet.",
         ErrorCode.DIALOGUE_INCONSISTENT: "The message is inconsistent with the dialogue.",
+        ErrorCode.RATE_LIMIT_EXCEEDED: "Too many messages, slow down.",
+        ErrorCode.TRANSACTION_ALREADY_SETTLED: "A transaction with the same id has already been settled.",
     }  # type: Dict[ErrorCode, str]
 
     def __init__(self, tac_type: Optional[Type] = None, **kwargs):
@@ -130,6 +135,10 @@ class TACMessage(Message):
                 assert self.is_set("error_code")
                 error_code = self.get("error_code")
                 assert error_code in set(self.ErrorCode)
+            elif tac_type == TACMessage.Type.BATCH:
+                assert self.is_set("messages")
+                messages = cast(List[bytes], self.get("messages"))
+                assert all(isinstance(message, bytes) for message in messages)
             else:
                 raise ValueError("Type not recognized.")
         except (AssertionError, ValueError):
@@ -18,15 +18,50 @@
 #
 # ------------------------------------------------------------------------------
 
-"""Serialization for the TAC protocol."""
+"""
+Serialization for the TAC protocol.
 
-from typing import Any, Dict, List, cast
+Two schemas share the same protobuf messages:
+- v1 references agents and goods by public key, with the bundles and the name maps as lists of pairs;
+- v2 references them by their index in the game (see GameIndex), with the bundles as packed lists of quantities
+  and the name maps as parallel lists.
+
+The decoder detects the schema of every message, so v1 and v2 peers can be mixed.
+The encoder uses v2 only when it is allowed to (see TACSerializer) and falls back to v1 otherwise.
+
+Independently of the schema, a large message can be compressed (see the compression module).
+A receiver reading the type of a message before decoding it gets the decompressed message along with the type,
+so that the message is decompressed once (see peek_type_and_decompress).
+
+From v3, several messages to the same recipient can be sent in a single BATCH message,
+which carries them already serialized (see TACSerializer.encode_batch).
+
+Every message can carry the version id of the game it belongs to, so that a controller hosting several games
+routes it without parsing its content (see peek_version_id).
+"""
+
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from aea.protocols.base.message import Message
 from aea.protocols.base.serialization import Serializer
 from . import tac_pb2
+from .compression import (
+    COMPRESSION_TO_PB,
+    DEFAULT_COMPRESSION_THRESHOLD,
+    PB_TO_COMPRESSION,
+    compress,
+    decompress,
+)
 from .message import TACMessage
 
+TAC_SCHEMA_VERSION = 3
+# The first schema version supporting the BATCH messages.
+BATCH_SCHEMA_VERSION = 3
+
+# A function decoding a field from a protobuf message, given the index of the game (if any).
+FieldDecoder = Callable[[Any, Optional["GameIndex"]], Any]
+
 
 def _from_dict_to_pairs(d):
     """Convert a flat dictionary into a list of StrStrPair or StrIntPair."""
@@ -55,9 +90,609 @@ def _from_pairs_to_dict(pairs):
     return result
 
 
+def _get(obj: Any, field: str) -> Any:
+    """Get a field of a dictionary, a message or an object (e.g. GameData or Transaction)."""
+    if isinstance(obj, (dict, Message)):
+        return obj.get(field)
+    return getattr(obj, field)
+
+
+class GameIndex:
+    """
+    The index of the agents and the goods of a game, used by the v2 schema.
+
+    Agents and goods are indexed in the order of their public keys, so that both ends
+    of a connection derive the same index from the name maps of the game.
+    """
+
+    def __init__(self, agent_pbks: Iterable[str], good_pbks: Iterable[str]) -> None:
+        """
+        Initialize the index.
+
+        :param agent_pbks: the public keys of the agents.
+        :param good_pbks: the public keys of the goods.
+        :return: None
+        """
+        self.agent_pbks = sorted(agent_pbks)
+        self.good_pbks = sorted(good_pbks)
+        self.agent_pbk_to_index = {
+            agent_pbk: i for i, agent_pbk in enumerate(self.agent_pbks)
+        }  # type: Dict[str, int]
+
+
+def _encode_game_data(
+    game_data_pb: tac_pb2.TACController.GameData, game_data: Any, schema_version: int  # type: ignore
+) -> bool:
+    """
+    Encode the game data.
+
+    :param game_data_pb: the protobuf message to fill.
+    :param game_data: the game data, as a dictionary, a message or a GameData object.
+    :param schema_version: the maximum schema version allowed.
+    :return: True if the v2 schema has been used, False otherwise.
+    """
+    game_data_pb.money = _get(game_data, "money")
+    game_data_pb.endowment.extend(_get(game_data, "endowment"))
+    game_data_pb.utility_params.extend(_get(game_data, "utility_params"))
+    game_data_pb.nb_agents = _get(game_data, "nb_agents")
+    game_data_pb.nb_goods = _get(game_data, "nb_goods")
+    game_data_pb.tx_fee = _get(game_data, "tx_fee")
+    agent_pbk_to_name = _get(game_data, "agent_pbk_to_name")
+    good_pbk_to_name = _get(game_data, "good_pbk_to_name")
+    if schema_version >= 2:
+        agent_pbks = sorted(agent_pbk_to_name.keys())
+        good_pbks = sorted(good_pbk_to_name.keys())
+        game_data_pb.agent_pbks.extend(agent_pbks)
+        game_data_pb.agent_names.extend(
+            [agent_pbk_to_name[agent_pbk] for agent_pbk in agent_pbks]
+        )
+        game_data_pb.good_pbks.extend(good_pbks)
+        game_data_pb.good_names.extend(
+            [good_pbk_to_name[good_pbk] for good_pbk in good_pbks]
+        )
+        return True
+    game_data_pb.agent_pbk_to_name.extend(_from_dict_to_pairs(agent_pbk_to_name))
+    game_data_pb.good_pbk_to_name.extend(_from_dict_to_pairs(good_pbk_to_name))
+    return False
+
+
+def _is_game_data_v2(game_data_pb: tac_pb2.TACController.GameData) -> bool:  # type: ignore
+    """Check whether the game data is in the v2 schema."""
+    return len(game_data_pb.agent_pbks) > 0 or len(game_data_pb.good_pbks) > 0
+
+
+def _decode_agent_pbk_to_name(
+    game_data_pb: tac_pb2.TACController.GameData,  # type: ignore
+) -> Dict[str, str]:
+    """Decode the mapping from the public keys to the names of the agents, in either schema."""
+    if _is_game_data_v2(game_data_pb):
+        return dict(zip(game_data_pb.agent_pbks, game_data_pb.agent_names))
+    return _from_pairs_to_dict(game_data_pb.agent_pbk_to_name)
+
+
+def _decode_good_pbk_to_name(
+    game_data_pb: tac_pb2.TACController.GameData,  # type: ignore
+) -> Dict[str, str]:
+    """Decode the mapping from the public keys to the names of the goods, in either schema."""
+    if _is_game_data_v2(game_data_pb):
+        return dict(zip(game_data_pb.good_pbks, game_data_pb.good_names))
+    return _from_pairs_to_dict(game_data_pb.good_pbk_to_name)
+
+
+def _decode_game_data(game_data_pb: tac_pb2.TACController.GameData) -> Dict[str, Any]:  # type: ignore
+    """
+    Decode the game data, in either schema.
+
+    :param game_data_pb: the protobuf message.
+    :return: the game data, as a dictionary.
+    """
+    return {
+        key: decode_field(game_data_pb, None)
+        for key, decode_field in _GAME_DATA_FIELDS.items()
+    }
+
+
+_GAME_DATA_FIELDS = {
+    "money": lambda g, i: g.money,
+    "endowment": lambda g, i: list(g.endowment),
+    "utility_params": lambda g, i: list(g.utility_params),
+    "nb_agents": lambda g, i: g.nb_agents,
+    "nb_goods": lambda g, i: g.nb_goods,
+    "tx_fee": lambda g, i: g.tx_fee,
+    "agent_pbk_to_name": lambda g, i: _decode_agent_pbk_to_name(g),
+    "good_pbk_to_name": lambda g, i: _decode_good_pbk_to_name(g),
+}  # type: Dict[str, FieldDecoder]
+
+
+def _encode_transaction(
+    tx_pb: tac_pb2.TACAgent.Transaction, tx: Any, game_index: Optional[GameIndex]  # type: ignore
+) -> bool:
+    """
+    Encode a transaction.
+
+    The v2 schema is used only if the index is available and the bundle lists a quantity for every good of the game.
+
+    :param tx_pb: the protobuf message to fill.
+    :param tx: the transaction, as a dictionary, a message or a Transaction object.
+    :param game_index: the index of the game, if the v2 schema is allowed.
+    :return: True if the v2 schema has been used, False otherwise.
+    """
+    tx_pb.transaction_id = _get(tx, "transaction_id")
+    tx_pb.is_sender_buyer = _get(tx, "is_sender_buyer")
+    tx_pb.amount = _get(tx, "amount")
+    counterparty = _get(tx, "counterparty")
+    quantities_by_good_pbk = _get(tx, "quantities_by_good_pbk")
+    if (
+        game_index is not None
+        and len(game_index.good_pbks) > 0
+        and len(quantities_by_good_pbk) == len(game_index.good_pbks)
+        and counterparty in game_index.agent_pbk_to_index
+    ):
+        try:
+            quantities = [
+                quantities_by_good_pbk[good_pbk] for good_pbk in game_index.good_pbks
+            ]
+        except KeyError:
+            pass
+        else:
+            tx_pb.counterparty_index = game_index.agent_pbk_to_index[counterparty]
+            tx_pb.quantities_by_index.extend(quantities)
+            return True
+    tx_pb.counterparty = counterparty
+    tx_pb.quantities.extend(_from_dict_to_pairs(quantities_by_good_pbk))
+    return False
+
+
+def _decode_counterparty(
+    tx_pb: tac_pb2.TACAgent.Transaction, game_index: Optional[GameIndex]  # type: ignore
+) -> str:
+    """Decode the counterparty of a transaction, in either schema."""
+    if len(tx_pb.quantities_by_index) > 0:
+        if game_index is None:
+            raise ValueError("Cannot decode a v2 transaction without the game index.")
+        return game_index.agent_pbks[tx_pb.counterparty_index]
+    return tx_pb.counterparty
+
+
+def _decode_quantities(
+    tx_pb: tac_pb2.TACAgent.Transaction, game_index: Optional[GameIndex]  # type: ignore
+) -> Dict[str, int]:
+    """Decode the bundle of a transaction, in either schema."""
+    if len(tx_pb.quantities_by_index) > 0:
+        if game_index is None:
+            raise ValueError("Cannot decode a v2 transaction without the game index.")
+        return dict(zip(game_index.good_pbks, tx_pb.quantities_by_index))
+    return _from_pairs_to_dict(tx_pb.quantities)
+
+
+def _decode_transaction(
+    tx_pb: tac_pb2.TACAgent.Transaction, game_index: Optional[GameIndex]  # type: ignore
+) -> Dict[str, Any]:
+    """
+    Decode a transaction, in either schema.
+
+    :param tx_pb: the protobuf message.
+    :param game_index: the index of the game.
+    :return: the transaction, as a dictionary.
+    :raises ValueError: if the transaction is in the v2 schema and the index is not available.
+    """
+    return {
+        key: decode_field(tx_pb, game_index)
+        for key, decode_field in _TRANSACTION_FIELDS.items()
+    }
+
+
+_TRANSACTION_FIELDS = {
+    "transaction_id": lambda t, i: t.transaction_id,
+    "is_sender_buyer": lambda t, i: t.is_sender_buyer,
+    "counterparty": _decode_counterparty,
+    "amount": lambda t, i: t.amount,
+    "quantities_by_good_pbk": _decode_quantities,
+}  # type: Dict[str, FieldDecoder]
+
+
+def _decode_state_update_transactions(
+    state_update_pb: tac_pb2.TACController.StateUpdate,  # type: ignore
+) -> List[Dict[str, Any]]:
+    """Decode the transactions of a state update, with the index of the game given by its initial state."""
+    initial_state = state_update_pb.initial_state
+    if _is_game_data_v2(initial_state):
+        game_index = GameIndex(initial_state.agent_pbks, initial_state.good_pbks)
+    else:
+        game_index = GameIndex(
+            [pair.first for pair in initial_state.agent_pbk_to_name],
+            [pair.first for pair in initial_state.good_pbk_to_name],
+        )
+    return [_decode_transaction(tx_pb, game_index) for tx_pb in state_update_pb.txs]
+
+
+# The value returned by the decoder of an optional field which is not set.
+_UNSET = object()
+
+
+def _decode_schema_version(container: tac_pb2.TACMessage) -> Any:  # type: ignore
+    """Decode the schema version of a message, which is not set for v1."""
+    if container.register.schema_version:
+        return container.register.schema_version
+    return container.schema_version or _UNSET
+
+
+def _content_fields(
+    content: str, fields: Dict[str, FieldDecoder]
+) -> Dict[str, FieldDecoder]:
+    """
+    Turn the decoders of the fields of a content message into decoders of the fields of the container.
+
+    :param content: the name of the content in the container.
+    :param fields: the decoders of the fields of the content.
+    :return: the decoders of the same fields, from the container.
+    """
+
+    def from_container(decode_field: FieldDecoder) -> FieldDecoder:
+        return lambda c, i: decode_field(getattr(c, content), i)
+
+    return {key: from_container(decode_field) for key, decode_field in fields.items()}
+
+
+_CONTENT_TO_TYPE = {
+    "register": TACMessage.Type.REGISTER,
+    "unregister": TACMessage.Type.UNREGISTER,
+    "transaction": TACMessage.Type.TRANSACTION,
+    "get_state_update": TACMessage.Type.GET_STATE_UPDATE,
+    "cancelled": TACMessage.Type.CANCELLED,
+    "game_data": TACMessage.Type.GAME_DATA,
+    "transaction_confirmation": TACMessage.Type.TRANSACTION_CONFIRMATION,
+    "state_update": TACMessage.Type.STATE_UPDATE,
+    "error": TACMessage.Type.TAC_ERROR,
+    "batch": TACMessage.Type.BATCH,
+}  # type: Dict[str, TACMessage.Type]
+
+_FIELD_NUMBER_TO_TYPE = {
+    field.number: _CONTENT_TO_TYPE.get(field.name)
+    for field in tac_pb2.TACMessage.DESCRIPTOR.oneofs_by_name["content"].fields
+}  # type: Dict[int, Optional[TACMessage.Type]]
+_COMPRESSED_FIELD_NUMBER = tac_pb2.TACMessage.DESCRIPTOR.fields_by_name[
+    "compressed"
+].number
+_VERSION_ID_FIELD_NUMBER = tac_pb2.TACMessage.DESCRIPTOR.fields_by_name[
+    "version_id"
+].number
+
+# For every type of message, the functions decoding its fields from the container and the game index.
+_FIELDS = {
+    TACMessage.Type.REGISTER: {
+        "agent_name": lambda c, i: c.register.agent_name,
+        "compressions": lambda c, i: [
+            PB_TO_COMPRESSION[compression]
+            for compression in c.register.compressions
+            if compression in PB_TO_COMPRESSION
+        ]
+        or _UNSET,
+    },
+    TACMessage.Type.UNREGISTER: {},
+    TACMessage.Type.TRANSACTION: _content_fields("transaction", _TRANSACTION_FIELDS),
+    TACMessage.Type.GET_STATE_UPDATE: {},
+    TACMessage.Type.CANCELLED: {},
+    TACMessage.Type.GAME_DATA: _content_fields("game_data", _GAME_DATA_FIELDS),
+    TACMessage.Type.TRANSACTION_CONFIRMATION: {
+        "transaction_id": lambda c, i: c.transaction_confirmation.transaction_id,
+    },
+    TACMessage.Type.STATE_UPDATE: {
+        "initial_state": lambda c, i: _decode_game_data(c.state_update.initial_state),
+        "transactions": lambda c, i: _decode_state_update_transactions(c.state_update),
+    },
+    TACMessage.Type.TAC_ERROR: {
+        "error_code": lambda c, i: TACMessage.ErrorCode(c.error.error_code),
+        "error_msg": lambda c, i: c.error.error_msg or _UNSET,
+        "details": lambda c, i: dict(c.error.details) if c.error.details else _UNSET,
+    },
+    TACMessage.Type.BATCH: {"messages": lambda c, i: list(c.batch.messages)},
+}  # type: Dict[TACMessage.Type, Dict[str, FieldDecoder]]
+for _fields in _FIELDS.values():
+    _fields["schema_version"] = lambda c, i: _decode_schema_version(c)
+    _fields["version_id"] = lambda c, i: c.version_id or _UNSET
+
+
+def _read_varint(obj: bytes, pos: int) -> Tuple[int, int]:
+    """
+    Read a varint of the protobuf wire format.
+
+    :param obj: the bytes.
+    :param pos: the position of the varint.
+    :return: the value and the position after the varint.
+    :raises ValueError: if the bytes end before the varint.
+    """
+    result = 0
+    shift = 0
+    while True:
+        if pos >= len(obj):
+            raise ValueError("Truncated message.")
+        b = obj[pos]
+        pos += 1
+        result |= (b & 0x7F) << shift
+        if not b & 0x80:
+            return result, pos
+        shift += 7
+
+
+def _iter_fields(obj: bytes) -> Iterator[Tuple[int, int, int]]:
+    """
+    Iterate over the top-level fields of an encoded protobuf message, without parsing their content.
+
+    :param obj: the bytes.
+    :return: an iterator over the number, the start and the end of the value of every field.
+    :raises ValueError: if the bytes are not a protobuf message.
+    """
+    pos = 0
+    end = len(obj)
+    while pos < end:
+        tag, pos = _read_varint(obj, pos)
+        field_number, wire_type = tag >> 3, tag & 0x07
+        start = pos
+        if wire_type == 0:
+            _, pos = _read_varint(obj, pos)
+        elif wire_type == 1:
+            pos += 8
+        elif wire_type == 2:
+            length, start = _read_varint(obj, pos)
+            pos = start + length
+        elif wire_type == 5:
+            pos += 4
+        else:
+            raise ValueError("Unsupported wire type: {}".format(wire_type))
+        if pos > end:
+            raise ValueError("Truncated message.")
+        yield field_number, start, pos
+
+
+def peek_type(
+    obj: bytes, allow_compressed: bool = True
+) -> Optional[TACMessage.Type]:
+    """
+    Get the type of an encoded TAC message, without parsing its content.
+
+    Only the tags of the top-level fields are read; the content is skipped.
+    A compressed message is decompressed first, if allowed. To decode the message afterwards,
+    use peek_type_and_decompress instead, which also returns the decompressed message.
+
+    >>> peek_type(TACSerializer().encode(TACMessage(tac_type=TACMessage.Type.UNREGISTER)))
+    <Type.UNREGISTER: 'unregister'>
+
+    :param obj: the bytes object
+    :param allow_compressed: whether the message may be compressed.
+    :return: the type of the message, or None if the message has no content or a content of a type unknown to TACMessage.
+    :raises ValueError: if the bytes are not a protobuf message, if the message is compressed and it is not allowed,
+                        or if it cannot be decompressed.
+    """
+    return peek_type_and_decompress(obj, allow_compressed)[0]
+
+
+def peek_type_and_decompress(
+    obj: bytes, allow_compressed: bool = True
+) -> Tuple[Optional[TACMessage.Type], bytes]:
+    """
+    Get the type of an encoded TAC message, without parsing its content, and the message decompressed.
+
+    A compressed message is decompressed, if allowed, and its type is read from the decompressed message,
+    which can be decoded without being decompressed again. The decompressed message cannot be compressed again,
+    so that a message is decompressed, and its size bounded, only once.
+
+    >>> msg = TACMessage(tac_type=TACMessage.Type.TAC_ERROR, error_code=TACMessage.ErrorCode.GENERIC_ERROR, error_msg="error " * 100)
+    >>> tac_bytes = TACSerializer(compression="zlib", compression_threshold=0).encode(msg)
+    >>> tac_type, decompressed = peek_type_and_decompress(tac_bytes)
+    >>> tac_type, len(decompressed) > len(tac_bytes), decompressed == TACSerializer().encode(msg)
+    (<Type.TAC_ERROR: 'tac_error'>, True, True)
+
+    :param obj: the bytes object
+    :param allow_compressed: whether the message may be compressed.
+    :return: the type of the message, or None if the message has no content or a content of a type unknown to TACMessage,
+             and the message, decompressed if it was compressed.
+    :raises ValueError: if the bytes are not a protobuf message, if the message is compressed and it is not allowed,
+                        or if it cannot be decompressed.
+    """
+    tac_type = None
+    for field_number, _, _ in _iter_fields(obj):
+        if field_number in _FIELD_NUMBER_TO_TYPE:
+            tac_type = _FIELD_NUMBER_TO_TYPE[field_number]
+        elif field_number == _COMPRESSED_FIELD_NUMBER:
+            if not allow_compressed:
+                raise ValueError("Compressed message not allowed.")
+            tac_container = tac_pb2.TACMessage()
+            tac_container.ParseFromString(obj)
+            decompressed = _decompress_container(tac_container)
+            return peek_type(decompressed, allow_compressed=False), decompressed
+    return tac_type, obj
+
+
+def peek_version_id(obj: bytes) -> Optional[str]:
+    """
+    Get the version id of the game of an encoded TAC message, without parsing its content.
+
+    The version id of a compressed message is also set outside of the compressed content,
+    hence the message is never decompressed.
+
+    >>> peek_version_id(TACSerializer(version_id="v1").encode(TACMessage(tac_type=TACMessage.Type.UNREGISTER)))
+    'v1'
+
+    :param obj: the bytes object
+    :return: the version id, or None if it is not set.
+    :raises ValueError: if the bytes are not a protobuf message.
+    """
+    version_id = None
+    for field_number, start, end in _iter_fields(obj):
+        if field_number == _VERSION_ID_FIELD_NUMBER:
+            version_id = obj[start:end].decode("utf-8")
+    return version_id or None
+
+
+def _decompress_container(tac_container: tac_pb2.TACMessage) -> bytes:  # type: ignore
+    """
+    Decompress the content of a compressed TAC message.
+
+    :param tac_container: the protobuf message of the compressed message.
+    :return: the serialized TAC message.
+    :raises ValueError: if the compression is not supported, or if the message cannot be decompressed (see decompress).
+    """
+    compression = PB_TO_COMPRESSION.get(tac_container.compression)
+    if compression is None:
+        raise ValueError(
+            "Compression not supported: {}".format(tac_container.compression)
+        )
+    return decompress(tac_container.compressed, compression)
+
+
+def _parse_container(obj: bytes) -> tac_pb2.TACMessage:  # type: ignore
+    """
+    Parse an encoded TAC message, decompressing it if needed.
+
+    :param obj: the bytes object
+    :return: the protobuf message.
+    :raises ValueError: if the compression is not supported, if the message cannot be decompressed (see decompress),
+                        or if the decompressed message is compressed again.
+    """
+    tac_container = tac_pb2.TACMessage()
+    tac_container.ParseFromString(obj)
+    if tac_container.compression != tac_pb2.TACMessage.NONE:
+        decompressed = _decompress_container(tac_container)
+        tac_container = tac_pb2.TACMessage()
+        tac_container.ParseFromString(decompressed)
+        if tac_container.compression != tac_pb2.TACMessage.NONE:
+            raise ValueError("Compressed message not allowed.")
+    return tac_container
+
+
+class LazyTACMessage(TACMessage):
+    """
+    A TACMessage decoded lazily.
+
+    Only the type is known at creation time. The protobuf message is parsed on the first access
+    to another field, and every field is converted to Python objects on its first access.
+    """
+
+    def __init__(
+        self,
+        tac_bytes: bytes,
+        tac_type: TACMessage.Type,
+        game_index: Optional[GameIndex] = None,
+        on_decode: Optional[Callable[[float], None]] = None,
+    ) -> None:
+        """
+        Initialize a lazy view of an encoded TAC message.
+
+        :param tac_bytes: the encoded message.
+        :param tac_type: the type of the message, e.g. from peek_type.
+        :param game_index: the index of the game, needed to decode the transactions in the v2 schema.
+        :param on_decode: the function called with the time (in seconds) spent to decode a field, parsing included. If None, the decoding is not timed.
+        :return: None
+        """
+        super().__init__(tac_type=tac_type)
+        self._tac_bytes = tac_bytes
+        self._game_index = game_index
+        self._on_decode = on_decode
+        self._container = None  # type: Optional[tac_pb2.TACMessage]
+        self._field_decoders = _FIELDS[tac_type]
+        self._pending = set(self._field_decoders.keys())
+
+    @property
+    def body(self) -> Dict:
+        """Get the body of the message, decoding the fields not decoded yet."""
+        for key in list(self._pending):
+            self._decode_field(key)
+        return self._body
+
+    @body.setter
+    def body(self, body: Dict) -> None:
+        """Set the body of the message."""
+        self._pending.clear()
+        self._body = body
+
+    def set(self, key: str, value: Any) -> None:
+        """Set key and value pair."""
+        self._pending.discard(key)
+        super().set(key, value)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get value for key."""
+        self._decode_field(key)
+        return super().get(key)
+
+    def unset(self, key: str) -> None:
+        """Unset value for key."""
+        self._pending.discard(key)
+        super().unset(key)
+
+    def is_set(self, key: str) -> bool:
+        """Check value is set for key."""
+        self._decode_field(key)
+        return super().is_set(key)
+
+    def _decode_field(self, key: str) -> None:
+        """
+        Decode a field, if it has not been decoded yet.
+
+        :param key: the name of the field.
+        :return: None
+        """
+        if key not in self._pending:
+            return
+        start = time.perf_counter() if self._on_decode is not None else 0.0
+        if self._container is None:
+            self._container = _parse_container(self._tac_bytes)
+        value = self._field_decoders[key](self._container, self._game_index)
+        self._pending.discard(key)
+        if value is not _UNSET:
+            self._body[key] = value
+        if self._on_decode is not None:
+            self._on_decode(time.perf_counter() - start)
+
+
 class TACSerializer(Serializer):
     """Serialization for the TAC protocol."""
 
+    def __init__(
+        self,
+        schema_version: int = 1,
+        game_index: Optional[GameIndex] = None,
+        compression: Optional[str] = None,
+        compression_threshold: int = DEFAULT_COMPRESSION_THRESHOLD,
+        version_id: Optional[str] = None,
+    ) -> None:
+        """
+        Initialize the serializer.
+
+        :param schema_version: the maximum schema version the encoder is allowed to use, i.e. the one supported by the receiver.
+        :param game_index: the index of the game, needed to encode and decode the transactions in the v2 schema.
+        :param compression: the compression the encoder is allowed to use, i.e. one supported by the receiver. If None, the messages are not compressed.
+        :param compression_threshold: the size (in bytes) from which a message is compressed.
+        :param version_id: the version id of the game set on the encoded messages which do not have one. If None, it is not set.
+        :return: None
+        """
+        assert 1 <= schema_version <= TAC_SCHEMA_VERSION
+        assert compression is None or compression in COMPRESSION_TO_PB
+        self.schema_version = schema_version
+        self.game_index = game_index
+        self.compression = compression
+        self.compression_threshold = compression_threshold
+        self.version_id = version_id
+
+    @property
+    def supports_batch(self) -> bool:
+        """Check whether the receiver supports the BATCH messages."""
+        return self.schema_version >= BATCH_SCHEMA_VERSION
+
+    def encode_batch(self, messages: List[bytes]) -> bytes:
+        """
+        Encode several serialized TAC messages in a single BATCH message.
+
+        The batch is compressed as a whole, like any other message.
+
+        :param messages: the serialized messages, in the order they must be handled.
+        :return: the bytes
+        """
+        return self.encode(
+            TACMessage(tac_type=TACMessage.Type.BATCH, messages=messages)
+        )
+
     def encode(self, msg: Message) -> bytes:
         """
         Decode the message.
@@ -67,25 +702,28 @@ class TACSerializer(Serializer):
         """
         tac_type = TACMessage.Type(msg.get("type"))
         tac_container = tac_pb2.TACMessage()
+        game_index = self.game_index if self.schema_version >= 2 else None
+        is_v2 = False
 
         if tac_type == TACMessage.Type.REGISTER:
             agent_name = msg.get("agent_name")
             tac_msg = tac_pb2.TACAgent.Register()  # type: ignore
             tac_msg.agent_name = agent_name
+            if msg.is_set("schema_version"):
+                tac_msg.schema_version = msg.get("schema_version")
+            if msg.is_set("compressions"):
+                tac_msg.compressions.extend(
+                    [
+                        COMPRESSION_TO_PB[compression]
+                        for compression in msg.get("compressions")
+                    ]
+                )
             tac_container.register.CopyFrom(tac_msg)
         elif tac_type == TACMessage.Type.UNREGISTER:
             tac_msg = tac_pb2.TACAgent.Unregister()  # type: ignore
             tac_container.unregister.CopyFrom(tac_msg)
         elif tac_type == TACMessage.Type.TRANSACTION:
-            tac_msg = tac_pb2.TACAgent.Transaction()  # type: ignore
-            tac_msg.transaction_id = msg.get("transaction_id")
-            tac_msg.is_sender_buyer = msg.get("is_sender_buyer")
-            tac_msg.counterparty = msg.get("counterparty")
-            tac_msg.amount = msg.get("amount")
-            tac_msg.quantities.extend(
-                _from_dict_to_pairs(msg.get("quantities_by_good_pbk"))
-            )
-            tac_container.transaction.CopyFrom(tac_msg)
+            is_v2 = _encode_transaction(tac_container.transaction, msg, game_index)
         elif tac_type == TACMessage.Type.GET_STATE_UPDATE:
             tac_msg = tac_pb2.TACAgent.GetStateUpdate()  # type: ignore
             tac_container.get_state_update.CopyFrom(tac_msg)
@@ -93,53 +731,30 @@ class TACSerializer(Serializer):
             tac_msg = tac_pb2.TACController.Cancelled()  # type: ignore
             tac_container.cancelled.CopyFrom(tac_msg)
         elif tac_type == TACMessage.Type.GAME_DATA:
-            tac_msg = tac_pb2.TACController.GameData()  # type: ignore
-            tac_msg.money = msg.get("money")
-            tac_msg.endowment.extend(msg.get("endowment"))
-            tac_msg.utility_params.extend(msg.get("utility_params"))
-            tac_msg.nb_agents = msg.get("nb_agents")
-            tac_msg.nb_goods = msg.get("nb_goods")
-            tac_msg.tx_fee = msg.get("tx_fee")
-            tac_msg.agent_pbk_to_name.extend(
-                _from_dict_to_pairs(msg.get("agent_pbk_to_name"))
-            )
-            tac_msg.good_pbk_to_name.extend(
-                _from_dict_to_pairs(msg.get("good_pbk_to_name"))
-            )
-            tac_container.game_data.CopyFrom(tac_msg)
+            is_v2 = _encode_game_data(tac_container.game_data, msg, self.schema_version)
         elif tac_type == TACMessage.Type.TRANSACTION_CONFIRMATION:
             tac_msg = tac_pb2.TACController.TransactionConfirmation()  # type: ignore
             tac_msg.transaction_id = msg.get("transaction_id")
             tac_container.transaction_confirmation.CopyFrom(tac_msg)
         elif tac_type == TACMessage.Type.STATE_UPDATE:
-            tac_msg = tac_pb2.TACController.StateUpdate()  # type: ignore
-            game_data_json = msg.get("initial_state")
-            game_data = tac_pb2.TACController.GameData()  # type: ignore
-            game_data.money = game_data_json["money"]  # type: ignore
-            game_data.endowment.extend(game_data_json["endowment"])  # type: ignore
-            game_data.utility_params.extend(game_data_json["utility_params"])  # type: ignore
-            game_data.nb_agents = game_data_json["nb_agents"]  # type: ignore
-            game_data.nb_goods = game_data_json["nb_goods"]  # type: ignore
-            game_data.tx_fee = game_data_json["tx_fee"]  # type: ignore
-            game_data.agent_pbk_to_name.extend(_from_dict_to_pairs(cast(Dict[str, str], game_data_json["agent_pbk_to_name"])))  # type: ignore
-            game_data.good_pbk_to_name.extend(_from_dict_to_pairs(cast(Dict[str, str], game_data_json["good_pbk_to_name"])))  # type: ignore
-
-            tac_msg.initial_state.CopyFrom(game_data)
-
-            transactions = []
-            msg_transactions = cast(List[Any], msg.get("transactions"))
-            for t in msg_transactions:
-                tx = tac_pb2.TACAgent.Transaction()  # type: ignore
-                tx.transaction_id = t.get("transaction_id")
-                tx.is_sender_buyer = t.get("is_sender_buyer")
-                tx.counterparty = t.get("counterparty")
-                tx.amount = t.get("amount")
-                tx.quantities.extend(
-                    _from_dict_to_pairs(t.get("quantities_by_good_pbk"))
+            state_update = tac_container.state_update
+            initial_state = msg.get("initial_state")
+            is_v2 = _encode_game_data(
+                state_update.initial_state, initial_state, self.schema_version
+            )
+            state_game_index = (
+                GameIndex(
+                    _get(initial_state, "agent_pbk_to_name").keys(),
+                    _get(initial_state, "good_pbk_to_name").keys(),
+                )
+                if is_v2
+                else None
+            )
+            for tx in msg.get("transactions"):
+                is_v2 = (
+                    _encode_transaction(state_update.txs.add(), tx, state_game_index)
+                    or is_v2
                 )
-                transactions.append(tx)
-            tac_msg.txs.extend(transactions)
-            tac_container.state_update.CopyFrom(tac_msg)
         elif tac_type == TACMessage.Type.TAC_ERROR:
             tac_msg = tac_pb2.TACController.Error()  # type: ignore
             tac_msg.error_code = TACMessage.ErrorCode(msg.get("error_code")).value
@@ -149,10 +764,32 @@ class TACSerializer(Serializer):
                 tac_msg.details.update(msg.get("details"))
 
             tac_container.error.CopyFrom(tac_msg)
+        elif tac_type == TACMessage.Type.BATCH:
+            tac_container.batch.messages.extend(msg.get("messages"))
         else:
             raise ValueError("Type not recognized: {}.".format(tac_type))
 
+        if is_v2:
+            tac_container.schema_version = self.schema_version
+        version_id = (
+            msg.get("version_id") if msg.is_set("version_id") else self.version_id
+        )
+        if version_id:
+            tac_container.version_id = version_id
         tac_message_bytes = tac_container.SerializeToString()
+        if (
+            self.compression is not None
+            and len(tac_message_bytes) >= self.compression_threshold
+        ):
+            compressed = compress(tac_message_bytes, self.compression)
+            if len(compressed) < len(tac_message_bytes):
+                tac_container = tac_pb2.TACMessage()
+                tac_container.compression = COMPRESSION_TO_PB[self.compression]
+                tac_container.compressed = compressed
+                if version_id:
+                    # the version id stays readable without decompressing the message.
+                    tac_container.version_id = version_id
+                tac_message_bytes = tac_container.SerializeToString()
         return tac_message_bytes
 
     def decode(self, obj: bytes) -> Message:
@@ -162,90 +799,37 @@ class TACSerializer(Serializer):
         :param obj: the bytes object
         :return: the message
         """
-        tac_container = tac_pb2.TACMessage()
-        tac_container.ParseFromString(obj)
-
-        new_body = {}  # type: Dict[str, Any]
-        tac_type = tac_container.WhichOneof("content")
-
-        if tac_type == "register":
-            new_body["type"] = TACMessage.Type.REGISTER
-            new_body["agent_name"] = tac_container.register.agent_name
-        elif tac_type == "unregister":
-            new_body["type"] = TACMessage.Type.UNREGISTER
-        elif tac_type == "transaction":
-            new_body["type"] = TACMessage.Type.TRANSACTION
-            new_body["transaction_id"] = tac_container.transaction.transaction_id
-            new_body["is_sender_buyer"] = tac_container.transaction.is_sender_buyer
-            new_body["counterparty"] = tac_container.transaction.counterparty
-            new_body["amount"] = tac_container.transaction.amount
-            new_body["quantities_by_good_pbk"] = _from_pairs_to_dict(
-                tac_container.transaction.quantities
-            )
-        elif tac_type == "get_state_update":
-            new_body["type"] = TACMessage.Type.GET_STATE_UPDATE
-        elif tac_type == "cancelled":
-            new_body["type"] = TACMessage.Type.CANCELLED
-        elif tac_type == "game_data":
-            new_body["type"] = TACMessage.Type.GAME_DATA
-            new_body["money"] = tac_container.game_data.money
-            new_body["endowment"] = list(tac_container.game_data.endowment)
-            new_body["utility_params"] = list(tac_container.game_data.utility_params)
-            new_body["nb_agents"] = tac_container.game_data.nb_agents
-            new_body["nb_goods"] = tac_container.game_data.nb_goods
-            new_body["tx_fee"] = tac_container.game_data.tx_fee
-            new_body["agent_pbk_to_name"] = _from_pairs_to_dict(
-                tac_container.game_data.agent_pbk_to_name
-            )
-            new_body["good_pbk_to_name"] = _from_pairs_to_dict(
-                tac_container.game_data.good_pbk_to_name
-            )
-        elif tac_type == "transaction_confirmation":
-            new_body["type"] = TACMessage.Type.TRANSACTION_CONFIRMATION
-            new_body[
-                "transaction_id"
-            ] = tac_container.transaction_confirmation.transaction_id
-        elif tac_type == "state_update":
-            new_body["type"] = TACMessage.Type.STATE_UPDATE
-            game_data = dict(
-                money=tac_container.state_update.initial_state.money,
-                endowment=tac_container.state_update.initial_state.endowment,
-                utility_params=tac_container.state_update.initial_state.utility_params,
-                nb_agents=tac_container.state_update.initial_state.nb_agents,
-                nb_goods=tac_container.state_update.initial_state.nb_goods,
-                tx_fee=tac_container.state_update.initial_state.tx_fee,
-                agent_pbk_to_name=_from_pairs_to_dict(
-                    tac_container.state_update.initial_state.agent_pbk_to_name
-                ),
-                good_pbk_to_name=_from_pairs_to_dict(
-                    tac_container.state_update.initial_state.good_pbk_to_name
-                ),
-            )
-            new_body["initial_state"] = game_data
-            transactions = []
-            for t in tac_container.state_update.txs:
-                tx_json = dict(
-                    transaction_id=t.transaction_id,
-                    is_sender_buyer=t.is_sender_buyer,
-                    counterparty=t.counterparty,
-                    amount=t.amount,
-                    quantities_by_good_pbk=_from_pairs_to_dict(t.quantities),
-                )
-                transactions.append(tx_json)
-            new_body["transactions"] = transactions
-        elif tac_type == "error":
-            new_body["type"] = TACMessage.Type.TAC_ERROR
-            new_body["error_code"] = TACMessage.ErrorCode(
-                tac_container.error.error_code
-            )
-            if tac_container.error.error_msg:
-                new_body["error_msg"] = tac_container.error.error_msg
-            if tac_container.error.details:
-                new_body["details"] = dict(tac_container.error.details)
-        else:
-            raise ValueError("Type not recognized.")
+        tac_container = _parse_container(obj)
 
-        tac_type = TACMessage.Type(new_body["type"])
-        new_body["type"] = tac_type
+        tac_type = _CONTENT_TO_TYPE.get(tac_container.WhichOneof("content"))
+        if tac_type is None:
+            raise ValueError("Type not recognized.")
+        new_body = {"type": tac_type}  # type: Dict[str, Any]
+        for key, decode_field in _FIELDS[tac_type].items():
+            value = decode_field(tac_container, self.game_index)
+            if value is not _UNSET:
+                new_body[key] = value
         tac_message = TACMessage(tac_type=tac_type, body=new_body)
         return tac_message
+
+    def decode_lazy(
+        self,
+        obj: bytes,
+        tac_type: Optional[TACMessage.Type] = None,
+        on_decode: Optional[Callable[[float], None]] = None,
+    ) -> LazyTACMessage:
+        """
+        Decode the message lazily: its fields are decoded on their first access.
+
+        :param obj: the bytes object
+        :param tac_type: the type of the message, if already known from peek_type_and_decompress,
+                         in which case obj should be the message it returned.
+        :param on_decode: the function called with the time (in seconds) spent to decode a field, parsing included. If None, the decoding is not timed.
+        :return: the message
+        :raises ValueError: if the type of the message is not recognized.
+        """
+        if tac_type is None:
+            tac_type, obj = peek_type_and_decompress(obj)
+            if tac_type is None:
+                raise ValueError("Type not recognized.")
+        return LazyTACMessage(obj, tac_type, self.game_index, on_decode)
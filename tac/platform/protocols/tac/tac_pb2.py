@@ -23,7 +23,7 @@ DESCRIPTOR = _descriptor.FileDescriptor(
     package="fetch.oef.pb",
     syntax="proto3",
     serialized_pb=_b(
-        '\n\ttac.proto\x12\x0c\x66\x65tch.oef.pb\x1a\x1cgoogle/protobuf/struct.proto"+\n\nStrIntPair\x12\r\n\x05\x66irst\x18\x01 \x01(\t\x12\x0e\n\x06second\x18\x02 \x01(\x05"+\n\nStrStrPair\x12\r\n\x05\x66irst\x18\x01 \x01(\t\x12\x0e\n\x06second\x18\x02 \x01(\t"\x80\x07\n\rTACController\x1a\x0c\n\nRegistered\x1a\x0e\n\x0cUnregistered\x1a\x0b\n\tCancelled\x1a\xe2\x01\n\x08GameData\x12\r\n\x05money\x18\x01 \x01(\x01\x12\x11\n\tendowment\x18\x02 \x03(\x05\x12\x16\n\x0eutility_params\x18\x03 \x03(\x01\x12\x11\n\tnb_agents\x18\x04 \x01(\x05\x12\x10\n\x08nb_goods\x18\x05 \x01(\x05\x12\x0e\n\x06tx_fee\x18\x06 \x01(\x01\x12\x33\n\x11\x61gent_pbk_to_name\x18\x07 \x03(\x0b\x32\x18.fetch.oef.pb.StrStrPair\x12\x32\n\x10good_pbk_to_name\x18\x08 \x03(\x0b\x32\x18.fetch.oef.pb.StrStrPair\x1a\x31\n\x17TransactionConfirmation\x12\x16\n\x0etransaction_id\x18\x01 \x01(\t\x1a{\n\x0bStateUpdate\x12;\n\rinitial_state\x18\x01 \x01(\x0b\x32$.fetch.oef.pb.TACController.GameData\x12/\n\x03txs\x18\x02 \x03(\x0b\x32".fetch.oef.pb.TACAgent.Transaction\x1a\xae\x03\n\x05\x45rror\x12?\n\nerror_code\x18\x01 \x01(\x0e\x32+.fetch.oef.pb.TACController.Error.ErrorCode\x12\x11\n\terror_msg\x18\x02 \x01(\t\x12(\n\x07\x64\x65tails\x18\x03 \x01(\x0b\x32\x17.google.protobuf.Struct"\xa6\x02\n\tErrorCode\x12\x11\n\rGENERIC_ERROR\x10\x00\x12\x15\n\x11REQUEST_NOT_VALID\x10\x01\x12 \n\x1c\x41GENT_PBK_ALREADY_REGISTERED\x10\x02\x12!\n\x1d\x41GENT_NAME_ALREADY_REGISTERED\x10\x03\x12\x18\n\x14\x41GENT_NOT_REGISTERED\x10\x04\x12\x19\n\x15TRANSACTION_NOT_VALID\x10\x05\x12\x1c\n\x18TRANSACTION_NOT_MATCHING\x10\x06\x12\x1f\n\x1b\x41GENT_NAME_NOT_IN_WHITELIST\x10\x07\x12\x1b\n\x17\x43OMPETITION_NOT_RUNNING\x10\x08\x12\x19\n\x15\x44IALOGUE_INCONSISTENT\x10\t"\xdf\x01\n\x08TACAgent\x1a\x1e\n\x08Register\x12\x12\n\nagent_name\x18\x01 \x01(\t\x1a\x0c\n\nUnregister\x1a\x92\x01\n\x0bTransaction\x12\x16\n\x0etransaction_id\x18\x01 \x01(\t\x12\x17\n\x0fis_sender_buyer\x18\x02 \x01(\x08\x12\x14\n\x0c\x63ounterparty\x18\x03 \x01(\t\x12\x0e\n\x06\x61mount\x18\x04 \x01(\x01\x12,\n\nquantities\x18\x05 \x03(\x0b\x32\x18.fetch.oef.pb.StrIntPair\x1a\x10\n\x0eGetStateUpdate"\xc8\x05\n\nTACMessage\x12\x33\n\x08register\x18\x01 \x01(\x0b\x32\x1f.fetch.oef.pb.TACAgent.RegisterH\x00\x12\x37\n\nunregister\x18\x02 \x01(\x0b\x32!.fetch.oef.pb.TACAgent.UnregisterH\x00\x12\x39\n\x0btransaction\x18\x03 \x01(\x0b\x32".fetch.oef.pb.TACAgent.TransactionH\x00\x12\x41\n\x10get_state_update\x18\x04 \x01(\x0b\x32%.fetch.oef.pb.TACAgent.GetStateUpdateH\x00\x12<\n\nregistered\x18\x05 \x01(\x0b\x32&.fetch.oef.pb.TACController.RegisteredH\x00\x12@\n\x0cunregistered\x18\x06 \x01(\x0b\x32(.fetch.oef.pb.TACController.UnregisteredH\x00\x12:\n\tcancelled\x18\x07 \x01(\x0b\x32%.fetch.oef.pb.TACController.CancelledH\x00\x12\x39\n\tgame_data\x18\x08 \x01(\x0b\x32$.fetch.oef.pb.TACController.GameDataH\x00\x12W\n\x18transaction_confirmation\x18\t \x01(\x0b\x32\x33.fetch.oef.pb.TACController.TransactionConfirmationH\x00\x12?\n\x0cstate_update\x18\n \x01(\x0b\x32\'.fetch.oef.pb.TACController.StateUpdateH\x00\x12\x32\n\x05\x65rror\x18\x0b \x01(\x0b\x32!.fetch.oef.pb.TACController.ErrorH\x00\x42\t\n\x07\x63ontentb\x06proto3'
+        '\n\ttac.proto\x12\x0c\x66\x65tch.oef.pb\x1a\x1cgoogle/protobuf/struct.proto"+\n\nStrIntPair\x12\r\n\x05\x66irst\x18\x01 \x01(\t\x12\x0e\n\x06second\x18\x02 \x01(\x05"+\n\nStrStrPair\x12\r\n\x05\x66irst\x18\x01 \x01(\t\x12\x0e\n\x06second\x18\x02 \x01(\t"\x8a\x08\n\rTACController\x1a\x0c\n\nRegistered\x1a\x0e\n\x0cUnregistered\x1a\x0b\n\tCancelled\x1a\xb2\x02\n\x08GameData\x12\r\n\x05money\x18\x01 \x01(\x01\x12\x11\n\tendowment\x18\x02 \x03(\x05\x12\x16\n\x0eutility_params\x18\x03 \x03(\x01\x12\x11\n\tnb_agents\x18\x04 \x01(\x05\x12\x10\n\x08nb_goods\x18\x05 \x01(\x05\x12\x0e\n\x06tx_fee\x18\x06 \x01(\x01\x12\x33\n\x11\x61gent_pbk_to_name\x18\x07 \x03(\x0b\x32\x18.fetch.oef.pb.StrStrPair\x12\x32\n\x10good_pbk_to_name\x18\x08 \x03(\x0b\x32\x18.fetch.oef.pb.StrStrPair\x12\x12\n\nagent_pbks\x18\t \x03(\t\x12\x13\n\x0b\x61gent_names\x18\n \x03(\t\x12\x11\n\tgood_pbks\x18\x0b \x03(\t\x12\x12\n\ngood_names\x18\x0c \x03(\t\x1a\x31\n\x17TransactionConfirmation\x12\x16\n\x0etransaction_id\x18\x01 \x01(\t\x1a{\n\x0bStateUpdate\x12;\n\rinitial_state\x18\x01 \x01(\x0b\x32$.fetch.oef.pb.TACController.GameData\x12/\n\x03txs\x18\x02 \x03(\x0b\x32".fetch.oef.pb.TACAgent.Transaction\x1a\xe8\x03\n\x05\x45rror\x12?\n\nerror_code\x18\x01 \x01(\x0e\x32+.fetch.oef.pb.TACController.Error.ErrorCode\x12\x11\n\terror_msg\x18\x02 \x01(\t\x12(\n\x07\x64\x65tails\x18\x03 \x01(\x0b\x32\x17.google.protobuf.Struct"\xe0\x02\n\tErrorCode\x12\x11\n\rGENERIC_ERROR\x10\x00\x12\x15\n\x11REQUEST_NOT_VALID\x10\x01\x12 \n\x1c\x41GENT_PBK_ALREADY_REGISTERED\x10\x02\x12!\n\x1d\x41GENT_NAME_ALREADY_REGISTERED\x10\x03\x12\x18\n\x14\x41GENT_NOT_REGISTERED\x10\x04\x12\x19\n\x15TRANSACTION_NOT_VALID\x10\x05\x12\x1c\n\x18TRANSACTION_NOT_MATCHING\x10\x06\x12\x1f\n\x1b\x41GENT_NAME_NOT_IN_WHITELIST\x10\x07\x12\x1b\n\x17\x43OMPETITION_NOT_RUNNING\x10\x08\x12\x19\n\x15\x44IALOGUE_INCONSISTENT\x10\t\x12\x17\n\x13RATE_LIMIT_EXCEEDED\x10\n\x12\x1f\n\x1bTRANSACTION_ALREADY_SETTLED\x10\x0b"\xec\x02\n\x08TACAgent\x1ar\n\x08Register\x12\x12\n\nagent_name\x18\x01 \x01(\t\x12\x16\n\x0eschema_version\x18\x02 \x01(\x05\x12:\n\x0c\x63ompressions\x18\x03 \x03(\x0e\x32$.fetch.oef.pb.TACMessage.Compression\x1a\x0c\n\nUnregister\x1a\xcb\x01\n\x0bTransaction\x12\x16\n\x0etransaction_id\x18\x01 \x01(\t\x12\x17\n\x0fis_sender_buyer\x18\x02 \x01(\x08\x12\x14\n\x0c\x63ounterparty\x18\x03 \x01(\t\x12\x0e\n\x06\x61mount\x18\x04 \x01(\x01\x12,\n\nquantities\x18\x05 \x03(\x0b\x32\x18.fetch.oef.pb.StrIntPair\x12\x1a\n\x12\x63ounterparty_index\x18\x06 \x01(\x05\x12\x1b\n\x13quantities_by_index\x18\x07 \x03(\x05\x1a\x10\n\x0eGetStateUpdate"\xbc\x07\n\nTACMessage\x12\x33\n\x08register\x18\x01 \x01(\x0b\x32\x1f.fetch.oef.pb.TACAgent.RegisterH\x00\x12\x37\n\nunregister\x18\x02 \x01(\x0b\x32!.fetch.oef.pb.TACAgent.UnregisterH\x00\x12\x39\n\x0btransaction\x18\x03 \x01(\x0b\x32".fetch.oef.pb.TACAgent.TransactionH\x00\x12\x41\n\x10get_state_update\x18\x04 \x01(\x0b\x32%.fetch.oef.pb.TACAgent.GetStateUpdateH\x00\x12<\n\nregistered\x18\x05 \x01(\x0b\x32&.fetch.oef.pb.TACController.RegisteredH\x00\x12@\n\x0cunregistered\x18\x06 \x01(\x0b\x32(.fetch.oef.pb.TACController.UnregisteredH\x00\x12:\n\tcancelled\x18\x07 \x01(\x0b\x32%.fetch.oef.pb.TACController.CancelledH\x00\x12\x39\n\tgame_data\x18\x08 \x01(\x0b\x32$.fetch.oef.pb.TACController.GameDataH\x00\x12W\n\x18transaction_confirmation\x18\t \x01(\x0b\x32\x33.fetch.oef.pb.TACController.TransactionConfirmationH\x00\x12?\n\x0cstate_update\x18\n \x01(\x0b\x32\'.fetch.oef.pb.TACController.StateUpdateH\x00\x12\x32\n\x05\x65rror\x18\x0b \x01(\x0b\x32!.fetch.oef.pb.TACController.ErrorH\x00\x12/\n\x05\x62\x61tch\x18\x0f \x01(\x0b\x32\x1e.fetch.oef.pb.TACMessage.BatchH\x00\x12\x16\n\x0eschema_version\x18\x0c \x01(\x05\x12\x39\n\x0b\x63ompression\x18\r \x01(\x0e\x32$.fetch.oef.pb.TACMessage.Compression\x12\x12\n\ncompressed\x18\x0e \x01(\x0c\x12\x12\n\nversion_id\x18\x10 \x01(\t\x1a\x19\n\x05\x42\x61tch\x12\x10\n\x08messages\x18\x01 \x03(\x0c"+\n\x0b\x43ompression\x12\x08\n\x04NONE\x10\x00\x12\x08\n\x04ZLIB\x10\x01\x12\x08\n\x04ZSTD\x10\x02\x42\t\n\x07\x63ontentb\x06proto3'
     ),
     dependencies=[google_dot_protobuf_dot_struct__pb2.DESCRIPTOR,],
 )
@@ -78,14 +78,47 @@ _TACCONTROLLER_ERROR_ERRORCODE = _descriptor.EnumDescriptor(
         _descriptor.EnumValueDescriptor(
             name="DIALOGUE_INCONSISTENT", index=9, number=9, options=None, type=None
         ),
+        _descriptor.EnumValueDescriptor(
+            name="RATE_LIMIT_EXCEEDED", index=10, number=10, options=None, type=None
+        ),
+        _descriptor.EnumValueDescriptor(
+            name="TRANSACTION_ALREADY_SETTLED",
+            index=11,
+            number=11,
+            options=None,
+            type=None,
+        ),
     ],
     containing_type=None,
     options=None,
-    serialized_start=750,
-    serialized_end=1044,
+    serialized_start=830,
+    serialized_end=1182,
 )
 _sym_db.RegisterEnumDescriptor(_TACCONTROLLER_ERROR_ERRORCODE)
 
+_TACMESSAGE_COMPRESSION = _descriptor.EnumDescriptor(
+    name="Compression",
+    full_name="fetch.oef.pb.TACMessage.Compression",
+    filename=None,
+    file=DESCRIPTOR,
+    values=[
+        _descriptor.EnumValueDescriptor(
+            name="NONE", index=0, number=0, options=None, type=None
+        ),
+        _descriptor.EnumValueDescriptor(
+            name="ZLIB", index=1, number=1, options=None, type=None
+        ),
+        _descriptor.EnumValueDescriptor(
+            name="ZSTD", index=2, number=2, options=None, type=None
+        ),
+    ],
+    containing_type=None,
+    options=None,
+    serialized_start=2454,
+    serialized_end=2497,
+)
+_sym_db.RegisterEnumDescriptor(_TACMESSAGE_COMPRESSION)
+
 
 _STRINTPAIR = _descriptor.Descriptor(
     name="StrIntPair",
@@ -397,6 +430,74 @@ _TACCONTROLLER_GAMEDATA = _descriptor.Descriptor(
             extension_scope=None,
             options=None,
         ),
+        _descriptor.FieldDescriptor(
+            name="agent_pbks",
+            full_name="fetch.oef.pb.TACController.GameData.agent_pbks",
+            index=8,
+            number=9,
+            type=9,
+            cpp_type=9,
+            label=3,
+            has_default_value=False,
+            default_value=[],
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            options=None,
+        ),
+        _descriptor.FieldDescriptor(
+            name="agent_names",
+            full_name="fetch.oef.pb.TACController.GameData.agent_names",
+            index=9,
+            number=10,
+            type=9,
+            cpp_type=9,
+            label=3,
+            has_default_value=False,
+            default_value=[],
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            options=None,
+        ),
+        _descriptor.FieldDescriptor(
+            name="good_pbks",
+            full_name="fetch.oef.pb.TACController.GameData.good_pbks",
+            index=10,
+            number=11,
+            type=9,
+            cpp_type=9,
+            label=3,
+            has_default_value=False,
+            default_value=[],
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            options=None,
+        ),
+        _descriptor.FieldDescriptor(
+            name="good_names",
+            full_name="fetch.oef.pb.TACController.GameData.good_names",
+            index=11,
+            number=12,
+            type=9,
+            cpp_type=9,
+            label=3,
+            has_default_value=False,
+            default_value=[],
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            options=None,
+        ),
     ],
     extensions=[],
     nested_types=[],
@@ -407,7 +508,7 @@ _TACCONTROLLER_GAMEDATA = _descriptor.Descriptor(
     extension_ranges=[],
     oneofs=[],
     serialized_start=209,
-    serialized_end=435,
+    serialized_end=515,
 )
 
 _TACCONTROLLER_TRANSACTIONCONFIRMATION = _descriptor.Descriptor(
@@ -443,8 +544,8 @@ _TACCONTROLLER_TRANSACTIONCONFIRMATION = _descriptor.Descriptor(
     syntax="proto3",
     extension_ranges=[],
     oneofs=[],
-    serialized_start=437,
-    serialized_end=486,
+    serialized_start=517,
+    serialized_end=566,
 )
 
 _TACCONTROLLER_STATEUPDATE = _descriptor.Descriptor(
@@ -497,8 +598,8 @@ _TACCONTROLLER_STATEUPDATE = _descriptor.Descriptor(
     syntax="proto3",
     extension_ranges=[],
     oneofs=[],
-    serialized_start=488,
-    serialized_end=611,
+    serialized_start=568,
+    serialized_end=691,
 )
 
 _TACCONTROLLER_ERROR = _descriptor.Descriptor(
@@ -568,8 +669,8 @@ _TACCONTROLLER_ERROR = _descriptor.Descriptor(
     syntax="proto3",
     extension_ranges=[],
     oneofs=[],
-    serialized_start=614,
-    serialized_end=1044,
+    serialized_start=694,
+    serialized_end=1182,
 )
 
 _TACCONTROLLER = _descriptor.Descriptor(
@@ -596,7 +697,7 @@ _TACCONTROLLER = _descriptor.Descriptor(
     extension_ranges=[],
     oneofs=[],
     serialized_start=148,
-    serialized_end=1044,
+    serialized_end=1182,
 )
 
 
@@ -624,6 +725,40 @@ _TACAGENT_REGISTER = _descriptor.Descriptor(
             extension_scope=None,
             options=None,
         ),
+        _descriptor.FieldDescriptor(
+            name="schema_version",
+            full_name="fetch.oef.pb.TACAgent.Register.schema_version",
+            index=1,
+            number=2,
+            type=5,
+            cpp_type=1,
+            label=1,
+            has_default_value=False,
+            default_value=0,
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            options=None,
+        ),
+        _descriptor.FieldDescriptor(
+            name="compressions",
+            full_name="fetch.oef.pb.TACAgent.Register.compressions",
+            index=2,
+            number=3,
+            type=14,
+            cpp_type=8,
+            label=3,
+            has_default_value=False,
+            default_value=[],
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            options=None,
+        ),
     ],
     extensions=[],
     nested_types=[],
@@ -633,8 +768,8 @@ _TACAGENT_REGISTER = _descriptor.Descriptor(
     syntax="proto3",
     extension_ranges=[],
     oneofs=[],
-    serialized_start=1059,
-    serialized_end=1089,
+    serialized_start=1197,
+    serialized_end=1311,
 )
 
 _TACAGENT_UNREGISTER = _descriptor.Descriptor(
@@ -652,8 +787,8 @@ _TACAGENT_UNREGISTER = _descriptor.Descriptor(
     syntax="proto3",
     extension_ranges=[],
     oneofs=[],
-    serialized_start=1091,
-    serialized_end=1103,
+    serialized_start=1313,
+    serialized_end=1325,
 )
 
 _TACAGENT_TRANSACTION = _descriptor.Descriptor(
@@ -748,6 +883,40 @@ _TACAGENT_TRANSACTION = _descriptor.Descriptor(
             extension_scope=None,
             options=None,
         ),
+        _descriptor.FieldDescriptor(
+            name="counterparty_index",
+            full_name="fetch.oef.pb.TACAgent.Transaction.counterparty_index",
+            index=5,
+            number=6,
+            type=5,
+            cpp_type=1,
+            label=1,
+            has_default_value=False,
+            default_value=0,
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            options=None,
+        ),
+        _descriptor.FieldDescriptor(
+            name="quantities_by_index",
+            full_name="fetch.oef.pb.TACAgent.Transaction.quantities_by_index",
+            index=6,
+            number=7,
+            type=5,
+            cpp_type=1,
+            label=3,
+            has_default_value=False,
+            default_value=[],
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            options=None,
+        ),
     ],
     extensions=[],
     nested_types=[],
@@ -757,8 +926,8 @@ _TACAGENT_TRANSACTION = _descriptor.Descriptor(
     syntax="proto3",
     extension_ranges=[],
     oneofs=[],
-    serialized_start=1106,
-    serialized_end=1252,
+    serialized_start=1328,
+    serialized_end=1531,
 )
 
 _TACAGENT_GETSTATEUPDATE = _descriptor.Descriptor(
@@ -776,8 +945,8 @@ _TACAGENT_GETSTATEUPDATE = _descriptor.Descriptor(
     syntax="proto3",
     extension_ranges=[],
     oneofs=[],
-    serialized_start=1254,
-    serialized_end=1270,
+    serialized_start=1533,
+    serialized_end=1549,
 )
 
 _TACAGENT = _descriptor.Descriptor(
@@ -800,11 +969,48 @@ _TACAGENT = _descriptor.Descriptor(
     syntax="proto3",
     extension_ranges=[],
     oneofs=[],
-    serialized_start=1047,
-    serialized_end=1270,
+    serialized_start=1185,
+    serialized_end=1549,
 )
 
 
+_TACMESSAGE_BATCH = _descriptor.Descriptor(
+    name="Batch",
+    full_name="fetch.oef.pb.TACMessage.Batch",
+    filename=None,
+    file=DESCRIPTOR,
+    containing_type=None,
+    fields=[
+        _descriptor.FieldDescriptor(
+            name="messages",
+            full_name="fetch.oef.pb.TACMessage.Batch.messages",
+            index=0,
+            number=1,
+            type=12,
+            cpp_type=9,
+            label=3,
+            has_default_value=False,
+            default_value=[],
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            options=None,
+        )
+    ],
+    extensions=[],
+    nested_types=[],
+    enum_types=[],
+    options=None,
+    is_extendable=False,
+    syntax="proto3",
+    extension_ranges=[],
+    oneofs=[],
+    serialized_start=2427,
+    serialized_end=2452,
+)
+
 _TACMESSAGE = _descriptor.Descriptor(
     name="TACMessage",
     full_name="fetch.oef.pb.TACMessage",
@@ -999,10 +1205,95 @@ _TACMESSAGE = _descriptor.Descriptor(
             extension_scope=None,
             options=None,
         ),
+        _descriptor.FieldDescriptor(
+            name="batch",
+            full_name="fetch.oef.pb.TACMessage.batch",
+            index=11,
+            number=15,
+            type=11,
+            cpp_type=10,
+            label=1,
+            has_default_value=False,
+            default_value=None,
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            options=None,
+        ),
+        _descriptor.FieldDescriptor(
+            name="schema_version",
+            full_name="fetch.oef.pb.TACMessage.schema_version",
+            index=12,
+            number=12,
+            type=5,
+            cpp_type=1,
+            label=1,
+            has_default_value=False,
+            default_value=0,
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            options=None,
+        ),
+        _descriptor.FieldDescriptor(
+            name="compression",
+            full_name="fetch.oef.pb.TACMessage.compression",
+            index=13,
+            number=13,
+            type=14,
+            cpp_type=8,
+            label=1,
+            has_default_value=False,
+            default_value=0,
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            options=None,
+        ),
+        _descriptor.FieldDescriptor(
+            name="compressed",
+            full_name="fetch.oef.pb.TACMessage.compressed",
+            index=14,
+            number=14,
+            type=12,
+            cpp_type=9,
+            label=1,
+            has_default_value=False,
+            default_value=_b(""),
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            options=None,
+        ),
+        _descriptor.FieldDescriptor(
+            name="version_id",
+            full_name="fetch.oef.pb.TACMessage.version_id",
+            index=15,
+            number=16,
+            type=9,
+            cpp_type=9,
+            label=1,
+            has_default_value=False,
+            default_value=_b("").decode("utf-8"),
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            options=None,
+        ),
     ],
     extensions=[],
-    nested_types=[],
-    enum_types=[],
+    nested_types=[_TACMESSAGE_BATCH],
+    enum_types=[_TACMESSAGE_COMPRESSION],
     options=None,
     is_extendable=False,
     syntax="proto3",
@@ -1016,8 +1307,8 @@ _TACMESSAGE = _descriptor.Descriptor(
             fields=[],
         ),
     ],
-    serialized_start=1273,
-    serialized_end=1985,
+    serialized_start=1552,
+    serialized_end=2508,
 )
 
 _TACCONTROLLER_REGISTERED.containing_type = _TACCONTROLLER
@@ -1041,11 +1332,13 @@ _TACCONTROLLER_ERROR.fields_by_name[
 _TACCONTROLLER_ERROR.containing_type = _TACCONTROLLER
 _TACCONTROLLER_ERROR_ERRORCODE.containing_type = _TACCONTROLLER_ERROR
 _TACAGENT_REGISTER.containing_type = _TACAGENT
+_TACAGENT_REGISTER.fields_by_name["compressions"].enum_type = _TACMESSAGE_COMPRESSION
 _TACAGENT_UNREGISTER.containing_type = _TACAGENT
 _TACAGENT_TRANSACTION.fields_by_name["quantities"].message_type = _STRINTPAIR
 _TACAGENT_TRANSACTION.containing_type = _TACAGENT
 _TACAGENT_GETSTATEUPDATE.containing_type = _TACAGENT
 _TACMESSAGE.fields_by_name["register"].message_type = _TACAGENT_REGISTER
+_TACMESSAGE_BATCH.containing_type = _TACMESSAGE
 _TACMESSAGE.fields_by_name["unregister"].message_type = _TACAGENT_UNREGISTER
 _TACMESSAGE.fields_by_name["transaction"].message_type = _TACAGENT_TRANSACTION
 _TACMESSAGE.fields_by_name["get_state_update"].message_type = _TACAGENT_GETSTATEUPDATE
@@ -1058,6 +1351,9 @@ _TACMESSAGE.fields_by_name[
 ].message_type = _TACCONTROLLER_TRANSACTIONCONFIRMATION
 _TACMESSAGE.fields_by_name["state_update"].message_type = _TACCONTROLLER_STATEUPDATE
 _TACMESSAGE.fields_by_name["error"].message_type = _TACCONTROLLER_ERROR
+_TACMESSAGE.fields_by_name["compression"].enum_type = _TACMESSAGE_COMPRESSION
+_TACMESSAGE.fields_by_name["batch"].message_type = _TACMESSAGE_BATCH
+_TACMESSAGE_COMPRESSION.containing_type = _TACMESSAGE
 _TACMESSAGE.oneofs_by_name["content"].fields.append(
     _TACMESSAGE.fields_by_name["register"]
 )
@@ -1123,6 +1419,10 @@ _TACMESSAGE.fields_by_name["error"].containing_oneof = _TACMESSAGE.oneofs_by_nam
     "content"
 ]
 DESCRIPTOR.message_types_by_name["StrIntPair"] = _STRINTPAIR
+_TACMESSAGE.oneofs_by_name["content"].fields.append(_TACMESSAGE.fields_by_name["batch"])
+_TACMESSAGE.fields_by_name["batch"].containing_oneof = _TACMESSAGE.oneofs_by_name[
+    "content"
+]
 DESCRIPTOR.message_types_by_name["StrStrPair"] = _STRSTRPAIR
 DESCRIPTOR.message_types_by_name["TACController"] = _TACCONTROLLER
 DESCRIPTOR.message_types_by_name["TACAgent"] = _TACAGENT
@@ -1287,11 +1587,21 @@ TACMessage = _reflection.GeneratedProtocolMessageType(
     (_message.Message,),
     dict(
         DESCRIPTOR=_TACMESSAGE,
+        Batch=_reflection.GeneratedProtocolMessageType(
+            "Batch",
+            (_message.Message,),
+            dict(
+                DESCRIPTOR=_TACMESSAGE_BATCH,
+                __module__="tac_pb2",
+                # @@protoc_insertion_point(class_scope:fetch.oef.pb.TACMessage.Batch)
+            ),
+        ),
         __module__="tac_pb2"
         # @@protoc_insertion_point(class_scope:fetch.oef.pb.TACMessage)
     ),
 )
 _sym_db.RegisterMessage(TACMessage)
 
+_sym_db.RegisterMessage(TACMessage.Batch)
 
 # @@protoc_insertion_point(module_scope)
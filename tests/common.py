@@ -17,10 +17,65 @@
 #
 # ------------------------------------------------------------------------------
 
-"""This module contains an OEF agent for testing."""
+"""This module contains common utilities for testing."""
+
+import random
+from typing import List
 
 from aea.channels.oef.connection import OEFMailBox
 
+from tac.agents.controller.base.states import Game, GameInitialization
+from tac.platform.game.base import GameConfiguration, Transaction
+
 
 class TOEFAgent(OEFMailBox):
     """An OEF agent for testing."""
+
+
+NB_AGENTS = 8
+NB_GOODS = 3
+
+
+def make_game() -> Game:
+    """Make a game with small endowments, so that some transactions are not valid."""
+    agent_pbk_to_name = {
+        "tac_agent_{}_pbk".format(i): "tac_agent_{}".format(i) for i in range(NB_AGENTS)
+    }
+    good_pbk_to_name = {
+        "tac_good_{}".format(i): "Good {}".format(i) for i in range(NB_GOODS)
+    }
+    game_configuration = GameConfiguration(
+        "1", NB_AGENTS, NB_GOODS, 1.0, agent_pbk_to_name, good_pbk_to_name
+    )
+    game_initialization = GameInitialization(
+        [20.0] * NB_AGENTS,
+        [[2] * NB_GOODS for _ in range(NB_AGENTS)],
+        [[10.0] * NB_GOODS for _ in range(NB_AGENTS)],
+        [1.0] * NB_GOODS,
+        [[2.0] * NB_GOODS for _ in range(NB_AGENTS)],
+        [20.0] * NB_AGENTS,
+    )
+    return Game(game_configuration, game_initialization)
+
+
+def make_transactions(nb_transactions: int) -> List[Transaction]:
+    """Make a reproducible sequence of random transactions."""
+    rng = random.Random(0)
+    transactions = []
+    for i in range(nb_transactions):
+        buyer, seller = rng.sample(range(NB_AGENTS), 2)
+        quantities = {
+            "tac_good_{}".format(good_id): rng.randint(0, 2)
+            for good_id in range(NB_GOODS)
+        }
+        transactions.append(
+            Transaction(
+                "tx_{}".format(i),
+                True,
+                "tac_agent_{}_pbk".format(seller),
+                rng.randint(1, 8),
+                quantities,
+                "tac_agent_{}_pbk".format(buyer),
+            )
+        )
+    return transactions
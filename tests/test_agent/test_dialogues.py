@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""This module contains the tests of the dialogues of the participants."""
+
+import sys
+
+from aea.protocols.fipa.message import FIPAMessage
+from tac.agents.participant.v1.base.dialogues import Dialogues
+from tac.agents.participant.v1.base.stats_manager import StatsManager
+
+AGENT_PBK = "agent_pbk"
+OPPONENT_PBK = "opponent_pbk"
+
+
+def _message(performative: FIPAMessage.Performative, msg_id: int) -> FIPAMessage:
+    """Make a FIPA message of a dialogue."""
+    if performative == FIPAMessage.Performative.CFP:
+        return FIPAMessage(
+            message_id=msg_id,
+            dialogue_id=1,
+            target=msg_id - 1,
+            performative=performative,
+            query=None,
+        )
+    return FIPAMessage(
+        message_id=msg_id, dialogue_id=1, target=msg_id - 1, performative=performative
+    )
+
+
+def test_ended_dialogues_are_removed():
+    """Test that the declined and matched dialogues are removed from all the indexes, and the others kept."""
+    dialogues = Dialogues()
+    declined = dialogues.create_self_initiated(OPPONENT_PBK, AGENT_PBK, is_seller=True)
+    declined.outgoing_extend([_message(FIPAMessage.Performative.CFP, 1)])
+    declined.incoming_extend([_message(FIPAMessage.Performative.DECLINE, 2)])
+    matched = dialogues.create_opponent_initiated(OPPONENT_PBK, 1, is_seller=False)
+    matched.incoming_extend([_message(FIPAMessage.Performative.CFP, 1)])
+    matched.outgoing_extend([_message(FIPAMessage.Performative.PROPOSE, 2)])
+    matched.incoming_extend([_message(FIPAMessage.Performative.ACCEPT, 3)])
+    matched.outgoing_extend([_message(FIPAMessage.Performative.MATCH_ACCEPT, 4)])
+    ongoing = dialogues.create_self_initiated(OPPONENT_PBK, AGENT_PBK, is_seller=False)
+    ongoing.outgoing_extend([_message(FIPAMessage.Performative.CFP, 1)])
+
+    assert declined.is_terminal and matched.is_terminal and not ongoing.is_terminal
+    assert set(dialogues.cleanup()) == {declined, matched}
+    assert list(dialogues.dialogues.values()) == [ongoing]
+    assert dialogues.dialogues_as_seller == {}
+    assert list(dialogues.dialogues_as_buyer.values()) == [ongoing]
+
+    summary = matched.summary()
+    assert summary.nb_messages == 4
+    assert summary.last_performative == FIPAMessage.Performative.MATCH_ACCEPT
+    assert not summary.is_expired
+
+
+def test_idle_dialogues_expire():
+    """Test that the dialogues without any message for longer than the timeout are removed and archived."""
+    dialogues = Dialogues(dialogue_timeout=10.0)
+    stats_manager = StatsManager(None, None)
+    dialogue = dialogues.create_self_initiated(OPPONENT_PBK, AGENT_PBK, is_seller=True)
+    dialogue.outgoing_extend([_message(FIPAMessage.Performative.CFP, 1)])
+
+    assert dialogues.cleanup() == []
+    removed = dialogues.cleanup(dialogue.last_activity + 11.0)
+    assert removed == [dialogue]
+    assert len(dialogues.dialogues) == 0
+    assert len(dialogues.dialogues_as_seller) == 0
+
+    stats_manager.archive_dialogue(removed[0].summary())
+    assert stats_manager.nb_expired_dialogues == 1
+    assert stats_manager.archived_dialogues[0].dialogue_opponent_pbk == OPPONENT_PBK
+
+
+def test_active_dialogues_do_not_expire():
+    """Test that a dialogue with a message since its expiry was scheduled is kept until the timeout from that message."""
+    dialogues = Dialogues(dialogue_timeout=10.0)
+    dialogue = dialogues.create_self_initiated(OPPONENT_PBK, AGENT_PBK, is_seller=True)
+    created_at = dialogue.last_activity
+    dialogue._last_activity = created_at + 5.0
+
+    assert dialogues.cleanup(created_at + 11.0) == []
+    assert dialogues.cleanup(created_at + 16.0) == [dialogue]
+    assert len(dialogues.dialogues) == 0
+
+
+def test_messages_are_routed_to_the_expecting_dialogue():
+    """Test that a message belongs to a registered dialogue only if the dialogue is expecting it."""
+    dialogues = Dialogues()
+    dialogue = dialogues.create_self_initiated(OPPONENT_PBK, AGENT_PBK, is_seller=False)
+    dialogue.outgoing_extend([_message(FIPAMessage.Performative.CFP, 1)])
+    propose = FIPAMessage(
+        message_id=2,
+        dialogue_id=dialogue.dialogue_label.dialogue_id,
+        target=1,
+        performative=FIPAMessage.Performative.PROPOSE,
+        proposal=[],
+    )
+
+    assert dialogues.is_belonging_to_registered_dialogue(
+        propose, AGENT_PBK, OPPONENT_PBK
+    )
+    assert dialogues.get_dialogue(propose, OPPONENT_PBK, AGENT_PBK) is dialogue
+    assert not dialogues.is_belonging_to_registered_dialogue(
+        propose, AGENT_PBK, "other_pbk"
+    )
+
+    dialogue.incoming_extend([propose])
+    dialogue.outgoing_extend([_message(FIPAMessage.Performative.ACCEPT, 3)])
+    assert not dialogues.is_belonging_to_registered_dialogue(
+        propose, AGENT_PBK, OPPONENT_PBK
+    )
+    assert dialogue.is_expecting_matching_accept()
+    assert dialogue.last_message_id == 3
+
+
+def test_messages_are_kept_in_debug_mode_only():
+    """Test that a dialogue keeps its messages only in debug mode, and has no per-instance dictionary."""
+    for debug in [False, True]:
+        dialogues = Dialogues(debug=debug)
+        dialogue = dialogues.create_self_initiated(
+            OPPONENT_PBK, AGENT_PBK, is_seller=True
+        )
+        cfp = _message(FIPAMessage.Performative.CFP, 1)
+        dialogue.outgoing_extend([cfp])
+        assert dialogue.outgoing_messages == ([cfp] if debug else [])
+        assert dialogue.incoming_messages == []
+        assert not hasattr(dialogue, "__dict__")
+        assert sys.getsizeof(dialogue) < 200
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""This module contains the tests of the price model of the world modelling agents."""
+
+import numpy as np
+import pytest
+
+from tac.agents.participant.v1.base.price_model import (
+    DEFAULT_PRICE,
+    GoodPriceModel,
+    GoodPriceModels,
+)
+
+
+def test_expectations_satisfy_the_constraint():
+    """Test that the expected prices are above the constraint of a seller, below the one of a buyer."""
+    np.random.seed(0)
+    model = GoodPriceModel()
+    for _ in range(100):
+        assert model.get_price_expectation(12.3, is_seller=True) > 12.3
+        assert model.get_price_expectation(12.3, is_seller=False) < 12.3
+    assert model.get_price_expectation(20.0, is_seller=True) == DEFAULT_PRICE
+    assert model.get_price_expectation(0.0, is_seller=False) == DEFAULT_PRICE
+
+
+def test_expectations_follow_the_outcomes():
+    """Test that the arms are drawn uniformly under the prior, and that the accepted prices win afterwards."""
+    np.random.seed(0)
+    model = GoodPriceModel()
+    prices = [model.get_price_expectation(19.5, is_seller=True) for _ in range(5000)]
+    values, counts = np.unique(prices, return_counts=True)
+    assert values.tolist() == pytest.approx([19.6, 19.7, 19.8, 19.9, 20.0])
+    assert all(abs(count - 1000) < 150 for count in counts)
+
+    for _ in range(50):
+        model.update(True, 19.8)
+        model.update(False, 19.6)
+    prices = [model.get_price_expectation(19.5, is_seller=True) for _ in range(1000)]
+    assert prices.count(19.8) > 900
+
+    with pytest.raises(KeyError):
+        model.update(True, 20.1)
+
+
+def test_expectations_are_batched_across_goods():
+    """Test that the expectations of several goods are drawn from the model of every good."""
+    np.random.seed(0)
+    models = GoodPriceModels(["good_0", "good_1", "good_2"])
+    # all the prices are rejected, but for one price per good.
+    models.beta_b[:] = 1000.0
+    models.models["good_0"].update(True, 5.0)
+    models.models["good_2"].update(True, 1.0)
+    models.beta_b[0, 50] = models.beta_b[2, 10] = 1.0
+    assert models.beta_a[0, 50] == 2.0
+
+    prices = models.get_price_expectations(
+        ["good_2", "good_0", "good_1"], [0.5, 4.0, 20.0], is_seller=True
+    )
+    assert prices[0] == pytest.approx(1.0)
+    assert prices[1] == pytest.approx(5.0)
+    assert prices[2] == DEFAULT_PRICE
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the tests of the search state of a participant."""
+
+import time
+
+from tac.agents.participant.v1.base.game_instance import Search, SearchTarget
+from tac.agents.participant.v1.base.stats_manager import StatsManager
+
+
+def test_only_outstanding_searches_are_kept():
+    """Test that the searches are removed when their result is received or when they expire."""
+    search = Search(search_timeout=10.0)
+    now = time.monotonic()
+    for target in [SearchTarget.TAC, SearchTarget.SELLERS, SearchTarget.BUYERS]:
+        search.add(search.get_next_id(), target, now=now)
+    assert search.nb_outstanding == 3
+
+    assert search.pop(2, now=now + 1.0) == (SearchTarget.SELLERS, 1.0)
+    assert search.cleanup(now=now + 5.0) == 0
+    assert search.cleanup(now=now + 11.0) == 2
+    assert search.nb_outstanding == 0
+    assert search.nb_expired == 2
+    assert search.pop(1) is None
+
+
+def test_search_stats_are_averaged_over_the_recent_results():
+    """Test that the search stats are averaged over the most recent search results."""
+    stats_manager = StatsManager(None, None, max_search_results=2)
+    assert stats_manager.avg_search_time() == 0.0
+    for latency, nb_results in [(3.0, 10), (1.0, 2), (2.0, 4)]:
+        stats_manager.add_search_result(latency, nb_results)
+    assert stats_manager.avg_search_time() == 1.5
+    assert stats_manager.avg_search_result_counts() == 3.0
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""This module contains the tests of the baseline strategy."""
+
+import random
+
+import pytest
+
+from tac.agents.participant.v1.examples.strategy import BaselineStrategy
+from tac.platform.game.helpers import marginal_utility
+
+NB_GOODS = 30
+TX_FEE = 1.0
+
+
+def _expected_price(
+    good_id: int,
+    current_holdings: list,
+    utility_params: list,
+    is_seller: bool,
+) -> float:
+    """Compute the price of the proposal of a unit of a good from the marginal utility of the whole bundle."""
+    delta_holdings = [0] * len(current_holdings)
+    delta_holdings[good_id] = -1 if is_seller else 1
+    switch = -1 if is_seller else 1
+    utility = round(
+        marginal_utility(utility_params, current_holdings, delta_holdings) * switch, 2
+    )
+    return utility + 0.51 if is_seller else utility - 0.51
+
+
+@pytest.mark.parametrize("is_seller", [True, False])
+def test_proposals_are_priced_by_marginal_utility(is_seller):
+    """Test that the vectorized proposals of the baseline strategy are the ones of the marginal utility of each good."""
+    rng = random.Random(0)
+    strategy = BaselineStrategy()
+    good_pbks = ["tac_good_{}_pbk".format(i) for i in range(NB_GOODS)]
+    current_holdings = [rng.randint(1, 5) for _ in range(NB_GOODS)]
+    utility_params = [rng.uniform(1.0, 10.0) for _ in range(NB_GOODS)]
+
+    proposals = strategy.get_proposals(
+        good_pbks, current_holdings, utility_params, TX_FEE, is_seller, None
+    )
+
+    expected = {}
+    for good_id, good_pbk in enumerate(good_pbks):
+        if is_seller and current_holdings[good_id] == 1:
+            continue
+        price = _expected_price(good_id, current_holdings, utility_params, is_seller)
+        if price > 0:
+            expected[good_pbk] = price
+    assert len(proposals) == len(expected) > 0
+    for proposal in proposals:
+        (good_pbk,) = [
+            good_pbk for good_pbk in good_pbks if proposal.values[good_pbk] == 1
+        ]
+        assert sum(proposal.values[good_pbk] for good_pbk in good_pbks) == 1
+        assert proposal.values["price"] == pytest.approx(expected[good_pbk])
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""This module contains the tests of the transaction manager of the participants."""
+
+import random
+import time
+
+import pytest
+
+from tac.agents.participant.v1.base.dialogues import DialogueLabel
+from tac.agents.participant.v1.base.states import AgentState
+from tac.agents.participant.v1.base.transaction_manager import (
+    LOCKED_TXS,
+    PENDING_INITIAL_ACCEPTANCES,
+    PENDING_PROPOSALS,
+    TransactionManager,
+)
+from tac.platform.game.base import Transaction
+
+NB_GOODS = 4
+TX_FEE = 1.0
+
+
+def _make_transaction(rng: random.Random, i: int, as_seller: bool) -> Transaction:
+    """Make a random transaction of the agent, as seller or buyer."""
+    return Transaction(
+        "tx_{}".format(i),
+        not as_seller,
+        "counterparty_pbk",
+        rng.randint(1, 10),
+        {"good_{}".format(j): rng.randint(0, 2) for j in range(NB_GOODS)},
+        "agent_pbk",
+    )
+
+
+def _assert_states_after_locks(manager: TransactionManager, agent_state: AgentState):
+    """Assert that the states after the locks are the ones obtained by replaying the locks."""
+    for as_seller, locked_txs in [
+        (True, manager.locked_txs_as_seller),
+        (False, manager.locked_txs_as_buyer),
+    ]:
+        expected = agent_state.apply(list(locked_txs.values()), TX_FEE)
+        actual = manager.state_after_locks(as_seller)
+        assert actual.balance == pytest.approx(expected.balance)
+        assert actual.current_holdings == expected.current_holdings
+
+
+def test_states_after_locks_are_maintained():
+    """Test that the states after the locks follow the locks added, removed, settled and expired."""
+    rng = random.Random(0)
+    agent_state = AgentState(100.0, [10] * NB_GOODS, [1.0] * NB_GOODS)
+    manager = TransactionManager("agent", pending_transaction_timeout=0)
+    manager.add_locked_tx(_make_transaction(rng, 0, as_seller=True), as_seller=True)
+    manager.init_states_after_locks(agent_state, TX_FEE)
+    _assert_states_after_locks(manager, agent_state)
+
+    for i in range(1, 50):
+        manager.add_locked_tx(_make_transaction(rng, i, i % 2 == 0), i % 2 == 0)
+        _assert_states_after_locks(manager, agent_state)
+        if i % 3 == 0:
+            manager.pop_locked_tx(rng.choice(list(manager.locked_txs.keys())))
+        elif i % 5 == 0:
+            initial_balance = agent_state.balance
+            manager.settle_locked_tx(rng.choice(list(manager.locked_txs.keys())))
+            assert agent_state.balance != initial_balance
+        _assert_states_after_locks(manager, agent_state)
+
+    manager.cleanup_pending_transactions()
+    assert len(manager.locked_txs) == 0
+    assert manager.state_after_locks(True) == agent_state
+    assert manager.state_after_locks(False) == agent_state
+
+
+def test_state_versions_follow_the_locks():
+    """Test that the version of the state after the locks of a role changes only with the locks of the role and the state of the agent."""
+    rng = random.Random(0)
+    agent_state = AgentState(100.0, [10] * NB_GOODS, [1.0] * NB_GOODS)
+    manager = TransactionManager("agent")
+    manager.init_states_after_locks(agent_state, TX_FEE)
+    versions = {True: manager.state_version(True), False: manager.state_version(False)}
+
+    manager.add_locked_tx(_make_transaction(rng, 0, as_seller=True), as_seller=True)
+    assert manager.state_version(True) > versions[True]
+    assert manager.state_version(False) == versions[False]
+    versions[True] = manager.state_version(True)
+
+    manager.add_locked_tx(_make_transaction(rng, 1, as_seller=False), as_seller=False)
+    manager.pop_locked_tx("tx_1")
+    assert manager.state_version(True) == versions[True]
+    assert manager.state_version(False) > versions[False]
+    versions[False] = manager.state_version(False)
+
+    manager.settle_locked_tx("tx_0")
+    assert manager.state_version(True) > versions[True]
+    assert manager.state_version(False) > versions[False]
+
+
+def test_pools_expire_after_the_timeout():
+    """Test that the pending proposals, the pending acceptances and the locks expire, unless they are removed before."""
+    rng = random.Random(0)
+    manager = TransactionManager("agent", pending_transaction_timeout=10)
+    labels = [DialogueLabel(i, "counterparty_pbk", "agent_pbk") for i in range(4)]
+    manager.add_pending_proposal(labels[0], 1, _make_transaction(rng, 0, True))
+    manager.add_pending_proposal(labels[1], 1, _make_transaction(rng, 1, True))
+    manager.add_pending_initial_acceptance(
+        labels[2], 2, _make_transaction(rng, 2, False)
+    )
+    manager.add_pending_initial_acceptance(
+        labels[3], 2, _make_transaction(rng, 3, False)
+    )
+    manager.add_locked_tx(_make_transaction(rng, 4, True), as_seller=True)
+    manager.add_locked_tx(_make_transaction(rng, 5, False), as_seller=False)
+    assert manager.pool_sizes == {
+        PENDING_PROPOSALS: 2,
+        PENDING_INITIAL_ACCEPTANCES: 2,
+        LOCKED_TXS: 2,
+    }
+
+    manager.pop_pending_proposal(labels[0], 1)
+    manager.discard_pending(labels[2])
+    manager.pop_locked_tx("tx_4")
+
+    manager.cleanup_pending_transactions(now=time.monotonic())
+    assert sum(manager.nb_expired.values()) == 0
+
+    manager.cleanup_pending_transactions(now=time.monotonic() + 11)
+    assert manager.nb_expired == {
+        PENDING_PROPOSALS: 1,
+        PENDING_INITIAL_ACCEPTANCES: 1,
+        LOCKED_TXS: 1,
+    }
+    assert manager.pool_sizes == {
+        PENDING_PROPOSALS: 0,
+        PENDING_INITIAL_ACCEPTANCES: 0,
+        LOCKED_TXS: 0,
+    }
+    assert labels[1] not in manager.pending_proposals
+    assert labels[3] not in manager.pending_initial_acceptances
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the tests of the world state of a participant."""
+
+from tac.agents.participant.v1.base.states import AgentState, WorldState
+from tac.platform.game.base import Transaction
+
+GOOD_PBKS = ["good_0", "good_1", "good_2"]
+OPPONENT_PBKS = ["opponent_{}".format(i) for i in range(10)]
+
+
+def test_opponent_states_are_shared_until_they_diverge():
+    """Test that the opponent models share their holdings until one of them is updated."""
+    agent_state = AgentState(100.0, [1, 2, 3], [10.0, 20.0, 30.0])
+    world_state = WorldState(OPPONENT_PBKS, GOOD_PBKS, agent_state)
+    opponent_states = world_state.opponent_states
+
+    assert set(opponent_states.keys()) == set(OPPONENT_PBKS)
+    assert all(state == agent_state for state in opponent_states.values())
+    assert (
+        len(set(id(state._current_holdings) for state in opponent_states.values())) == 1
+    )
+    assert agent_state._current_holdings is not (
+        opponent_states["opponent_0"]._current_holdings
+    )
+
+    tx = Transaction(
+        "tx_0",
+        True,
+        "opponent_1",
+        5.0,
+        {"good_0": 1, "good_1": 0, "good_2": 2},
+        "opponent_0",
+    )
+    opponent_states["opponent_0"].update(tx, 1.0)
+    assert opponent_states["opponent_0"].current_holdings == [2, 2, 5]
+    assert opponent_states["opponent_0"].balance == 94.5
+    assert opponent_states["opponent_1"].current_holdings == [1, 2, 3]
+    assert opponent_states["opponent_1"].balance == 100.0
+    assert agent_state.current_holdings == [1, 2, 3]
+
+    opponent_states["opponent_0"].revert(tx, 1.0)
+    assert opponent_states["opponent_0"] == opponent_states["opponent_1"]
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""This module contains the tests of the batches of TAC messages."""
+
+from queue import Queue
+from typing import List
+
+from aea.mail.base import Envelope, OutBox
+from tac.platform.protocols.tac.batching import BatchingOutBox
+from tac.platform.protocols.tac.message import TACMessage
+from tac.platform.protocols.tac.serialization import (
+    BATCH_SCHEMA_VERSION,
+    TACSerializer,
+    peek_type,
+)
+
+CONTROLLER_PBK = "controller_pbk"
+
+
+def _confirmations(nb_messages: int) -> List[bytes]:
+    """Make some serialized transaction confirmations."""
+    return [
+        TACSerializer().encode(
+            TACMessage(
+                tac_type=TACMessage.Type.TRANSACTION_CONFIRMATION,
+                transaction_id="transaction_{}".format(i),
+            )
+        )
+        for i in range(nb_messages)
+    ]
+
+
+def _drain(queue: Queue) -> List[Envelope]:
+    """Get the envelopes put in a queue."""
+    envelopes = []
+    while not queue.empty():
+        envelopes.append(queue.get_nowait())
+    return envelopes
+
+
+def test_batch_round_trip():
+    """Test that the messages of a batch are decoded back in order."""
+    messages = _confirmations(3)
+    serializer = TACSerializer(BATCH_SCHEMA_VERSION)
+    tac_bytes = serializer.encode_batch(messages)
+    assert peek_type(tac_bytes) == TACMessage.Type.BATCH
+
+    batch = serializer.decode(tac_bytes)
+    assert batch.check_consistency()
+    assert batch.get("messages") == messages
+    assert serializer.decode_lazy(tac_bytes).get("messages") == messages
+    assert [
+        serializer.decode(message).get("transaction_id")
+        for message in batch.get("messages")
+    ] == ["transaction_0", "transaction_1", "transaction_2"]
+
+
+def test_outbox_coalesces_messages():
+    """Test that the TAC messages to the same recipient are sent in a single envelope, and the others at once."""
+    queue = Queue()  # type: Queue
+    serializer = TACSerializer(BATCH_SCHEMA_VERSION)
+    outbox = BatchingOutBox(OutBox(queue), lambda to: serializer)
+    messages = _confirmations(3)
+    for message in messages:
+        outbox.put_message("agent_pbk", CONTROLLER_PBK, TACMessage.protocol_id, message)
+    outbox.put_message("other_pbk", CONTROLLER_PBK, TACMessage.protocol_id, b"")
+    outbox.put_message("agent_pbk", CONTROLLER_PBK, "fipa", b"fipa")
+
+    assert [envelope.protocol_id for envelope in _drain(queue)] == ["fipa"]
+    assert outbox.nb_pending == 4
+
+    assert outbox.flush() == 2
+    envelopes = _drain(queue)
+    assert [envelope.to for envelope in envelopes] == ["agent_pbk", "other_pbk"]
+    assert serializer.decode(envelopes[0].message).get("messages") == messages
+    assert envelopes[1].message == b""
+    assert outbox.nb_pending == 0
+    assert outbox.flush() == 0
+
+
+def test_outbox_without_batch_support():
+    """Test that the messages to a recipient which does not support the batches are sent one per envelope."""
+    queue = Queue()  # type: Queue
+    outbox = BatchingOutBox(OutBox(queue), lambda to: TACSerializer())
+    messages = _confirmations(3)
+    for message in messages:
+        outbox.put_message("agent_pbk", CONTROLLER_PBK, TACMessage.protocol_id, message)
+
+    assert outbox.flush() == 3
+    assert [envelope.message for envelope in _drain(queue)] == messages
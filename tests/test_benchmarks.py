@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""This module contains the tests of the serialization benchmarks."""
+
+import json
+import os
+
+from benchmarks.serialization import main, run
+from tac.platform.protocols.tac.message import TACMessage
+from tac.platform.protocols.tac.serialization import TAC_SCHEMA_VERSION
+
+
+def test_run():
+    """Test that every TAC message type and every FIPA payload is benchmarked."""
+    report = run([2], [3], [0, 2], repeat=1, number=1)
+    results = report["results"]
+    tac_messages = {
+        (result["message"], result["schema_version"])
+        for result in results
+        if result["protocol"] == "tac"
+    }
+    assert tac_messages == {
+        (tac_type.value, schema_version)
+        for tac_type in TACMessage.Type
+        for schema_version in (1, TAC_SCHEMA_VERSION)
+    }
+    assert {r["message"] for r in results if r["protocol"] == "fipa"} == {
+        "cfp",
+        "propose",
+        "accept",
+    }
+    assert {
+        r.get("history_length") for r in results if r["message"] == "state_update"
+    } == {0, 2}
+    assert all(r["size_bytes"] > 0 and r["encode_us"] > 0 for r in results)
+
+
+def test_main_writes_json(tmpdir):
+    """Test that the results are written as a JSON document."""
+    path = os.path.join(str(tmpdir), "serialization.json")
+    main(
+        [
+            "--nb-agents",
+            "2",
+            "--nb-goods",
+            "2",
+            "--history-lengths",
+            "1",
+            "--repeat",
+            "1",
+            "--number",
+            "1",
+            "--output",
+            path,
+        ]
+    )
+    with open(path) as f:
+        report = json.load(f)
+    assert report["metadata"]["number"] == 1
+    assert len(report["results"]) > 0
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""This module contains the tests of the compression of the TAC messages."""
+
+import pytest
+
+from tac.platform.game.base import GameData, Transaction
+from tac.platform.protocols.tac import tac_pb2
+from tac.platform.protocols.tac.compression import (
+    ZLIB,
+    ZSTD,
+    choose_compression,
+    compress,
+    decompress,
+    supported_compressions,
+)
+from tac.platform.protocols.tac.message import TACMessage
+from tac.platform.protocols.tac.serialization import TACSerializer, peek_type
+
+NB_AGENTS = 10
+NB_GOODS = 100
+
+
+def _make_state_update(history_length: int) -> TACMessage:
+    """Make the state update of the first agent of a game."""
+    agent_pbks = ["tac_agent_{}_pbk".format(i) for i in range(NB_AGENTS)]
+    good_pbks = ["tac_good_{:02}_pbk".format(i) for i in range(NB_GOODS)]
+    game_data = GameData(
+        agent_pbks[0],
+        100.0,
+        [2] * NB_GOODS,
+        [0.01] * NB_GOODS,
+        NB_AGENTS,
+        NB_GOODS,
+        1.0,
+        {agent_pbk: agent_pbk[:-4] for agent_pbk in agent_pbks},
+        {good_pbk: good_pbk[:-4] for good_pbk in good_pbks},
+        "1",
+    )
+    transactions = [
+        Transaction(
+            "transaction_{}".format(i),
+            True,
+            agent_pbks[1],
+            10.0,
+            {good_pbk: i % 3 for good_pbk in good_pbks},
+            agent_pbks[0],
+        )
+        for i in range(history_length)
+    ]
+    return TACMessage(
+        tac_type=TACMessage.Type.STATE_UPDATE,
+        initial_state=game_data,
+        transactions=transactions,
+    )
+
+
+@pytest.fixture(params=[ZLIB, ZSTD])
+def compression(request) -> str:
+    """Get every compression, skipping zstd if it is not installed."""
+    if request.param == ZSTD:
+        pytest.importorskip("zstandard")
+    return request.param
+
+
+def test_compress_and_decompress(compression):
+    """Test that compressed data is decompressed back equal."""
+    data = b"tac_good_00_pbk" * 1000
+    compressed = compress(data, compression)
+    assert len(compressed) < len(data)
+    assert decompress(compressed, compression) == data
+
+
+def test_large_message_is_compressed(compression):
+    """Test that a message above the threshold is compressed and decoded back equal, eagerly and lazily."""
+    msg = _make_state_update(50)
+    serializer = TACSerializer(compression=compression, compression_threshold=1024)
+    plain_bytes = TACSerializer().encode(msg)
+    tac_bytes = serializer.encode(msg)
+    assert len(tac_bytes) * 4 < len(plain_bytes)
+
+    container = tac_pb2.TACMessage()
+    container.ParseFromString(tac_bytes)
+    assert container.WhichOneof("content") is None
+    assert container.compression != tac_pb2.TACMessage.NONE
+
+    decoded = TACSerializer().decode(tac_bytes)
+    assert decoded == TACSerializer().decode(plain_bytes)
+    assert peek_type(tac_bytes) == TACMessage.Type.STATE_UPDATE
+    assert TACSerializer().decode_lazy(tac_bytes) == decoded
+
+
+def test_small_message_is_not_compressed(compression):
+    """Test that a message below the threshold is sent as is."""
+    msg = _make_state_update(0)
+    serializer = TACSerializer(compression=compression, compression_threshold=10**6)
+    assert serializer.encode(msg) == TACSerializer().encode(msg)
+
+
+def test_register_compressions():
+    """Test that the compressions supported by an agent are sent with its registration, and that one is chosen."""
+    msg = TACMessage(
+        tac_type=TACMessage.Type.REGISTER,
+        agent_name="agent",
+        compressions=supported_compressions(),
+    )
+    decoded = TACSerializer().decode(TACSerializer().encode(msg))
+    assert decoded.get("compressions") == supported_compressions()
+    assert (
+        choose_compression(decoded.get("compressions")) == supported_compressions()[0]
+    )
+    assert choose_compression([ZLIB]) == ZLIB
+    assert choose_compression([]) is None
+
+
+def test_decompressed_size_is_bounded(compression):
+    """Test that data decompressing beyond the maximum size, or followed by other data, is rejected."""
+    data = b"\0" * 10**6
+    compressed = compress(data, compression)
+    assert len(compressed) < 10**4
+    assert decompress(compressed, compression, max_size=len(data)) == data
+    with pytest.raises(ValueError):
+        decompress(compressed, compression, max_size=len(data) - 1)
+    with pytest.raises(ValueError):
+        decompress(compressed + b"trailing", compression)
+    with pytest.raises(ValueError):
+        decompress(compressed[:-4], compression)
+
+
+def test_compressed_message_can_be_rejected():
+    """Test that the type of a compressed message is not read if compression is not allowed."""
+    msg = _make_state_update(50)
+    tac_bytes = TACSerializer(compression=ZLIB, compression_threshold=1024).encode(msg)
+    assert peek_type(tac_bytes) == TACMessage.Type.STATE_UPDATE
+    with pytest.raises(ValueError):
+        peek_type(tac_bytes, allow_compressed=False)
+    plain_bytes = TACSerializer().encode(msg)
+    assert (
+        peek_type(plain_bytes, allow_compressed=False) == TACMessage.Type.STATE_UPDATE
+    )
+
+
+def test_compressed_message_cannot_be_compressed_again():
+    """Test that a message whose decompressed content is compressed again is rejected."""
+    msg = _make_state_update(50)
+    inner_bytes = TACSerializer(compression=ZLIB, compression_threshold=1024).encode(
+        msg
+    )
+    tac_container = tac_pb2.TACMessage()
+    tac_container.compression = tac_pb2.TACMessage.ZLIB
+    tac_container.compressed = compress(inner_bytes, ZLIB)
+    tac_bytes = tac_container.SerializeToString()
+
+    with pytest.raises(ValueError):
+        peek_type(tac_bytes)
+    with pytest.raises(ValueError):
+        TACSerializer().decode(tac_bytes)
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the tests of the game dumps."""
+
+import json
+import os
+
+import pytest
+
+from tac.agents.controller.base.states import Game
+from tac.platform.game.dump import (
+    dump_game,
+    find_game_dump,
+    game_dump_filename,
+    load_game,
+    open_game_dump,
+)
+
+from .common import make_game, make_transactions
+
+
+def _played_game() -> Game:
+    """Make a game and settle some transactions."""
+    game = make_game()
+    for tx in make_transactions(50):
+        if game.is_transaction_valid(tx):
+            game.settle_transaction(tx)
+    return game
+
+
+@pytest.mark.parametrize("compression", [None, "gzip", "zstd"])
+def test_dump_and_load(tmpdir, compression):
+    """Test that a dumped game is loaded back equal, and that the dump is a valid JSON document."""
+    if compression == "zstd":
+        pytest.importorskip("zstandard")
+    game = _played_game()
+    path = os.path.join(str(tmpdir), game_dump_filename(compression))
+    dump_game(game, path)
+
+    assert find_game_dump(str(tmpdir)) == path
+    assert load_game(path) == game
+    with open_game_dump(path) as f:
+        assert Game.from_dict(json.load(f)) == game
+
+
+def test_dump_without_transactions(tmpdir):
+    """Test that a game without transactions is dumped and loaded."""
+    game = make_game()
+    path = os.path.join(str(tmpdir), game_dump_filename())
+    dump_game(game, path)
+    assert load_game(path) == game
+
+
+def test_empty_dump(tmpdir):
+    """Test that a dump without game is loaded as None."""
+    path = os.path.join(str(tmpdir), game_dump_filename())
+    dump_game(None, path)
+    assert load_game(path) is None
+
+
+def test_load_legacy_dump(tmpdir):
+    """Test that a dump written at once with json.dump is still loaded."""
+    game = _played_game()
+    path = os.path.join(str(tmpdir), game_dump_filename())
+    with open(path, "w") as f:
+        json.dump(game.to_dict(), f)
+    assert load_game(path) == game
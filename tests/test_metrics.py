@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the tests of the runtime metrics of the controller."""
+
+import os
+import urllib.request
+
+from tac.agents.controller.base.metrics import (
+    ControllerMetrics,
+    Histogram,
+    MetricsServer,
+)
+
+
+def test_histogram_buckets_are_cumulative():
+    """Test that the histogram counts a sample in every bucket whose bound is not lower than the sample."""
+    histogram = Histogram([0.1, 1.0])
+    for value in [0.05, 0.1, 0.5, 2.0]:
+        histogram.observe(value)
+    assert histogram.cumulative_counts() == [("0.1", 2), ("1.0", 3), ("+Inf", 4)]
+    assert histogram.count == 4
+    assert histogram.sum == 2.65
+
+
+def test_render_and_dump(tmpdir):
+    """Test that the metrics are rendered in the Prometheus text format and dumped to a file."""
+    metrics = ControllerMetrics(rate_interval=0.0)
+    metrics.observe_handler("TRANSACTION", 0.002)
+    metrics.observe_handler_update("TRANSACTION", 0.02)
+    metrics.observe_received(100)
+    metrics.observe_decode(0.0001)
+    metrics.observe_encode(40, 0.0001)
+    metrics.settlements += 3
+    metrics.rejections += 1
+    metrics.update()
+
+    text = metrics.render()
+    assert (
+        'tac_controller_handler_latency_seconds_bucket{message_type="TRANSACTION",le="0.0025"} 1'
+        in text
+    )
+    assert (
+        'tac_controller_handler_latency_seconds_count{message_type="TRANSACTION"} 1'
+        in text
+    )
+    assert (
+        'tac_controller_handler_update_latency_seconds_bucket{message_type="TRANSACTION",le="0.025"} 1'
+        in text
+    )
+    assert "tac_controller_received_bytes_total 100" in text
+    assert "tac_controller_sent_bytes_total 40" in text
+    assert "tac_controller_settlements_total 3" in text
+    assert metrics.settlements_per_second > 0
+
+    path = os.path.join(str(tmpdir), "metrics.prom")
+    metrics.dump(path)
+    with open(path) as f:
+        assert f.read() == metrics.render()
+
+
+def test_metrics_server():
+    """Test that the metrics are served over HTTP."""
+    metrics = ControllerMetrics()
+    metrics.rejections = 7
+    server = MetricsServer(metrics, port=0)
+    server.start()
+    try:
+        url = "http://127.0.0.1:{}/metrics".format(server.port)
+        with urllib.request.urlopen(url, timeout=5) as response:
+            assert response.status == 200
+            assert "tac_controller_rejections_total 7" in response.read().decode()
+    finally:
+        server.stop()
+    assert not server.is_running
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the tests of the asynchronous monitor."""
+
+import time
+from typing import List, Optional
+
+import pytest
+
+from tac.platform.game.stats import GameStats
+
+from .common import make_game, make_transactions
+
+pytest.importorskip("visdom")
+
+from tac.gui.monitor import AsyncMonitor, Monitor  # noqa: E402
+
+
+class RecordingMonitor(Monitor):
+    """A monitor that records the number of transactions of the game at every refresh."""
+
+    def __init__(self):
+        """Instantiate the monitor."""
+        self.game_stats = None  # type: Optional[GameStats]
+        self.refreshes = []  # type: List[int]
+        self._is_running = False
+
+    def start(self, game_stats: Optional[GameStats] = None):
+        """Start the monitor."""
+        self.game_stats = game_stats
+        self._is_running = True
+
+    def set_gamestats(self, game_stats: GameStats):
+        """Set the game stats."""
+        self.game_stats = game_stats
+
+    def update(self):
+        """Record the number of transactions shown."""
+        time.sleep(0.01)
+        if self.game_stats is not None:
+            self.refreshes.append(len(self.game_stats.game.transactions))
+
+    def stop(self):
+        """Stop the monitor."""
+        self._is_running = False
+
+    @property
+    def is_running(self) -> bool:
+        """Check if the monitor is running."""
+        return self._is_running
+
+
+def test_updates_are_coalesced_and_consistent():
+    """Test that many updates lead to few refreshes, and that the last refresh shows the final game."""
+    recording_monitor = RecordingMonitor()
+    monitor = AsyncMonitor(recording_monitor, max_rate=20.0)
+    monitor.start(None)
+    game = make_game()
+    monitor.set_gamestats(GameStats(game))
+
+    for tx in make_transactions(200):
+        if game.is_transaction_valid(tx):
+            game.settle_transaction(tx)
+            monitor.update()
+    monitor.stop()
+
+    assert not recording_monitor.is_running
+    assert 0 < len(recording_monitor.refreshes) < len(game.transactions)
+    assert recording_monitor.refreshes[-1] == len(game.transactions)
+    game_snapshot = recording_monitor.game_stats.game
+    assert game_snapshot is not game
+    assert list(game_snapshot.transactions) == list(game.transactions)
+    assert recording_monitor.game_stats.holdings_history()[-1].tolist() == [
+        list(holdings) for holdings in game.get_holdings_matrix()
+    ]
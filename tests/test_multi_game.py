@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""This module contains the tests of a controller hosting several games."""
+
+import os
+
+import pytest
+from aea.mail.base import Envelope
+
+from tac.agents.controller.agent import ControllerAgent
+from tac.agents.controller.base.metrics import METRICS_FILENAME
+from tac.agents.controller.base.tac_parameters import TACParameters
+from tac.gui.monitor import NullMonitor
+from tac.platform.protocols.tac.message import TACMessage
+from tac.platform.protocols.tac.serialization import (
+    BATCH_SCHEMA_VERSION,
+    TACSerializer,
+)
+
+
+def test_messages_are_routed_to_their_game(monkeypatch):
+    """Test that a controller hosting several games routes the messages by the version id of their game."""
+    controller_agent = ControllerAgent(
+        "controller",
+        "127.0.0.1",
+        10000,
+        TACParameters(version_id="game_1"),
+        NullMonitor(),
+    )
+    controller_agent.add_game(TACParameters(version_id="game_2"))
+    with pytest.raises(AssertionError):
+        controller_agent.add_game(TACParameters(version_id="game_2"))
+    sent = []
+    for game_handler in controller_agent.game_handlers.values():
+        monkeypatch.setattr(
+            game_handler,
+            "send_tac_message",
+            lambda to, tac_msg: sent.append((to, tac_msg)),
+        )
+
+    for agent_pbk, version_id in [
+        ("agent_1_pbk", "game_1"),
+        ("agent_2_pbk", "game_2"),
+        ("agent_3_pbk", "game_3"),
+        ("agent_4_pbk", None),
+    ]:
+        tac_msg = TACMessage(tac_type=TACMessage.Type.REGISTER, agent_name=agent_pbk)
+        controller_agent.agent_message_dispatcher.handle_agent_message(
+            Envelope(
+                to=controller_agent.crypto.public_key,
+                sender=agent_pbk,
+                protocol_id=TACMessage.protocol_id,
+                message=TACSerializer(version_id=version_id).encode(tac_msg),
+            )
+        )
+
+    game_handlers = controller_agent.game_handlers
+    assert set(game_handlers["game_1"].registered_agents) == {"agent_1_pbk"}
+    assert set(game_handlers["game_2"].registered_agents) == {"agent_2_pbk"}
+    assert controller_agent.get_game_handler("game_3") is None
+    assert controller_agent.get_game_handler(None) is None
+    assert [
+        (to, tac_msg.get("error_code"))
+        for to, tac_msg in sent
+        if tac_msg.get("type") == TACMessage.Type.TAC_ERROR
+    ] == [
+        ("agent_3_pbk", TACMessage.ErrorCode.REQUEST_NOT_VALID.value),
+        ("agent_4_pbk", TACMessage.ErrorCode.REQUEST_NOT_VALID.value),
+    ]
+
+
+def test_messages_of_a_single_game_need_no_version_id():
+    """Test that a controller hosting a single game routes every message to it."""
+    controller_agent = ControllerAgent(
+        "controller",
+        "127.0.0.1",
+        10000,
+        TACParameters(version_id="game_1"),
+        NullMonitor(),
+    )
+    game_handler = controller_agent.game_handler
+    assert controller_agent.get_game_handler(None) is game_handler
+    assert controller_agent.get_game_handler("game_2") is game_handler
+
+
+def test_metrics_are_dumped_for_every_game(tmpdir, monkeypatch):
+    """Test that the metrics of the controller are dumped next to every game it hosted."""
+    monkeypatch.setenv("SHARED_DIR", str(tmpdir))
+    controller_agent = ControllerAgent(
+        "controller",
+        "127.0.0.1",
+        10000,
+        TACParameters(version_id="game_1"),
+        NullMonitor(),
+    )
+    controller_agent.add_game(TACParameters(version_id="game_2"))
+    controller_agent.teardown()
+
+    for game_handler in controller_agent.game_handlers.values():
+        assert os.path.isfile(os.path.join(game_handler.version_dir, METRICS_FILENAME))
+
+
+def test_batches_are_routed_to_their_game(monkeypatch):
+    """Test that a controller hosting several games routes a batch by its version id before unpacking it."""
+    controller_agent = ControllerAgent(
+        "controller",
+        "127.0.0.1",
+        10000,
+        TACParameters(version_id="game_1"),
+        NullMonitor(),
+    )
+    controller_agent.add_game(TACParameters(version_id="game_2"))
+    sent = []
+    for game_handler in controller_agent.game_handlers.values():
+        monkeypatch.setattr(
+            game_handler,
+            "send_tac_message",
+            lambda to, tac_msg: sent.append((to, tac_msg)),
+        )
+
+    for agent_pbk, version_id in [("agent_1_pbk", "game_2"), ("agent_2_pbk", None)]:
+        serializer = TACSerializer(BATCH_SCHEMA_VERSION, version_id=version_id)
+        tac_msg = TACMessage(tac_type=TACMessage.Type.REGISTER, agent_name=agent_pbk)
+        controller_agent.agent_message_dispatcher.handle_agent_message(
+            Envelope(
+                to=controller_agent.crypto.public_key,
+                sender=agent_pbk,
+                protocol_id=TACMessage.protocol_id,
+                message=serializer.encode_batch([serializer.encode(tac_msg)]),
+            )
+        )
+
+    game_handlers = controller_agent.game_handlers
+    assert set(game_handlers["game_1"].registered_agents) == set()
+    assert set(game_handlers["game_2"].registered_agents) == {"agent_1_pbk"}
+    assert [(to, tac_msg.get("error_code")) for to, tac_msg in sent] == [
+        ("agent_2_pbk", TACMessage.ErrorCode.REQUEST_NOT_VALID.value)
+    ]
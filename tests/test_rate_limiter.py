@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the tests of the rate limiting of the controller."""
+
+from tac.agents.controller.base.rate_limiter import RateLimiter, TokenBucket
+from tac.platform.protocols.tac.message import TACMessage
+from tac.platform.protocols.tac.serialization import TACSerializer
+
+
+def test_token_bucket_refill_is_capped():
+    """Test that an idle bucket does not accumulate more tokens than its burst."""
+    bucket = TokenBucket(rate=10.0, burst=3, now=0.0)
+    assert [bucket.consume(now=100.0) for _ in range(4)] == [True, True, True, False]
+    assert not bucket.consume(now=100.05)
+    assert bucket.consume(now=100.2)
+
+
+def test_rate_limiter_is_per_sender():
+    """Test that a flooding sender does not consume the tokens of the others."""
+    rate_limiter = RateLimiter(rate=1.0, burst=2)
+    assert [rate_limiter.allow("flooder", now=0.0) for _ in range(5)] == [
+        True,
+        True,
+        False,
+        False,
+        False,
+    ]
+    assert rate_limiter.nb_rejected("flooder") == 3
+    assert rate_limiter.allow("agent", now=0.0)
+    assert rate_limiter.nb_rejected("agent") == 0
+
+    assert rate_limiter.allow("flooder", now=1.0)
+    assert rate_limiter.nb_rejected("flooder") == 0
+
+
+def test_idle_buckets_are_evicted():
+    """Test that only the senders active in the last burst / rate seconds have a bucket."""
+    rate_limiter = RateLimiter(rate=1.0, burst=2)
+    for i in range(100):
+        assert rate_limiter.allow("sender_{}".format(i), now=i * 0.1)
+    assert len(rate_limiter) == 20
+
+    assert [rate_limiter.allow("flooder", now=20.0) for _ in range(3)] == [
+        True,
+        True,
+        False,
+    ]
+    assert len(rate_limiter) == 1
+    assert rate_limiter.nb_rejected("flooder") == 1
+    assert rate_limiter.allow("agent", now=22.0)
+    assert len(rate_limiter) == 1
+    assert rate_limiter.nb_rejected("flooder") == 0
+
+
+def test_rate_limit_error_code_serialization():
+    """Test that the rate limit error survives the serialization."""
+    msg = TACMessage(
+        tac_type=TACMessage.Type.TAC_ERROR,
+        error_code=TACMessage.ErrorCode.RATE_LIMIT_EXCEEDED,
+    )
+    actual_msg = TACSerializer().decode(TACSerializer().encode(msg))
+    assert actual_msg.get("error_code") == TACMessage.ErrorCode.RATE_LIMIT_EXCEEDED
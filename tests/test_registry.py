@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the tests of the agent registry of the controller."""
+
+import pytest
+
+from tac.agents.controller.base.registry import AgentRegistry
+
+
+class TestAgentRegistry:
+    """Class to test the agent registry."""
+
+    def test_register_and_unregister(self):
+        """Test that the registry is indexed both by public key and by name."""
+        registry = AgentRegistry()
+        registry.register("pbk_0", "agent_0")
+        registry.register("pbk_1", "agent_1")
+
+        assert len(registry) == 2
+        assert "pbk_0" in registry
+        assert registry.is_name_registered("agent_1")
+        assert registry.pbk_to_name == {"pbk_0": "agent_0", "pbk_1": "agent_1"}
+        assert set(registry.public_keys) == {"pbk_0", "pbk_1"}
+
+        assert registry.unregister("pbk_0") == "agent_0"
+        assert "pbk_0" not in registry
+        assert not registry.is_name_registered("agent_0")
+        registry.register("pbk_2", "agent_0")
+        assert registry.pbk_to_name["pbk_2"] == "agent_0"
+
+    def test_duplicates_are_rejected(self):
+        """Test that a public key or a name cannot be registered twice."""
+        registry = AgentRegistry()
+        registry.register("pbk_0", "agent_0")
+        with pytest.raises(ValueError):
+            registry.register("pbk_0", "agent_1")
+        with pytest.raises(ValueError):
+            registry.register("pbk_1", "agent_0")
+        assert registry.pbk_to_name == {"pbk_0": "agent_0"}
+
+    def test_whitelist(self):
+        """Test the whitelist check."""
+        assert AgentRegistry().is_whitelisted("anyone")
+        registry = AgentRegistry(whitelist=["agent_0"])
+        assert registry.is_whitelisted("agent_0")
+        assert not registry.is_whitelisted("agent_1")
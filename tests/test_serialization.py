@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""This module contains the tests of the serialization of the TAC messages."""
+
+import pytest
+
+from tac.platform.game.base import GameData, Transaction
+from tac.platform.protocols.tac import serialization, tac_pb2
+from tac.platform.protocols.tac.message import TACMessage
+from tac.platform.protocols.tac.serialization import (
+    GameIndex,
+    LazyTACMessage,
+    TAC_SCHEMA_VERSION,
+    TACSerializer,
+    peek_type,
+    peek_type_and_decompress,
+    peek_version_id,
+)
+
+NB_AGENTS = 5
+NB_GOODS = 100
+AGENT_PBKS = ["tac_agent_{}_pbk".format(i) for i in range(NB_AGENTS)]
+GOOD_PBKS = ["tac_good_{}_pbk".format(i) for i in range(NB_GOODS)]
+
+
+def _make_transaction_message(quantities_by_good_pbk=None) -> TACMessage:
+    """Make a transaction message over every good."""
+    if quantities_by_good_pbk is None:
+        quantities_by_good_pbk = {
+            good_pbk: i % 3 for i, good_pbk in enumerate(GOOD_PBKS)
+        }
+    return TACMessage(
+        tac_type=TACMessage.Type.TRANSACTION,
+        transaction_id="transaction_id",
+        is_sender_buyer=True,
+        counterparty=AGENT_PBKS[3],
+        amount=10.0,
+        quantities_by_good_pbk=quantities_by_good_pbk,
+    )
+
+
+def _make_game_data() -> GameData:
+    """Make the game data of the first agent."""
+    return GameData(
+        AGENT_PBKS[0],
+        20.0,
+        [1] * NB_GOODS,
+        [0.5] * NB_GOODS,
+        NB_AGENTS,
+        NB_GOODS,
+        1.0,
+        {agent_pbk: agent_pbk[:-4] for agent_pbk in AGENT_PBKS},
+        {good_pbk: good_pbk[:-4] for good_pbk in GOOD_PBKS},
+        "1",
+    )
+
+
+@pytest.fixture
+def v2_serializer() -> TACSerializer:
+    """Make a serializer allowed to use the packed schema."""
+    return TACSerializer(TAC_SCHEMA_VERSION, GameIndex(AGENT_PBKS, GOOD_PBKS))
+
+
+def test_transaction_round_trip(v2_serializer):
+    """Test that a transaction is decoded back equal in both schemas, and that the packed one is smaller."""
+    msg = _make_transaction_message()
+    v1_bytes = TACSerializer().encode(msg)
+    v2_bytes = v2_serializer.encode(msg)
+    assert len(v2_bytes) * 4 < len(v1_bytes)
+
+    for tac_bytes in (v1_bytes, v2_bytes):
+        decoded = v2_serializer.decode(tac_bytes)
+        for key in ("transaction_id", "is_sender_buyer", "counterparty", "amount"):
+            assert decoded.get(key) == msg.get(key)
+        assert decoded.get("quantities_by_good_pbk") == msg.get(
+            "quantities_by_good_pbk"
+        )
+    assert v2_serializer.decode(v2_bytes).get("schema_version") == TAC_SCHEMA_VERSION
+    assert not v2_serializer.decode(v1_bytes).is_set("schema_version")
+
+
+def test_v1_is_the_default():
+    """Test that the default serializer writes the v1 schema only."""
+    tac_bytes = TACSerializer().encode(_make_transaction_message())
+    container = tac_pb2.TACMessage()
+    container.ParseFromString(tac_bytes)
+    assert container.schema_version == 0
+    assert len(container.transaction.quantities_by_index) == 0
+    assert len(container.transaction.quantities) == NB_GOODS
+
+
+def test_v2_transaction_needs_the_index(v2_serializer):
+    """Test that a packed transaction cannot be decoded without the index of the game."""
+    tac_bytes = v2_serializer.encode(_make_transaction_message())
+    with pytest.raises(ValueError):
+        TACSerializer().decode(tac_bytes)
+
+
+def test_partial_bundle_falls_back_to_v1(v2_serializer):
+    """Test that a bundle over a subset of the goods is encoded with the v1 schema."""
+    msg = _make_transaction_message({GOOD_PBKS[0]: 1, GOOD_PBKS[1]: 2})
+    decoded = TACSerializer().decode(v2_serializer.encode(msg))
+    assert decoded.get("quantities_by_good_pbk") == {GOOD_PBKS[0]: 1, GOOD_PBKS[1]: 2}
+
+
+def test_state_update_round_trip(v2_serializer):
+    """Test that a state update with GameData and Transaction objects is self-contained in the packed schema."""
+    game_data = _make_game_data()
+    tx = Transaction(
+        "transaction_id",
+        True,
+        AGENT_PBKS[1],
+        10.0,
+        {good_pbk: 1 for good_pbk in GOOD_PBKS},
+        AGENT_PBKS[0],
+    )
+    msg = TACMessage(
+        tac_type=TACMessage.Type.STATE_UPDATE,
+        initial_state=game_data,
+        transactions=[tx],
+    )
+    for serializer in (TACSerializer(), v2_serializer):
+        decoded = TACSerializer().decode(serializer.encode(msg))
+        initial_state = decoded.get("initial_state")
+        assert initial_state["agent_pbk_to_name"] == game_data.agent_pbk_to_name
+        assert initial_state["good_pbk_to_name"] == game_data.good_pbk_to_name
+        assert initial_state["endowment"] == game_data.endowment
+        [decoded_tx] = decoded.get("transactions")
+        assert decoded_tx["counterparty"] == tx.counterparty
+        assert decoded_tx["quantities_by_good_pbk"] == tx.quantities_by_good_pbk
+
+
+def test_register_schema_version():
+    """Test that the schema version supported by an agent is sent with its registration."""
+    msg = TACMessage(
+        tac_type=TACMessage.Type.REGISTER,
+        agent_name="agent",
+        schema_version=TAC_SCHEMA_VERSION,
+    )
+    decoded = TACSerializer().decode(TACSerializer().encode(msg))
+    assert decoded.get("agent_name") == "agent"
+    assert decoded.get("schema_version") == TAC_SCHEMA_VERSION
+
+    legacy = TACMessage(tac_type=TACMessage.Type.REGISTER, agent_name="agent")
+    assert (
+        not TACSerializer()
+        .decode(TACSerializer().encode(legacy))
+        .is_set("schema_version")
+    )
+
+
+def _make_messages():
+    """Make a message of every type."""
+    game_data = _make_game_data()
+    return [
+        TACMessage(tac_type=TACMessage.Type.REGISTER, agent_name="agent"),
+        TACMessage(tac_type=TACMessage.Type.UNREGISTER),
+        _make_transaction_message(),
+        TACMessage(tac_type=TACMessage.Type.GET_STATE_UPDATE),
+        TACMessage(tac_type=TACMessage.Type.CANCELLED),
+        TACMessage(tac_type=TACMessage.Type.GAME_DATA, **vars(game_data)),
+        TACMessage(
+            tac_type=TACMessage.Type.TRANSACTION_CONFIRMATION,
+            transaction_id="transaction_id",
+        ),
+        TACMessage(
+            tac_type=TACMessage.Type.STATE_UPDATE,
+            initial_state=game_data,
+            transactions=[],
+        ),
+        TACMessage(
+            tac_type=TACMessage.Type.TAC_ERROR,
+            error_code=TACMessage.ErrorCode.GENERIC_ERROR,
+            error_msg="error",
+        ),
+    ]
+
+
+@pytest.mark.parametrize("schema_version", [1, 2])
+def test_lazy_decoding(schema_version, v2_serializer):
+    """Test that every type of message is decoded lazily to the same message as eagerly."""
+    serializer = v2_serializer if schema_version == 2 else TACSerializer()
+    for msg in _make_messages():
+        tac_bytes = serializer.encode(msg)
+        assert peek_type(tac_bytes) == msg.get("type")
+        lazy_msg = serializer.decode_lazy(tac_bytes)
+        assert isinstance(lazy_msg, LazyTACMessage)
+        assert lazy_msg == serializer.decode(tac_bytes)
+        assert lazy_msg.check_consistency()
+
+
+def test_lazy_decoding_parses_on_first_access(v2_serializer):
+    """Test that the content of a lazy message is parsed on the first access to a field, not before."""
+    lazy_msg = v2_serializer.decode_lazy(
+        v2_serializer.encode(_make_transaction_message())
+    )
+    assert lazy_msg.get("type") == TACMessage.Type.TRANSACTION
+    assert lazy_msg._container is None
+    assert lazy_msg.get("counterparty") == AGENT_PBKS[3]
+    assert lazy_msg._container is not None
+    assert "quantities_by_good_pbk" not in lazy_msg._body
+
+
+def test_lazy_decoding_is_timed_per_field(v2_serializer):
+    """Test that the decoding of every field of a lazy message is reported once, on its first access."""
+    decoding_times = []
+    lazy_msg = v2_serializer.decode_lazy(
+        v2_serializer.encode(_make_transaction_message()),
+        on_decode=decoding_times.append,
+    )
+    lazy_msg.get("type")
+    assert decoding_times == []
+    lazy_msg.get("counterparty")
+    lazy_msg.get("counterparty")
+    lazy_msg.get("amount")
+    assert len(decoding_times) == 2
+    assert all(seconds >= 0 for seconds in decoding_times)
+
+
+def test_peek_unknown_type():
+    """Test that the type of a message without content, or of a content unknown to TACMessage, is None."""
+    container = tac_pb2.TACMessage()
+    assert peek_type(container.SerializeToString()) is None
+    container.registered.SetInParent()
+    assert peek_type(container.SerializeToString()) is None
+    with pytest.raises(ValueError):
+        TACSerializer().decode_lazy(container.SerializeToString())
+    with pytest.raises(ValueError):
+        peek_type(b"\x1a\x05ab")
+
+
+@pytest.mark.parametrize("compression", [None, "zlib"])
+def test_version_id(compression):
+    """Test that the version id of the game is set by the serializer, and read without decoding the message."""
+    serializer = TACSerializer(
+        compression=compression, compression_threshold=0, version_id="tac_1"
+    )
+    tac_bytes = serializer.encode(_make_transaction_message())
+    if compression is not None:
+        assert tac_pb2.TACMessage.FromString(tac_bytes).compressed
+    assert peek_version_id(tac_bytes) == "tac_1"
+    assert serializer.decode(tac_bytes).get("version_id") == "tac_1"
+    assert serializer.decode_lazy(tac_bytes).get("version_id") == "tac_1"
+
+    msg = TACMessage(tac_type=TACMessage.Type.UNREGISTER, version_id="tac_2")
+    assert peek_version_id(serializer.encode(msg)) == "tac_2"
+    tac_bytes = TACSerializer().encode(_make_transaction_message())
+    assert peek_version_id(tac_bytes) is None
+    assert not TACSerializer().decode(tac_bytes).is_set("version_id")
+
+
+def test_peeked_message_is_decoded_without_decompressing_it_again(monkeypatch):
+    """Test that a compressed message is decompressed once, when its type is read, and decoded from the result."""
+    msg = TACMessage(
+        tac_type=TACMessage.Type.TAC_ERROR,
+        error_code=TACMessage.ErrorCode.GENERIC_ERROR,
+        error_msg="error " * 100,
+    )
+    tac_bytes = TACSerializer(compression="zlib", compression_threshold=0).encode(msg)
+    decompressed_sizes = []
+    decompress = serialization.decompress
+
+    def _decompress(data, compression):
+        decompressed_sizes.append(len(data))
+        return decompress(data, compression)
+
+    monkeypatch.setattr(serialization, "decompress", _decompress)
+    tac_type, plain_bytes = peek_type_and_decompress(tac_bytes)
+    tac_msg = TACSerializer().decode_lazy(plain_bytes, tac_type)
+    assert tac_msg.get("error_msg") == msg.get("error_msg")
+    assert len(decompressed_sizes) == 1
+
+    tac_msg = TACSerializer().decode_lazy(tac_bytes)
+    assert tac_msg.get("error_msg") == msg.get("error_msg")
+    assert len(decompressed_sizes) == 2
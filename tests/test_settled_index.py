@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""This module contains the tests of the index of the settled transactions."""
+
+from tac.agents.controller.base.settled_index import SettledTransactionIndex
+from tac.platform.protocols.tac.message import TACMessage
+from tac.platform.protocols.tac.serialization import TACSerializer
+
+from .common import make_transactions
+
+
+def test_settled_transactions_are_found():
+    """Test that only the settled transaction ids are found in the index."""
+    transaction_ids = [tx.transaction_id for tx in make_transactions(100)]
+    index = SettledTransactionIndex(transaction_ids[:50])
+    for transaction_id in transaction_ids[50:60]:
+        index.add(transaction_id)
+
+    assert len(index) == 60
+    assert all(transaction_id in index for transaction_id in transaction_ids[:60])
+    assert not any(transaction_id in index for transaction_id in transaction_ids[60:])
+    assert None not in index
+
+
+def test_already_settled_error_code_serialization():
+    """Test that the 'already settled' error survives the serialization."""
+    msg = TACMessage(
+        tac_type=TACMessage.Type.TAC_ERROR,
+        error_code=TACMessage.ErrorCode.TRANSACTION_ALREADY_SETTLED,
+        details={"transaction_id": "tx_0"},
+    )
+    actual_msg = TACSerializer().decode(TACSerializer().encode(msg))
+    assert (
+        actual_msg.get("error_code") == TACMessage.ErrorCode.TRANSACTION_ALREADY_SETTLED
+    )
+    assert actual_msg.get("details") == {"transaction_id": "tx_0"}
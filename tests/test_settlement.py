@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the tests of the settlement engine of the controller."""
+
+import pytest
+
+from tac.agents.controller.base.settlement import (
+    SettlementEngine,
+    partition_transactions,
+)
+
+from .common import make_game, make_transactions
+
+
+def test_groups_are_conflict_free_and_preserve_order():
+    """Test that the groups involve disjoint agents and keep the per-agent arrival order."""
+    game = make_game()
+    transactions = make_transactions(50)
+    agent_pbk_to_index = {
+        agent_pbk: i for i, agent_pbk in enumerate(game.configuration.agent_pbks)
+    }
+    groups = partition_transactions(transactions, agent_pbk_to_index)
+
+    assert sorted(i for group in groups for i in group) == list(range(50))
+    group_of = {
+        i: group_index for group_index, group in enumerate(groups) for i in group
+    }
+    for group in groups:
+        agents = [
+            agent
+            for i in group
+            for agent in (transactions[i].buyer_pbk, transactions[i].seller_pbk)
+        ]
+        assert len(agents) == len(set(agents))
+    for i, tx_i in enumerate(transactions):
+        for j in range(i):
+            tx_j = transactions[j]
+            if {tx_i.buyer_pbk, tx_i.seller_pbk} & {tx_j.buyer_pbk, tx_j.seller_pbk}:
+                assert group_of[j] < group_of[i]
+
+
+@pytest.mark.parametrize("nb_workers", [1, 3])
+def test_engine_matches_sequential_settlement(nb_workers):
+    """Test that the settlement engine gives the same outcome as settling the transactions one by one."""
+    transactions = make_transactions(200)
+
+    expected_game = make_game()
+    expected_outcome = []
+    for tx in transactions:
+        is_valid = expected_game.is_transaction_valid(tx)
+        if is_valid:
+            expected_game.settle_transaction(tx)
+        expected_outcome.append(is_valid)
+
+    game = make_game()
+    engine = SettlementEngine(game, nb_workers=nb_workers)
+    try:
+        for tx in transactions[:120]:
+            engine.submit(tx)
+        outcome = engine.settle()
+        for tx in transactions[120:]:
+            engine.submit(tx)
+        outcome += engine.settle()
+    finally:
+        engine.stop()
+
+    assert [tx for tx, _ in outcome] == transactions
+    assert [is_settled for _, is_settled in outcome] == expected_outcome
+    assert 0 < sum(expected_outcome) < len(transactions)
+    assert game.transactions == expected_game.transactions
+    assert game.get_holdings_dict() == expected_game.get_holdings_dict()
+    assert game.get_balances() == expected_game.get_balances()
+    assert game.get_prices() == expected_game.get_prices()
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the tests of the handling of the transactions by the controller."""
+
+from aea.mail.base import Envelope
+
+from tac.agents.controller.agent import ControllerAgent
+from tac.agents.controller.base.tac_parameters import TACParameters
+from tac.gui.monitor import NullMonitor
+from tac.platform.protocols.tac.message import TACMessage
+from tac.platform.protocols.tac.serialization import TACSerializer
+
+
+def test_transaction_matched_twice_in_a_cycle_is_settled_once(monkeypatch, tmp_path):
+    """Test that a transaction id matched again before the settlement of the cycle is rejected."""
+    monkeypatch.setenv("SHARED_DIR", str(tmp_path))
+    controller_agent = ControllerAgent(
+        "controller",
+        "127.0.0.1",
+        10000,
+        TACParameters(min_nb_agents=2, settlement_workers=1),
+        NullMonitor(),
+    )
+    dispatcher = controller_agent.agent_message_dispatcher
+    game_handler = controller_agent.game_handler
+    for agent_pbk in ["agent_1_pbk", "agent_2_pbk"]:
+        dispatcher.handle_agent_message(
+            Envelope(
+                to=controller_agent.crypto.public_key,
+                sender=agent_pbk,
+                protocol_id=TACMessage.protocol_id,
+                message=TACSerializer().encode(
+                    TACMessage(tac_type=TACMessage.Type.REGISTER, agent_name=agent_pbk)
+                ),
+            )
+        )
+    game_handler.start_competition()
+    sent_messages = []
+    monkeypatch.setattr(
+        game_handler,
+        "send_tac_message",
+        lambda to, tac_msg: sent_messages.append((to, tac_msg)),
+    )
+
+    game = game_handler.current_game
+    seller_state = game.agent_states["agent_2_pbk"]
+    good_id = seller_state.current_holdings.index(max(seller_state.current_holdings))
+    quantities = {
+        good_pbk: 1 if i == good_id else 0
+        for i, good_pbk in enumerate(game.configuration.good_pbks)
+    }
+    handler = dispatcher.handlers[TACMessage.Type.TRANSACTION]
+    for _ in range(2):
+        for sender, counterparty, is_sender_buyer in [
+            ("agent_1_pbk", "agent_2_pbk", True),
+            ("agent_2_pbk", "agent_1_pbk", False),
+        ]:
+            handler.handle(
+                TACMessage(
+                    tac_type=TACMessage.Type.TRANSACTION,
+                    transaction_id="transaction_0",
+                    is_sender_buyer=is_sender_buyer,
+                    counterparty=counterparty,
+                    amount=1.0,
+                    quantities_by_good_pbk=quantities,
+                ),
+                sender,
+            )
+    assert [tac_msg.get("error_code") for _, tac_msg in sent_messages] == [
+        TACMessage.ErrorCode.TRANSACTION_ALREADY_SETTLED
+    ] * 2
+
+    dispatcher.update()
+    game_handler.stop()
+    assert len(game.transactions) == 1
+    assert [tac_msg.get("type") for _, tac_msg in sent_messages[2:]] == [
+        TACMessage.Type.TRANSACTION_CONFIRMATION
+    ] * 2
+
+    update_latency = controller_agent.metrics.handler_update_latency
+    assert update_latency["TRANSACTION"].count == 1
+    dispatcher.update()
+    assert update_latency["TRANSACTION"].count == 1
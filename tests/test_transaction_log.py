@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the tests of the transaction log of the controller."""
+
+import os
+
+import pytest
+
+from tac.agents.controller.base.transaction_log import (
+    TransactionLog,
+    TransactionLogReader,
+    recover_game,
+)
+from tac.platform.game.base import Transaction
+
+from .common import make_game, make_transactions
+
+
+def _settle(game, transactions, transaction_log):
+    """Settle the valid transactions and log them."""
+    for tx in transactions:
+        if game.is_transaction_valid(tx):
+            game.settle_transaction(tx)
+            transaction_log.append(tx)
+
+
+class TestTransactionLog:
+    """Class to test the transaction log."""
+
+    def test_recover_game(self, tmpdir):
+        """Test that the game rebuilt from the log is equal to the original one."""
+        path = os.path.join(str(tmpdir), "transactions.jsonl")
+        game = make_game()
+        transaction_log = TransactionLog.create(path, game, sync_every=10)
+        _settle(game, make_transactions(100), transaction_log)
+        transaction_log.close()
+
+        recovered_game = recover_game(path)
+        assert recovered_game == game
+        assert recovered_game.get_holdings_dict() == game.get_holdings_dict()
+        assert recovered_game.get_balances() == game.get_balances()
+
+    def test_truncated_record_is_ignored(self, tmpdir):
+        """Test that a record truncated by a crash is ignored by the recovery."""
+        path = os.path.join(str(tmpdir), "transactions.jsonl")
+        game = make_game()
+        transaction_log = TransactionLog.create(path, game)
+        _settle(game, make_transactions(20), transaction_log)
+        transaction_log.close()
+        with open(path, "a") as f:
+            f.write('{"transaction_id": "tx_trunc')
+
+        recovered_game = recover_game(path)
+        assert recovered_game.transactions == game.transactions
+
+    def test_failed_creation_keeps_the_existing_log(self, tmpdir, monkeypatch):
+        """Test that the existing log is left untouched if the creation of a new one fails."""
+        path = os.path.join(str(tmpdir), "transactions.jsonl")
+        game = make_game()
+        transaction_log = TransactionLog.create(path, game)
+        _settle(game, make_transactions(20), transaction_log)
+        transaction_log.close()
+        with open(path) as f:
+            content = f.read()
+
+        def _fail(tx):
+            raise ValueError("Transaction not serializable.")
+
+        monkeypatch.setattr(Transaction, "to_dict", _fail)
+        with pytest.raises(ValueError):
+            TransactionLog.create(path, game)
+        with open(path) as f:
+            assert f.read() == content
+        assert os.listdir(str(tmpdir)) == ["transactions.jsonl"]
+
+    def test_tail_reader_follows_the_log(self, tmpdir):
+        """Test that the tail reader returns the transactions as they are synced."""
+        path = os.path.join(str(tmpdir), "transactions.jsonl")
+        game = make_game()
+        transaction_log = TransactionLog.create(path, game, sync_every=1000)
+        reader = TransactionLogReader(path)
+        configuration, initialization = reader.read_header()
+        assert configuration == game.configuration
+        assert initialization == game.initialization
+        assert list(reader.read_transactions()) == []
+
+        transactions = make_transactions(60)
+        _settle(game, transactions[:30], transaction_log)
+        transaction_log.sync()
+        nb_first = len(game.transactions)
+        assert list(reader.read_transactions()) == game.transactions
+
+        _settle(game, transactions[30:], transaction_log)
+        transaction_log.close()
+        followed = list(reader.follow(poll_interval=0.0, is_stopped=lambda: True))
+        assert followed == game.transactions[nb_first:]
+        reader.close()
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""This module contains the tests of the store of the settled transactions."""
+
+from tac.agents.controller.base.transaction_store import TransactionStore
+
+from .common import NB_AGENTS, make_game, make_transactions
+
+
+def test_store_is_a_sequence():
+    """Test that the store behaves like the list of its transactions."""
+    transactions = make_transactions(20)
+    store = TransactionStore(transactions[:10])
+    for tx in transactions[10:]:
+        store.append(tx)
+
+    assert store == transactions
+    assert transactions == store
+    assert len(store) == 20
+    assert store[3] is transactions[3]
+    assert store[5:8] == transactions[5:8]
+    assert list(store) == transactions
+
+
+def test_views_are_the_history_of_every_agent():
+    """Test that the view of an agent contains its transactions, as sent by the agent, in settlement order."""
+    transactions = make_transactions(50)
+    store = TransactionStore(transactions)
+    for i in range(NB_AGENTS):
+        agent_pbk = "tac_agent_{}_pbk".format(i)
+        view = store.view(agent_pbk)
+        involved = [
+            tx for tx in transactions if agent_pbk in (tx.sender, tx.counterparty)
+        ]
+        assert len(view) == len(involved)
+        assert [tx.transaction_id for tx in view] == [
+            tx.transaction_id for tx in involved
+        ]
+        assert all(tx.sender == agent_pbk for tx in view)
+        for tx, expected in zip(view, involved):
+            assert tx.buyer_pbk == expected.buyer_pbk
+            assert tx.seller_pbk == expected.seller_pbk
+            assert tx.amount == expected.amount
+        assert [tx.transaction_id for tx in view[1:3]] == [
+            tx.transaction_id for tx in involved[1:3]
+        ]
+    assert len(store.view("unknown_pbk")) == 0
+
+
+def test_view_is_live():
+    """Test that a view reflects the transactions settled after its creation."""
+    game = make_game()
+    view = game.transactions.view("tac_agent_0_pbk")
+    nb_settled = 0
+    for tx in make_transactions(50):
+        if "tac_agent_0_pbk" in (tx.sender, tx.counterparty) and (
+            game.is_transaction_valid(tx)
+        ):
+            game.settle_transaction(tx)
+            nb_settled += 1
+    assert nb_settled > 0
+    assert len(view) == nb_settled
+
+
+def test_snapshot_ignores_the_later_transactions():
+    """Test that a snapshot, and the views of its agents, only contain the transactions settled before it."""
+    transactions = make_transactions(50)
+    store = TransactionStore(transactions[:20])
+    snapshot = store.snapshot()
+    for tx in transactions[20:]:
+        store.append(tx)
+
+    assert len(snapshot) == 20
+    assert list(snapshot) == transactions[:20]
+    assert snapshot[-1] is transactions[19]
+    assert snapshot[5:30] == transactions[5:20]
+    agent_pbk = "tac_agent_0_pbk"
+    assert [tx.transaction_id for tx in snapshot.view(agent_pbk)] == [
+        tx.transaction_id
+        for tx in transactions[:20]
+        if agent_pbk in (tx.sender, tx.counterparty)
+    ]